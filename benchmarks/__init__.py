@@ -0,0 +1,4 @@
+"""
+Paquete benchmarks - Scripts de medición de rendimiento
+Se ejecutan con: python -m benchmarks.<script>
+"""
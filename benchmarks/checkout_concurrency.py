@@ -0,0 +1,138 @@
+"""
+Benchmark: latencia de checkout mientras corre un reporte en paralelo
+Compara los perfiles del engine SQLite (ver config/database.py)
+
+Uso:
+    python -m benchmarks.checkout_concurrency [--sales 20000] [--checkouts 200]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+from config.database import create_db_engine, ENGINE_PROFILES
+from models import (
+    Base, Category, Product, RawMaterial, ProductMaterial, Sale, SaleItem,
+    PaymentMethod, SaleStatus
+)
+from services.sale_service import SaleService
+
+def seed(session_factory, n_products, n_sales):
+    """Crea un catálogo con recetas y un historial de ventas"""
+    session = session_factory()
+    try:
+        category = Category(name="Bench")
+        session.add(category)
+        materials = [
+            RawMaterial(name=f"Material {i}", sku=f"MAT-{i:04d}", unit='g', stock=1e9, cost_per_unit=1.0)
+            for i in range(30)
+        ]
+        session.add_all(materials)
+        products = [
+            Product(name=f"Producto {i}", sku=f"PROD-{i:05d}", category=category,
+                    stock=10**9, sale_price=1000, cost_price=400)
+            for i in range(n_products)
+        ]
+        session.add_all(products)
+        session.flush()
+        session.bulk_insert_mappings(ProductMaterial, [
+            {'product_id': p.id, 'raw_material_id': m.id, 'quantity_needed': 1.5}
+            for p in products for m in random.sample(materials, 6)
+        ])
+
+        start = datetime.now() - timedelta(days=365)
+        sale_rows = [
+            {'invoice_number': f"HIST-{i:08d}", 'subtotal': 5000, 'total': 5000,
+             'payment_method': PaymentMethod.CASH, 'status': SaleStatus.COMPLETED,
+             'created_at': start + timedelta(minutes=i), 'updated_at': start}
+            for i in range(n_sales)
+        ]
+        session.bulk_insert_mappings(Sale, sale_rows)
+        item_rows = []
+        for sale_id in range(1, n_sales + 1):
+            for product in random.sample(products, 5):
+                item_rows.append({'sale_id': sale_id, 'product_id': product.id, 'quantity': 1,
+                                  'unit_price': 1000, 'subtotal': 1000,
+                                  'created_at': start, 'updated_at': start})
+        session.bulk_insert_mappings(SaleItem, item_rows)
+        session.commit()
+        return [p.id for p in products]
+    finally:
+        session.close()
+
+def run_report(session_factory, stop):
+    """Reporte pesado en bucle (top productos sobre todo el historial)"""
+    runs = 0
+    while not stop.is_set():
+        session = session_factory()
+        try:
+            session.query(
+                SaleItem.product_id, func.sum(SaleItem.quantity), func.sum(SaleItem.subtotal)
+            ).join(Sale).group_by(SaleItem.product_id).order_by(func.sum(SaleItem.subtotal).desc()).all()
+            runs += 1
+        finally:
+            session.close()
+    stop.runs = runs
+
+def run_profile(profile, args):
+    """Mide la latencia de checkout para un perfil"""
+    directory = tempfile.mkdtemp(prefix='bench_checkout_')
+    db_path = os.path.join(directory, 'bench.db')
+    engine = create_db_engine(db_path, profile=profile, echo=False)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    product_ids = seed(session_factory, args.products, args.sales)
+
+    stop = threading.Event()
+    reporter = threading.Thread(target=run_report, args=(session_factory, stop), daemon=True)
+    reporter.start()
+    time.sleep(0.2)
+
+    latencies = []
+    session = session_factory()
+    try:
+        for _ in range(args.checkouts):
+            items = [
+                {'product_id': pid, 'quantity': 1, 'unit_price': 1000, 'subtotal': 1000}
+                for pid in random.sample(product_ids, args.lines)
+            ]
+            t0 = time.perf_counter()
+            SaleService.create_sale(session, items, payment_method=PaymentMethod.CASH)
+            latencies.append((time.perf_counter() - t0) * 1000)
+    finally:
+        session.close()
+        stop.set()
+        reporter.join()
+        engine.dispose()
+
+    latencies.sort()
+    return {
+        'profile': profile,
+        'p50': statistics.median(latencies),
+        'p95': latencies[int(len(latencies) * 0.95) - 1],
+        'max': latencies[-1],
+        'report_runs': getattr(stop, 'runs', 0)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia de checkout con un reporte concurrente")
+    parser.add_argument('--products', type=int, default=300)
+    parser.add_argument('--sales', type=int, default=20000)
+    parser.add_argument('--checkouts', type=int, default=200)
+    parser.add_argument('--lines', type=int, default=15)
+    parser.add_argument('--profiles', nargs='*', default=list(ENGINE_PROFILES))
+    args = parser.parse_args()
+
+    print(f"{'Perfil':<14}{'p50 (ms)':>10}{'p95 (ms)':>10}{'max (ms)':>10}{'reportes':>10}")
+    for profile in args.profiles:
+        result = run_profile(profile, args)
+        print(f"{result['profile']:<14}{result['p50']:>10.1f}{result['p95']:>10.1f}"
+              f"{result['max']:>10.1f}{result['report_runs']:>10}")
+
+if __name__ == '__main__':
+    main()
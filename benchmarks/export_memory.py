@@ -0,0 +1,105 @@
+"""
+Benchmark: memoria de la exportación de ventas
+Exporta (Excel y CSV) un historial pequeño y uno varias veces más grande
+con ExportService y compara el pico de memoria de Python (tracemalloc).
+Con la escritura en flujo continuo el pico no debe crecer con el número
+de ventas; falla (código de salida 1) si el historial grande supera el
+pico del pequeño en más del margen permitido.
+
+Uso:
+    python -m benchmarks.export_memory [--sales 5000] [--factor 4] [--margin 1.5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from config.database import create_db_engine
+from models import Base, Customer, Product, Sale, SaleItem, PaymentMethod, SaleStatus
+from services.export_service import ExportService
+
+ITEMS_PER_SALE = 3
+
+def seed(engine, n_sales):
+    """Crea clientes, productos y un año de ventas con sus items"""
+    start = datetime.now() - timedelta(days=365)
+    with engine.begin() as conn:
+        conn.execute(insert(Customer), [
+            {'name': f"Cliente {i}", 'created_at': start, 'updated_at': start} for i in range(200)
+        ])
+        conn.execute(insert(Product), [
+            {'name': f"Producto {i}", 'sku': f"PROD-{i:05d}", 'stock': 100, 'sale_price': 1000,
+             'created_at': start, 'updated_at': start}
+            for i in range(100)
+        ])
+        step = timedelta(days=365) / n_sales
+        conn.execute(insert(Sale), [
+            {'invoice_number': f"HIST-{i:08d}", 'customer_id': random.choice([None, random.randint(1, 200)]),
+             'subtotal': 3000, 'total': 3000, 'payment_method': PaymentMethod.CASH,
+             'status': SaleStatus.COMPLETED, 'created_at': start + step * i, 'updated_at': start}
+            for i in range(n_sales)
+        ])
+        conn.execute(insert(SaleItem), [
+            {'sale_id': sale_id, 'product_id': random.randint(1, 100), 'quantity': 1,
+             'unit_price': 1000, 'subtotal': 1000, 'created_at': start, 'updated_at': start}
+            for sale_id in range(1, n_sales + 1) for _ in range(ITEMS_PER_SALE)
+        ])
+
+def measure(engine, path):
+    """Pico de memoria y tiempo de exportar todas las ventas a path"""
+    session = sessionmaker(bind=engine)()
+    try:
+        tracemalloc.start()
+        started = time.perf_counter()
+        ExportService.write(path, [ExportService.sales_sheet(), ExportService.sale_items_sheet()], session)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        session.close()
+    return peak, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sales', type=int, default=5000)
+    parser.add_argument('--factor', type=int, default=4, help="Veces más ventas en el historial grande")
+    parser.add_argument('--margin', type=float, default=1.5, help="Crecimiento máximo permitido del pico")
+    args = parser.parse_args()
+
+    sizes = (args.sales, args.sales * args.factor)
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {}
+        for n_sales in sizes:
+            print(f"Creando {n_sales:,} ventas con {ITEMS_PER_SALE} items...")
+            engines[n_sales] = create_db_engine(os.path.join(tmp, f"bench_{n_sales}.db"))
+            Base.metadata.create_all(bind=engines[n_sales])
+            seed(engines[n_sales], n_sales)
+        print()
+
+        for extension in ('xlsx', 'csv'):
+            (small_peak, small_time), (large_peak, large_time) = [
+                measure(engines[n_sales], os.path.join(tmp, f"ventas_{n_sales}.{extension}"))
+                for n_sales in sizes
+            ]
+            status = "OK" if large_peak <= small_peak * args.margin else "ERROR"
+            failed = failed or status == "ERROR"
+            print(
+                f"[{status}] {extension:>4}: {sizes[0]:,} ventas {small_peak / 1e6:6.1f} MB ({small_time:.1f}s) | "
+                f"{sizes[1]:,} ventas {large_peak / 1e6:6.1f} MB ({large_time:.1f}s)"
+            )
+
+        for engine in engines.values():
+            engine.dispose()
+
+    if failed:
+        print(f"\nEl pico de memoria creció más de {args.margin:.1f}x con el historial")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: reporte de consumo de materias primas sobre un historial grande
+Crea una base temporal con 500 materias primas y 1.000.000 de movimientos
+repartidos en un año, y mide ReportService.materials_consumption para
+períodos de 30, 90 y 365 días. Falla (código de salida 1) si algún período
+tarda más del límite.
+
+Uso:
+    python -m benchmarks.materials_consumption [--materials 500] [--movements 1000000] [--limit 1.0]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert, text
+from sqlalchemy.orm import sessionmaker
+from config.database import create_db_engine
+from models import Base, RawMaterial, RawMaterialMovement, RawMaterialMovementType
+from services.report_service import ReportService
+
+BATCH_SIZE = 50000
+
+def seed(engine, n_materials, n_movements, end):
+    """Crea las materias primas y el historial de movimientos (80% producción)"""
+    start = end - timedelta(days=365)
+    with engine.begin() as conn:
+        conn.execute(insert(RawMaterial), [
+            {'name': f"Material {i:04d}", 'sku': f"MAT-{i:04d}", 'unit': 'g',
+             'stock': random.uniform(0, 5000), 'min_stock': 100, 'cost_per_unit': random.uniform(0.1, 5),
+             'created_at': start, 'updated_at': start}
+            for i in range(n_materials)
+        ])
+
+        types = [RawMaterialMovementType.PRODUCTION] * 8 + [
+            RawMaterialMovementType.PURCHASE, RawMaterialMovementType.RETURN
+        ]
+        seconds = int((end - start).total_seconds())
+        for offset in range(0, n_movements, BATCH_SIZE):
+            rows = []
+            for _ in range(min(BATCH_SIZE, n_movements - offset)):
+                movement_type = random.choice(types)
+                created_at = start + timedelta(seconds=random.randrange(seconds))
+                quantity = random.uniform(1, 50)
+                rows.append({
+                    'raw_material_id': random.randint(1, n_materials),
+                    'movement_type': movement_type,
+                    'quantity': -quantity if movement_type == RawMaterialMovementType.PRODUCTION else quantity,
+                    'cost': 0.0,
+                    'created_at': created_at,
+                    'updated_at': created_at
+                })
+            conn.execute(insert(RawMaterialMovement), rows)
+        conn.execute(text("ANALYZE"))
+
+def measure(session_factory, date_from, date_to, repeat=3):
+    """Mejor tiempo de varias ejecuciones del reporte"""
+    best = None
+    rows = []
+    for _ in range(repeat):
+        session = session_factory()
+        try:
+            started = time.perf_counter()
+            rows = ReportService.materials_consumption(session, date_from, date_to)
+            elapsed = time.perf_counter() - started
+        finally:
+            session.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--materials', type=int, default=500)
+    parser.add_argument('--movements', type=int, default=1000000)
+    parser.add_argument('--limit', type=float, default=1.0, help="Segundos máximos por período")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(os.path.join(tmp, 'bench.db'))
+        Base.metadata.create_all(bind=engine)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        print(f"Creando {args.materials} materias primas y {args.movements:,} movimientos...")
+        started = time.perf_counter()
+        seed(engine, args.materials, args.movements, today + timedelta(days=1))
+        print(f"Datos listos en {time.perf_counter() - started:.1f}s\n")
+
+        session_factory = sessionmaker(bind=engine)
+        failed = False
+        for days in (30, 90, 365):
+            elapsed, count = measure(session_factory, (today - timedelta(days=days - 1)).date(), today.date())
+            status = "OK" if elapsed <= args.limit else "ERROR"
+            failed = failed or status == "ERROR"
+            print(f"[{status}] {days:>3} días: {elapsed * 1000:8.1f} ms ({count} materias primas)")
+
+        engine.dispose()
+
+    if failed:
+        print(f"\nAlgún período superó el límite de {args.limit:.2f}s")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
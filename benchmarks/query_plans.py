@@ -0,0 +1,159 @@
+"""
+Verificación de planes de consulta (EXPLAIN QUERY PLAN)
+Falla (código de salida 1) si alguna consulta de reportes o historiales
+recorre completa una tabla grande en lugar de usar un índice. La misma
+verificación corre con pytest en tests/test_query_plans.py
+
+Uso:
+    python -m benchmarks.query_plans
+"""
+import sys
+from datetime import date, datetime, timedelta
+from sqlalchemy import create_engine, func, desc
+from sqlalchemy.orm import sessionmaker
+from utils.date_ranges import on_day
+from database.sale_repository import SaleRepository
+from database.product_repository import ProductRepository
+from database.customer_repository import CustomerRepository
+from database.raw_material_repository import RawMaterialRepository
+from database.expense_repository import ExpenseRepository
+from services.report_service import ReportService
+from models import (
+    Base, Sale, SaleItem, Product, Customer, DailySalesRollup, RawMaterialMovement,
+    InventoryMovement, ProductMaterial, Expense
+)
+
+# Tablas que crecen con el historial: no se permite un SCAN completo sobre ellas
+LARGE_TABLES = (
+    'sales', 'sale_items', 'inventory_movements', 'raw_material_movements',
+    'product_materials', 'expenses', 'daily_sales_rollup'
+)
+
+def report_queries(session):
+    """Consultas de reportes e historiales a verificar"""
+    date_from = date(2025, 1, 1)
+    date_to = date_from + timedelta(days=30)
+    return {
+        'top_productos': session.query(
+            Product.name,
+            func.sum(DailySalesRollup.quantity).label('total_quantity'),
+            func.sum(DailySalesRollup.revenue).label('total_amount')
+        ).join(
+            DailySalesRollup, Product.id == DailySalesRollup.ref_id
+        ).filter(
+            DailySalesRollup.kind == DailySalesRollup.PRODUCT,
+            DailySalesRollup.day.between(date_from, date_to)
+        ).group_by(Product.id, Product.name).order_by(desc('total_quantity')).limit(10),
+
+        'top_clientes': session.query(
+            Customer.name,
+            func.sum(DailySalesRollup.sales_count).label('purchase_count'),
+            func.sum(DailySalesRollup.revenue).label('total_amount')
+        ).join(
+            DailySalesRollup, Customer.id == DailySalesRollup.ref_id
+        ).filter(
+            DailySalesRollup.kind == DailySalesRollup.CUSTOMER,
+            DailySalesRollup.day.between(date_from, date_to)
+        ).group_by(Customer.id, Customer.name).order_by(desc('total_amount')).limit(10),
+
+        'resumen_ventas': session.query(
+            func.sum(DailySalesRollup.revenue), func.sum(DailySalesRollup.sales_count)
+        ).filter(
+            DailySalesRollup.kind == DailySalesRollup.TOTAL,
+            DailySalesRollup.day.between(date_from, date_to)
+        ),
+
+        # Aporte de una venta al resumen diario (SalesRollupService.snapshot)
+        'resumen_aporte_venta': session.query(
+            SaleItem.product_id, func.sum(SaleItem.quantity), func.sum(SaleItem.subtotal)
+        ).filter(SaleItem.sale_id == 1).group_by(SaleItem.product_id),
+
+        'consumo_materias_primas': ReportService.materials_consumption_query(session, date_from, date_to),
+
+        'items_de_venta': session.query(SaleItem).filter(SaleItem.sale_id == 1),
+
+        'receta_de_producto': session.query(ProductMaterial).filter(ProductMaterial.product_id == 1),
+
+        'historial_producto': session.query(InventoryMovement).filter(
+            InventoryMovement.product_id == 1
+        ).order_by(InventoryMovement.created_at.desc()),
+
+        'movimientos_productos_del_dia': session.query(InventoryMovement).filter(
+            on_day(InventoryMovement.created_at, date_from)
+        ).order_by(InventoryMovement.created_at.desc()),
+
+        'movimientos_materias_primas_del_dia': session.query(RawMaterialMovement).filter(
+            on_day(RawMaterialMovement.created_at, date_from)
+        ).order_by(RawMaterialMovement.created_at.desc()),
+
+        'anular_movimientos_venta': session.query(InventoryMovement).filter(
+            InventoryMovement.reference == 'SALE-1'
+        ),
+
+        'listado_ventas': session.query(Sale).order_by(Sale.created_at.desc()).limit(50),
+
+        'listado_egresos': session.query(Expense).order_by(Expense.created_at.desc()).limit(50),
+
+        # Páginas siguientes de los listados (keyset)
+        'pagina_ventas': SaleRepository.page_query(session, (datetime(2025, 1, 1), 100)),
+
+        'pagina_egresos_efectivo': ExpenseRepository.page_query(
+            session, (datetime(2025, 1, 1), 100), filters={'cash': True}
+        ),
+
+        'pagina_productos': ProductRepository.page_query(session, ('M', 100)),
+
+        'pagina_clientes': CustomerRepository.page_query(session, ('M', 100)),
+
+        'pagina_materias_primas': RawMaterialRepository.page_query(session, ('M', 100)),
+    }
+
+def explain(engine, statement):
+    """Devuelve las líneas de detalle de EXPLAIN QUERY PLAN para una sentencia"""
+    sql = statement.compile(dialect=engine.dialect, compile_kwargs={'literal_binds': True})
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [row[3] for row in rows]
+
+def full_scans(plan):
+    """Detalles del plan que recorren completa una tabla grande"""
+    offending = []
+    for detail in plan:
+        if not detail.startswith('SCAN '):
+            continue
+        table = detail.split()[1]
+        if table in LARGE_TABLES and 'USING' not in detail:
+            offending.append(detail)
+    return offending
+
+def check_query_plans(engine=None):
+    """
+    Revisa los planes de todas las consultas
+
+    Returns:
+        dict {nombre_consulta: [detalles con SCAN completo]} solo con las que fallan
+    """
+    if engine is None:
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        failures = {}
+        for name, query in report_queries(session).items():
+            offending = full_scans(explain(engine, query.statement))
+            if offending:
+                failures[name] = offending
+        return failures
+    finally:
+        session.close()
+
+def main():
+    failures = check_query_plans()
+    if failures:
+        for name, details in failures.items():
+            print(f"[ERROR] {name}: {'; '.join(details)}")
+        sys.exit(1)
+    print("[OK] Todas las consultas usan índices")
+
+if __name__ == '__main__':
+    main()
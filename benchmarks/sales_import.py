@@ -0,0 +1,84 @@
+"""
+Benchmark: importación de ventas desde Excel
+Genera un libro con 100.000 ventas (más algunas filas inválidas o
+duplicadas), lo importa con ImportService sobre una base temporal y
+compara el tiempo con el de solo leer el libro con openpyxl en modo
+read_only, que es el piso de la importación. Falla (código de salida 1) si
+validar e insertar agrega más que el margen permitido sobre la lectura.
+
+Uso:
+    python -m benchmarks.sales_import [--rows 100000] [--margin 2.0]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from openpyxl import Workbook, load_workbook
+from sqlalchemy.orm import sessionmaker
+from config.database import create_db_engine
+from models import Base, Sale
+from services.import_service import ImportService
+
+HEADERS = ["N° Factura", "Fecha", "Cliente", "Método Pago", "Estado", "Subtotal", "Impuesto", "Descuento", "Total"]
+
+def write_workbook(path, n_rows):
+    """Libro de ventas con clientes repetidos, ventas sin cliente y filas con errores"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Ventas")
+    ws.append(HEADERS)
+    for i in range(n_rows):
+        ws.append([
+            f"IMP-{i:08d}", f"{i % 28 + 1:02d}/{i % 12 + 1:02d}/2025 10:{i % 60:02d}",
+            f"Cliente {i % 500}" if i % 3 else None, "Tarjeta", "Completada", 1000, 0, 0, 1000
+        ])
+    ws.append(["IMP-00000001", "01/01/2025", "Duplicada", "Efectivo", "Completada", 1, 0, 0, 1])
+    ws.append(["IMP-FECHA", "fecha inválida", "X", "Efectivo", "Completada", 1, 0, 0, 1])
+    wb.save(path)
+
+def read_only_time(path):
+    """Tiempo de recorrer todas las filas del libro sin procesarlas"""
+    started = time.perf_counter()
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for _ in wb.active.iter_rows(values_only=True):
+            pass
+    finally:
+        wb.close()
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--margin', type=float, default=2.0, help="Veces el tiempo de lectura permitido")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ventas.xlsx')
+        print(f"Generando libro con {args.rows:,} ventas...")
+        write_workbook(path, args.rows)
+
+        engine = create_db_engine(os.path.join(tmp, 'bench.db'))
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        try:
+            read_seconds = read_only_time(path)
+            started = time.perf_counter()
+            result = ImportService.import_sales(session, path)
+            import_seconds = time.perf_counter() - started
+            imported = session.query(Sale).count()
+        finally:
+            session.close()
+            engine.dispose()
+
+    print(f"\nLectura openpyxl: {read_seconds:6.1f}s")
+    print(f"Importación:      {import_seconds:6.1f}s ({imported / import_seconds:,.0f} filas/s, "
+          f"{result.imported:,} importadas, {len(result.errors)} errores)")
+
+    failed = import_seconds > read_seconds * args.margin or result.imported != args.rows or len(result.errors) != 2
+    print(f"[{'ERROR' if failed else 'OK'}] importación / lectura = {import_seconds / read_seconds:.2f}x")
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
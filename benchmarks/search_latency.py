@@ -0,0 +1,187 @@
+"""
+Benchmark: latencia de la búsqueda de productos y clientes
+Crea un catálogo pequeño y uno varias veces más grande (productos y
+clientes), los deja con el esquema al día (tablas FTS5 llenas por la
+migración) y mide búsquedas por prefijo con SearchIndex y con el LIKE
+'%texto%' anterior. Falla (código de salida 1) si la latencia de las
+búsquedas selectivas (cuyos resultados no crecen con el catálogo) en el
+catálogo grande supera la del pequeño en más del margen permitido, o si
+el índice no devuelve los mismos registros que la misma búsqueda hecha en
+Python.
+
+Uso:
+    python -m benchmarks.search_latency [--products 5000] [--factor 10] [--margin 3.0]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import unicodedata
+from datetime import datetime
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import sessionmaker
+from config.database import create_db_engine
+from config.migrations import create_tables, migrate
+from database.search_index import SearchIndex
+from models import Product, Customer
+
+WORDS = (
+    'crispetas', 'caramelo', 'mantequilla', 'queso', 'limón', 'gaseosa', 'combo', 'familiar',
+    'pequeño', 'grande', 'picante', 'dulce', 'salado', 'jalapeño', 'café', 'té', 'maní',
+    'chocolate', 'fresa', 'vainilla', 'canción', 'agua', 'jugo', 'naranja', 'mango'
+)
+NAMES = ('José', 'María', 'Andrés', 'Lucía', 'Sofía', 'Camilo', 'Valentina', 'Julián', 'Martín', 'Inés')
+SURNAMES = ('Pérez', 'Gómez', 'Rodríguez', 'López', 'Martínez', 'Díaz', 'Hernández', 'Muñoz')
+
+# Búsquedas selectivas: sus resultados no crecen con el catálogo, así que
+# su latencia tampoco debe crecer (es la que se verifica)
+SELECTIVE_QUERIES = (
+    ('products', 'PROD-000123'), ('products', '000123'), ('products', 'PROD-0001'),
+    ('customers', '10000123'), ('customers', 'cliente42@correo'), ('customers', '3000000123'),
+)
+
+# Búsquedas amplias: coinciden con una fracción fija del catálogo (informativo)
+BROAD_QUERIES = (
+    ('products', 'crisp'), ('products', 'limon gase'), ('products', 'jalapeno'),
+    ('customers', 'jose'), ('customers', 'perez mar'),
+)
+
+def seed(engine, n_products, rng):
+    """Crea productos y clientes con nombres de varias palabras"""
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(insert(Product), [
+            {'name': ' '.join(rng.sample(WORDS, 3)).capitalize(), 'sku': f"PROD-{i:06d}",
+             'description': ' '.join(rng.sample(WORDS, 5)), 'stock': 10, 'sale_price': 1000,
+             'created_at': now, 'updated_at': now}
+            for i in range(n_products)
+        ])
+        conn.execute(insert(Customer), [
+            {'name': f"{rng.choice(NAMES)} {rng.choice(SURNAMES)} {rng.choice(SURNAMES)}",
+             'document_number': f"{10000000 + i}", 'email': f"cliente{i}@correo.com",
+             'phone': f"300{i:07d}", 'created_at': now, 'updated_at': now}
+            for i in range(n_products)
+        ])
+
+def fold(value):
+    """Minúsculas sin tildes (como el tokenizador unicode61 con remove_diacritics)"""
+    decomposed = unicodedata.normalize('NFD', value or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+def expected_ids(session, table, search):
+    """
+    Ids que coinciden con la búsqueda según SearchIndex.match_query, calculado
+    en Python: cada trozo de la búsqueda debe aparecer en alguna columna como
+    palabras consecutivas, la última como prefijo
+    """
+    if table == 'products':
+        rows = session.query(Product.id, Product.name, Product.sku, Product.description).all()
+    else:
+        rows = session.query(Customer.id, Customer.name, Customer.document_number, Customer.email, Customer.phone).all()
+    phrases = [words for words in (re.findall(r'\w+', fold(chunk)) for chunk in search.split()) if words]
+
+    def contains(words, phrase):
+        size = len(phrase)
+        return any(
+            words[i:i + size - 1] == phrase[:-1] and words[i + size - 1].startswith(phrase[-1])
+            for i in range(len(words) - size + 1)
+        )
+
+    matches = set()
+    for row in rows:
+        columns = [re.findall(r'\w+', fold(value)) for value in row[1:]]
+        if all(any(contains(words, phrase) for words in columns) for phrase in phrases):
+            matches.add(row[0])
+    return matches
+
+def like_ids(session, table, search):
+    """Búsqueda anterior: LIKE '%texto%' sobre todas las filas"""
+    pattern = f"%{search}%"
+    if table == 'products':
+        query = session.query(Product.id).filter(or_(Product.name.ilike(pattern), Product.sku.ilike(pattern)))
+    else:
+        query = session.query(Customer.id).filter(or_(
+            Customer.name.ilike(pattern), Customer.email.ilike(pattern), Customer.document_number.ilike(pattern)
+        ))
+    return [row[0] for row in query.order_by('name').limit(50)]
+
+def timed(function, repeat):
+    """Mejor tiempo (ms) de varias ejecuciones"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def measure(engine, queries, repeat, check):
+    """
+    Returns:
+        (ms totales con el índice, ms totales con LIKE, búsquedas con resultados distintos a la referencia)
+    """
+    session = sessionmaker(bind=engine)()
+    try:
+        search = {'products': SearchIndex.search_products, 'customers': SearchIndex.search_customers}
+        index_ms = like_ms = 0.0
+        mismatches = []
+        for table, text in queries:
+            index_ms += timed(lambda: search[table](session, text, 50), repeat)
+            like_ms += timed(lambda: like_ids(session, table, text), repeat)
+            if check and set(search[table](session, text)) != expected_ids(session, table, text):
+                mismatches.append(f"{table}: '{text}'")
+        return index_ms, like_ms, mismatches
+    finally:
+        session.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--products', type=int, default=5000, help="Productos (y clientes) del catálogo pequeño")
+    parser.add_argument('--factor', type=int, default=10, help="Veces más registros en el catálogo grande")
+    parser.add_argument('--margin', type=float, default=3.0, help="Crecimiento máximo permitido de la latencia")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    sizes = (args.products, args.products * args.factor)
+    groups = (('selectivas', SELECTIVE_QUERIES), ('amplias', BROAD_QUERIES))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_products in sizes:
+            print(f"Creando {n_products:,} productos y {n_products:,} clientes...")
+            engine = create_db_engine(os.path.join(tmp, f"search_{n_products}.db"))
+            with engine.begin() as conn:
+                create_tables(conn)
+            seed(engine, n_products, random.Random(n_products))
+            migrate(engine)  # Base sin versión: la migración crea y llena las tablas FTS
+            for name, queries in groups:
+                results[name, n_products] = measure(engine, queries, args.repeat, check=n_products == sizes[0])
+            engine.dispose()
+    print()
+
+    failed = False
+    for name, queries in groups:
+        (small_index, small_like, mismatches), (large_index, large_like, _) = [
+            results[name, n_products] for n_products in sizes
+        ]
+        for mismatch in mismatches:
+            print(f"[ERROR] Resultados distintos a la referencia: {mismatch}")
+            failed = True
+        status = "INFO"
+        if name == 'selectivas':
+            # Piso de 1 ms para que el ruido en tiempos mínimos no haga fallar la comparación
+            status = "OK" if large_index <= max(small_index, 1.0) * args.margin else "ERROR"
+            failed = failed or status == "ERROR"
+        print(f"[{status}] {len(queries)} búsquedas {name} con índice: {sizes[0]:,} registros {small_index:7.1f} ms | "
+              f"{sizes[1]:,} registros {large_index:7.1f} ms")
+        print(f"[INFO] {len(queries)} búsquedas {name} con LIKE:   {sizes[0]:,} registros {small_like:7.1f} ms | "
+              f"{sizes[1]:,} registros {large_like:7.1f} ms")
+
+    if failed:
+        print(f"\nLa búsqueda con índice creció más de {args.margin:.1f}x con el catálogo o dio resultados distintos")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
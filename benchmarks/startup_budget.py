@@ -0,0 +1,110 @@
+"""
+Benchmark: presupuesto de tiempo del inicio
+Crea una base de datos grande de prueba, inicia la aplicación contra ella
+(main.py --exit-after-startup, con Qt sin pantalla) y lee la ejecución que
+StartupTracer dejó en startup_log.json. Muestra el tiempo de cada fase del
+inicio y falla (código de salida 1) si el inicio hasta la primera pintura
+supera el presupuesto o si la aplicación no arrancó.
+
+Uso:
+    python -m benchmarks.startup_budget [--sales 50000] [--budget 3000] [--runs 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from sqlalchemy.orm import sessionmaker
+from config.database import create_db_engine
+from config.migrations import migrate
+from services.sales_rollup_service import SalesRollupService
+from utils.startup_tracer import StartupTracer, DEFAULT_BUDGET_MS
+from benchmarks.export_memory import seed, ITEMS_PER_SALE
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def build_fixture(db_path, n_sales):
+    """Base de datos con clientes, productos, ventas y su resumen diario (esquema ya versionado)"""
+    engine = create_db_engine(db_path)
+    migrate(engine)
+    seed(engine, n_sales)
+    session = sessionmaker(bind=engine)()
+    try:
+        SalesRollupService.rebuild(session)
+        session.commit()
+    finally:
+        session.close()
+    engine.dispose()
+
+def run_startup(db_path, budget_ms, timeout):
+    """
+    Inicia la aplicación y espera que se cierre tras la primera pintura
+
+    Returns:
+        (código de salida o None si se agotó el tiempo, ejecución registrada o None, salida)
+    """
+    env = dict(
+        os.environ, INVENTORY_DB_PATH=db_path, INVENTORY_STARTUP_BUDGET_MS=str(budget_ms),
+        QT_QPA_PLATFORM='offscreen', PYTHONIOENCODING='utf-8'
+    )
+    log_path = os.path.join(os.path.dirname(db_path), 'startup_log.json')
+    if os.path.exists(log_path):
+        os.remove(log_path)
+    try:
+        process = subprocess.run(
+            [sys.executable, 'main.py', '--exit-after-startup'], cwd=BASE_DIR, env=env,
+            capture_output=True, text=True, encoding='utf-8', timeout=timeout
+        )
+    except subprocess.TimeoutExpired as e:
+        output = e.stdout or b''
+        return None, None, output.decode('utf-8', 'replace') if isinstance(output, bytes) else output
+    report = None
+    if os.path.exists(log_path):
+        with open(log_path, 'r', encoding='utf-8') as file:
+            report = json.load(file)[-1]
+    return process.returncode, report, process.stdout + process.stderr
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sales', type=int, default=50000)
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET_MS, help="Presupuesto del inicio (ms)")
+    parser.add_argument('--runs', type=int, default=3, help="Inicios a medir (se evalúa el mejor)")
+    parser.add_argument('--timeout', type=int, default=120, help="Segundos máximos por inicio")
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'inventory.db')
+        print(f"Creando {args.sales:,} ventas con {ITEMS_PER_SALE} items...")
+        started = time.perf_counter()
+        build_fixture(db_path, args.sales)
+        print(f"Base de prueba: {os.path.getsize(db_path) / 1e6:.1f} MB ({time.perf_counter() - started:.1f}s)\n")
+
+        reports = []
+        for run in range(1, args.runs + 1):
+            returncode, report, output = run_startup(db_path, args.budget, args.timeout)
+            if returncode != 0 or report is None:
+                status = "tiempo agotado" if returncode is None else f"código {returncode}"
+                print(f"[ERROR] Inicio {run}: la aplicación no terminó el inicio ({status})")
+                print(output[-2000:])
+                failed = True
+                break
+            reports.append(report)
+            print(f"Inicio {run}: {report['total_ms']:.0f} ms (importaciones {report['import_ms']:.0f} ms)")
+
+        if reports:
+            best = min(reports, key=lambda report: report['total_ms'])
+            print("\nMejor inicio:")
+            print(StartupTracer.summary(best))
+            status = "OK" if best['total_ms'] <= args.budget else "ERROR"
+            failed = failed or status == "ERROR"
+            print(f"\n[{status}] Inicio hasta la primera pintura: {best['total_ms']:.0f} ms "
+                  f"(presupuesto {args.budget} ms, {args.sales:,} ventas)")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -18,6 +18,8 @@ a = Analysis(
         'sqlalchemy.ext.declarative',
         'openpyxl',
         'openpyxl.styles',
+        'lxml.etree',
+        'numpy',
         'reportlab',
         'PIL',
         'dotenv',
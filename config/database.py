@@ -2,24 +2,114 @@
 Configuración de la base de datos SQLite
 """
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, scoped_session
-from models.base import Base
+from sqlalchemy.pool import QueuePool
+from utils.startup_tracer import StartupTracer
 
-# Ruta de la base de datos
-DB_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-DB_PATH = os.path.join(DB_DIR, 'inventory.db')
+# Ruta de la base de datos (INVENTORY_DB_PATH permite usar otra, ej: la base
+# de prueba de benchmarks/startup_budget.py)
+DB_PATH = os.environ.get('INVENTORY_DB_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'data', 'inventory.db'
+)
+DB_DIR = os.path.dirname(os.path.abspath(DB_PATH))
 
 # Crear directorio data si no existe
 os.makedirs(DB_DIR, exist_ok=True)
 
+# Perfiles del engine SQLite
+# - performance: WAL (los reportes no bloquean las ventas), synchronous=NORMAL,
+#   caché de páginas y mmap amplios, temporales en memoria
+# - safe: journal clásico con synchronous=FULL (máxima durabilidad)
+# Se elige con la variable de entorno INVENTORY_DB_PROFILE (por defecto: performance)
+ENGINE_PROFILES = {
+    'performance': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'cache_size': -64000,       # Negativo = KiB (64 MB)
+            'mmap_size': 268435456,     # 256 MB
+            'temp_store': 'MEMORY',
+            'busy_timeout': 5000,       # ms
+        },
+        'pool_size': 8,       # Hilo de la interfaz + workers en segundo plano
+        'max_overflow': 8,
+        'pool_timeout': 30,
+    },
+    'safe': {
+        'pragmas': {
+            'journal_mode': 'DELETE',
+            'synchronous': 'FULL',
+            'temp_store': 'MEMORY',
+            'busy_timeout': 5000,
+        },
+        'pool_size': 4,
+        'max_overflow': 4,
+        'pool_timeout': 30,
+    },
+}
+
+DEFAULT_PROFILE = 'performance'
+DB_PROFILE = os.environ.get('INVENTORY_DB_PROFILE', DEFAULT_PROFILE).strip().lower()
+DB_ECHO = os.environ.get('INVENTORY_DB_ECHO', '0') == '1'  # '1' para ver las queries SQL en consola (debug)
+
+def get_engine_profile(name=None):
+    """
+    Obtiene la configuración de un perfil del engine
+    Los PRAGMA se pueden sobrescribir con variables de entorno
+    INVENTORY_DB_<PRAGMA> (ej: INVENTORY_DB_CACHE_SIZE=-128000)
+    """
+    name = name or DB_PROFILE
+    if name not in ENGINE_PROFILES:
+        print(f"⚠ Perfil de base de datos desconocido '{name}', usando '{DEFAULT_PROFILE}'")
+        name = DEFAULT_PROFILE
+
+    profile = dict(ENGINE_PROFILES[name])
+    pragmas = dict(profile['pragmas'])
+    for pragma in ('journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout'):
+        override = os.environ.get(f'INVENTORY_DB_{pragma.upper()}')
+        if override:
+            pragmas[pragma] = override
+    profile['pragmas'] = pragmas
+    profile['name'] = name
+    return profile
+
+def create_db_engine(db_path=DB_PATH, profile=None, echo=DB_ECHO):
+    """
+    Crea un engine SQLite con el perfil indicado
+    Los PRAGMA se aplican en cada conexión nueva del pool
+    """
+    profile = get_engine_profile(profile)
+    pragmas = profile['pragmas']
+    busy_timeout = int(pragmas.get('busy_timeout', 5000))
+
+    db_engine = create_engine(
+        f'sqlite:///{db_path}',
+        echo=echo,
+        connect_args={
+            'check_same_thread': False,
+            'timeout': busy_timeout / 1000
+        },
+        poolclass=QueuePool,
+        pool_size=profile['pool_size'],
+        max_overflow=profile['max_overflow'],
+        pool_timeout=profile['pool_timeout']
+    )
+
+    @event.listens_for(db_engine, 'connect')
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
+
+    return db_engine
+
 # Crear engine de SQLAlchemy
 DATABASE_URL = f'sqlite:///{DB_PATH}'
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,  # Cambiar a True para ver las queries SQL en consola (debug)
-    connect_args={'check_same_thread': False}  
-)
+engine = create_db_engine(DB_PATH)
 
 # Crear sesión
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -27,7 +117,9 @@ Session = scoped_session(SessionLocal)
 
 def init_db():
     """
-    Inicializa la base de datos creando todas las tablas
+    Inicializa la base de datos: la crea si es nueva o aplica las migraciones
+    pendientes (ver config/migrations.py). Con el esquema al día solo se lee
+    su versión, sin DDL
     """
     # Importar todos los modelos para que SQLAlchemy los registre
     from models import (
@@ -35,8 +127,12 @@ def init_db():
         Sale, SaleItem, InventoryMovement
     )
     
-    # Crear todas las tablas
-    Base.metadata.create_all(bind=engine)
+    from config.migrations import migrate
+    
+    with StartupTracer.phase('esquema'):
+        applied = migrate(engine)
+    if applied:
+        print(f"✓ Esquema actualizado a la versión {applied[-1][0]} ({len(applied)} migraciones)")
     print("Base de datos inicializada correctamente")
 
 def get_session():
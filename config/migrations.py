@@ -0,0 +1,195 @@
+"""
+Versión del esquema y migraciones ordenadas de la base de datos
+La tabla schema_version guarda una fila por migración aplicada. Al iniciar
+solo se lee la versión actual (un entero): si el esquema está al día no se
+ejecuta DDL ni se inspeccionan las tablas. Una base nueva se crea completa
+con create_all y queda en la última versión; una base anterior (incluidas
+las que se actualizaban con los antiguos scripts migrate_*.py y no tienen
+versión) aplica las migraciones pendientes en orden, todas en una sola
+transacción: si alguna falla la base queda como estaba.
+
+Para cambiar el esquema: modificar el modelo y agregar una migración al
+final de MIGRATIONS. Debe ser idempotente, porque una base sin versión
+puede tener ya el cambio y la migración 1 crea con el esquema actual las
+tablas que falten. Los objetos que no salen de los modelos (ej: las tablas
+de búsqueda) se crean también en create_schema() para las bases nuevas.
+"""
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, select, insert, func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from models import Base, DailySalesRollup, Sale
+from database.search_index import SearchIndex
+
+schema_metadata = MetaData()
+
+schema_version = Table(
+    'schema_version', schema_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+
+class SchemaVersionError(Exception):
+    """La base de datos es de una versión más nueva de la aplicación"""
+    pass
+
+
+# Columnas que agregaban los scripts migrate_*.py a tablas ya existentes
+LEGACY_COLUMNS = {
+    'products': [
+        ('image_path', 'VARCHAR(500)'),
+    ],
+    'sales': [
+        ('transfer_type', 'VARCHAR(100)'),
+        ('has_invoice', 'INTEGER DEFAULT 0 NOT NULL'),
+        ('invoice_generated_at', 'DATETIME'),
+    ],
+    'expenses': [
+        ('amount', 'REAL'),
+        ('payment_method', 'VARCHAR(50)'),
+        ('transfer_type', 'VARCHAR(100)'),
+        ('recipient', 'VARCHAR(200)'),
+        ('is_authorized', 'INTEGER DEFAULT 0'),
+    ],
+    'inventory_movements': [
+        ('edit_reason', 'VARCHAR(500)'),
+        ('note', 'VARCHAR(500)'),
+    ],
+    'raw_material_movements': [
+        ('note', 'VARCHAR(500)'),
+    ],
+}
+
+# Índices reemplazados por otros declarados en los modelos
+OBSOLETE_INDEXES = (
+    'ix_raw_material_movements_type_created',  # -> ix_raw_material_movements_consumption
+)
+
+def create_tables(conn):
+    """Crea las tablas que falten con el esquema actual de los modelos"""
+    Base.metadata.create_all(bind=conn)
+
+def create_schema(conn):
+    """Esquema completo de una base nueva: tablas de los modelos y tablas de búsqueda"""
+    create_tables(conn)
+    SearchIndex.create(conn)
+
+def add_legacy_columns(conn):
+    """Agrega a las tablas existentes las columnas que les falten"""
+    for table, columns in LEGACY_COLUMNS.items():
+        existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+        for column, definition in columns:
+            if column not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                print(f"[OK] Columna '{column}' agregada a la tabla '{table}'")
+
+def create_indexes(conn):
+    """Crea los índices declarados en los modelos que falten y actualiza las estadísticas"""
+    for table in Base.metadata.sorted_tables:
+        existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA index_list({table.name})")}
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if index.name not in existing:
+                index.create(bind=conn)
+                print(f"[OK] Índice '{index.name}' creado en '{table.name}'")
+    for index_name in OBSOLETE_INDEXES:
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index_name}")
+    conn.exec_driver_sql("ANALYZE")
+
+def fill_daily_sales_rollup(conn):
+    """Llena el resumen diario desde las ventas si la tabla está vacía"""
+    from services.sales_rollup_service import SalesRollupService
+
+    if conn.execute(select(DailySalesRollup.id).limit(1)).first() is not None:
+        return
+    if conn.execute(select(Sale.id).limit(1)).first() is None:
+        return
+    session = Session(bind=conn)  # Usa la transacción de la migración
+    try:
+        written = SalesRollupService.rebuild(session)
+        session.flush()
+        print(f"[OK] Resumen diario de ventas recalculado: {written} filas")
+    finally:
+        session.close()
+
+# Migraciones en orden: (versión, descripción, función(conexión))
+MIGRATIONS = [
+    (1, "Tablas del esquema", create_tables),
+    (2, "Columnas de los scripts migrate_*.py", add_legacy_columns),
+    (3, "Índices declarados en los modelos", create_indexes),
+    (4, "Resumen diario de ventas", fill_daily_sales_rollup),
+    (5, "Búsqueda de texto de productos y clientes (FTS5)", SearchIndex.create),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def read_version(conn):
+    """Versión del esquema, None si la base no tiene tabla de versión"""
+    try:
+        return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+    except OperationalError:
+        return None
+
+def schema_status(engine):
+    """
+    Returns:
+        (versión actual o None sin tabla de versión, [(versión, descripción) pendientes])
+    """
+    with engine.connect() as conn:
+        version = read_version(conn)
+    return version, [
+        (number, description) for number, description, _ in MIGRATIONS if number > (version or 0)
+    ]
+
+def migrate(engine):
+    """
+    Deja el esquema en la última versión
+
+    Returns:
+        Lista de (versión, descripción) aplicadas; vacía si ya estaba al día
+    """
+    with engine.connect() as conn:
+        version = read_version(conn)
+    if version == SCHEMA_VERSION:
+        return []
+    if version is not None and version > SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"La base de datos está en la versión {version} del esquema y esta aplicación "
+            f"solo conoce hasta la {SCHEMA_VERSION}"
+        )
+
+    with engine.connect() as conn:
+        # BEGIN explícito: el driver sqlite3 no abre transacción antes del DDL.
+        # IMMEDIATE toma el bloqueo de escritura, así dos instancias que
+        # inician a la vez no migran al mismo tiempo
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            version = read_version(conn)  # Otra instancia pudo migrar mientras se esperaba el bloqueo
+            new_database = False
+            if version is None:
+                new_database = conn.exec_driver_sql(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' LIMIT 1"
+                ).first() is None
+                schema_version.create(bind=conn)
+                version = 0
+
+            pending = [migration for migration in MIGRATIONS if migration[0] > version]
+            if new_database:
+                create_schema(conn)  # Esquema completo: las migraciones solo se registran
+            else:
+                for number, description, apply in pending:
+                    print(f"Aplicando migración {number}: {description}...")
+                    apply(conn)
+
+            now = datetime.now()
+            if pending:
+                conn.execute(insert(schema_version), [
+                    {'version': number, 'description': description, 'applied_at': now}
+                    for number, description, _ in pending
+                ])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return [(number, description) for number, description, _ in pending]
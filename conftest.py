@@ -0,0 +1,6 @@
+"""
+Configuración de pytest: las pruebas están en tests/
+test_install.py es la verificación manual de la instalación (abre una
+ventana al importarse), no una prueba
+"""
+collect_ignore = ['test_install.py']
@@ -3,5 +3,6 @@ Paquete core - Funcionalidades centrales
 """
 from core.hardware_id import get_hardware_id, format_hardware_id
 from core.license_manager import LicenseManager
+from core.events import EventBus
 
-__all__ = ['get_hardware_id', 'format_hardware_id', 'LicenseManager']
\ No newline at end of file
+__all__ = ['get_hardware_id', 'format_hardware_id', 'LicenseManager', 'EventBus']
@@ -0,0 +1,132 @@
+"""
+Bus de eventos del dominio - Notifica a las vistas qué datos cambiaron
+Los servicios y diálogos publican un evento después de confirmar la
+transacción; cada vista se suscribe a los que le afectan y actualiza solo
+las filas involucradas (o se marca como pendiente si no está visible).
+"""
+
+
+class DomainEvent:
+    """Evento base"""
+
+    def __repr__(self):
+        values = ', '.join(f"{name}={value!r}" for name, value in vars(self).items())
+        return f"<{type(self).__name__}({values})>"
+
+
+class SaleCommitted(DomainEvent):
+    """Se confirmó una venta nueva o la edición de una existente"""
+
+    def __init__(self, sale_id, customer_id=None, product_ids=(), edited=False):
+        self.sale_id = sale_id
+        self.customer_id = customer_id
+        self.product_ids = frozenset(product_ids)
+        self.edited = edited
+
+
+class SaleCancelled(DomainEvent):
+    """Se canceló una venta"""
+
+    def __init__(self, sale_id, product_ids=()):
+        self.sale_id = sale_id
+        self.product_ids = frozenset(product_ids)
+
+
+class SaleUpdated(DomainEvent):
+    """Cambiaron datos de una venta que no afectan el inventario (ej: factura generada)"""
+
+    def __init__(self, sale_id):
+        self.sale_id = sale_id
+
+
+class SalesCleared(DomainEvent):
+    """Se eliminaron todas las ventas (con sus items y el resumen diario)"""
+    pass
+
+
+class StockChanged(DomainEvent):
+    """Cambió el stock de productos y/o materias primas"""
+
+    def __init__(self, product_ids=(), raw_material_ids=()):
+        self.product_ids = frozenset(product_ids)
+        self.raw_material_ids = frozenset(raw_material_ids)
+
+
+class ProductUpdated(DomainEvent):
+    """
+    Se crearon, editaron o eliminaron productos
+    product_ids vacío significa "cualquier producto" (ej: importación masiva)
+    """
+
+    def __init__(self, product_ids=(), created=False, deleted=False):
+        self.product_ids = frozenset(product_ids)
+        self.created = created
+        self.deleted = deleted
+
+
+class RawMaterialUpdated(DomainEvent):
+    """Se crearon, editaron o eliminaron materias primas (ids vacío = cualquiera)"""
+
+    def __init__(self, raw_material_ids=(), created=False, deleted=False):
+        self.raw_material_ids = frozenset(raw_material_ids)
+        self.created = created
+        self.deleted = deleted
+
+
+class CustomerUpdated(DomainEvent):
+    """Se crearon, editaron o eliminaron clientes (ids vacío = cualquiera)"""
+
+    def __init__(self, customer_ids=(), created=False, deleted=False):
+        self.customer_ids = frozenset(customer_ids)
+        self.created = created
+        self.deleted = deleted
+
+
+class ExpenseRecorded(DomainEvent):
+    """Se registró o eliminó un egreso"""
+
+    def __init__(self, expense_id=None, deleted=False):
+        self.expense_id = expense_id
+        self.deleted = deleted
+
+
+class EventBus:
+    """
+    Bus de eventos en proceso
+    Los manejadores se ejecutan en el hilo que publica, en orden de suscripción
+    """
+
+    _subscribers = {}
+
+    @staticmethod
+    def subscribe(event_type, handler):
+        """Suscribe un manejador a un tipo de evento (y sus subclases)"""
+        handlers = EventBus._subscribers.setdefault(event_type, [])
+        if handler not in handlers:
+            handlers.append(handler)
+
+    @staticmethod
+    def unsubscribe(event_type, handler):
+        handlers = EventBus._subscribers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    @staticmethod
+    def publish(event):
+        """
+        Entrega el evento a los suscriptores
+        Un manejador que falla no impide que los demás reciban el evento
+        """
+        for event_type, handlers in list(EventBus._subscribers.items()):
+            if not isinstance(event, event_type):
+                continue
+            for handler in list(handlers):
+                try:
+                    handler(event)
+                except Exception as e:
+                    print(f"Error al manejar el evento {type(event).__name__}: {e}")
+
+    @staticmethod
+    def clear():
+        """Elimina todas las suscripciones"""
+        EventBus._subscribers.clear()
@@ -1,15 +1,35 @@
 """
 Generador de ID único basado en el hardware del equipo
+Calcularlo es lento (en Windows consulta a wmic en un subproceso), así que
+se calcula una sola vez y se guarda en hardware_id.json junto a la base de
+datos, firmado con HMAC sobre datos del equipo que se leen sin subprocesos:
+un archivo editado a mano o copiado de otro equipo no vale y se recalcula.
+Cuando el ID no hace falta de inmediato, start_hardware_probe() lo calcula
+en segundo plano sin bloquear el inicio.
 """
 import hashlib
+import hmac
+import json
+import os
 import platform
 import subprocess
+import threading
 import uuid
 
-def get_hardware_id():
+CACHE_FILENAME = 'hardware_id.json'
+
+# Clave de la firma del archivo de caché
+_CACHE_KEY = b'inventory-system/hardware-id/v1'
+
+_hardware_id = None     # ID ya leído o calculado en este proceso
+_probe_thread = None
+_probe_lock = threading.Lock()
+
+def probe_hardware_id():
     """
     Genera un ID único basado en características del hardware del equipo.
     Este ID será siempre el mismo para el mismo equipo.
+    Es la consulta lenta: usar get_hardware_id(), que la guarda en caché.
     """
     hardware_info = []
     
@@ -51,6 +71,84 @@ def get_hardware_id():
     
     return hardware_hash
 
+def _signature(hardware_id):
+    """Firma del ID ligada al equipo (MAC, nombre y sistema, sin subprocesos)"""
+    machine = f"{hardware_id}|{uuid.getnode()}|{platform.node()}|{platform.system()}"
+    return hmac.new(_CACHE_KEY, machine.encode(), hashlib.sha256).hexdigest()
+
+def cache_path():
+    from config.database import DB_DIR
+    return os.path.join(DB_DIR, CACHE_FILENAME)
+
+def read_cached_hardware_id():
+    """
+    ID guardado en la caché firmada
+    
+    Returns:
+        str o None si no hay caché, está alterada o es de otro equipo
+    """
+    try:
+        with open(cache_path(), 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    
+    hardware_id = data.get('hardware_id') if isinstance(data, dict) else None
+    if not isinstance(hardware_id, str) or not hmac.compare_digest(
+        str(data.get('signature', '')), _signature(hardware_id)
+    ):
+        return None
+    return hardware_id
+
+def save_cached_hardware_id(hardware_id):
+    """Guarda el ID firmado (escritura atómica)"""
+    path = cache_path()
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'hardware_id': hardware_id, 'signature': _signature(hardware_id)}, file)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"No se pudo guardar la caché del hardware ID: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def _probe_and_cache():
+    global _hardware_id
+    hardware_id = probe_hardware_id()
+    save_cached_hardware_id(hardware_id)
+    _hardware_id = hardware_id
+
+def start_hardware_probe():
+    """
+    Calcula el ID en un hilo en segundo plano y lo guarda en la caché
+    Si ya hay un cálculo en curso devuelve ese mismo hilo
+    
+    Returns:
+        threading.Thread del cálculo
+    """
+    global _probe_thread
+    with _probe_lock:
+        if _probe_thread is None or not _probe_thread.is_alive():
+            _probe_thread = threading.Thread(target=_probe_and_cache, name='hardware-id-probe', daemon=True)
+            _probe_thread.start()
+        return _probe_thread
+
+def get_hardware_id():
+    """
+    ID único del equipo: de memoria o de la caché firmada; solo si no hay
+    caché válida se calcula (esperando al cálculo en segundo plano si ya
+    estaba en curso) y se guarda
+    """
+    global _hardware_id
+    if _hardware_id is None:
+        _hardware_id = read_cached_hardware_id()
+    if _hardware_id is None:
+        start_hardware_probe().join()
+    if _hardware_id is None:
+        _hardware_id = probe_hardware_id()  # El hilo falló: calcular aquí
+    return _hardware_id
+
 def format_hardware_id(hardware_id):
     """
     Formatea el hardware ID para que sea más legible
@@ -64,7 +162,7 @@ def format_hardware_id(hardware_id):
 
 # Para debug/testing
 if __name__ == '__main__':
-    hw_id = get_hardware_id()
+    hw_id = probe_hardware_id()
     formatted_id = format_hardware_id(hw_id)
     print(f"Hardware ID completo: {hw_id}")
     print(f"Hardware ID formateado: {formatted_id}")
\ No newline at end of file
@@ -1,39 +1,64 @@
 """
 Gestor de Licencias - Maneja la validación y activación de licencias
+La fila License se lee una sola vez por proceso y queda en memoria (separada
+de la sesión): la validez y la información de la licencia se evalúan sobre
+esa copia sin volver a consultar la base. Activar o desactivar la licencia
+actualiza la base y la copia.
 """
 from datetime import datetime, timedelta
 from config.database import get_session, close_session
 from models.license import License
-from core.hardware_id import get_hardware_id, format_hardware_id
+from core.hardware_id import (
+    get_hardware_id, format_hardware_id, read_cached_hardware_id, start_hardware_probe
+)
+from utils.startup_tracer import StartupTracer
 
 class LicenseManager:
     """
     Gestiona todo lo relacionado con las licencias
     """
     
+    _license = None   # Copia en memoria de la fila License
+    
+    @staticmethod
+    def _remember(session, license, committed=False):
+        """Separa la licencia de la sesión y la guarda como copia en memoria"""
+        if committed:
+            session.refresh(license)  # El commit expiró los atributos
+        session.expunge(license)
+        LicenseManager._license = license
+        return license
+    
     @staticmethod
     def get_or_create_license():
         """
         Obtiene la licencia existente o crea una nueva si no existe
         """
+        if LicenseManager._license is not None:
+            return LicenseManager._license
+        
         session = get_session()
         try:
             # Buscar licencia existente
             license = session.query(License).first()
             
-            if license is None:
-                # No existe licencia, crear una nueva
-                hardware_id = get_hardware_id()
-                license = License(
-                    hardware_id=hardware_id,
-                    is_active=False,  # Por defecto inactiva
-                    last_validated=datetime.now()
-                )
-                session.add(license)
-                session.commit()
-                print(f"✓ Nueva licencia creada: {format_hardware_id(hardware_id)}")
+            if license is not None:
+                if read_cached_hardware_id() is None:
+                    start_hardware_probe()  # Deja el ID en caché sin demorar el inicio
+                return LicenseManager._remember(session, license)
             
-            return license
+            # No existe licencia, crear una nueva
+            with StartupTracer.phase('hardware_id'):
+                hardware_id = get_hardware_id()
+            license = License(
+                hardware_id=hardware_id,
+                is_active=False,  # Por defecto inactiva
+                last_validated=datetime.now()
+            )
+            session.add(license)
+            session.commit()
+            print(f"✓ Nueva licencia creada: {format_hardware_id(hardware_id)}")
+            return LicenseManager._remember(session, license, committed=True)
             
         except Exception as e:
             session.rollback()
@@ -42,6 +67,22 @@ class LicenseManager:
         finally:
             close_session()
     
+    @staticmethod
+    def get_license():
+        """Licencia en memoria (la lee de la base la primera vez), None si no existe"""
+        if LicenseManager._license is not None:
+            return LicenseManager._license
+        
+        session = get_session()
+        try:
+            license = session.query(License).first()
+            return LicenseManager._remember(session, license) if license is not None else None
+        except Exception as e:
+            print(f"Error al leer licencia: {e}")
+            return None
+        finally:
+            close_session()
+    
     @staticmethod
     def is_license_valid():
         """
@@ -49,29 +90,21 @@ class LicenseManager:
         POR AHORA: Solo verifica localmente
         FUTURO: Validará con Firebase
         """
-        session = get_session()
-        try:
-            license = session.query(License).first()
-            
-            if license is None:
-                return False
-            
-            # Verificar si está activa
-            if not license.is_active:
-                return False
-            
-            # Verificar si no ha expirado
-            if license.expiration_date:
-                if datetime.now() > license.expiration_date:
-                    return False
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error al validar licencia: {e}")
+        license = LicenseManager.get_license()
+        
+        if license is None:
             return False
-        finally:
-            close_session()
+        
+        # Verificar si está activa
+        if not license.is_active:
+            return False
+        
+        # Verificar si no ha expirado
+        if license.expiration_date:
+            if datetime.now() > license.expiration_date:
+                return False
+        
+        return True
     
     @staticmethod
     def activate_license(days=30):
@@ -89,6 +122,7 @@ class LicenseManager:
                 license.expiration_date = datetime.now() + timedelta(days=days)
                 license.last_validated = datetime.now()
                 session.commit()
+                LicenseManager._remember(session, license, committed=True)
                 print(f"✓ Licencia activada hasta: {license.expiration_date}")
                 return True
             
@@ -113,6 +147,7 @@ class LicenseManager:
             if license:
                 license.is_active = False
                 session.commit()
+                LicenseManager._remember(session, license, committed=True)
                 print("✓ Licencia desactivada")
                 return True
             
@@ -130,26 +165,18 @@ class LicenseManager:
         """
         Obtiene información de la licencia
         """
-        session = get_session()
-        try:
-            license = session.query(License).first()
-            
-            if license:
-                return {
-                    'hardware_id': format_hardware_id(license.hardware_id),
-                    'is_active': license.is_active,
-                    'expiration_date': license.expiration_date,
-                    'last_validated': license.last_validated,
-                    'user_email': license.user_email
-                }
-            
-            return None
-            
-        except Exception as e:
-            print(f"Error al obtener info de licencia: {e}")
-            return None
-        finally:
-            close_session()
+        license = LicenseManager.get_license()
+        
+        if license:
+            return {
+                'hardware_id': format_hardware_id(license.hardware_id),
+                'is_active': license.is_active,
+                'expiration_date': license.expiration_date,
+                'last_validated': license.last_validated,
+                'user_email': license.user_email
+            }
+        
+        return None
     
     @staticmethod
     def validate_with_firebase():
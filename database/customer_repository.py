@@ -0,0 +1,31 @@
+"""
+Repositorio de Clientes - Listado paginado por nombre
+"""
+from models import Customer
+from database.paged_repository import PagedRepository, ASC
+from database.search_index import SearchIndex
+
+
+class CustomerRepository(PagedRepository):
+    """
+    Acceso paginado a los clientes ordenados por nombre
+    """
+
+    model = Customer
+    ORDERS = {
+        'name': ((Customer.name, ASC), (Customer.id, ASC)),
+    }
+    DEFAULT_ORDER = 'name'
+
+    @classmethod
+    def apply_filters(cls, query, filters):
+        """
+        Args:
+            filters: dict opcional con
+                search: palabras (o inicios de palabra) del nombre, documento,
+                    email o teléfono (ver SearchIndex)
+        """
+        search = (filters.get('search') or '').strip()
+        if search:
+            query = query.filter(SearchIndex.customer_filter(query.session, search))
+        return query
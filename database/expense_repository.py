@@ -0,0 +1,39 @@
+"""
+Repositorio de Egresos - Listado paginado del más reciente al más antiguo
+"""
+from sqlalchemy.orm import joinedload
+from models import Expense, ExpenseType
+from database.paged_repository import PagedRepository, DESC
+
+
+class ExpenseRepository(PagedRepository):
+    """
+    Acceso paginado a los egresos
+    """
+
+    model = Expense
+    ORDERS = {
+        'recent': ((Expense.created_at, DESC), (Expense.id, DESC)),
+    }
+    DEFAULT_ORDER = 'recent'
+
+    @classmethod
+    def base_query(cls, session):
+        return session.query(Expense).options(
+            joinedload(Expense.product),
+            joinedload(Expense.raw_material)
+        )
+
+    @classmethod
+    def apply_filters(cls, query, filters):
+        """
+        Args:
+            filters: dict opcional con
+                cash: True = solo egresos de efectivo, False = solo de inventario
+        """
+        cash = filters.get('cash')
+        if cash is True:
+            query = query.filter(Expense.expense_type == ExpenseType.CASH)
+        elif cash is False:
+            query = query.filter(Expense.expense_type != ExpenseType.CASH)
+        return query
@@ -0,0 +1,109 @@
+"""
+Repositorio paginado base - Paginación por llave (keyset) para los listados
+En lugar de OFFSET, cada página continúa desde la llave de orden de la
+última fila cargada, así que traer la página N cuesta lo mismo que traer
+la primera y el costo no crece con el número de registros.
+"""
+from sqlalchemy import or_, and_
+
+ASC = 'asc'
+DESC = 'desc'
+
+
+class PagedRepository:
+    """
+    Base de los repositorios de listados
+
+    Las subclases definen:
+        model: Modelo consultado
+        ORDERS: dict {nombre: ((columna, ASC|DESC), ...)}; cada orden debe
+            terminar en una columna única (id) y sus columnas no deben ser nulas
+        DEFAULT_ORDER: Nombre del orden por defecto
+    y opcionalmente sobrescriben base_query(), apply_filters() y to_row()
+    """
+
+    DEFAULT_PAGE_SIZE = 100
+
+    model = None
+    ORDERS = {}
+    DEFAULT_ORDER = None
+
+    @classmethod
+    def base_query(cls, session):
+        """Consulta sin filtros ni orden"""
+        return session.query(cls.model)
+
+    @classmethod
+    def apply_filters(cls, query, filters):
+        """Aplica los filtros del listado (por defecto ninguno)"""
+        return query
+
+    @classmethod
+    def to_row(cls, row):
+        """Convierte un resultado de la consulta en la fila que recibe la vista"""
+        return row
+
+    @classmethod
+    def get_order(cls, order=None):
+        """Columnas y direcciones de un orden por nombre"""
+        name = order or cls.DEFAULT_ORDER
+        if name not in cls.ORDERS:
+            raise ValueError(f"Orden desconocido para {cls.__name__}: {name}")
+        return cls.ORDERS[name]
+
+    @classmethod
+    def key_of(cls, row, order=None):
+        """Llave de paginación de una fila (valores de las columnas del orden)"""
+        return tuple(getattr(row, column.key) for column, _ in cls.get_order(order))
+
+    @classmethod
+    def page_query(cls, session, after_key=None, limit=None, filters=None, order=None):
+        """Consulta de una página (ver fetch_page)"""
+        columns = cls.get_order(order)
+        query = cls.apply_filters(cls.base_query(session), filters or {})
+        if after_key is not None:
+            query = query.filter(cls._after(columns, after_key))
+
+        query = query.order_by(*[
+            column.desc() if direction == DESC else column.asc()
+            for column, direction in columns
+        ])
+        return query.limit(limit or cls.DEFAULT_PAGE_SIZE)
+
+    @classmethod
+    def fetch_page(cls, session, after_key=None, limit=None, filters=None, order=None):
+        """
+        Obtiene una página del listado
+
+        Args:
+            session: Sesión de base de datos
+            after_key: key_of() de la última fila ya cargada (None = primera página)
+            limit: Tamaño de la página (por defecto DEFAULT_PAGE_SIZE)
+            filters: dict con los filtros que entiende apply_filters()
+            order: Nombre del orden (ver ORDERS)
+
+        Returns:
+            Lista de filas (ver to_row)
+        """
+        rows = cls.page_query(session, after_key, limit, filters, order).all()
+        return [cls.to_row(row) for row in rows]
+
+    @classmethod
+    def fetch_by_ids(cls, session, ids):
+        """Obtiene las filas con esos ids (para refrescar filas ya cargadas)"""
+        rows = cls.base_query(session).filter(cls.model.id.in_(list(ids))).all()
+        return [cls.to_row(row) for row in rows]
+
+    @staticmethod
+    def _after(columns, key):
+        """
+        Condición "fila posterior a key" según el orden
+        (c1 > v1) OR (c1 = v1 AND c2 > v2) OR ... respetando la dirección de cada columna
+        """
+        conditions = []
+        for position, (column, direction) in enumerate(columns):
+            value = key[position]
+            step = column < value if direction == DESC else column > value
+            equals = [prev == key[i] for i, (prev, _) in enumerate(columns[:position])]
+            conditions.append(and_(*equals, step))
+        return or_(*conditions)
@@ -0,0 +1,41 @@
+"""
+Repositorio de Productos - Listado paginado por nombre
+"""
+from sqlalchemy.orm import joinedload
+from models import Product
+from database.paged_repository import PagedRepository, ASC
+from database.search_index import SearchIndex
+
+
+class ProductRepository(PagedRepository):
+    """
+    Acceso paginado a los productos ordenados por nombre
+    """
+
+    model = Product
+    ORDERS = {
+        'name': ((Product.name, ASC), (Product.id, ASC)),
+    }
+    DEFAULT_ORDER = 'name'
+
+    @classmethod
+    def base_query(cls, session):
+        return session.query(Product).options(joinedload(Product.category))
+
+    @classmethod
+    def apply_filters(cls, query, filters):
+        """
+        Args:
+            filters: dict opcional con
+                search: palabras (o inicios de palabra) del nombre, SKU,
+                    descripción o categoría (ver SearchIndex)
+                category_id: Solo productos de esa categoría
+        """
+        search = (filters.get('search') or '').strip()
+        if search:
+            query = query.filter(SearchIndex.product_filter(query.session, search))
+
+        category_id = filters.get('category_id')
+        if category_id:
+            query = query.filter(Product.category_id == category_id)
+        return query
@@ -0,0 +1,31 @@
+"""
+Repositorio de Materias Primas - Listado paginado por nombre
+"""
+from sqlalchemy import or_
+from models import RawMaterial
+from database.paged_repository import PagedRepository, ASC
+
+
+class RawMaterialRepository(PagedRepository):
+    """
+    Acceso paginado a las materias primas ordenadas por nombre
+    """
+
+    model = RawMaterial
+    ORDERS = {
+        'name': ((RawMaterial.name, ASC), (RawMaterial.id, ASC)),
+    }
+    DEFAULT_ORDER = 'name'
+
+    @classmethod
+    def apply_filters(cls, query, filters):
+        """
+        Args:
+            filters: dict opcional con
+                search: texto contenido en el nombre o el SKU
+        """
+        search = (filters.get('search') or '').strip()
+        if search:
+            pattern = f"%{search}%"
+            query = query.filter(or_(RawMaterial.name.ilike(pattern), RawMaterial.sku.ilike(pattern)))
+        return query
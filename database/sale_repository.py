@@ -0,0 +1,90 @@
+"""
+Repositorio de Ventas - Consultas paginadas por llave (keyset) para el listado
+Cada página es un rango del índice de created_at: el costo depende del
+tamaño de la página y no de la cantidad de ventas históricas.
+"""
+from sqlalchemy import func
+from models import Sale, Customer, SaleStatus, PaymentMethod
+from database.paged_repository import PagedRepository, DESC
+
+
+class SaleRow:
+    """
+    Fila liviana del listado de ventas (sin sesión ni relaciones perezosas)
+    Expone los mismos atributos que usan los diálogos de detalle, edición y factura
+    """
+    __slots__ = (
+        'id', 'invoice_number', 'created_at', 'customer_id', 'customer_name',
+        'subtotal', 'tax', 'discount', 'total', 'payment_method', 'transfer_type',
+        'status', 'has_invoice'
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def __repr__(self):
+        return f"<SaleRow(id={self.id}, invoice={self.invoice_number}, total=${self.total})>"
+
+
+class SaleRepository(PagedRepository):
+    """
+    Acceso paginado a las ventas ordenadas de la más reciente a la más antigua
+    """
+
+    model = Sale
+    ORDERS = {
+        'recent': ((Sale.created_at, DESC), (Sale.id, DESC)),
+    }
+    DEFAULT_ORDER = 'recent'
+
+    COLUMNS = (
+        Sale.id, Sale.invoice_number, Sale.created_at, Sale.customer_id,
+        Customer.name.label('customer_name'), Sale.subtotal, Sale.tax,
+        Sale.discount, Sale.total, Sale.payment_method, Sale.transfer_type,
+        Sale.status, Sale.has_invoice
+    )
+
+    @classmethod
+    def base_query(cls, session):
+        return session.query(*cls.COLUMNS).outerjoin(Customer, Sale.customer_id == Customer.id)
+
+    @classmethod
+    def apply_filters(cls, query, filters):
+        """
+        Aplica los filtros del listado
+
+        Args:
+            filters: dict opcional con
+                search: texto contenido en el número de factura
+                payment_method: PaymentMethod o su valor ("Efectivo", ...)
+        """
+        filters = filters or {}
+        search = (filters.get('search') or '').strip()
+        if search:
+            query = query.filter(Sale.invoice_number.ilike(f"%{search}%"))
+
+        payment_method = filters.get('payment_method')
+        if payment_method and payment_method != 'Todos':
+            if not isinstance(payment_method, PaymentMethod):
+                payment_method = PaymentMethod(payment_method)
+            query = query.filter(Sale.payment_method == payment_method)
+        return query
+
+    @classmethod
+    def to_row(cls, row):
+        return SaleRow(**row._asdict())
+
+    @classmethod
+    def fetch_one(cls, session, sale_id):
+        """Obtiene una sola fila del listado (para refrescar tras editar)"""
+        row = cls.base_query(session).filter(Sale.id == sale_id).first()
+        return cls.to_row(row) if row else None
+
+    @classmethod
+    def total_amount(cls, session, filters=None):
+        """Suma del total de las ventas no canceladas que cumplen los filtros"""
+        query = session.query(func.coalesce(func.sum(Sale.total), 0.0)).filter(
+            Sale.status != SaleStatus.CANCELLED
+        )
+        return cls.apply_filters(query, filters).scalar()
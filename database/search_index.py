@@ -0,0 +1,231 @@
+"""
+Índices de búsqueda de texto (SQLite FTS5) de productos y clientes
+products_fts (nombre, SKU, descripción, categoría) y customers_fts (nombre,
+documento, email, teléfono) usan como rowid el id de la fila y se mantienen
+al día con triggers, así que cualquier escritura (ORM, importaciones
+masivas con Core) queda indexada sin código adicional. Las búsquedas son
+por prefijo de cada palabra, sin distinguir mayúsculas ni tildes, y
+devuelven ids ordenados por relevancia (bm25): el costo depende de las
+coincidencias y no del tamaño del catálogo.
+
+Si el SQLite del equipo no trae FTS5 las tablas no se crean y las
+búsquedas usan LIKE como antes.
+"""
+import re
+from sqlalchemy import text, Integer, or_
+from sqlalchemy.exc import OperationalError
+from models import Product, Customer
+
+# Palabras de la búsqueda (mismo criterio que el tokenizador unicode61)
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+TOKENIZE = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
+
+class SearchIndex:
+    """
+    Definición, mantenimiento y consultas de las tablas FTS5
+    """
+
+    # Tabla FTS -> (tabla origen, columnas indexadas, pesos bm25)
+    TABLES = {
+        'products_fts': ('products', ('name', 'sku', 'description', 'category'), (10.0, 8.0, 1.0, 2.0)),
+        'customers_fts': ('customers', ('name', 'document', 'email', 'phone'), (10.0, 8.0, 4.0, 4.0)),
+    }
+
+    # Valores de cada columna indexada a partir de una fila (new/old) de la tabla origen
+    PRODUCT_VALUES = (
+        "{row}.id, {row}.name, {row}.sku, COALESCE({row}.description, ''), "
+        "COALESCE((SELECT name FROM categories WHERE id = {row}.category_id), '')"
+    )
+    CUSTOMER_VALUES = (
+        "{row}.id, {row}.name, COALESCE({row}.document_number, ''), "
+        "COALESCE({row}.email, ''), COALESCE({row}.phone, '')"
+    )
+
+    TRIGGERS = {
+        'products_fts_insert': f"""
+            CREATE TRIGGER products_fts_insert AFTER INSERT ON products BEGIN
+                INSERT INTO products_fts (rowid, name, sku, description, category)
+                VALUES ({PRODUCT_VALUES.format(row='new')});
+            END""",
+        'products_fts_update': f"""
+            CREATE TRIGGER products_fts_update AFTER UPDATE OF name, sku, description, category_id ON products BEGIN
+                DELETE FROM products_fts WHERE rowid = old.id;
+                INSERT INTO products_fts (rowid, name, sku, description, category)
+                VALUES ({PRODUCT_VALUES.format(row='new')});
+            END""",
+        'products_fts_delete': """
+            CREATE TRIGGER products_fts_delete AFTER DELETE ON products BEGIN
+                DELETE FROM products_fts WHERE rowid = old.id;
+            END""",
+        'categories_fts_update': """
+            CREATE TRIGGER categories_fts_update AFTER UPDATE OF name ON categories BEGIN
+                UPDATE products_fts SET category = new.name
+                WHERE rowid IN (SELECT id FROM products WHERE category_id = new.id);
+            END""",
+        'categories_fts_delete': """
+            CREATE TRIGGER categories_fts_delete AFTER DELETE ON categories BEGIN
+                UPDATE products_fts SET category = ''
+                WHERE rowid IN (SELECT id FROM products WHERE category_id = old.id);
+            END""",
+        'customers_fts_insert': f"""
+            CREATE TRIGGER customers_fts_insert AFTER INSERT ON customers BEGIN
+                INSERT INTO customers_fts (rowid, name, document, email, phone)
+                VALUES ({CUSTOMER_VALUES.format(row='new')});
+            END""",
+        'customers_fts_update': f"""
+            CREATE TRIGGER customers_fts_update AFTER UPDATE OF name, document_number, email, phone ON customers BEGIN
+                DELETE FROM customers_fts WHERE rowid = old.id;
+                INSERT INTO customers_fts (rowid, name, document, email, phone)
+                VALUES ({CUSTOMER_VALUES.format(row='new')});
+            END""",
+        'customers_fts_delete': """
+            CREATE TRIGGER customers_fts_delete AFTER DELETE ON customers BEGIN
+                DELETE FROM customers_fts WHERE rowid = old.id;
+            END""",
+    }
+
+    _available = {}     # URL de la base -> True/False (si existen las tablas), consultado una vez
+
+    @staticmethod
+    def create(conn):
+        """
+        Crea las tablas FTS que falten (llenándolas desde las tablas origen)
+        y sus triggers; es idempotente
+
+        Returns:
+            False si el SQLite no tiene FTS5
+        """
+        existing = {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        try:
+            for fts_table, (_, columns, _) in SearchIndex.TABLES.items():
+                if fts_table not in existing:
+                    conn.exec_driver_sql(
+                        f"CREATE VIRTUAL TABLE {fts_table} USING fts5({', '.join(columns)}, {TOKENIZE})"
+                    )
+                    SearchIndex.rebuild(conn, fts_table)
+        except OperationalError as e:
+            if 'fts5' not in str(e):
+                raise
+            print(f"⚠ Búsqueda de texto no disponible (SQLite sin FTS5): {e}")
+            return False
+
+        for name, ddl in SearchIndex.TRIGGERS.items():
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+            conn.exec_driver_sql(ddl)
+        SearchIndex._available.clear()
+        return True
+
+    @staticmethod
+    def rebuild(conn, fts_table=None):
+        """Vuelve a llenar una tabla FTS (o todas) desde su tabla origen"""
+        for name in ([fts_table] if fts_table else SearchIndex.TABLES):
+            source, columns, _ = SearchIndex.TABLES[name]
+            values = SearchIndex.PRODUCT_VALUES if source == 'products' else SearchIndex.CUSTOMER_VALUES
+            conn.exec_driver_sql(f"DELETE FROM {name}")
+            conn.exec_driver_sql(
+                f"INSERT INTO {name} (rowid, {', '.join(columns)}) "
+                f"SELECT {values.format(row=source)} FROM {source}"
+            )
+
+    @staticmethod
+    def available(session):
+        """True si la base tiene las tablas FTS (se consulta una vez por base y proceso)"""
+        url = str(session.get_bind().url)
+        if url not in SearchIndex._available:
+            SearchIndex._available[url] = session.execute(text(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ('products_fts', 'customers_fts')"
+            )).scalar() == len(SearchIndex.TABLES)
+        return SearchIndex._available[url]
+
+    @staticmethod
+    def match_query(search):
+        """
+        Consulta FTS5 de un texto: cada trozo separado por espacios es
+        requerido y su última palabra es prefijo; las palabras unidas por
+        otros signos (SKU, email) forman una frase, que el índice resuelve
+        sin recorrer las palabras muy frecuentes como 'PROD'
+        Ej: 'crisp PROD-0012' -> '"crisp"* AND "PROD 0012"*'; None si no hay palabras
+        """
+        phrases = []
+        for chunk in (search or '').split():
+            words = WORD_PATTERN.findall(chunk)
+            if words:
+                phrases.append(f'"{" ".join(words)}"*')
+        return ' AND '.join(phrases) if phrases else None
+
+    @staticmethod
+    def matching_ids(fts_table, query):
+        """
+        Subconsulta con los ids que coinciden (para filtrar un listado con
+        column.in_(...) sin cambiar su orden)
+        """
+        return text(
+            f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH :query"
+        ).bindparams(query=query).columns(rowid=Integer)
+
+    @staticmethod
+    def ranked_ids(session, fts_table, search, limit=None):
+        """
+        Ids que coinciden con la búsqueda, los más relevantes primero
+
+        Returns:
+            Lista de ids ([] si la búsqueda no tiene palabras)
+        """
+        query = SearchIndex.match_query(search)
+        if query is None:
+            return []
+        weights = ', '.join(str(weight) for weight in SearchIndex.TABLES[fts_table][2])
+        sql = (
+            f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH :query "
+            f"ORDER BY bm25({fts_table}, {weights})"
+        )
+        params = {'query': query}
+        if limit:
+            sql += " LIMIT :limit"
+            params['limit'] = limit
+        return [row[0] for row in session.execute(text(sql), params)]
+
+    @staticmethod
+    def search_products(session, search, limit=None):
+        """Ids de productos por nombre, SKU, descripción o categoría (ordenados por relevancia)"""
+        if SearchIndex.available(session):
+            return SearchIndex.ranked_ids(session, 'products_fts', search, limit)
+        query = session.query(Product.id).filter(SearchIndex.product_filter(session, search))
+        return [row[0] for row in query.order_by(Product.name).limit(limit)]
+
+    @staticmethod
+    def search_customers(session, search, limit=None):
+        """Ids de clientes por nombre, documento, email o teléfono (ordenados por relevancia)"""
+        if SearchIndex.available(session):
+            return SearchIndex.ranked_ids(session, 'customers_fts', search, limit)
+        query = session.query(Customer.id).filter(SearchIndex.customer_filter(session, search))
+        return [row[0] for row in query.order_by(Customer.name).limit(limit)]
+
+    @staticmethod
+    def product_filter(session, search):
+        """Condición de búsqueda sobre Product (FTS si está disponible, si no LIKE)"""
+        if SearchIndex.available(session):
+            query = SearchIndex.match_query(search)
+            if query is None:
+                return Product.id.is_(None)
+            return Product.id.in_(SearchIndex.matching_ids('products_fts', query))
+        pattern = f"%{search.strip()}%"
+        return or_(Product.name.ilike(pattern), Product.sku.ilike(pattern))
+
+    @staticmethod
+    def customer_filter(session, search):
+        """Condición de búsqueda sobre Customer (FTS si está disponible, si no LIKE)"""
+        if SearchIndex.available(session):
+            query = SearchIndex.match_query(search)
+            if query is None:
+                return Customer.id.is_(None)
+            return Customer.id.in_(SearchIndex.matching_ids('customers_fts', query))
+        pattern = f"%{search.strip()}%"
+        return or_(
+            Customer.name.ilike(pattern),
+            Customer.email.ilike(pattern),
+            Customer.document_number.ilike(pattern),
+            Customer.phone.ilike(pattern)
+        )
@@ -1,24 +1,77 @@
 """
 Sistema de Inventario y Ventas
 Punto de entrada principal de la aplicación
+
+Opciones:
+    --profile-startup      Perfila el inicio con cProfile hasta la primera
+                           pintura, muestra las funciones e importaciones más
+                           costosas y cierra la aplicación
+    --exit-after-startup   Cierra la aplicación tras la primera pintura (lo usa
+                           benchmarks/startup_budget.py)
 """
 import sys
-from PyQt6.QtWidgets import QApplication
-from config.database import init_db
-from core.license_manager import LicenseManager
+import os
+import multiprocessing
+from utils.startup_tracer import StartupTracer
+
+PROFILE_FLAG = '--profile-startup'
+EXIT_FLAG = '--exit-after-startup'
+
+def report_startup(app, profiler=None, exit_after=False):
+    """
+    Cierra la medición del inicio (primera vuelta del ciclo de eventos con la
+    ventana pintada), la guarda en el registro y avisa si pasó el presupuesto
+    """
+    from config.database import DB_DIR
+    
+    if profiler is not None:
+        profiler.disable()
+    report = StartupTracer.finish(os.path.join(DB_DIR, 'startup_log.json'))
+    if report is not None:
+        print("\n" + StartupTracer.summary(report))
+        if report['over_budget']:
+            print(f"⚠ El inicio tardó {report['total_ms']:.0f} ms, más que el presupuesto de {report['budget_ms']} ms")
+    
+    if profiler is not None:
+        import pstats
+        
+        profile_path = os.path.join(DB_DIR, 'startup.prof')
+        profiler.dump_stats(profile_path)
+        print(f"\nPerfil del inicio guardado en {profile_path} (ver con: python -m pstats)")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(30)
+        if report is not None:
+            print("Importaciones más costosas (con sus dependencias):")
+            for module, ms in report['imports']:
+                print(f"   {module:<45} {ms:>8.0f} ms")
+    
+    if exit_after or profiler is not None:
+        app.quit()
 
 def main():
     """
     Función principal que inicia la aplicación
     """
+    profiler = None
+    if PROFILE_FLAG in sys.argv:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    exit_after = EXIT_FLAG in sys.argv
+    StartupTracer.start()
+    
     print("=" * 50)
     print("Sistema de Inventario y Ventas")
     print("=" * 50)
     
+    with StartupTracer.phase('importaciones'):
+        from config.database import init_db
+        from core.license_manager import LicenseManager
+    
     # 1. Inicializar base de datos
     print("\n[1/4] Inicializando base de datos...")
     try:
-        init_db()
+        with StartupTracer.phase('base de datos'):
+            init_db()
     except Exception as e:
         print(f"✗ Error al inicializar BD: {e}")
         return
@@ -26,7 +79,8 @@ def main():
     # 2. Verificar/crear licencia
     print("\n[2/4] Verificando licencia...")
     try:
-        license = LicenseManager.get_or_create_license()
+        with StartupTracer.phase('licencia'):
+            license = LicenseManager.get_or_create_license()
         if license is None:
             print("✗ Error al crear/obtener licencia")
             return
@@ -36,36 +90,45 @@ def main():
     
     # 3. Validar licencia
     print("\n[3/4] Validando licencia...")
-    is_valid = LicenseManager.is_license_valid()
-    
-    if not is_valid:
-        print("⚠ Licencia inactiva o expirada")
-        print("ℹ Por ahora activando automáticamente para desarrollo...")
-        LicenseManager.activate_license(365)  # 1 año para desarrollo
-        is_valid = True
-    else:
-        print("✓ Licencia válida")
-    
-    # Mostrar info de la licencia
-    license_info = LicenseManager.get_license_info()
+    with StartupTracer.phase('validación'):
+        is_valid = LicenseManager.is_license_valid()
+        
+        if not is_valid:
+            print("⚠ Licencia inactiva o expirada")
+            print("ℹ Por ahora activando automáticamente para desarrollo...")
+            LicenseManager.activate_license(365)  # 1 año para desarrollo
+            is_valid = True
+        else:
+            print("✓ Licencia válida")
+        
+        # Mostrar info de la licencia
+        license_info = LicenseManager.get_license_info()
     if license_info:
         print(f"\n📋 Información de Licencia:")
         print(f"   Hardware ID: {license_info['hardware_id']}")
         print(f"   Estado: {'✓ Activa' if license_info['is_active'] else '✗ Inactiva'}")
         if license_info['expiration_date']:
             print(f"   Expira: {license_info['expiration_date'].strftime('%d/%m/%Y')}")
-
+    
     # 4. Iniciar aplicación GUI
     print("\n[4/4] Iniciando interfaz gráfica...")
     
-    app = QApplication(sys.argv)
-    app.setApplicationName("Sistema de Inventario")
-    app.setOrganizationName("MiEmpresa")
+    with StartupTracer.phase('qt'):
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtCore import QTimer
+        app = QApplication(sys.argv)
+        app.setApplicationName("Sistema de Inventario")
+        app.setOrganizationName("MiEmpresa")
     
     # Importar y mostrar ventana principal
-    from ui.main_window import MainWindow
-    window = MainWindow()
-    window.show()
+    with StartupTracer.phase('ventana'):
+        from ui.main_window import MainWindow
+        window = MainWindow()
+        window.show()
+    
+    # La ventana crea el dashboard en la primera vuelta del ciclo de eventos;
+    # el inicio termina en la vuelta siguiente, con todo pintado
+    QTimer.singleShot(0, lambda: QTimer.singleShot(0, lambda: report_startup(app, profiler, exit_after)))
     
     print("\n" + "=" * 50)
     print("✓ Aplicación iniciada correctamente")
@@ -74,4 +137,5 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    multiprocessing.freeze_support()  # Procesos del pool de importación en el ejecutable
+    main()
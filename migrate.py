@@ -0,0 +1,71 @@
+"""
+Actualiza el esquema de la base de datos (ver config/migrations.py)
+Reemplaza a los antiguos scripts migrate_*.py: aplica en orden, en una sola
+transacción, las migraciones pendientes. La aplicación lo hace sola al
+iniciar; este script sirve para ver el estado o migrar sin abrir la interfaz.
+
+Uso:
+    python migrate.py                      (aplica las migraciones pendientes)
+    python migrate.py --status             (versión actual y migraciones pendientes)
+    python migrate.py --rebuild-rollup [2025-01-01 2025-12-31]
+                                           (recalcula el resumen diario de ventas, todo o ese rango de días)
+"""
+import argparse
+from datetime import date
+from config.database import engine, get_session, close_session
+from config.migrations import migrate, schema_status, SCHEMA_VERSION
+
+def show_status():
+    version, pending = schema_status(engine)
+    if version is None:
+        print("La base de datos no tiene versión de esquema (nueva o de los scripts migrate_*.py)")
+    else:
+        print(f"Versión del esquema: {version} (última: {SCHEMA_VERSION})")
+    for number, description in pending:
+        print(f"   Pendiente {number}: {description}")
+    if not pending:
+        print("[OK] El esquema está al día")
+
+def rebuild_rollup(date_from=None, date_to=None):
+    from services.sales_rollup_service import SalesRollupService
+
+    session = get_session()
+    try:
+        written = SalesRollupService.rebuild(session, date_from, date_to)
+        session.commit()
+        print(f"[OK] Resumen recalculado: {written} filas")
+        return True
+    except Exception as e:
+        session.rollback()
+        print(f"[ERROR] Error al recalcular el resumen: {str(e)}")
+        return False
+    finally:
+        close_session()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--status', action='store_true', help="Muestra la versión sin migrar")
+    parser.add_argument(
+        '--rebuild-rollup', nargs='*', type=date.fromisoformat, metavar='FECHA',
+        help="Recalcula el resumen diario de ventas (opcional: desde y hasta)"
+    )
+    args = parser.parse_args()
+
+    if args.status:
+        show_status()
+        return
+
+    try:
+        applied = migrate(engine)
+    except Exception as e:
+        print(f"[ERROR] Error durante la migración (la base quedó sin cambios): {str(e)}")
+        return
+    for number, description in applied:
+        print(f"[OK] Migración {number}: {description}")
+    print(f"\n[OK] Esquema en la versión {SCHEMA_VERSION}")
+
+    if args.rebuild_rollup is not None:
+        rebuild_rollup(*args.rebuild_rollup[:2])
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,8 @@ from models.inventory_movement import InventoryMovement, MovementType
 from models.expense import Expense, ExpenseType, ExpenseReason
 from models.inventory_password import InventoryPassword
 from models.company_info import CompanyInfo
+from models.invoice_sequence import InvoiceSequence
+from models.daily_sales_rollup import DailySalesRollup
 
 __all__ = [
     'Base',
@@ -38,4 +40,6 @@ __all__ = [
     'ExpenseReason',
     'InventoryPassword',
     'CompanyInfo',
+    'InvoiceSequence',
+    'DailySalesRollup',
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Modelo de Cliente - Clientes de la empresa
 """
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, String, Text, Index
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 
@@ -10,6 +10,10 @@ class Customer(BaseModel):
     Clientes que realizan compras
     """
     __tablename__ = 'customers'
+    __table_args__ = (
+        # Listado paginado ordenado por nombre
+        Index('ix_customers_name', 'name'),
+    )
     
     # Información personal
     name = Column(String(200), nullable=False)
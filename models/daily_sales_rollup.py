@@ -0,0 +1,42 @@
+"""
+Modelo de Resumen Diario de Ventas - Totales pre-agregados por día
+"""
+from sqlalchemy import Column, String, Float, Integer, Date, Index
+from models.base import BaseModel
+
+class DailySalesRollup(BaseModel):
+    """
+    Totales de ventas por día y dimensión (producto, cliente o total del día)
+    Se mantiene en la misma transacción que registra, edita o cancela la
+    venta; las ventas canceladas no aportan. Los reportes leen estas filas
+    en lugar de recorrer todos los items del período.
+    """
+    __tablename__ = 'daily_sales_rollup'
+    __table_args__ = (
+        # Llave del resumen (destino del UPSERT) y rango de días por dimensión
+        Index('ux_daily_sales_rollup_key', 'kind', 'day', 'ref_id', unique=True),
+    )
+    
+    # Dimensiones
+    PRODUCT = 'product'
+    CUSTOMER = 'customer'
+    TOTAL = 'total'
+    
+    # Día de la venta
+    day = Column(Date, nullable=False)
+    
+    # Dimensión y id del producto/cliente (0 para el total del día)
+    kind = Column(String(20), nullable=False)
+    ref_id = Column(Integer, default=0, nullable=False)
+    
+    # Unidades vendidas
+    quantity = Column(Float, default=0.0, nullable=False)
+    
+    # Producto: suma de subtotales de sus items; cliente y total: suma de Sale.total
+    revenue = Column(Float, default=0.0, nullable=False)
+    
+    # Número de ventas
+    sales_count = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<DailySalesRollup(day={self.day}, kind={self.kind}, ref_id={self.ref_id}, revenue=${self.revenue})>"
@@ -1,7 +1,7 @@
 """
 Modelo de Egreso - Registro de salidas de productos/materias primas sin venta
 """
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 import enum
@@ -39,6 +39,9 @@ class Expense(BaseModel):
     Registro de salidas de productos o materias primas que no son ventas
     """
     __tablename__ = 'expenses'
+    __table_args__ = (
+        Index('ix_expenses_created_at', 'created_at'),
+    )
     
     # Tipo de egreso
     expense_type = Column(SQLEnum(ExpenseType), nullable=False)
@@ -1,7 +1,7 @@
 """
 Modelo de Movimiento de Inventario - Historial de entradas y salidas
 """
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 import enum
@@ -18,6 +18,14 @@ class InventoryMovement(BaseModel):
     Útil para auditoría y trazabilidad
     """
     __tablename__ = 'inventory_movements'
+    __table_args__ = (
+        # Historial de movimientos por fecha
+        Index('ix_inventory_movements_created_at', 'created_at'),
+        # Historial de un producto
+        Index('ix_inventory_movements_product_created', 'product_id', 'created_at'),
+        # Anulación de movimientos de una venta (SALE-<id>)
+        Index('ix_inventory_movements_reference', 'reference'),
+    )
     
     # Producto afectado
     product_id = Column(Integer, ForeignKey('products.id'), nullable=False)
@@ -0,0 +1,27 @@
+"""
+Modelo de Secuencia de Facturación - Consecutivos por prefijo
+"""
+from sqlalchemy import Column, String, Integer
+from models.base import BaseModel
+
+class InvoiceSequence(BaseModel):
+    """
+    Consecutivo de numeración por prefijo (ventas, notas crédito, series por caja)
+    Cada asignación incrementa last_value con un UPDATE ... RETURNING atómico
+    """
+    __tablename__ = 'invoice_sequences'
+    
+    # Prefijo de la serie (ej: INV, NC, INV-T2)
+    prefix = Column(String(50), unique=True, nullable=False)
+    
+    # Último número asignado en la serie
+    last_value = Column(Integer, default=0, nullable=False)
+    
+    # Cantidad de dígitos con que se formatea el número
+    padding = Column(Integer, default=6, nullable=False)
+    
+    # Descripción de la serie (opcional)
+    description = Column(String(200), nullable=True)
+    
+    def __repr__(self):
+        return f"<InvoiceSequence(prefix={self.prefix}, last_value={self.last_value})>"
@@ -1,7 +1,7 @@
 """
 Modelo de Producto - Productos del inventario
 """
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, Text
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 
@@ -10,6 +10,10 @@ class Product(BaseModel):
     Productos en el inventario
     """
     __tablename__ = 'products'
+    __table_args__ = (
+        # Listado paginado ordenado por nombre
+        Index('ix_products_name', 'name'),
+    )
     
     # Información básica
     name = Column(String(200), nullable=False)
@@ -2,7 +2,7 @@
 Modelo ProductMaterial - Relación entre productos y materias primas
 Define qué materias primas y en qué cantidad necesita cada producto
 """
-from sqlalchemy import Column, Integer, Float, ForeignKey
+from sqlalchemy import Column, Integer, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 
@@ -12,6 +12,10 @@ class ProductMaterial(BaseModel):
     Define la receta/composición de cada producto
     """
     __tablename__ = 'product_materials'
+    __table_args__ = (
+        Index('ix_product_materials_product_id', 'product_id'),
+        Index('ix_product_materials_raw_material_id', 'raw_material_id'),
+    )
     
     # Relaciones
     product_id = Column(Integer, ForeignKey('products.id'), nullable=False)
@@ -1,7 +1,7 @@
 """
 Modelo de Materia Prima - Materias primas del inventario
 """
-from sqlalchemy import Column, String, Float, Integer, Text
+from sqlalchemy import Column, String, Float, Integer, Text, Index
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 
@@ -10,6 +10,10 @@ class RawMaterial(BaseModel):
     Materias primas para la fabricación de productos
     """
     __tablename__ = 'raw_materials'
+    __table_args__ = (
+        # Listado paginado ordenado por nombre
+        Index('ix_raw_materials_name', 'name'),
+    )
     
     # Información básica
     name = Column(String(200), nullable=False)
@@ -1,7 +1,7 @@
 """
 Modelo de Movimiento de Materia Prima - Historial de entradas/salidas de materias primas
 """
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 import enum
@@ -19,6 +19,15 @@ class RawMaterialMovement(BaseModel):
     Registro de movimientos de materias primas
     """
     __tablename__ = 'raw_material_movements'
+    __table_args__ = (
+        # Historial de movimientos por fecha
+        Index('ix_raw_material_movements_created_at', 'created_at'),
+        # Historial de una materia prima
+        Index('ix_raw_material_movements_material_created', 'raw_material_id', 'created_at'),
+        # Consumo de cada materia prima por tipo de movimiento en un período;
+        # incluye la cantidad para que el reporte se resuelva solo con el índice
+        Index('ix_raw_material_movements_consumption', 'raw_material_id', 'movement_type', 'created_at', 'quantity'),
+    )
     
     # Relación con materia prima
     raw_material_id = Column(Integer, ForeignKey('raw_materials.id'), nullable=False)
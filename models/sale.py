@@ -1,7 +1,7 @@
 """
 Modelo de Venta - Registro de ventas realizadas
 """
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, Enum as SQLEnum, DateTime
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, Enum as SQLEnum, DateTime, Index
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 import enum
@@ -26,6 +26,12 @@ class Sale(BaseModel):
     Ventas realizadas a clientes
     """
     __tablename__ = 'sales'
+    __table_args__ = (
+        # Reportes y listados por rango de fechas
+        Index('ix_sales_created_at', 'created_at'),
+        # Mejores clientes en un período
+        Index('ix_sales_customer_created', 'customer_id', 'created_at'),
+    )
     
     # Número de factura/ticket
     invoice_number = Column(String(50), unique=True, nullable=False)
@@ -1,7 +1,7 @@
 """
 Modelo de Item de Venta - Productos individuales en una venta
 """
-from sqlalchemy import Column, Integer, Float, ForeignKey
+from sqlalchemy import Column, Integer, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 
@@ -10,6 +10,10 @@ class SaleItem(BaseModel):
     Items individuales de una venta (detalle de productos vendidos)
     """
     __tablename__ = 'sale_items'
+    __table_args__ = (
+        Index('ix_sale_items_sale_id', 'sale_id'),
+        Index('ix_sale_items_product_id', 'product_id'),
+    )
     
     # Venta a la que pertenece
     sale_id = Column(Integer, ForeignKey('sales.id'), nullable=False)
@@ -0,0 +1,9 @@
+"""
+Paquete services - Lógica de negocio independiente de la interfaz
+"""
+from services.invoice_sequence_service import InvoiceSequenceService
+from services.sales_rollup_service import SalesRollupService
+from services.recipe_cache import RecipeCache
+from services.sale_service import SaleService, SaleResult, SaleServiceError
+
+__all__ = ['InvoiceSequenceService', 'SalesRollupService', 'RecipeCache', 'SaleService', 'SaleResult', 'SaleServiceError']
@@ -0,0 +1,148 @@
+"""
+Motor de Lista de Materiales (BOM) - Proyección de producción vectorizada
+Carga de una vez la matriz de recetas (productos × materias primas) y los
+vectores de stock y costo de las materias primas; las unidades producibles
+y el costo de todos los productos salen de una sola pasada de NumPy, y las
+simulaciones ("¿y si compro X de la materia prima Y?") se resuelven en
+memoria sin volver a consultar la base de datos.
+"""
+import numpy as np
+from models import Product, ProductMaterial, RawMaterial
+
+
+class BomEngine:
+    """
+    Matriz de recetas en memoria
+
+    Atributos:
+        product_ids: ids de los productos con receta (filas de la matriz)
+        material_ids: ids de las materias primas (columnas de la matriz)
+        need: matriz (productos × materias primas) con la cantidad necesaria por unidad
+        stock: vector de stock de cada materia prima
+        cost: vector de costo por unidad de cada materia prima
+    """
+
+    def __init__(self, products, material_ids, need, stock, cost):
+        """
+        Args:
+            products: Lista de (id, nombre, precio de venta) de los productos con receta
+            material_ids: Lista de ids de materias primas (orden de las columnas)
+            need, stock, cost: ver atributos de la clase
+        """
+        self.product_ids = [product_id for product_id, _, _ in products]
+        self.product_names = [name for _, name, _ in products]
+        self.sale_prices = np.array([price or 0.0 for _, _, price in products], dtype=float)
+        self.material_ids = list(material_ids)
+        self.need = need
+        self.stock = stock
+        self.cost = cost
+        self._product_index = {product_id: row for row, product_id in enumerate(self.product_ids)}
+        self._material_index = {material_id: column for column, material_id in enumerate(self.material_ids)}
+
+    @classmethod
+    def load(cls, session):
+        """
+        Construye el motor con tres consultas (recetas, productos y materias primas)
+        """
+        recipes = session.query(
+            ProductMaterial.product_id,
+            ProductMaterial.raw_material_id,
+            ProductMaterial.quantity_needed
+        ).join(
+            RawMaterial, RawMaterial.id == ProductMaterial.raw_material_id
+        ).all()
+
+        product_ids = sorted({product_id for product_id, _, _ in recipes})
+        products = []
+        if product_ids:
+            products = [tuple(row) for row in session.query(
+                Product.id, Product.name, Product.sale_price
+            ).filter(Product.id.in_(product_ids)).order_by(Product.id).all()]
+
+        materials = session.query(
+            RawMaterial.id, RawMaterial.stock, RawMaterial.cost_per_unit
+        ).order_by(RawMaterial.id).all()
+        material_ids = [material_id for material_id, _, _ in materials]
+        stock = np.array([material_stock or 0.0 for _, material_stock, _ in materials], dtype=float)
+        cost = np.array([material_cost or 0.0 for _, _, material_cost in materials], dtype=float)
+
+        engine = cls(products, material_ids, np.zeros((len(products), len(material_ids))), stock, cost)
+        rows, columns, quantities = [], [], []
+        for product_id, raw_material_id, quantity_needed in recipes:
+            row = engine._product_index.get(product_id)
+            if row is None:
+                continue  # Receta de un producto que ya no existe
+            rows.append(row)
+            columns.append(engine._material_index[raw_material_id])
+            quantities.append(quantity_needed or 0.0)
+        # add.at acumula si la receta repite una materia prima
+        np.add.at(engine.need, (np.array(rows, dtype=int), np.array(columns, dtype=int)), quantities)
+        return engine
+
+    def max_producible_units(self, stock=None):
+        """
+        Unidades producibles de cada producto: mínimo de stock / cantidad
+        necesaria sobre las materias primas de su receta (0 si ninguna cuenta)
+
+        Args:
+            stock: Vector de stock a usar en lugar del actual (simulaciones)
+
+        Returns:
+            np.ndarray de enteros alineado con product_ids
+        """
+        stock = self.stock if stock is None else stock
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = np.where(self.need > 0, stock / self.need, np.inf)
+        units = ratios.min(axis=1, initial=np.inf)
+        return np.where(np.isinf(units), 0, np.trunc(units)).astype(np.int64)
+
+    def material_costs(self):
+        """Costo de materias primas por unidad de cada producto (producto punto)"""
+        return self.need @ self.cost
+
+    def projection(self):
+        """
+        Proyección de producción de todos los productos con receta
+
+        Returns:
+            Lista de (nombre, unidades producibles, costo de materias primas, precio de venta)
+        """
+        return list(zip(
+            self.product_names,
+            self.max_producible_units().tolist(),
+            self.material_costs().tolist(),
+            self.sale_prices.tolist()
+        ))
+
+    def stock_with(self, purchases):
+        """
+        Vector de stock sumando compras hipotéticas
+
+        Args:
+            purchases: dict {raw_material_id: cantidad}
+        """
+        stock = self.stock.copy()
+        for raw_material_id, quantity in purchases.items():
+            if raw_material_id not in self._material_index:
+                raise KeyError(f"Materia prima {raw_material_id} no encontrada")
+            stock[self._material_index[raw_material_id]] += quantity
+        return stock
+
+    def what_if(self, purchases):
+        """
+        Efecto de comprar materias primas sobre las unidades producibles
+
+        Args:
+            purchases: dict {raw_material_id: cantidad a comprar}
+
+        Returns:
+            dict {product_id: (unidades actuales, unidades con la compra)} solo
+            con los productos que cambian
+        """
+        before = self.max_producible_units()
+        after = self.max_producible_units(self.stock_with(purchases))
+        changed = np.nonzero(after != before)[0]
+        return {
+            self.product_ids[row]: (int(before[row]), int(after[row]))
+            for row in changed
+        }
@@ -0,0 +1,352 @@
+"""
+Servicio de Exportación - Excel y CSV en flujo continuo
+Las filas salen de consultas por columnas con yield_per (sin cargar
+objetos del ORM ni relaciones perezosas) y se escriben en un libro
+write_only de openpyxl, que va volcando cada fila a disco; así exportar
+un año de ventas usa memoria constante. Si el archivo termina en .csv se
+escribe texto plano, que es todavía más rápido. openpyxl se importa recién
+al escribir un libro, no al iniciar la aplicación.
+"""
+import csv
+import os
+from sqlalchemy import func
+from models import (
+    Sale, SaleItem, Product, Customer, InventoryMovement, RawMaterial, RawMaterialMovement
+)
+from utils.date_ranges import on_day
+
+
+class ExportCancelled(Exception):
+    """La exportación se canceló antes de terminar"""
+    pass
+
+
+class ExportSheet:
+    """
+    Definición de una hoja a exportar
+
+    Atributos:
+        title: Nombre de la hoja (o sufijo del archivo CSV)
+        headers: Encabezados de las columnas
+        rows: Filas (iterable) o función(session) que devuelve un iterable
+        widths: Anchos de las columnas en Excel
+        header_color: Color de fondo de los encabezados
+        header_font_color: Color de letra de los encabezados (None = negro)
+        heading: Título opcional sobre la tabla (fila combinada de color)
+        heading_color: Color de fondo del título
+        count: Total de filas o función(session) que lo calcula (para el progreso)
+    """
+
+    def __init__(self, title, headers, rows, widths=None, header_color="CCCCCC",
+                 header_font_color=None, heading=None, heading_color="2563eb", count=None):
+        self.title = title
+        self.headers = headers
+        self.rows = rows
+        self.widths = widths or []
+        self.header_color = header_color
+        self.header_font_color = header_font_color
+        self.heading = heading
+        self.heading_color = heading_color
+        self.count = count
+
+    def iter_rows(self, session):
+        return self.rows(session) if callable(self.rows) else iter(self.rows)
+
+    def total(self, session):
+        if callable(self.count):
+            return self.count(session)
+        if self.count is not None:
+            return self.count
+        if isinstance(self.rows, (list, tuple)):
+            return len(self.rows)
+        return 0
+
+
+class ExportService:
+    """
+    Escritura de hojas en Excel (write_only) o CSV y consultas de exportación
+    """
+
+    YIELD_PER = 1000
+
+    # Filas entre avisos de progreso y revisiones de cancelación
+    PROGRESS_STEP = 500
+
+    DATETIME_FORMAT = "%d/%m/%Y %H:%M"
+
+    @staticmethod
+    def write(path, sheets, session=None, progress=None, cancelled=None):
+        """
+        Escribe las hojas en path según su extensión (.csv o Excel)
+
+        Args:
+            path: Archivo destino
+            sheets: Lista de ExportSheet
+            session: Sesión para las hojas que consultan la base de datos
+            progress: función(filas escritas, total) llamada cada PROGRESS_STEP filas
+            cancelled: threading.Event; si se activa se borra lo escrito y se lanza ExportCancelled
+
+        Returns:
+            dict {título de hoja: filas escritas}
+        """
+        progress = progress or (lambda done, total: None)
+        total = sum(sheet.total(session) for sheet in sheets)
+        state = {'done': 0}
+
+        def tick(rows):
+            for row in rows:
+                yield row
+                state['done'] += 1
+                if state['done'] % ExportService.PROGRESS_STEP == 0:
+                    if cancelled is not None and cancelled.is_set():
+                        raise ExportCancelled()
+                    progress(state['done'], max(total, state['done']))
+
+        if path.lower().endswith('.csv'):
+            paths = ExportService.csv_paths(path, sheets)
+            writer = ExportService._write_csv
+        else:
+            paths = [path]
+            writer = ExportService._write_xlsx
+
+        try:
+            counts = writer(paths, sheets, session, tick)
+        except BaseException:
+            for written in paths:
+                if os.path.exists(written):
+                    os.remove(written)
+            raise
+
+        progress(state['done'], state['done'])
+        return counts
+
+    @staticmethod
+    def csv_paths(path, sheets):
+        """Un CSV por hoja: con varias hojas se agrega el título al nombre"""
+        if len(sheets) == 1:
+            return [path]
+        base, extension = os.path.splitext(path)
+        return [f"{base}_{sheet.title.replace(' ', '_')}{extension}" for sheet in sheets]
+
+    @staticmethod
+    def _write_xlsx(paths, sheets, session, tick):
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
+
+        wb = Workbook(write_only=True)
+        counts = {}
+        for sheet in sheets:
+            ws = wb.create_sheet(title=sheet.title)
+            for column, width in enumerate(sheet.widths, 1):
+                ws.column_dimensions[get_column_letter(column)].width = width
+
+            # Estilos creados una sola vez por hoja; las celdas de datos van sin estilo
+            center = Alignment(horizontal="center", vertical="center")
+            if sheet.heading:
+                cell = WriteOnlyCell(ws, value=sheet.heading)
+                cell.font = Font(size=14, bold=True, color="FFFFFF")
+                cell.fill = PatternFill(start_color=sheet.heading_color, end_color=sheet.heading_color, fill_type="solid")
+                cell.alignment = center
+                ws.append([cell])
+                ws.merged_cells.add(f"A1:{get_column_letter(max(len(sheet.headers), 1))}1")
+                ws.append([])
+
+            header_font = Font(bold=True, color=sheet.header_font_color) if sheet.header_font_color else Font(bold=True)
+            header_fill = PatternFill(start_color=sheet.header_color, end_color=sheet.header_color, fill_type="solid")
+            header_cells = []
+            for header in sheet.headers:
+                cell = WriteOnlyCell(ws, value=header)
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.alignment = center
+                header_cells.append(cell)
+            ws.append(header_cells)
+
+            count = 0
+            try:
+                for row in tick(sheet.iter_rows(session)):
+                    ws.append(row)
+                    count += 1
+            except BaseException:
+                # Guardar cierra los temporales de openpyxl; write() borra el archivo parcial
+                wb.save(paths[0])
+                raise
+            counts[sheet.title] = count
+
+        wb.save(paths[0])
+        return counts
+
+    @staticmethod
+    def _write_csv(paths, sheets, session, tick):
+        counts = {}
+        for path, sheet in zip(paths, sheets):
+            # utf-8-sig para que Excel reconozca las tildes al abrir el CSV
+            with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+                writer = csv.writer(f)
+                writer.writerow(sheet.headers)
+                count = 0
+                for row in tick(sheet.iter_rows(session)):
+                    writer.writerow(row)
+                    count += 1
+            counts[sheet.title] = count
+        return counts
+
+    @staticmethod
+    def _stream(query):
+        return query.execution_options(yield_per=ExportService.YIELD_PER)
+
+    @staticmethod
+    def _format_datetime(value, fmt=DATETIME_FORMAT):
+        return value.strftime(fmt) if value else ""
+
+    # ========== Consultas de exportación ==========
+
+    @staticmethod
+    def sales_sheet():
+        """Hoja de resumen de ventas (más recientes primero)"""
+        def rows(session):
+            query = session.query(
+                Sale.invoice_number, Sale.created_at, Customer.name, Sale.payment_method,
+                Sale.status, Sale.subtotal, Sale.tax, Sale.discount, Sale.total
+            ).outerjoin(
+                Customer, Customer.id == Sale.customer_id
+            ).order_by(Sale.created_at.desc(), Sale.id.desc())
+            for invoice, created_at, customer, payment_method, status, subtotal, tax, discount, total \
+                    in ExportService._stream(query):
+                yield (
+                    invoice, ExportService._format_datetime(created_at), customer or "Cliente General",
+                    payment_method.value, status.value, subtotal, tax, discount, total
+                )
+
+        return ExportSheet(
+            "Resumen de Ventas",
+            ["N° Factura", "Fecha", "Cliente", "Método Pago", "Estado", "Subtotal", "Impuesto", "Descuento", "Total"],
+            rows,
+            widths=[15, 18, 25, 15, 12, 12, 12, 12, 12],
+            header_color="2563eb",
+            header_font_color="FFFFFF",
+            count=lambda session: session.query(func.count(Sale.id)).scalar()
+        )
+
+    @staticmethod
+    def sale_items_sheet():
+        """Hoja de detalle de los items vendidos, en el mismo orden que las ventas"""
+        def rows(session):
+            query = session.query(
+                Sale.invoice_number, Sale.created_at, Customer.name, Product.name,
+                SaleItem.quantity, SaleItem.unit_price, SaleItem.subtotal
+            ).join(
+                Sale, Sale.id == SaleItem.sale_id
+            ).outerjoin(
+                Customer, Customer.id == Sale.customer_id
+            ).outerjoin(
+                Product, Product.id == SaleItem.product_id
+            ).order_by(Sale.created_at.desc(), Sale.id.desc(), SaleItem.id)
+            for invoice, created_at, customer, product, quantity, unit_price, subtotal \
+                    in ExportService._stream(query):
+                yield (
+                    invoice, ExportService._format_datetime(created_at), customer or "Cliente General",
+                    product or "Producto eliminado", quantity, unit_price, subtotal
+                )
+
+        return ExportSheet(
+            "Detalle de Items",
+            ["N° Factura", "Fecha", "Cliente", "Producto", "Cantidad", "Precio Unit.", "Subtotal"],
+            rows,
+            widths=[15, 18, 25, 30, 10, 12, 12],
+            header_color="10b981",
+            header_font_color="FFFFFF",
+            count=lambda session: session.query(func.count(SaleItem.id)).scalar()
+        )
+
+    @staticmethod
+    def customers_sheet():
+        """Hoja de clientes ordenados por nombre"""
+        def rows(session):
+            query = session.query(
+                Customer.id, Customer.name, Customer.email, Customer.phone, Customer.address,
+                Customer.document_type, Customer.document_number, Customer.created_at
+            ).order_by(Customer.name)
+            for customer_id, name, email, phone, address, document_type, document_number, created_at \
+                    in ExportService._stream(query):
+                yield (
+                    customer_id, name, email or "", phone or "", address or "",
+                    document_type or "", document_number or "", ExportService._format_datetime(created_at)
+                )
+
+        return ExportSheet(
+            "Clientes",
+            ["ID", "Nombre", "Email", "Teléfono", "Dirección", "Tipo Doc.", "Número Doc.", "Fecha Registro"],
+            rows,
+            widths=[8, 30, 30, 15, 40, 12, 15, 18],
+            header_color="2563eb",
+            header_font_color="FFFFFF",
+            count=lambda session: session.query(func.count(Customer.id)).scalar()
+        )
+
+    @staticmethod
+    def product_movements_sheet(day):
+        """Hoja de movimientos de productos de un día"""
+        def rows(session):
+            query = session.query(
+                InventoryMovement.created_at, Product.name, InventoryMovement.movement_type,
+                InventoryMovement.quantity, InventoryMovement.previous_stock, InventoryMovement.new_stock,
+                InventoryMovement.reason, InventoryMovement.note
+            ).outerjoin(
+                Product, Product.id == InventoryMovement.product_id
+            ).filter(
+                on_day(InventoryMovement.created_at, day)
+            ).order_by(InventoryMovement.created_at.asc())
+            for created_at, product, movement_type, quantity, previous_stock, new_stock, reason, note \
+                    in ExportService._stream(query):
+                yield (
+                    ExportService._format_datetime(created_at, "%d/%m/%Y %H:%M:%S"),
+                    product or "Producto eliminado", movement_type.value, quantity,
+                    previous_stock, new_stock, reason or "", note or ""
+                )
+
+        return ExportSheet(
+            "Productos",
+            ["Fecha/Hora", "Producto", "Tipo", "Cantidad", "Stock Anterior", "Stock Nuevo", "Razón", "Anotación"],
+            rows,
+            widths=[20, 30, 12, 12, 15, 15, 40, 40],
+            heading=f"Movimientos de Productos - {day.strftime('%d/%m/%Y')}",
+            count=lambda session: session.query(func.count(InventoryMovement.id)).filter(
+                on_day(InventoryMovement.created_at, day)
+            ).scalar()
+        )
+
+    @staticmethod
+    def raw_material_movements_sheet(day):
+        """Hoja de movimientos de materias primas de un día"""
+        def rows(session):
+            query = session.query(
+                RawMaterialMovement.created_at, RawMaterial.name, RawMaterialMovement.movement_type,
+                RawMaterialMovement.quantity, RawMaterial.unit, RawMaterialMovement.reason,
+                RawMaterialMovement.cost
+            ).outerjoin(
+                RawMaterial, RawMaterial.id == RawMaterialMovement.raw_material_id
+            ).filter(
+                on_day(RawMaterialMovement.created_at, day)
+            ).order_by(RawMaterialMovement.created_at.asc())
+            for created_at, material, movement_type, quantity, unit, reason, cost \
+                    in ExportService._stream(query):
+                yield (
+                    ExportService._format_datetime(created_at, "%d/%m/%Y %H:%M:%S"),
+                    material or "Materia prima eliminada", movement_type.value, quantity,
+                    unit or "", reason or "", cost or 0
+                )
+
+        return ExportSheet(
+            "Materias Primas",
+            ["Fecha/Hora", "Materia Prima", "Tipo", "Cantidad", "Unidad", "Razón", "Costo"],
+            rows,
+            widths=[20, 30, 15, 12, 12, 40, 12],
+            heading=f"Movimientos de Materias Primas - {day.strftime('%d/%m/%Y')}",
+            heading_color="10b981",
+            count=lambda session: session.query(func.count(RawMaterialMovement.id)).filter(
+                on_day(RawMaterialMovement.created_at, day)
+            ).scalar()
+        )
@@ -0,0 +1,337 @@
+"""
+Servicio de Importación - Ventas y clientes desde Excel
+El libro se lee en modo read_only (fila por fila, sin cargarlo entero), las
+claves existentes (facturas, nombres, emails, documentos) se precargan en
+conjuntos en memoria y las filas se validan por bloques que se insertan
+con un solo INSERT masivo cada uno (sobre la tabla: el INSERT masivo del
+ORM parte el bloque en sentencias sueltas cuando alternan valores nulos).
+Todo queda en una transacción: si se cancela o falla, no se guarda nada.
+openpyxl se importa recién al leer un libro, no al iniciar la aplicación.
+"""
+from datetime import datetime, date
+from sqlalchemy import insert
+from models import Sale, Customer, PaymentMethod, SaleStatus, InvoiceSequence
+from services.sales_rollup_service import SalesRollupService
+from services.invoice_sequence_service import InvoiceSequenceService
+
+
+class ImportCancelled(Exception):
+    """La importación se canceló antes de terminar"""
+    pass
+
+
+class ImportResult:
+    """
+    Resultado de una importación
+
+    Atributos:
+        imported: Filas importadas
+        errors: Mensajes de las filas omitidas ("Fila N: ...")
+    """
+
+    def __init__(self):
+        self.imported = 0
+        self.errors = []
+
+    def summary(self, label, max_errors=10):
+        """Mensaje para el usuario con las primeras filas con error"""
+        message = f"Importación completada\n\n{label}: {self.imported}"
+        if self.errors:
+            message += f"\n\nErrores encontrados:\n" + "\n".join(self.errors[:max_errors])
+            if len(self.errors) > max_errors:
+                message += f"\n... y {len(self.errors) - max_errors} errores más"
+        return message
+
+
+class ImportService:
+    """
+    Importación por bloques de ventas y clientes
+    """
+
+    CHUNK_SIZE = 2000
+
+    GENERAL_CUSTOMER = "Cliente General"
+
+    SALE_DATE_FORMATS = ["%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]
+
+    SALES_HEADER_KEYWORDS = ['factura', 'fecha', 'cliente', 'método pago', 'metodo pago', 'estado', 'subtotal', 'total']
+    SALES_INVALID_HEADER_KEYWORDS = ['teléfono', 'telefono', 'dirección', 'direccion', 'stock', 'precio venta', 'precio costo']
+
+    CUSTOMERS_HEADER_KEYWORDS = ['nombre', 'email', 'telefono', 'teléfono', 'direccion', 'dirección', 'documento']
+    CUSTOMERS_INVALID_HEADER_KEYWORDS = ['factura', 'venta', 'método pago', 'metodo pago', 'subtotal', 'impuesto', 'descuento']
+
+    @staticmethod
+    def read_headers(file_path):
+        """Primera fila de la hoja activa (sin cargar el resto del libro)"""
+        from openpyxl import load_workbook
+
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for row in wb.active.iter_rows(max_row=1, values_only=True):
+                return list(row)
+            return []
+        finally:
+            wb.close()
+
+    @staticmethod
+    def headers_match(headers, keywords, invalid_keywords):
+        """
+        True si algún encabezado corresponde al tipo de datos esperado y
+        ninguno a otro tipo (ej: un archivo de clientes al importar ventas)
+        """
+        texts = [str(header).lower() for header in headers if header]
+        has_valid = any(keyword in text for text in texts for keyword in keywords)
+        has_invalid = any(keyword in text for text in texts for keyword in invalid_keywords)
+        return has_valid and not has_invalid
+
+    @staticmethod
+    def _iter_chunks(file_path, progress, cancelled):
+        """
+        Filas de datos (desde la fila 2) agrupadas en bloques de CHUNK_SIZE
+
+        Yields:
+            Lista de (número de fila, valores)
+        """
+        from openpyxl import load_workbook
+
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            ws = wb.active
+            total = ImportService._data_rows(ws)
+            chunk = []
+            done = 0
+            for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
+                chunk.append((row_idx, row))
+                if len(chunk) >= ImportService.CHUNK_SIZE:
+                    yield chunk
+                    done += len(chunk)
+                    chunk = []
+                    if cancelled is not None and cancelled.is_set():
+                        raise ImportCancelled()
+                    progress(done, max(total, done))
+            if chunk:
+                yield chunk
+                done += len(chunk)
+            progress(done, done)
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _data_rows(ws):
+        """
+        Filas de datos según la dimensión guardada en el archivo (0 si no la tiene)
+        ws.max_row no sirve en modo read_only: sin dimensión recorre toda la hoja
+        """
+        from openpyxl.utils import range_boundaries
+
+        try:
+            _, _, _, max_row = range_boundaries(ws.calculate_dimension())
+        except (ValueError, TypeError):
+            return 0
+        return max((max_row or 1) - 1, 0)
+
+    # ========== Clientes ==========
+
+    @staticmethod
+    def import_customers(session, file_path, progress=None, cancelled=None):
+        """
+        Importa clientes; se omiten nombres, emails y documentos que ya existen
+        (en la base de datos o en filas anteriores del archivo)
+
+        Returns:
+            ImportResult
+        """
+        progress = progress or (lambda done, total: None)
+        result = ImportResult()
+
+        names = {name for (name,) in session.query(Customer.name)}
+        emails = {email for (email,) in session.query(Customer.email).filter(Customer.email.isnot(None))}
+        documents = {
+            number for (number,) in session.query(Customer.document_number).filter(Customer.document_number.isnot(None))
+        }
+
+        try:
+            for chunk in ImportService._iter_chunks(file_path, progress, cancelled):
+                rows = []
+                for row_idx, row in chunk:
+                    if not row or not row[0]:
+                        continue
+
+                    # Con ID en la primera columna (archivo generado por la exportación)
+                    values = row[1:] if isinstance(row[0], int) else row
+                    name, email, phone, address, document_type, document_number = [
+                        ImportService._text(values, index) for index in range(6)
+                    ]
+
+                    if not name:
+                        result.errors.append(f"Fila {row_idx}: Nombre vacío")
+                        continue
+                    if name in names:
+                        result.errors.append(f"Fila {row_idx}: Cliente '{name}' ya existe")
+                        continue
+                    if email and email in emails:
+                        result.errors.append(f"Fila {row_idx}: Email '{email}' ya existe")
+                        continue
+                    if document_number and document_number in documents:
+                        result.errors.append(f"Fila {row_idx}: Número de documento '{document_number}' ya existe")
+                        continue
+
+                    names.add(name)
+                    if email:
+                        emails.add(email)
+                    if document_number:
+                        documents.add(document_number)
+                    rows.append({
+                        'name': name,
+                        'email': email,
+                        'phone': phone,
+                        'address': address,
+                        'document_type': document_type,
+                        'document_number': document_number
+                    })
+
+                if rows:
+                    session.execute(insert(Customer.__table__), rows)
+                    result.imported += len(rows)
+
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+
+        return result
+
+    # ========== Ventas ==========
+
+    @staticmethod
+    def import_sales(session, file_path, progress=None, cancelled=None):
+        """
+        Importa ventas (solo encabezados, sin items); se omiten las facturas que
+        ya existen y se crean los clientes nuevos por nombre. Al final se
+        recalcula el resumen diario de los días importados y se avanzan las
+        series de numeración cuyos números se importaron.
+
+        Returns:
+            ImportResult
+        """
+        progress = progress or (lambda done, total: None)
+        result = ImportResult()
+
+        invoices = {invoice for (invoice,) in session.query(Sale.invoice_number)}
+        customer_ids = {}
+        for customer_id, name in session.query(Customer.id, Customer.name).order_by(Customer.id.desc()):
+            customer_ids[name] = customer_id  # Con nombres repetidos gana el primero, como filter_by().first()
+        sequences = session.query(InvoiceSequence.prefix, InvoiceSequence.padding).all()
+        highest = {}  # Prefijo de la serie -> mayor consecutivo importado
+        first_day = last_day = None
+
+        try:
+            for chunk in ImportService._iter_chunks(file_path, progress, cancelled):
+                rows = []
+                new_customers = []
+                for row_idx, row in chunk:
+                    if not row or not row[0]:
+                        continue
+                    row = tuple(row) + (None,) * (9 - len(row))
+
+                    invoice_number = str(row[0])
+                    if invoice_number in invoices:
+                        result.errors.append(f"Fila {row_idx}: Factura {invoice_number} ya existe")
+                        continue
+
+                    try:
+                        sale_date = ImportService.parse_sale_date(row[1])
+                    except ValueError as e:
+                        result.errors.append(f"Fila {row_idx}: Formato de fecha inválido '{row[1]}' - {str(e)}")
+                        continue
+
+                    try:
+                        subtotal, tax, discount, total = [float(value) if value else 0.0 for value in row[5:9]]
+                    except (TypeError, ValueError):
+                        result.errors.append(f"Fila {row_idx}: Valores numéricos inválidos")
+                        continue
+
+                    customer_name = str(row[2]) if row[2] else ImportService.GENERAL_CUSTOMER
+                    if customer_name not in customer_ids and customer_name != ImportService.GENERAL_CUSTOMER:
+                        customer_ids[customer_name] = None  # Se crea al insertar el bloque
+                        new_customers.append({'name': customer_name})
+
+                    invoices.add(invoice_number)
+                    for prefix, padding in sequences:
+                        value = InvoiceSequenceService.parse_value(prefix, invoice_number, padding)
+                        if value is not None and value > highest.get(prefix, 0):
+                            highest[prefix] = value
+                    rows.append({
+                        'invoice_number': invoice_number,
+                        'customer_name': customer_name,
+                        'payment_method': ImportService._enum(PaymentMethod, row[3], PaymentMethod.CASH),
+                        'status': ImportService._enum(SaleStatus, row[4], SaleStatus.COMPLETED),
+                        'subtotal': subtotal,
+                        'tax': tax,
+                        'discount': discount,
+                        'total': total,
+                        'created_at': sale_date
+                    })
+                    first_day = min(first_day or sale_date.date(), sale_date.date())
+                    last_day = max(last_day or sale_date.date(), sale_date.date())
+
+                if new_customers:
+                    created = session.execute(
+                        insert(Customer.__table__).returning(Customer.id, Customer.name),
+                        new_customers
+                    )
+                    for customer_id, name in created:
+                        customer_ids[name] = customer_id
+
+                if rows:
+                    for sale in rows:
+                        sale['customer_id'] = customer_ids.get(sale.pop('customer_name'))
+                    session.execute(insert(Sale.__table__), rows)
+                    result.imported += len(rows)
+
+            # Recalcular el resumen diario de los días importados
+            if first_day is not None:
+                SalesRollupService.rebuild(session, first_day, last_day)
+
+            # Que la próxima venta no reciba un número importado
+            for prefix, value in highest.items():
+                InvoiceSequenceService.advance_to(session, prefix, value)
+
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+
+        return result
+
+    @staticmethod
+    def parse_sale_date(value):
+        """Fecha de la venta desde una celda (datetime, date o texto)"""
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, date):
+            return datetime.combine(value, datetime.min.time())
+        if not value:
+            raise ValueError("Fecha vacía")
+        text = str(value).strip()
+        for date_format in ImportService.SALE_DATE_FORMATS:
+            try:
+                return datetime.strptime(text, date_format)
+            except ValueError:
+                continue
+        raise ValueError("Formato no reconocido")
+
+    @staticmethod
+    def _enum(enum_type, value, default):
+        try:
+            return enum_type(str(value)) if value else default
+        except ValueError:
+            return default
+
+    @staticmethod
+    def _text(values, index):
+        """Texto sin espacios de una celda, None si está vacía o no existe"""
+        if index >= len(values) or values[index] is None:
+            return None
+        text = str(values[index]).strip()
+        return text or None
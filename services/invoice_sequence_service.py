@@ -0,0 +1,133 @@
+"""
+Servicio de Numeración de Facturas - Consecutivos sin huecos por prefijo
+La asignación es un único UPDATE ... RETURNING dentro de la transacción de
+la venta: si la venta se revierte, el número también; y dos cajas que
+confirman al mismo tiempo quedan serializadas por el bloqueo de escritura
+de SQLite, sin reintentos ni consultas de unicidad. Cualquier otra
+escritura de números con el prefijo de una serie (ej: importación de
+ventas) debe llamar a advance_to() en su transacción para que la serie no
+vuelva a asignar un número ya usado.
+"""
+from datetime import datetime
+from sqlalchemy import update, func, cast, Integer
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import Sale, InvoiceSequence
+
+
+class InvoiceSequenceService:
+    """
+    Asigna números de factura por serie
+    """
+
+    # Prefijos de las series conocidas
+    SALES = 'INV'
+    CREDIT_NOTE = 'NC'
+
+    DEFAULT_PADDING = 6
+
+    @staticmethod
+    def terminal_prefix(terminal, base=SALES):
+        """Prefijo de la serie de una caja/terminal (ej: INV-T2)"""
+        return f"{base}-T{terminal}"
+
+    @staticmethod
+    def format_number(prefix, value, padding=DEFAULT_PADDING):
+        """Formatea un consecutivo (ej: INV-000123)"""
+        return f"{prefix}-{value:0{padding}d}"
+
+    @staticmethod
+    def next_number(session, prefix=SALES):
+        """
+        Asigna el siguiente número de la serie
+        No confirma la transacción: el número queda reservado solo si el
+        llamador hace commit
+
+        Returns:
+            str con el número formateado
+        """
+        row = InvoiceSequenceService._increment(session, prefix)
+        if row is None:
+            # Primera vez que se usa la serie: crearla y reintentar una vez
+            InvoiceSequenceService.ensure_sequence(session, prefix)
+            row = InvoiceSequenceService._increment(session, prefix)
+
+        value, padding = row
+        return InvoiceSequenceService.format_number(prefix, value, padding)
+
+    @staticmethod
+    def ensure_sequence(session, prefix, description=None, padding=DEFAULT_PADDING):
+        """
+        Crea la serie si no existe, continuando desde el mayor número ya
+        usado en ventas con ese prefijo
+        """
+        now = datetime.now()
+        stmt = sqlite_insert(InvoiceSequence).values(
+            prefix=prefix,
+            last_value=InvoiceSequenceService._last_used_value(session, prefix, padding),
+            padding=padding,
+            description=description,
+            created_at=now,
+            updated_at=now
+        ).on_conflict_do_nothing(index_elements=['prefix'])
+        session.execute(stmt)
+
+    @staticmethod
+    def advance_to(session, prefix, value):
+        """
+        Lleva la serie al menos hasta value (nunca la retrocede)
+        Si la serie aún no existe no hace nada: al crearla, ensure_sequence
+        continúa desde el mayor número ya usado en ventas
+        """
+        stmt = (
+            update(InvoiceSequence)
+            .where(InvoiceSequence.prefix == prefix, InvoiceSequence.last_value < value)
+            .values(last_value=value, updated_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        session.execute(stmt)
+
+    @staticmethod
+    def parse_value(prefix, invoice_number, padding=DEFAULT_PADDING):
+        """
+        Consecutivo de un número de la serie (ej: INV-000123 -> 123), con el
+        mismo criterio que _last_used_value
+
+        Returns:
+            int, o None si el número no pertenece a la serie
+        """
+        if not invoice_number.startswith(f"{prefix}-"):
+            return None
+        suffix = invoice_number[len(prefix) + 1:]
+        if not (suffix.isascii() and suffix.isdigit()) or len(suffix) > max(padding, 9):
+            return None
+        return int(suffix)
+
+    @staticmethod
+    def _increment(session, prefix):
+        """Incrementa la serie y devuelve (last_value, padding), o None si no existe"""
+        stmt = (
+            update(InvoiceSequence)
+            .where(InvoiceSequence.prefix == prefix)
+            .values(last_value=InvoiceSequence.last_value + 1, updated_at=datetime.now())
+            .returning(InvoiceSequence.last_value, InvoiceSequence.padding)
+            .execution_options(synchronize_session=False)
+        )
+        return session.execute(stmt).first()
+
+    @staticmethod
+    def _last_used_value(session, prefix, padding):
+        """
+        Mayor consecutivo ya usado en ventas con el prefijo dado
+        Se ignoran los números generados con timestamp por el esquema
+        anterior (10 o más dígitos) para no saltar la serie
+        """
+        start = len(prefix) + 2
+        suffix = func.substr(Sale.invoice_number, start)
+        value = session.query(
+            func.max(cast(suffix, Integer))
+        ).filter(
+            Sale.invoice_number.like(f"{prefix}-%"),
+            suffix.op('NOT GLOB')('*[^0-9]*'),
+            func.length(suffix).between(1, max(padding, 9))
+        ).scalar()
+        return value or 0
@@ -0,0 +1,91 @@
+"""
+Caché de Recetas - Materias primas de cada producto en memoria
+Las recetas cambian muy poco (edición del producto o de sus materias
+primas, importación) y se leen en cada venta, edición, cancelación y
+egreso. Cada receta se consulta una sola vez y queda como una tupla de
+(raw_material_id, quantity_needed); los cambios la invalidan a través del
+bus de eventos.
+"""
+from models import ProductMaterial
+from core.events import EventBus, ProductUpdated, RawMaterialUpdated
+
+
+class RecipeCache:
+    """
+    Caché de recetas por id de producto para todo el proceso
+    Un producto sin receta se guarda como tupla vacía para no volver a consultarlo
+    """
+
+    _recipes = {}
+
+    @staticmethod
+    def get(session, product_id):
+        """Receta de un producto: tupla de (raw_material_id, quantity_needed)"""
+        return RecipeCache.get_many(session, [product_id])[product_id]
+
+    @staticmethod
+    def get_many(session, product_ids):
+        """
+        Recetas de varios productos; las que faltan se cargan con una sola consulta IN
+
+        Returns:
+            dict {product_id: ((raw_material_id, quantity_needed), ...)}
+        """
+        product_ids = set(product_ids)
+        missing = product_ids - RecipeCache._recipes.keys()
+        if missing:
+            loaded = {product_id: [] for product_id in missing}
+            rows = session.query(
+                ProductMaterial.product_id,
+                ProductMaterial.raw_material_id,
+                ProductMaterial.quantity_needed
+            ).filter(ProductMaterial.product_id.in_(missing)).all()
+            for product_id, raw_material_id, quantity_needed in rows:
+                loaded[product_id].append((raw_material_id, quantity_needed))
+            for product_id, recipe in loaded.items():
+                RecipeCache._recipes[product_id] = tuple(recipe)
+
+        return {product_id: RecipeCache._recipes[product_id] for product_id in product_ids}
+
+    @staticmethod
+    def explode(session, items):
+        """
+        Materias primas que consume un conjunto de productos
+
+        Args:
+            items: Iterable de (product_id, cantidad)
+
+        Returns:
+            dict {raw_material_id: cantidad total necesaria}
+        """
+        items = list(items)
+        recipes = RecipeCache.get_many(session, [product_id for product_id, _ in items])
+        needed = {}
+        for product_id, quantity in items:
+            for raw_material_id, quantity_needed in recipes[product_id]:
+                needed[raw_material_id] = needed.get(raw_material_id, 0) + quantity_needed * quantity
+        return needed
+
+    @staticmethod
+    def invalidate(product_ids=None):
+        """Descarta las recetas de esos productos (None = todas)"""
+        if product_ids is None:
+            RecipeCache._recipes.clear()
+            return
+        for product_id in product_ids:
+            RecipeCache._recipes.pop(product_id, None)
+
+    @staticmethod
+    def _on_product_updated(event):
+        # ids vacío = cualquier producto (ej: importación masiva)
+        RecipeCache.invalidate(event.product_ids or None)
+
+    @staticmethod
+    def _on_raw_material_updated(event):
+        # Al eliminar una materia prima se borran sus filas de las recetas
+        if event.deleted or not event.raw_material_ids:
+            RecipeCache.invalidate()
+
+
+EventBus.subscribe(ProductUpdated, RecipeCache._on_product_updated)
+EventBus.subscribe(RawMaterialUpdated, RecipeCache._on_raw_material_updated)
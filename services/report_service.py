@@ -0,0 +1,173 @@
+"""
+Servicio de Reportes - Consultas de la vista de reportes
+Cada reporte recibe la sesión y los parámetros y devuelve tuplas simples
+(no objetos del ORM), así puede ejecutarse en un hilo de trabajo con su
+propia sesión y el resultado se pinta después en el hilo de la interfaz.
+"""
+from sqlalchemy import func, desc, select
+from models import (
+    Product, Customer, DailySalesRollup, RawMaterial, RawMaterialMovement, RawMaterialMovementType
+)
+from utils.date_ranges import in_period
+from services.bom_engine import BomEngine
+
+
+class ReportService:
+    """
+    Consultas de reportes
+    """
+
+    TOP_LIMIT = 10
+
+    @staticmethod
+    def top_products(session, date_from, date_to, limit=TOP_LIMIT):
+        """
+        Productos más vendidos desde el resumen diario (ventas no canceladas)
+
+        Returns:
+            Lista de (nombre, cantidad, total)
+        """
+        return [tuple(row) for row in session.query(
+            Product.name,
+            func.sum(DailySalesRollup.quantity).label('total_quantity'),
+            func.sum(DailySalesRollup.revenue).label('total_amount')
+        ).join(
+            DailySalesRollup, Product.id == DailySalesRollup.ref_id
+        ).filter(
+            DailySalesRollup.kind == DailySalesRollup.PRODUCT,
+            DailySalesRollup.day.between(date_from, date_to)
+        ).group_by(
+            Product.id, Product.name
+        ).order_by(
+            desc('total_quantity')
+        ).limit(limit).all()]
+
+    @staticmethod
+    def top_customers(session, date_from, date_to, limit=TOP_LIMIT):
+        """
+        Mejores clientes desde el resumen diario (ventas no canceladas)
+
+        Returns:
+            Lista de (nombre, compras, total)
+        """
+        return [tuple(row) for row in session.query(
+            Customer.name,
+            func.sum(DailySalesRollup.sales_count).label('purchase_count'),
+            func.sum(DailySalesRollup.revenue).label('total_amount')
+        ).join(
+            DailySalesRollup, Customer.id == DailySalesRollup.ref_id
+        ).filter(
+            DailySalesRollup.kind == DailySalesRollup.CUSTOMER,
+            DailySalesRollup.day.between(date_from, date_to)
+        ).group_by(
+            Customer.id, Customer.name
+        ).order_by(
+            desc('total_amount')
+        ).limit(limit).all()]
+
+    @staticmethod
+    def sales_summary(session, date_from, date_to):
+        """
+        Total vendido y número de ventas del período
+
+        Returns:
+            (total, cantidad)
+        """
+        total, count = session.query(
+            func.coalesce(func.sum(DailySalesRollup.revenue), 0),
+            func.coalesce(func.sum(DailySalesRollup.sales_count), 0)
+        ).filter(
+            DailySalesRollup.kind == DailySalesRollup.TOTAL,
+            DailySalesRollup.day.between(date_from, date_to)
+        ).one()
+        return total, count
+
+    @staticmethod
+    def low_stock_products(session):
+        """
+        Productos con stock bajo o igual al mínimo
+
+        Returns:
+            Lista de (nombre, stock, stock mínimo)
+        """
+        return [tuple(row) for row in session.query(
+            Product.name, Product.stock, Product.min_stock
+        ).filter(
+            Product.stock <= Product.min_stock
+        ).all()]
+
+    @staticmethod
+    def materials_consumption_query(session, date_from, date_to):
+        """
+        Consulta única del consumo de materias primas en el período
+        La suma de cada materia prima es una subconsulta correlacionada que
+        recorre solo su tramo del índice ix_raw_material_movements_consumption
+        (materia prima, tipo, fecha, cantidad), sin tocar la tabla de
+        movimientos ni ordenar los resultados intermedios
+        """
+        consumed = select(
+            func.abs(func.sum(RawMaterialMovement.quantity))
+        ).where(
+            RawMaterialMovement.raw_material_id == RawMaterial.id,
+            RawMaterialMovement.movement_type == RawMaterialMovementType.PRODUCTION,
+            in_period(RawMaterialMovement.created_at, date_from, date_to)
+        ).correlate(RawMaterial).scalar_subquery()
+
+        consumption = select(
+            RawMaterial.name,
+            RawMaterial.unit,
+            RawMaterial.cost_per_unit,
+            RawMaterial.stock,
+            RawMaterial.min_stock,
+            consumed.label('consumed')
+        ).subquery()
+
+        return session.query(
+            consumption.c.name,
+            consumption.c.unit,
+            consumption.c.consumed,
+            consumption.c.consumed * consumption.c.cost_per_unit,
+            consumption.c.stock,
+            consumption.c.stock <= consumption.c.min_stock
+        ).filter(
+            consumption.c.consumed.isnot(None)
+        ).order_by(consumption.c.name)
+
+    @staticmethod
+    def materials_consumption(session, date_from, date_to):
+        """
+        Consumo de materias primas (movimientos de producción) en el período
+
+        Returns:
+            Lista de (nombre, unidad, cantidad consumida, costo, stock actual, stock bajo)
+        """
+        return [
+            (name, unit, consumed, cost, stock, bool(is_low_stock))
+            for name, unit, consumed, cost, stock, is_low_stock
+            in ReportService.materials_consumption_query(session, date_from, date_to).all()
+        ]
+
+    @staticmethod
+    def production_projection(session):
+        """
+        Unidades producibles con el stock actual de materias primas
+        Calculada con el motor de recetas (BomEngine) en una sola pasada
+
+        Returns:
+            Lista de (nombre, unidades producibles, costo de materias primas, precio de venta)
+        """
+        return BomEngine.load(session).projection()
+
+    @staticmethod
+    def low_materials_stock(session):
+        """
+        Materias primas con stock bajo o en cero, de menor a mayor stock
+
+        Returns:
+            Lista de (nombre, unidad, stock, stock mínimo)
+        """
+        return [tuple(row) for row in session.query(
+            RawMaterial.name, RawMaterial.unit, RawMaterial.stock, RawMaterial.min_stock
+        ).filter(
+            RawMaterial.stock <= RawMaterial.min_stock
+        ).order_by(RawMaterial.stock.asc()).all()]
@@ -0,0 +1,437 @@
+"""
+Servicio de Ventas - Registro, edición y cancelación de ventas
+Independiente de la interfaz gráfica: carga productos y materias primas con
+unas pocas consultas IN (...), toma las recetas de RecipeCache, aplica los
+cambios de stock en memoria y escribe items y movimientos con inserciones
+masivas en una sola transacción, junto con el resumen diario de ventas.
+"""
+from datetime import datetime
+from models import (
+    Sale, SaleItem, Product, SaleStatus, InventoryMovement, MovementType,
+    RawMaterial, RawMaterialMovement, RawMaterialMovementType
+)
+from services.invoice_sequence_service import InvoiceSequenceService
+from services.sales_rollup_service import SalesRollupService
+from services.recipe_cache import RecipeCache
+from core.events import EventBus, SaleCommitted, SaleCancelled, StockChanged
+
+
+class SaleServiceError(Exception):
+    """Error de validación al registrar, editar o cancelar una venta"""
+    pass
+
+
+class SaleResult:
+    """
+    Resultado de una operación de venta
+    Lo usan NewSaleDialog, la edición completa y la cancelación para
+    mostrar el resumen sin volver a consultar la base de datos
+    """
+
+    def __init__(self, sale, items_count=0, product_movements=0, material_movements=0):
+        self.sale_id = sale.id
+        self.invoice_number = sale.invoice_number
+        self.status = sale.status
+        self.subtotal = sale.subtotal
+        self.tax = sale.tax
+        self.total = sale.total
+        self.items_count = items_count
+        self.product_movements = product_movements
+        self.material_movements = material_movements
+
+    def __repr__(self):
+        return f"<SaleResult(invoice={self.invoice_number}, total=${self.total}, status={self.status.value})>"
+
+
+class SaleService:
+    """
+    Operaciones transaccionales sobre ventas
+    Cada método recibe la sesión del llamador, confirma (commit) al terminar
+    y hace rollback si algo falla, relanzando la excepción
+    """
+
+    @staticmethod
+    def create_sale(session, sale_items, customer_id=None, payment_method=None,
+                    tax_amount=0.0, transfer_type=None, notes=None,
+                    invoice_prefix=InvoiceSequenceService.SALES):
+        """
+        Registra una venta nueva y descuenta productos y materias primas
+
+        Args:
+            session: Sesión de base de datos
+            sale_items: Lista de dicts con product_id, quantity, unit_price y subtotal
+            customer_id: Cliente (opcional)
+            payment_method: PaymentMethod de la venta
+            tax_amount: Impuesto de la venta
+            transfer_type: Tipo de transferencia (cuando aplica)
+            notes: Notas de la venta
+            invoice_prefix: Serie de numeración (ej: INV o la serie de la caja)
+
+        Returns:
+            SaleResult
+        """
+        if not sale_items:
+            raise SaleServiceError("La venta debe tener al menos un producto")
+
+        try:
+            now = datetime.now()
+            sale = Sale(
+                invoice_number=InvoiceSequenceService.next_number(session, invoice_prefix),
+                customer_id=customer_id,
+                payment_method=payment_method,
+                tax=tax_amount or 0.0,
+                transfer_type=transfer_type,
+                discount=0,
+                notes=notes,
+                status=SaleStatus.COMPLETED,
+                created_at=now,
+                updated_at=now
+            )
+            sale.subtotal = sum(item['subtotal'] for item in sale_items)
+            sale.total = sale.subtotal + sale.tax - sale.discount
+            session.add(sale)
+            session.flush()  # Obtener sale.id para items y referencias
+
+            products, recipes, materials = SaleService._load_stock_context(
+                session, [item['product_id'] for item in sale_items]
+            )
+
+            item_rows = SaleService._build_item_rows(sale.id, sale_items, now)
+            movement_rows, material_rows = SaleService._apply_exit(
+                sale_items, products, recipes, materials, now,
+                reason=f"Venta {sale.invoice_number}",
+                reference=f"SALE-{sale.id}",
+                material_reference=sale.invoice_number,
+                material_reason=lambda qty, product: f"Producción de {qty} unidades de {product.name}"
+            )
+
+            SaleService._bulk_write(session, item_rows, movement_rows, material_rows)
+            SalesRollupService.record(session, sale.id)
+            result = SaleResult(sale, len(item_rows), len(movement_rows), len(material_rows))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+        SaleService._publish(SaleCommitted(result.sale_id, customer_id, products), products, materials)
+        return result
+
+    @staticmethod
+    def edit_sale(session, sale_id, sale_items, customer_id=None, payment_method=None,
+                  tax_amount=0.0, transfer_type=None):
+        """
+        Reemplaza los items de una venta
+        Devuelve al inventario los items originales y descuenta los nuevos;
+        sin payment_method se conserva el método de pago de la venta
+
+        Returns:
+            SaleResult
+        """
+        if not sale_items:
+            raise SaleServiceError("Debe agregar al menos un producto")
+
+        try:
+            sale = SaleService._get_editable_sale(session, sale_id)
+            rollup_before = SalesRollupService.snapshot(session, sale.id)
+            invoice = sale.invoice_number
+            original_items = [
+                {'product_id': item.product_id, 'quantity': item.quantity}
+                for item in sale.items
+            ]
+
+            now = datetime.now()
+            products, recipes, materials = SaleService._load_stock_context(
+                session,
+                [item['product_id'] for item in original_items] +
+                [item['product_id'] for item in sale_items]
+            )
+
+            # PASO 1: Devolver al inventario los productos originales
+            return_rows, return_material_rows = SaleService._apply_return(
+                original_items, products, recipes, materials, now,
+                reason=f"Devolución por edición de venta {invoice}",
+                reference=None,
+                material_reference=invoice
+            )
+
+            # PASO 2: Eliminar items antiguos (una sola sentencia)
+            session.query(SaleItem).filter(SaleItem.sale_id == sale.id).delete(synchronize_session=False)
+            session.expire(sale, ['items'])
+
+            # PASO 3: Descontar los nuevos items verificando stock disponible
+            exit_rows, exit_material_rows = SaleService._apply_exit(
+                sale_items, products, recipes, materials, now,
+                reason=f"Venta editada {invoice}",
+                reference=None,
+                material_reference=invoice,
+                material_reason=lambda qty, product: f"Producción venta editada {invoice}",
+                check_stock=True
+            )
+
+            item_rows = SaleService._build_item_rows(sale.id, sale_items, now)
+            movement_rows = return_rows + exit_rows
+            material_rows = return_material_rows + exit_material_rows
+            SaleService._bulk_write(session, item_rows, movement_rows, material_rows)
+
+            # Actualizar datos de la venta
+            sale.customer_id = customer_id
+            if payment_method is not None:
+                sale.payment_method = payment_method
+            sale.tax = tax_amount or 0.0
+            sale.transfer_type = transfer_type
+            sale.discount = 0
+            sale.status = SaleStatus.EDITED
+            sale.subtotal = sum(item['subtotal'] for item in sale_items)
+            sale.total = sale.subtotal + sale.tax - sale.discount
+            SalesRollupService.record(session, sale.id, rollup_before)
+            result = SaleResult(sale, len(item_rows), len(movement_rows), len(material_rows))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+        SaleService._publish(
+            SaleCommitted(result.sale_id, customer_id, products, edited=True), products, materials
+        )
+        return result
+
+    @staticmethod
+    def cancel_sale(session, sale_id, rollup_before=None):
+        """
+        Cancela una venta y devuelve al inventario productos y materias primas
+        Los cambios pendientes en la sesión (p. ej. datos básicos de la venta)
+        se confirman en la misma transacción
+
+        Args:
+            session: Sesión de base de datos
+            sale_id: Venta a cancelar
+            rollup_before: SalesRollupService.snapshot() tomado antes de
+                modificar la venta en la sesión (por defecto, el estado actual)
+
+        Returns:
+            SaleResult
+        """
+        try:
+            sale = SaleService._get_editable_sale(session, sale_id)
+            if sale.status == SaleStatus.CANCELLED:
+                raise SaleServiceError("Esta venta ya está cancelada")
+            if rollup_before is None:
+                rollup_before = SalesRollupService.snapshot(session, sale.id)
+
+            invoice = sale.invoice_number
+            items = [
+                {'product_id': item.product_id, 'quantity': item.quantity}
+                for item in sale.items
+            ]
+
+            now = datetime.now()
+            products, recipes, materials = SaleService._load_stock_context(
+                session, [item['product_id'] for item in items]
+            )
+            movement_rows, material_rows = SaleService._apply_return(
+                items, products, recipes, materials, now,
+                reason=f"Devolución por cancelación de venta {invoice}",
+                reference=f"CANCELLED-SALE-{sale.id}",
+                material_reference=invoice
+            )
+
+            # Anular los movimientos de venta originales
+            session.query(InventoryMovement).filter(
+                InventoryMovement.reference == f"SALE-{sale.id}"
+            ).update(
+                {InventoryMovement.note: f"[ANULADO] Cancelación de venta {invoice}"},
+                synchronize_session=False
+            )
+
+            SaleService._bulk_write(session, [], movement_rows, material_rows)
+            sale.status = SaleStatus.CANCELLED
+            SalesRollupService.record(session, sale.id, rollup_before)
+            result = SaleResult(sale, len(items), len(movement_rows), len(material_rows))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+        SaleService._publish(SaleCancelled(result.sale_id, products), products, materials)
+        return result
+
+    # ------------------------------------------------------------------
+    # Auxiliares
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _publish(event, products, materials):
+        """Notifica la venta y el cambio de stock (después del commit)"""
+        EventBus.publish(event)
+        EventBus.publish(StockChanged(products, materials))
+
+    @staticmethod
+    def _get_editable_sale(session, sale_id):
+        """Obtiene una venta validando que exista y que no tenga factura"""
+        sale = session.query(Sale).filter_by(id=sale_id).first()
+        if not sale:
+            raise SaleServiceError("Venta no encontrada")
+        if getattr(sale, 'has_invoice', 0):
+            raise SaleServiceError("Esta venta ya tiene una factura legal generada y no puede ser modificada.")
+        return sale
+
+    @staticmethod
+    def _load_stock_context(session, product_ids):
+        """
+        Carga productos y materias primas con dos consultas; las recetas
+        salen de RecipeCache (sin consultas si ya están en memoria)
+
+        Returns:
+            (products, recipes, materials) donde products y materials son
+            dicts por id y recipes es {product_id: ((raw_material_id, quantity_needed), ...)}
+        """
+        product_ids = set(product_ids)
+        if not product_ids:
+            return {}, {}, {}
+
+        products = {
+            p.id: p for p in session.query(Product).filter(Product.id.in_(product_ids)).all()
+        }
+
+        recipes = RecipeCache.get_many(session, product_ids)
+        material_ids = {
+            raw_material_id for recipe in recipes.values() for raw_material_id, _ in recipe
+        }
+        materials = {}
+        if material_ids:
+            materials = {
+                m.id: m for m in session.query(RawMaterial).filter(RawMaterial.id.in_(material_ids)).all()
+            }
+
+        return products, recipes, materials
+
+    @staticmethod
+    def _build_item_rows(sale_id, sale_items, now):
+        """Construye las filas de SaleItem para inserción masiva"""
+        return [
+            {
+                'sale_id': sale_id,
+                'product_id': item['product_id'],
+                'quantity': item['quantity'],
+                'unit_price': item['unit_price'],
+                'subtotal': item['subtotal'],
+                'created_at': now,
+                'updated_at': now
+            }
+            for item in sale_items
+        ]
+
+    @staticmethod
+    def _apply_exit(sale_items, products, recipes, materials, now, reason, reference,
+                    material_reference, material_reason, check_stock=False):
+        """
+        Descuenta en memoria productos y materias primas
+
+        Returns:
+            (movement_rows, material_rows) listos para inserción masiva
+        """
+        movement_rows = []
+        material_rows = []
+        for item_data in sale_items:
+            quantity = item_data['quantity']
+            product = products.get(item_data['product_id'])
+            if product is None:
+                raise SaleServiceError(f"Producto {item_data.get('product_name', item_data['product_id'])} no encontrado")
+            if check_stock and product.stock < quantity:
+                raise SaleServiceError(
+                    f"Stock insuficiente para {item_data.get('product_name', product.name)}. Disponible: {product.stock}"
+                )
+
+            previous_stock = product.stock
+            product.stock -= quantity
+            movement_rows.append({
+                'product_id': product.id,
+                'movement_type': MovementType.EXIT,
+                'quantity': -quantity,
+                'previous_stock': previous_stock,
+                'new_stock': product.stock,
+                'reason': reason,
+                'reference': reference,
+                'created_at': now,
+                'updated_at': now
+            })
+
+            for raw_material_id, quantity_needed in recipes.get(product.id, ()):
+                raw_material = materials.get(raw_material_id)
+                if raw_material is None:
+                    continue
+                quantity_to_deduct = quantity_needed * quantity
+                raw_material.stock -= quantity_to_deduct
+                material_rows.append({
+                    'raw_material_id': raw_material_id,
+                    'movement_type': RawMaterialMovementType.PRODUCTION,
+                    'quantity': -quantity_to_deduct,
+                    'cost': 0.0,
+                    'reference': material_reference,
+                    'reason': material_reason(quantity, product),
+                    'created_at': now,
+                    'updated_at': now
+                })
+
+        return movement_rows, material_rows
+
+    @staticmethod
+    def _apply_return(items, products, recipes, materials, now, reason, reference, material_reference):
+        """
+        Devuelve en memoria productos y materias primas al inventario
+
+        Returns:
+            (movement_rows, material_rows) listos para inserción masiva
+        """
+        movement_rows = []
+        material_rows = []
+        for item_data in items:
+            quantity = item_data['quantity']
+            product = products.get(item_data['product_id'])
+            if product is None:
+                continue
+
+            previous_stock = product.stock
+            product.stock += quantity
+            movement_rows.append({
+                'product_id': product.id,
+                'movement_type': MovementType.ENTRY,
+                'quantity': quantity,
+                'previous_stock': previous_stock,
+                'new_stock': product.stock,
+                'reason': reason,
+                'reference': reference,
+                'created_at': now,
+                'updated_at': now
+            })
+
+            for raw_material_id, quantity_needed in recipes.get(product.id, ()):
+                raw_material = materials.get(raw_material_id)
+                if raw_material is None:
+                    continue
+                quantity_to_return = quantity_needed * quantity
+                raw_material.stock += quantity_to_return
+                material_rows.append({
+                    'raw_material_id': raw_material_id,
+                    'movement_type': RawMaterialMovementType.RETURN,
+                    'quantity': quantity_to_return,
+                    'cost': 0.0,
+                    'reference': material_reference,
+                    'reason': reason,
+                    'created_at': now,
+                    'updated_at': now
+                })
+
+        return movement_rows, material_rows
+
+    @staticmethod
+    def _bulk_write(session, item_rows, movement_rows, material_rows):
+        """Escribe items y movimientos con una inserción masiva por tabla"""
+        if item_rows:
+            session.bulk_insert_mappings(SaleItem, item_rows)
+        if movement_rows:
+            session.bulk_insert_mappings(InventoryMovement, movement_rows)
+        if material_rows:
+            session.bulk_insert_mappings(RawMaterialMovement, material_rows)
+        # Los productos y materias primas modificados se escriben en el flush
+        session.flush()
@@ -0,0 +1,166 @@
+"""
+Servicio de Resumen Diario de Ventas - Mantiene la tabla daily_sales_rollup
+Cada operación toma el aporte de la venta antes del cambio (snapshot), lo
+vuelve a tomar después y escribe solo la diferencia con un UPSERT dentro de
+la misma transacción de la venta. rebuild() recalcula el resumen desde las
+ventas para llenar la tabla por primera vez o corregirla.
+"""
+from datetime import datetime
+from sqlalchemy import func, select, insert, delete, literal, DateTime
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import Sale, SaleItem, SaleStatus, DailySalesRollup
+from utils.date_ranges import day_bounds
+
+
+class SalesRollupService:
+    """
+    Actualiza el resumen diario de ventas
+    No confirma la transacción: los cambios quedan junto con los de la venta
+    """
+
+    @staticmethod
+    def snapshot(session, sale_id):
+        """
+        Aporte actual de una venta al resumen
+        Escribe antes los cambios pendientes de la sesión (flush)
+
+        Returns:
+            dict {(kind, day, ref_id): (quantity, revenue, sales_count)};
+            vacío si la venta no existe o está cancelada
+        """
+        session.flush()
+        sale = session.query(
+            Sale.created_at, Sale.customer_id, Sale.total, Sale.status
+        ).filter(Sale.id == sale_id).first()
+        if sale is None or sale.status == SaleStatus.CANCELLED:
+            return {}
+
+        items = session.query(
+            SaleItem.product_id,
+            func.sum(SaleItem.quantity),
+            func.sum(SaleItem.subtotal)
+        ).filter(SaleItem.sale_id == sale_id).group_by(SaleItem.product_id).all()
+
+        day = sale.created_at.date()
+        quantity = sum(item_quantity for _, item_quantity, _ in items)
+        contribution = {(DailySalesRollup.TOTAL, day, 0): (quantity, sale.total, 1)}
+        if sale.customer_id:
+            contribution[(DailySalesRollup.CUSTOMER, day, sale.customer_id)] = (quantity, sale.total, 1)
+        for product_id, item_quantity, subtotal in items:
+            contribution[(DailySalesRollup.PRODUCT, day, product_id)] = (item_quantity, subtotal, 1)
+        return contribution
+
+    @staticmethod
+    def record(session, sale_id, before=None):
+        """
+        Lleva al resumen el estado actual de la venta
+
+        Args:
+            session: Sesión de base de datos
+            sale_id: Venta creada, editada o cancelada
+            before: snapshot() tomado antes de modificar la venta (None = venta nueva)
+        """
+        SalesRollupService.apply(session, before or {}, SalesRollupService.snapshot(session, sale_id))
+
+    @staticmethod
+    def apply(session, before, after):
+        """Escribe la diferencia entre dos snapshots con un único UPSERT"""
+        deltas = {}
+        for sign, contribution in ((-1, before), (1, after)):
+            for key, values in contribution.items():
+                current = deltas.get(key, (0, 0.0, 0))
+                deltas[key] = tuple(total + sign * value for total, value in zip(current, values))
+
+        now = datetime.now()
+        rows = [
+            {
+                'kind': kind,
+                'day': day,
+                'ref_id': ref_id,
+                'quantity': quantity,
+                'revenue': revenue,
+                'sales_count': sales_count,
+                'created_at': now,
+                'updated_at': now
+            }
+            for (kind, day, ref_id), (quantity, revenue, sales_count) in deltas.items()
+            if quantity or revenue or sales_count
+        ]
+        if not rows:
+            return
+
+        stmt = sqlite_insert(DailySalesRollup).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['kind', 'day', 'ref_id'],
+            set_={
+                'quantity': DailySalesRollup.quantity + stmt.excluded.quantity,
+                'revenue': DailySalesRollup.revenue + stmt.excluded.revenue,
+                'sales_count': DailySalesRollup.sales_count + stmt.excluded.sales_count,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+        session.execute(stmt)
+
+        # Quitar las filas que se quedaron sin ventas (ej: única venta del día cancelada)
+        session.execute(
+            delete(DailySalesRollup).where(
+                DailySalesRollup.day.in_({row['day'] for row in rows}),
+                DailySalesRollup.sales_count <= 0
+            ).execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def rebuild(session, date_from=None, date_to=None):
+        """
+        Recalcula el resumen desde las ventas (todas o las del rango de días)
+        Usar para llenar la tabla la primera vez o tras cargas masivas
+
+        Returns:
+            Cantidad de filas escritas
+        """
+        clear = delete(DailySalesRollup)
+        sale_filters = [Sale.status != SaleStatus.CANCELLED]
+        if date_from is not None:
+            clear = clear.where(DailySalesRollup.day >= date_from)
+            sale_filters.append(Sale.created_at >= day_bounds(date_from)[0])
+        if date_to is not None:
+            clear = clear.where(DailySalesRollup.day <= date_to)
+            sale_filters.append(Sale.created_at < day_bounds(date_to)[1])
+        session.execute(clear.execution_options(synchronize_session=False))
+
+        now = literal(datetime.now(), DateTime)
+        day = func.date(Sale.created_at)
+        sale_quantity = select(
+            SaleItem.sale_id,
+            func.sum(SaleItem.quantity).label('quantity')
+        ).group_by(SaleItem.sale_id).subquery()
+        quantity = func.coalesce(func.sum(sale_quantity.c.quantity), 0)
+
+        totals = select(
+            literal(DailySalesRollup.TOTAL), day, literal(0),
+            quantity, func.sum(Sale.total), func.count(Sale.id), now, now
+        ).outerjoin(
+            sale_quantity, sale_quantity.c.sale_id == Sale.id
+        ).where(*sale_filters).group_by(day)
+
+        customers = select(
+            literal(DailySalesRollup.CUSTOMER), day, Sale.customer_id,
+            quantity, func.sum(Sale.total), func.count(Sale.id), now, now
+        ).outerjoin(
+            sale_quantity, sale_quantity.c.sale_id == Sale.id
+        ).where(*sale_filters, Sale.customer_id.isnot(None)).group_by(day, Sale.customer_id)
+
+        products = select(
+            literal(DailySalesRollup.PRODUCT), day, SaleItem.product_id,
+            func.sum(SaleItem.quantity), func.sum(SaleItem.subtotal),
+            func.count(func.distinct(Sale.id)), now, now
+        ).join(
+            SaleItem, SaleItem.sale_id == Sale.id
+        ).where(*sale_filters).group_by(day, SaleItem.product_id)
+
+        columns = ['kind', 'day', 'ref_id', 'quantity', 'revenue', 'sales_count', 'created_at', 'updated_at']
+        written = 0
+        for query in (totals, customers, products):
+            result = session.execute(insert(DailySalesRollup).from_select(columns, query))
+            written += result.rowcount
+        return written
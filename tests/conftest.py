@@ -0,0 +1,73 @@
+"""
+Fixtures comunes de las pruebas: base SQLite temporal con el esquema al día
+"""
+import pytest
+from sqlalchemy.orm import sessionmaker
+from config.database import create_db_engine
+from config.migrations import migrate
+from models import Category, Product, RawMaterial, ProductMaterial
+from services.recipe_cache import RecipeCache
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', "slow: pruebas lentas (omitir con -m 'not slow')")
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Las cachés del proceso guardan ids de la base de la prueba anterior"""
+    RecipeCache.invalidate()
+    yield
+    RecipeCache.invalidate()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine sobre una base nueva en un directorio temporal"""
+    engine = create_db_engine(str(tmp_path / 'inventory.db'))
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def product(session):
+    """Producto con stock suficiente para registrar ventas"""
+    product = Product(
+        name="Crispetas", sku="PROD-000001", category=Category(name="Snacks"),
+        stock=1000, sale_price=1000, cost_price=400
+    )
+    session.add(product)
+    session.commit()
+    return product
+
+
+@pytest.fixture
+def recipe_product(session):
+    """Producto con receta: 2 g de maíz y 0.5 g de sal por unidad"""
+    corn = RawMaterial(name="Maíz", sku="MAT-001", unit='g', stock=100, cost_per_unit=10)
+    salt = RawMaterial(name="Sal", sku="MAT-002", unit='g', stock=100, cost_per_unit=2)
+    product = Product(name="Crispetas saladas", sku="PROD-000002", stock=50, sale_price=3000, cost_price=0)
+    session.add_all([corn, salt, product])
+    session.flush()
+    session.add_all([
+        ProductMaterial(product_id=product.id, raw_material_id=corn.id, quantity_needed=2),
+        ProductMaterial(product_id=product.id, raw_material_id=salt.id, quantity_needed=0.5),
+    ])
+    session.commit()
+    return product, corn, salt
+
+
+def sale_items(product, quantity=1):
+    """Items de venta en el formato de SaleService.create_sale"""
+    return [{
+        'product_id': product.id, 'quantity': quantity,
+        'unit_price': product.sale_price, 'subtotal': product.sale_price * quantity
+    }]
@@ -0,0 +1,99 @@
+"""
+Pruebas de BomEngine contra los cálculos por producto del modelo
+(Product.max_producible_units y real_cost_from_materials)
+"""
+import pytest
+from models import Product, RawMaterial, ProductMaterial
+
+np = pytest.importorskip('numpy')
+
+from services.bom_engine import BomEngine
+
+
+@pytest.fixture
+def catalogue(session):
+    """
+    Materias primas A (stock 100), B (stock 30), C (stock 7) y productos:
+    - combo: 2 A + 3 B
+    - receta_con_cero: 4 A + 0 C (la C no limita)
+    - repetido: 1 B dos veces en la receta (consume 2 B por unidad)
+    - solo_c: 2 C
+    """
+    materials = {
+        name: RawMaterial(name=name, sku=f"MAT-{name}", unit='g', stock=stock, cost_per_unit=cost)
+        for name, stock, cost in (('A', 100, 1.5), ('B', 30, 4.0), ('C', 7, 10.0))
+    }
+    recipes = {
+        'combo': [('A', 2), ('B', 3)],
+        'receta_con_cero': [('A', 4), ('C', 0)],
+        'repetido': [('B', 1), ('B', 1)],
+        'solo_c': [('C', 2)],
+    }
+    products = {
+        name: Product(name=name, sku=f"PROD-{name}", stock=0, sale_price=1000)
+        for name in recipes
+    }
+    session.add_all(list(materials.values()) + list(products.values()))
+    session.flush()
+    for name, recipe in recipes.items():
+        session.add_all([
+            ProductMaterial(product_id=products[name].id, raw_material_id=materials[material].id,
+                            quantity_needed=quantity)
+            for material, quantity in recipe
+        ])
+    session.commit()
+    return products, materials
+
+
+def by_product(engine, values):
+    return dict(zip(engine.product_ids, np.asarray(values).tolist()))
+
+
+def test_matches_product_model(session, catalogue):
+    products, _ = catalogue
+    engine = BomEngine.load(session)
+    units = by_product(engine, engine.max_producible_units())
+    costs = by_product(engine, engine.material_costs())
+
+    for name, product in products.items():
+        session.refresh(product)
+        assert costs[product.id] == pytest.approx(product.real_cost_from_materials)
+        if name != 'repetido':
+            assert units[product.id] == product.max_producible_units
+
+    assert units[products['combo'].id] == 10            # min(100 / 2, 30 / 3)
+    assert units[products['receta_con_cero'].id] == 25  # La C con cantidad 0 no cuenta
+
+
+def test_repeated_material_is_summed(session, catalogue):
+    products, _ = catalogue
+    engine = BomEngine.load(session)
+
+    assert by_product(engine, engine.max_producible_units())[products['repetido'].id] == 15  # 30 / (1 + 1)
+    assert by_product(engine, engine.material_costs())[products['repetido'].id] == pytest.approx(8.0)
+
+
+def test_what_if_reports_only_changed_products(session, catalogue):
+    products, materials = catalogue
+    engine = BomEngine.load(session)
+
+    changes = engine.what_if({materials['C'].id: 5})  # C: 7 -> 12
+
+    assert changes == {products['solo_c'].id: (3, 6)}
+    assert products['receta_con_cero'].id not in changes
+    assert engine.stock[engine.material_ids.index(materials['C'].id)] == 7  # La simulación no cambia el stock
+
+
+def test_what_if_unknown_material(session, catalogue):
+    with pytest.raises(KeyError):
+        BomEngine.load(session).what_if({9999: 1})
+
+
+def test_empty_catalogue(session):
+    engine = BomEngine.load(session)
+
+    assert engine.product_ids == []
+    assert engine.max_producible_units().tolist() == []
+    assert engine.material_costs().tolist() == []
+    assert engine.projection() == []
+    assert engine.what_if({}) == {}
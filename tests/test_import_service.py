@@ -0,0 +1,42 @@
+"""
+Pruebas de la importación de ventas (ImportService)
+"""
+import pytest
+from services import SaleService
+from services.import_service import ImportService
+from tests.conftest import sale_items
+
+openpyxl = pytest.importorskip('openpyxl')
+
+HEADERS = ["N° Factura", "Fecha", "Cliente", "Método Pago", "Estado", "Subtotal", "Impuesto", "Descuento", "Total"]
+
+
+def write_sales(path, invoice_numbers):
+    """Libro de ventas con una fila por número de factura"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(HEADERS)
+    for invoice_number in invoice_numbers:
+        ws.append([invoice_number, "01/03/2025 10:00", "Cliente", "Efectivo", "Completada", 1000, 0, 0, 1000])
+    wb.save(path)
+    return str(path)
+
+
+def test_checkout_after_importing_sequence_numbers(session, product, tmp_path):
+    assert SaleService.create_sale(session, sale_items(product)).invoice_number == 'INV-000001'
+
+    path = write_sales(tmp_path / 'ventas.xlsx', ['INV-000002', 'INV-000007', 'IMP-000099'])
+    result = ImportService.import_sales(session, path)
+    assert result.imported == 3 and not result.errors
+
+    numbers = [SaleService.create_sale(session, sale_items(product)).invoice_number for _ in range(2)]
+    assert numbers == ['INV-000008', 'INV-000009']
+
+
+def test_import_keeps_sequence_ahead_of_lower_numbers(session, product, tmp_path):
+    for _ in range(3):
+        SaleService.create_sale(session, sale_items(product))
+
+    ImportService.import_sales(session, write_sales(tmp_path / 'ventas.xlsx', ['INV-000001-A', 'INV-000000']))
+
+    assert SaleService.create_sale(session, sale_items(product)).invoice_number == 'INV-000004'
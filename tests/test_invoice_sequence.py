@@ -0,0 +1,55 @@
+"""
+Pruebas de la numeración de facturas (InvoiceSequenceService)
+"""
+from datetime import datetime
+from sqlalchemy import insert
+from models import Sale, PaymentMethod, SaleStatus, InvoiceSequence
+from services import InvoiceSequenceService, SaleService
+from tests.conftest import sale_items
+
+
+def insert_sale(session, invoice_number):
+    """Venta escrita sin pasar por la serie (como una importación)"""
+    now = datetime.now()
+    session.execute(insert(Sale.__table__), [{
+        'invoice_number': invoice_number, 'subtotal': 1000, 'tax': 0, 'discount': 0, 'total': 1000,
+        'payment_method': PaymentMethod.CASH, 'status': SaleStatus.COMPLETED,
+        'created_at': now, 'updated_at': now
+    }])
+
+
+def test_numbers_are_consecutive(session, product):
+    numbers = [SaleService.create_sale(session, sale_items(product)).invoice_number for _ in range(3)]
+    assert numbers == ['INV-000001', 'INV-000002', 'INV-000003']
+
+
+def test_new_sequence_continues_after_existing_sales(session, product):
+    insert_sale(session, 'INV-000041')
+    session.commit()
+    assert SaleService.create_sale(session, sale_items(product)).invoice_number == 'INV-000042'
+
+
+def test_advance_to_skips_numbers_written_outside_the_sequence(session, product):
+    SaleService.create_sale(session, sale_items(product))
+    insert_sale(session, 'INV-000002')
+    InvoiceSequenceService.advance_to(session, 'INV', 2)
+    session.commit()
+
+    assert SaleService.create_sale(session, sale_items(product)).invoice_number == 'INV-000003'
+
+
+def test_advance_to_never_moves_back(session, product):
+    for _ in range(5):
+        SaleService.create_sale(session, sale_items(product))
+    InvoiceSequenceService.advance_to(session, 'INV', 2)
+    session.commit()
+
+    assert session.query(InvoiceSequence.last_value).filter_by(prefix='INV').scalar() == 5
+
+
+def test_parse_value():
+    assert InvoiceSequenceService.parse_value('INV', 'INV-000123') == 123
+    assert InvoiceSequenceService.parse_value('INV', 'INV-T2-000123') is None
+    assert InvoiceSequenceService.parse_value('INV-T2', 'INV-T2-000123') == 123
+    assert InvoiceSequenceService.parse_value('INV', 'INV-20250101123456') is None  # Esquema anterior
+    assert InvoiceSequenceService.parse_value('INV', 'IMP-000001') is None
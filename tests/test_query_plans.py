@@ -0,0 +1,45 @@
+"""
+Regresión de planes de consulta: las consultas de reportes e historiales
+deben usar índices (EXPLAIN QUERY PLAN sin SCAN completo de tablas grandes)
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from config.migrations import migrate
+from services.sales_rollup_service import SalesRollupService
+from benchmarks.query_plans import report_queries, explain, full_scans
+from benchmarks.export_memory import seed
+
+QUERY_NAMES = list(report_queries(Session()))
+
+
+@pytest.fixture(scope='module')
+def seeded_engine():
+    """Base en memoria con historial de ventas, su resumen diario y estadísticas (ANALYZE)"""
+    engine = create_engine('sqlite://', poolclass=StaticPool)
+    migrate(engine)
+    seed(engine, 2000)
+    session = sessionmaker(bind=engine)()
+    try:
+        SalesRollupService.rebuild(session)
+        session.commit()
+    finally:
+        session.close()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def queries(seeded_engine):
+    session = sessionmaker(bind=seeded_engine)()
+    yield report_queries(session)
+    session.close()
+
+
+@pytest.mark.parametrize('name', QUERY_NAMES)
+def test_query_uses_indexes(seeded_engine, queries, name):
+    plan = explain(seeded_engine, queries[name].statement)
+    assert not full_scans(plan), f"{name} recorre una tabla completa: {plan}"
@@ -0,0 +1,92 @@
+"""
+Pruebas de SaleService: stock, movimientos y errores de venta, edición y cancelación
+"""
+import pytest
+from sqlalchemy.exc import IntegrityError
+from models import Sale, SaleItem, InventoryMovement, RawMaterialMovement, PaymentMethod, SaleStatus
+from services import SaleService, SaleServiceError
+from tests.conftest import sale_items
+
+
+def stock(session, *records):
+    """Stock actual en la base (no el de la copia en la sesión)"""
+    session.expire_all()
+    return [record.stock for record in records]
+
+
+def test_create_discounts_product_and_materials(session, recipe_product):
+    product, corn, salt = recipe_product
+    result = SaleService.create_sale(session, sale_items(product, 3), payment_method=PaymentMethod.CASH)
+
+    assert stock(session, product, corn, salt) == [47, 94, 98.5]
+    assert result.total == 9000 and result.items_count == 1
+    movement = session.query(InventoryMovement).filter_by(product_id=product.id).one()
+    assert (movement.reference, movement.quantity, movement.new_stock) == (f"SALE-{result.sale_id}", -3, 47)
+    assert session.query(RawMaterialMovement).filter_by(reference=result.invoice_number).count() == 2
+
+
+def test_edit_returns_old_items_and_discounts_new(session, recipe_product, product):
+    recipe, corn, salt = recipe_product
+    sale_id = SaleService.create_sale(session, sale_items(recipe, 3), payment_method=PaymentMethod.CARD).sale_id
+
+    SaleService.edit_sale(session, sale_id, sale_items(recipe, 1) + sale_items(product, 2))
+
+    assert stock(session, recipe, product, corn, salt) == [49, 998, 98, 99.5]
+    sale = session.get(Sale, sale_id)
+    assert sale.status == SaleStatus.EDITED
+    assert sale.payment_method == PaymentMethod.CARD  # Sin payment_method se conserva
+    assert sale.total == 3000 + 2000
+    assert session.query(SaleItem).filter_by(sale_id=sale_id).count() == 2
+
+
+def test_edit_with_insufficient_stock_changes_nothing(session, recipe_product):
+    product, corn, salt = recipe_product
+    sale_id = SaleService.create_sale(session, sale_items(product, 3)).sale_id
+
+    with pytest.raises(SaleServiceError, match="Stock insuficiente"):
+        SaleService.edit_sale(session, sale_id, sale_items(product, 54))  # 50 - 3 + 3 = 50 disponibles
+
+    assert stock(session, product, corn, salt) == [47, 94, 98.5]
+    assert session.get(Sale, sale_id).status == SaleStatus.COMPLETED
+    assert session.query(SaleItem).filter_by(sale_id=sale_id).one().quantity == 3
+
+
+def test_cancel_returns_stock_and_voids_sale_movements(session, recipe_product):
+    product, corn, salt = recipe_product
+    sale_id = SaleService.create_sale(session, sale_items(product, 3)).sale_id
+
+    SaleService.cancel_sale(session, sale_id)
+
+    assert stock(session, product, corn, salt) == [50, 100, 100]
+    assert session.get(Sale, sale_id).status == SaleStatus.CANCELLED
+    sale_movement = session.query(InventoryMovement).filter_by(reference=f"SALE-{sale_id}").one()
+    assert sale_movement.note.startswith("[ANULADO]")
+    returned = session.query(InventoryMovement).filter_by(reference=f"CANCELLED-SALE-{sale_id}").one()
+    assert (returned.quantity, returned.new_stock) == (3, 50)
+
+
+def test_second_cancel_fails(session, recipe_product):
+    product, corn, salt = recipe_product
+    sale_id = SaleService.create_sale(session, sale_items(product, 3)).sale_id
+    SaleService.cancel_sale(session, sale_id)
+
+    with pytest.raises(SaleServiceError, match="ya está cancelada"):
+        SaleService.cancel_sale(session, sale_id)
+
+    assert stock(session, product, corn, salt) == [50, 100, 100]
+
+
+def test_failed_bulk_write_rolls_back_stock(session, recipe_product, monkeypatch):
+    product, corn, salt = recipe_product
+
+    def failing_write(session, item_rows, movement_rows, material_rows):
+        session.bulk_insert_mappings(SaleItem, [dict(item_rows[0], product_id=None)])  # NOT NULL
+        session.flush()
+
+    monkeypatch.setattr(SaleService, '_bulk_write', staticmethod(failing_write))
+    with pytest.raises(IntegrityError):
+        SaleService.create_sale(session, sale_items(product, 3))
+
+    assert stock(session, product, corn, salt) == [50, 100, 100]
+    assert session.query(Sale).count() == 0
+    assert session.query(InventoryMovement).count() == 0
@@ -0,0 +1,61 @@
+"""
+Pruebas del resumen diario de ventas: las actualizaciones incrementales de
+SaleService deben dejar las mismas filas que SalesRollupService.rebuild()
+"""
+from models import Customer, DailySalesRollup
+from services import SaleService, SalesRollupService
+from tests.conftest import sale_items
+
+
+def rollup_rows(session):
+    """Filas del resumen como conjunto de (kind, day, ref_id, quantity, revenue, sales_count)"""
+    return {
+        (row.kind, row.day, row.ref_id, round(row.quantity, 6), round(row.revenue, 6), row.sales_count)
+        for row in session.query(DailySalesRollup)
+    }
+
+
+def rebuilt_rows(session):
+    """Filas que produce rebuild() sobre las mismas ventas (sin confirmar)"""
+    SalesRollupService.rebuild(session)
+    rows = rollup_rows(session)
+    session.rollback()
+    return rows
+
+
+def assert_matches_rebuild(session):
+    incremental = rollup_rows(session)
+    assert incremental == rebuilt_rows(session)
+    assert all(sales_count > 0 for *_, sales_count in incremental)
+    return incremental
+
+
+def test_incremental_rollup_matches_rebuild(session, recipe_product, product):
+    recipe, _, _ = recipe_product
+    first, second = Customer(name="Ana"), Customer(name="Luis")
+    session.add_all([first, second])
+    session.commit()
+
+    sale_a = SaleService.create_sale(
+        session, sale_items(recipe, 3) + sale_items(product, 1), customer_id=first.id
+    ).sale_id
+    sale_b = SaleService.create_sale(session, sale_items(product, 2)).sale_id
+    rows = assert_matches_rebuild(session)
+    assert {(kind, ref_id) for kind, _, ref_id, *_ in rows} == {
+        (DailySalesRollup.TOTAL, 0), (DailySalesRollup.CUSTOMER, first.id),
+        (DailySalesRollup.PRODUCT, recipe.id), (DailySalesRollup.PRODUCT, product.id),
+    }
+
+    # La venta A pasa a otro cliente y deja de incluir la receta: sus filas quedan en 0 y se borran
+    SaleService.edit_sale(session, sale_a, sale_items(product, 4), customer_id=second.id)
+    rows = assert_matches_rebuild(session)
+    keys = {(kind, ref_id) for kind, _, ref_id, *_ in rows}
+    assert (DailySalesRollup.CUSTOMER, first.id) not in keys
+    assert (DailySalesRollup.PRODUCT, recipe.id) not in keys
+    assert (DailySalesRollup.CUSTOMER, second.id) in keys
+
+    SaleService.cancel_sale(session, sale_b)
+    assert_matches_rebuild(session)
+
+    SaleService.cancel_sale(session, sale_a)
+    assert assert_matches_rebuild(session) == set()
@@ -0,0 +1,118 @@
+"""
+Pruebas de la búsqueda de texto (SearchIndex): consultas FTS5 y triggers
+que mantienen los índices al día
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from models import Category, Product, Customer
+from database.search_index import SearchIndex
+
+
+@pytest.fixture
+def catalogue(session):
+    if not SearchIndex.available(session):
+        pytest.skip("SQLite sin FTS5")
+    drinks = Category(name="Bebidas")
+    products = {
+        sku: Product(name=name, sku=sku, category=category, stock=10, sale_price=1000)
+        for sku, name, category in (
+            ('PROD-0012', "Café con leche", drinks),
+            ('PROD-0015', "Té helado", drinks),
+            ('PROD-1001', "Crispetas de caramelo", None),
+        )
+    }
+    customers = [
+        Customer(name="José Pérez", document_number="10203040", email="jose@correo.com"),
+        Customer(name="María Gómez", document_number="50607080", phone="3001234567"),
+    ]
+    session.add_all(list(products.values()) + customers)
+    session.commit()
+    return products, customers, drinks
+
+
+def skus(session, search):
+    ids = SearchIndex.search_products(session, search)
+    return [session.get(Product, product_id).sku for product_id in ids]
+
+
+def test_prefix_search_ignores_case_and_accents(session, catalogue):
+    assert skus(session, 'cafe') == ['PROD-0012']
+    assert skus(session, 'CAFÉ LEC') == ['PROD-0012']
+    assert skus(session, 'te hel') == ['PROD-0015']
+    assert session.get(Customer, SearchIndex.search_customers(session, 'jose per')[0]).name == "José Pérez"
+
+
+def test_sku_phrase_search(session, catalogue):
+    assert sorted(skus(session, 'PROD-001')) == ['PROD-0012', 'PROD-0015']
+    assert skus(session, 'PROD-1001') == ['PROD-1001']
+    assert skus(session, '0015') == ['PROD-0015']
+
+
+def test_filters_keep_listing_queries(session, catalogue):
+    query = session.query(Product.sku).filter(SearchIndex.product_filter(session, 'bebidas'))
+    assert sorted(sku for (sku,) in query) == ['PROD-0012', 'PROD-0015']
+    query = session.query(Customer.name).filter(SearchIndex.customer_filter(session, '300123'))
+    assert [name for (name,) in query] == ["María Gómez"]
+
+
+def test_category_rename_and_delete_update_products(session, catalogue):
+    _, _, drinks = catalogue
+    drinks.name = "Refrescos"
+    session.commit()
+    assert skus(session, 'bebidas') == []
+    assert sorted(skus(session, 'refres')) == ['PROD-0012', 'PROD-0015']
+
+    # Borrado directo (sin la cascada del ORM): lo cubre el trigger de categorías
+    session.query(Category).filter(Category.id == drinks.id).delete(synchronize_session=False)
+    session.commit()
+    assert skus(session, 'refres') == []
+    assert skus(session, 'cafe') == ['PROD-0012']
+
+
+def test_product_edit_and_delete(session, catalogue):
+    products, _, _ = catalogue
+    products['PROD-1001'].name = "Maní salado"
+    session.commit()
+    assert skus(session, 'crisp') == []
+    assert skus(session, 'mani') == ['PROD-1001']
+
+    session.delete(products['PROD-1001'])
+    session.commit()
+    assert skus(session, 'mani') == []
+
+
+def test_customer_delete(session, catalogue):
+    _, customers, _ = catalogue
+    session.delete(customers[0])
+    session.commit()
+    assert SearchIndex.search_customers(session, '10203040') == []
+    assert len(SearchIndex.search_customers(session, '50607080')) == 1
+
+
+@pytest.mark.parametrize('search', ['', '   ', '--', '¡!?', None])
+def test_input_without_words(session, catalogue, search):
+    assert SearchIndex.match_query(search) is None
+    assert SearchIndex.search_products(session, search) == []
+    if search is not None:
+        assert session.query(Product).filter(SearchIndex.product_filter(session, search)).count() == 0
+
+
+def test_match_query():
+    assert SearchIndex.match_query('crisp PROD-0012') == '"crisp"* AND "PROD 0012"*'
+    assert SearchIndex.match_query('  "café"  ') == '"café"*'  # Las comillas no llegan a la consulta
+
+
+def test_availability_is_per_database(session, catalogue, tmp_path):
+    plain = create_engine(f"sqlite:///{tmp_path / 'sin_fts.db'}")
+    Product.__table__.create(bind=plain)
+    other = sessionmaker(bind=plain)()
+    try:
+        assert SearchIndex.available(session)
+        assert not SearchIndex.available(other)  # Usa LIKE en la base sin tablas FTS
+        other.add(Product(name="Café", sku="X-1", stock=0, sale_price=0))
+        other.commit()
+        assert len(SearchIndex.search_products(other, 'caf')) == 1
+    finally:
+        other.close()
+        plain.dispose()
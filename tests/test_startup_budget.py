@@ -0,0 +1,25 @@
+"""
+Presupuesto de tiempo del inicio contra una base de datos grande
+Inicia main.py (Qt sin pantalla) y falla si la primera pintura supera
+DEFAULT_BUDGET_MS (INVENTORY_STARTUP_BUDGET_MS)
+"""
+import pytest
+from utils.startup_tracer import DEFAULT_BUDGET_MS
+from benchmarks.startup_budget import build_fixture, run_startup
+
+pytest.importorskip('PyQt6')
+
+FIXTURE_SALES = 20000
+
+
+@pytest.mark.slow
+def test_startup_within_budget(tmp_path):
+    db_path = str(tmp_path / 'inventory.db')
+    build_fixture(db_path, FIXTURE_SALES)
+
+    returncode, report, output = run_startup(db_path, DEFAULT_BUDGET_MS, timeout=120)
+
+    assert returncode == 0 and report is not None, f"La aplicación no terminó el inicio:\n{output[-2000:]}"
+    assert not report['over_budget'], (
+        f"Inicio de {report['total_ms']:.0f} ms, presupuesto {DEFAULT_BUDGET_MS} ms"
+    )
@@ -0,0 +1,23 @@
+"""
+Pruebas del listado de imágenes sueltas de ThumbnailCache
+"""
+import os
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip('PyQt6')
+
+from ui.widgets import thumbnail_cache
+from ui.widgets.thumbnail_cache import ThumbnailCache
+
+
+def test_image_added_while_running_is_found(tmp_path, monkeypatch):
+    monkeypatch.setattr(thumbnail_cache, 'IMAGES_DIR', str(tmp_path))
+    monkeypatch.setattr(ThumbnailCache, '_legacy_names', None)
+    product = SimpleNamespace(image_path=None, sku='PROD-000001', name='Crispetas')
+    assert ThumbnailCache.sources_for(product) == []
+
+    (tmp_path / 'PROD-000001.png').write_bytes(b'')
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 1))  # Por si el sistema de archivos tiene poca resolución
+
+    assert ThumbnailCache.sources_for(product) == [str(tmp_path / 'PROD-000001.png')]
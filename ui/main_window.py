@@ -1,28 +1,45 @@
 """
 Ventana principal de la aplicación
+Las vistas se crean (y sus módulos se importan) al navegar a ellas por
+primera vez; al iniciar solo se construye la barra lateral y el dashboard
+se crea en la primera vuelta del ciclo de eventos, con la ventana ya pintada.
 """
+import importlib
+import time
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, 
     QPushButton, QLabel, QStackedWidget, QFrame, QDialog
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
 from ui.styles import MAIN_STYLESHEET
-from ui.views.dashboard_view import DashboardView
-from ui.views.products_view import ProductsView
-from ui.views.raw_materials_view import RawMaterialsView
-from ui.views.inventory_view import InventoryView
-from ui.views.sales_view import SalesView
-from ui.views.customers_view import CustomersView
-from ui.views.expenses_view import ExpensesView
-from ui.views.reports_view import ReportsView
+from utils.startup_tracer import StartupTracer
 
 class MainWindow(QMainWindow):
     """
     Ventana principal con sidebar y vistas intercambiables
     """
+    
+    # Registro de vistas: nombre -> (módulo, clase). La vista queda en self.<nombre>_view
+    VIEWS = {
+        'dashboard': ('ui.views.dashboard_view', 'DashboardView'),
+        'products': ('ui.views.products_view', 'ProductsView'),
+        'raw_materials': ('ui.views.raw_materials_view', 'RawMaterialsView'),
+        'inventory': ('ui.views.inventory_view', 'InventoryView'),
+        'sales': ('ui.views.sales_view', 'SalesView'),
+        'expenses': ('ui.views.expenses_view', 'ExpensesView'),
+        'customers': ('ui.views.customers_view', 'CustomersView'),
+        'reports': ('ui.views.reports_view', 'ReportsView'),
+    }
+    
+    # Vistas que reciben la ventana como padre
+    PARENTED_VIEWS = ('inventory',)
+    
     def __init__(self):
         super().__init__()
+        self.view_times = {}  # nombre -> segundos que tomó importar y crear la vista
+        for name in self.VIEWS:
+            setattr(self, f"{name}_view", None)
         self.init_ui()
         
     def init_ui(self):
@@ -50,8 +67,9 @@ class MainWindow(QMainWindow):
         self.create_content_area()
         main_layout.addWidget(self.content_area)
         
-        # Mostrar dashboard por defecto
-        self.show_dashboard()
+        # Mostrar dashboard por defecto (se crea con la ventana ya pintada)
+        self.btn_dashboard.setChecked(True)
+        QTimer.singleShot(0, self.show_dashboard)
     
     def create_sidebar(self):
         """Crea la barra lateral de navegación"""
@@ -135,32 +153,33 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout(self.content_area)
         layout.setContentsMargins(0, 0, 0, 0)
         
-        # Stacked widget para cambiar entre vistas
+        # Stacked widget para cambiar entre vistas (se llena al navegar)
         self.stacked_widget = QStackedWidget()
         
-        # Crear vistas
-        self.dashboard_view = DashboardView()
-        self.products_view = ProductsView()
-        self.raw_materials_view = RawMaterialsView()
-        # InventoryView se crea lazy para permitir autenticación
-        self.inventory_view = None
-        self.sales_view = SalesView()
-        self.expenses_view = ExpensesView()
-        self.customers_view = CustomersView()
-        self.reports_view = ReportsView()
-        
-        # Agregar vistas al stack (inventario se agrega dinámicamente)
-        self.stacked_widget.addWidget(self.dashboard_view)
-        self.stacked_widget.addWidget(self.products_view)
-        self.stacked_widget.addWidget(self.raw_materials_view)
-        # self.inventory_view se agregará después de la autenticación
-        self.stacked_widget.addWidget(self.sales_view)
-        self.stacked_widget.addWidget(self.expenses_view)
-        self.stacked_widget.addWidget(self.customers_view)
-        self.stacked_widget.addWidget(self.reports_view)
-        
         layout.addWidget(self.stacked_widget)
     
+    def get_view(self, name):
+        """Vista registrada; la primera vez importa su módulo y la crea"""
+        view = getattr(self, f"{name}_view")
+        if view is None:
+            started = time.perf_counter()
+            module_name, class_name = self.VIEWS[name]
+            with StartupTracer.phase(f"vista {name}"):
+                view_class = getattr(importlib.import_module(module_name), class_name)
+                view = view_class(self) if name in self.PARENTED_VIEWS else view_class()
+            setattr(self, f"{name}_view", view)
+            self.stacked_widget.addWidget(view)
+            self.view_times[name] = time.perf_counter() - started
+            print(f"Vista '{name}' creada en {self.view_times[name] * 1000:.0f} ms")
+        return view
+    
+    def show_view(self, name):
+        """Marca el botón de la vista y la muestra (creándola si hace falta)"""
+        view = self.get_view(name)
+        self.uncheck_all_buttons()
+        getattr(self, f"btn_{name}").setChecked(True)
+        self.stacked_widget.setCurrentWidget(view)
+    
     def uncheck_all_buttons(self):
         """Desmarca todos los botones de navegación"""
         self.btn_dashboard.setChecked(False)
@@ -174,38 +193,23 @@ class MainWindow(QMainWindow):
     
     def show_dashboard(self):
         """Muestra el dashboard"""
-        self.uncheck_all_buttons()
-        self.btn_dashboard.setChecked(True)
-        self.stacked_widget.setCurrentWidget(self.dashboard_view)
+        self.show_view('dashboard')
     
     def show_products(self):
         """Muestra la vista de productos"""
-        self.uncheck_all_buttons()
-        self.btn_products.setChecked(True)
-        self.stacked_widget.setCurrentWidget(self.products_view)
+        self.show_view('products')
     
     def show_raw_materials(self):
         """Muestra la vista de materias primas"""
         if not self._ensure_inventory_auth():
             return
-        self.uncheck_all_buttons()
-        self.btn_raw_materials.setChecked(True)
-        self.stacked_widget.setCurrentWidget(self.raw_materials_view)
+        self.show_view('raw_materials')
     
     def show_inventory(self):
         """Muestra la vista de inventario"""
         if not self._ensure_inventory_auth():
             return
-        # Crear vista de inventario si no existe
-        if self.inventory_view is None:
-            from ui.views.inventory_view import InventoryView
-            self.inventory_view = InventoryView(self)
-            # Insertar en la posición correcta (después de raw_materials, index 2)
-            self.stacked_widget.insertWidget(3, self.inventory_view)
-        
-        self.uncheck_all_buttons()
-        self.btn_inventory.setChecked(True)
-        self.stacked_widget.setCurrentWidget(self.inventory_view)
+        self.show_view('inventory')
 
     def _ensure_inventory_auth(self):
         """Solicita autenticación si la sección de inventario está protegida."""
@@ -232,24 +236,16 @@ class MainWindow(QMainWindow):
     
     def show_sales(self):
         """Muestra la vista de ventas"""
-        self.uncheck_all_buttons()
-        self.btn_sales.setChecked(True)
-        self.stacked_widget.setCurrentWidget(self.sales_view)
+        self.show_view('sales')
     
     def show_expenses(self):
         """Muestra la vista de egresos"""
-        self.uncheck_all_buttons()
-        self.btn_expenses.setChecked(True)
-        self.stacked_widget.setCurrentWidget(self.expenses_view)
+        self.show_view('expenses')
     
     def show_customers(self):
         """Muestra la vista de clientes"""
-        self.uncheck_all_buttons()
-        self.btn_customers.setChecked(True)
-        self.stacked_widget.setCurrentWidget(self.customers_view)
+        self.show_view('customers')
     
     def show_reports(self):
         """Muestra la vista de reportes"""
-        self.uncheck_all_buttons()
-        self.btn_reports.setChecked(True)
-        self.stacked_widget.setCurrentWidget(self.reports_view)
\ No newline at end of file
+        self.show_view('reports')
@@ -6,12 +6,18 @@ from PyQt6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QLineEdit, QMessageBox,
     QDialog, QFormLayout, QComboBox, QTextEdit, QHeaderView, QFileDialog
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QShowEvent
 from config.database import get_session, close_session
+from database.customer_repository import CustomerRepository
+from ui.widgets.paged_table import PagedTableLoader
+from ui.widgets.view_refresher import ViewRefresher
+from ui.widgets.export_runner import get_export_path, run_export
+from ui.widgets.task_runner import run_task
+from services.export_service import ExportService
+from services.import_service import ImportService
+from core.events import EventBus, CustomerUpdated
 from models import Customer
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment
 from datetime import datetime
 import traceback
 
@@ -111,7 +117,7 @@ class CustomersView(QWidget):
         search_layout = QHBoxLayout()
         
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Buscar por nombre, email o documento...")
+        self.search_input.setPlaceholderText("Buscar por nombre, documento, email o teléfono...")
         self.search_input.textChanged.connect(self.search_customers)
         self.search_input.setFixedHeight(40)
         self.search_input.setStyleSheet("color: #0f172a;")
@@ -152,119 +158,125 @@ class CustomersView(QWidget):
         self.table.horizontalHeader().setStretchLastSection(False)
         
         layout.addWidget(self.table)
+        
+        # Carga por páginas: solo se traen las filas que se van a ver
+        self.loader = PagedTableLoader(
+            self.table, CustomerRepository, self.fill_customer_row,
+            row_height=50,
+            on_error=self.show_load_error
+        )
+        
+        # Buscar en la base de datos cuando el usuario deja de escribir
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.load_customers)
+        
+        # Refresco incremental: solo las filas de los clientes que cambiaron
+        self.refresher = ViewRefresher(self, self.load_customers, self.loader.refresh_rows)
+        self.refresher.subscribe(CustomerUpdated, self.on_customers_updated)
     
     def showEvent(self, event: QShowEvent):
         """Se ejecuta cuando la vista se muestra"""
         super().showEvent(event)
-        self.load_customers()
+        # Solo aplica los cambios publicados mientras la vista estaba oculta
+        self.refresher.on_show()
     
     def load_customers(self):
-        """Carga todos los clientes en la tabla"""
-        session = get_session()
-        try:
-            customers = session.query(Customer).all()
-            
-            self.table.setRowCount(len(customers))
-            
-            for row, customer in enumerate(customers):
-                # ID
-                self.table.setItem(row, 0, QTableWidgetItem(str(customer.id)))
-                
-                # Nombre
-                self.table.setItem(row, 1, QTableWidgetItem(customer.name))
-                
-                # Email
-                email = customer.email or "-"
-                self.table.setItem(row, 2, QTableWidgetItem(email))
-                
-                # Teléfono
-                phone = customer.phone or "-"
-                self.table.setItem(row, 3, QTableWidgetItem(phone))
-                
-                # Documento
-                document = customer.document_number or "-"
-                self.table.setItem(row, 4, QTableWidgetItem(document))
-                
-                # Botones de acción
-                actions_widget = QWidget()
-                actions_layout = QHBoxLayout(actions_widget)
-                actions_layout.setContentsMargins(8, 5, 8, 5)
-                actions_layout.setSpacing(8)
-                
-                btn_edit = QPushButton("Editar")
-                btn_edit.setMinimumWidth(80)
-                btn_edit.setFixedHeight(32)
-                btn_edit.setStyleSheet("""
-                    QPushButton {
-                        background-color: #2563eb;
-                        color: white;
-                        border: none;
-                        border-radius: 4px;
-                        font-size: 12px;
-                        font-weight: 500;
-                        padding: 4px 8px;
-                    }
-                    QPushButton:hover {
-                        background-color: #1d4ed8;
-                    }
-                """)
-                btn_edit.clicked.connect(lambda checked, c=customer: self.edit_customer(c))
-                
-                btn_delete = QPushButton("Eliminar")
-                btn_delete.setMinimumWidth(80)
-                btn_delete.setFixedHeight(32)
-                btn_delete.setStyleSheet("""
-                    QPushButton {
-                        background-color: #ef4444;
-                        color: white;
-                        border: none;
-                        border-radius: 4px;
-                        font-size: 12px;
-                        font-weight: 500;
-                        padding: 4px 8px;
-                    }
-                    QPushButton:hover {
-                        background-color: #dc2626;
-                    }
-                """)
-                btn_delete.clicked.connect(lambda checked, c=customer: self.delete_customer(c))
-                
-                actions_layout.addWidget(btn_edit)
-                actions_layout.addWidget(btn_delete)
-                
-                self.table.setCellWidget(row, 5, actions_widget)
-                self.table.setRowHeight(row, 50)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al cargar clientes: {str(e)}")
-        finally:
-            close_session()
+        """Carga la primera página de clientes según la búsqueda actual"""
+        self.loader.reload({'search': self.search_input.text()})
+    
+    def fill_customer_row(self, row, customer):
+        """Pinta un cliente en una fila de la tabla"""
+        # ID
+        self.table.setItem(row, 0, QTableWidgetItem(str(customer.id)))
+        
+        # Nombre
+        self.table.setItem(row, 1, QTableWidgetItem(customer.name))
+        
+        # Email
+        email = customer.email or "-"
+        self.table.setItem(row, 2, QTableWidgetItem(email))
+        
+        # Teléfono
+        phone = customer.phone or "-"
+        self.table.setItem(row, 3, QTableWidgetItem(phone))
+        
+        # Documento
+        document = customer.document_number or "-"
+        self.table.setItem(row, 4, QTableWidgetItem(document))
+        
+        # Botones de acción
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(8, 5, 8, 5)
+        actions_layout.setSpacing(8)
+        
+        btn_edit = QPushButton("Editar")
+        btn_edit.setMinimumWidth(80)
+        btn_edit.setFixedHeight(32)
+        btn_edit.setStyleSheet("""
+            QPushButton {
+                background-color: #2563eb;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                font-size: 12px;
+                font-weight: 500;
+                padding: 4px 8px;
+            }
+            QPushButton:hover {
+                background-color: #1d4ed8;
+            }
+        """)
+        btn_edit.clicked.connect(lambda checked, c=customer: self.edit_customer(c))
+        
+        btn_delete = QPushButton("Eliminar")
+        btn_delete.setMinimumWidth(80)
+        btn_delete.setFixedHeight(32)
+        btn_delete.setStyleSheet("""
+            QPushButton {
+                background-color: #ef4444;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                font-size: 12px;
+                font-weight: 500;
+                padding: 4px 8px;
+            }
+            QPushButton:hover {
+                background-color: #dc2626;
+            }
+        """)
+        btn_delete.clicked.connect(lambda checked, c=customer: self.delete_customer(c))
+        
+        actions_layout.addWidget(btn_edit)
+        actions_layout.addWidget(btn_delete)
+        
+        self.table.setCellWidget(row, 5, actions_widget)
+    
+    def show_load_error(self, error):
+        QMessageBox.critical(self, "Error", f"Error al cargar clientes: {str(error)}")
+    
+    def on_customers_updated(self, event):
+        if event.created:
+            self.refresher.invalidate()  # El nuevo cliente puede ir en cualquier posición
+        else:
+            self.refresher.patch(event.customer_ids)
     
     def search_customers(self, text):
-        """Busca clientes por nombre, email o documento"""
-        for row in range(self.table.rowCount()):
-            name = self.table.item(row, 1).text().lower()
-            email = self.table.item(row, 2).text().lower()
-            document = self.table.item(row, 4).text().lower()
-            
-            if (text.lower() in name or 
-                text.lower() in email or 
-                text.lower() in document):
-                self.table.setRowHidden(row, False)
-            else:
-                self.table.setRowHidden(row, True)
+        """Busca clientes por nombre, documento, email o teléfono (índice de búsqueda, con espera entre teclas)"""
+        self.search_timer.start()
     
     def add_customer(self):
         """Abre diálogo para agregar cliente"""
         dialog = CustomerDialog(self)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_customers()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def edit_customer(self, customer):
         """Abre diálogo para editar cliente"""
         dialog = CustomerDialog(self, customer)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_customers()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def delete_customer(self, customer):
         """Elimina un cliente"""
@@ -296,10 +308,11 @@ class CustomersView(QWidget):
                 if reply == QMessageBox.StandardButton.No:
                     return
             
+            customer_id = customer.id
             session.delete(customer)
             session.commit()
+            EventBus.publish(CustomerUpdated([customer_id], deleted=True))
             QMessageBox.information(self, "Éxito", "Cliente eliminado correctamente")
-            self.load_customers()
             
         except Exception as e:
             session.rollback()
@@ -308,78 +321,31 @@ class CustomersView(QWidget):
             close_session()
     
     def export_to_excel(self):
-        """Exporta todos los clientes a un archivo Excel"""
+        """Exporta todos los clientes a Excel (o CSV) en segundo plano"""
+        file_path = get_export_path(
+            self,
+            "Guardar Clientes como Excel",
+            f"Clientes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        )
+        
+        if not file_path:
+            return
+        
+        session = get_session()
         try:
-            # Seleccionar ubicación del archivo
-            file_path, _ = QFileDialog.getSaveFileName(
-                self,
-                "Guardar Clientes como Excel",
-                f"Clientes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                "Excel Files (*.xlsx)"
-            )
-            
-            if not file_path:
-                return
-            
-            session = get_session()
-            try:
-                # Obtener todos los clientes
-                customers = session.query(Customer).order_by(Customer.name).all()
-                
-                if not customers:
-                    QMessageBox.warning(self, "Advertencia", "No hay clientes para exportar")
-                    return
-                
-                # Crear libro de Excel
-                wb = Workbook()
-                ws = wb.active
-                ws.title = "Clientes"
-                
-                # Encabezados con estilo
-                headers = ["ID", "Nombre", "Email", "Teléfono", "Dirección", "Tipo Doc.", "Número Doc.", "Fecha Registro"]
-                for col, header in enumerate(headers, 1):
-                    cell = ws.cell(row=1, column=col, value=header)
-                    cell.font = Font(bold=True, color="FFFFFF")
-                    cell.fill = PatternFill(start_color="2563eb", end_color="2563eb", fill_type="solid")
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                # Datos
-                for row, customer in enumerate(customers, 2):
-                    ws.cell(row=row, column=1, value=customer.id)
-                    ws.cell(row=row, column=2, value=customer.name)
-                    ws.cell(row=row, column=3, value=customer.email or "")
-                    ws.cell(row=row, column=4, value=customer.phone or "")
-                    ws.cell(row=row, column=5, value=customer.address or "")
-                    ws.cell(row=row, column=6, value=customer.document_type or "")
-                    ws.cell(row=row, column=7, value=customer.document_number or "")
-                    ws.cell(row=row, column=8, value=customer.created_at.strftime("%d/%m/%Y %H:%M") if customer.created_at else "")
-                
-                # Ajustar anchos de columna
-                ws.column_dimensions['A'].width = 8
-                ws.column_dimensions['B'].width = 30
-                ws.column_dimensions['C'].width = 30
-                ws.column_dimensions['D'].width = 15
-                ws.column_dimensions['E'].width = 40
-                ws.column_dimensions['F'].width = 12
-                ws.column_dimensions['G'].width = 15
-                ws.column_dimensions['H'].width = 18
-                
-                # Guardar archivo
-                wb.save(file_path)
-                
-                QMessageBox.information(
-                    self,
-                    "Éxito",
-                    f"Clientes exportados correctamente\n\nArchivo: {file_path}\nTotal clientes: {len(customers)}"
-                )
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al exportar: {str(e)}\n\n{traceback.format_exc()}")
-            finally:
-                close_session()
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error: {str(e)}")
+            has_customers = session.query(Customer.id).first() is not None
+        finally:
+            close_session()
+        
+        if not has_customers:
+            QMessageBox.warning(self, "Advertencia", "No hay clientes para exportar")
+            return
+        
+        sheet = ExportService.customers_sheet()
+        run_export(
+            self, file_path, [sheet],
+            lambda counts: f"Clientes exportados correctamente\n\nArchivo: {file_path}\nTotal clientes: {counts[sheet.title]}"
+        )
     
     def import_from_excel(self):
         """Importa clientes desde un archivo Excel"""
@@ -418,167 +384,45 @@ class CustomersView(QWidget):
             if msg.exec() != QMessageBox.StandardButton.Yes:
                 return
             
-            session = get_session()
-            try:
-                # Cargar archivo Excel
-                wb = load_workbook(file_path)
-                ws = wb.active
-                
-                # Validar encabezados para asegurarse de que es un archivo de clientes
-                headers = [cell.value for cell in ws[1]]
-                
-                # Verificar que tenga encabezados relacionados con clientes
-                expected_headers_keywords = ['nombre', 'email', 'telefono', 'teléfono', 'direccion', 'dirección', 'documento']
-                has_valid_headers = any(
-                    any(keyword in str(header).lower() for keyword in expected_headers_keywords)
-                    for header in headers if header
-                )
-                
-                # Verificar que NO tenga encabezados de ventas
-                invalid_headers_keywords = ['factura', 'venta', 'método pago', 'metodo pago', 'subtotal', 'impuesto', 'descuento']
-                has_invalid_headers = any(
-                    any(keyword in str(header).lower() for keyword in invalid_headers_keywords)
-                    for header in headers if header
+            # Validar encabezados para asegurarse de que es un archivo de clientes
+            headers = ImportService.read_headers(file_path)
+            if not ImportService.headers_match(
+                headers, ImportService.CUSTOMERS_HEADER_KEYWORDS, ImportService.CUSTOMERS_INVALID_HEADER_KEYWORDS
+            ):
+                QMessageBox.critical(
+                    self,
+                    "Formato Incorrecto",
+                    "El archivo Excel no tiene el formato correcto para importar clientes.\n\n"
+                    "Parece ser un archivo de ventas u otro tipo de datos.\n\n"
+                    "Por favor, seleccione un archivo Excel con el formato de clientes:\n"
+                    "• Nombre\n"
+                    "• Email\n"
+                    "• Teléfono\n"
+                    "• Dirección\n"
+                    "• Tipo Documento\n"
+                    "• Número Documento"
                 )
-                
-                if has_invalid_headers or not has_valid_headers:
-                    QMessageBox.critical(
-                        self,
-                        "Formato Incorrecto",
-                        "El archivo Excel no tiene el formato correcto para importar clientes.\n\n"
-                        "Parece ser un archivo de ventas u otro tipo de datos.\n\n"
-                        "Por favor, seleccione un archivo Excel con el formato de clientes:\n"
-                        "• Nombre\n"
-                        "• Email\n"
-                        "• Teléfono\n"
-                        "• Dirección\n"
-                        "• Tipo Documento\n"
-                        "• Número Documento"
-                    )
-                    return
-                
-                imported_count = 0
-                errors = []
-                
-                # Leer datos (empezando desde la fila 2, asumiendo que la 1 son encabezados)
-                for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
-                    try:
-                        # Verificar que la fila no esté vacía
-                        if not row or not row[0]:
-                            continue
-                        
-                        # Detectar si la primera columna es ID numérico
-                        if isinstance(row[0], int):
-                            # El formato tiene ID en la primera columna (generado por exportación)
-                            name = str(row[1]).strip() if len(row) > 1 and row[1] else ""
-                            email = str(row[2]).strip() if len(row) > 2 and row[2] else None
-                            phone = str(row[3]).strip() if len(row) > 3 and row[3] else None
-                            address = str(row[4]).strip() if len(row) > 4 and row[4] else None
-                            document_type = str(row[5]).strip() if len(row) > 5 and row[5] else None
-                            document_number = str(row[6]).strip() if len(row) > 6 and row[6] else None
-                        else:
-                            # El formato no tiene ID, empieza con nombre
-                            name = str(row[0]).strip() if row[0] else ""
-                            email = str(row[1]).strip() if len(row) > 1 and row[1] else None
-                            phone = str(row[2]).strip() if len(row) > 2 and row[2] else None
-                            address = str(row[3]).strip() if len(row) > 3 and row[3] else None
-                            document_type = str(row[4]).strip() if len(row) > 4 and row[4] else None
-                            document_number = str(row[5]).strip() if len(row) > 5 and row[5] else None
-                        
-                        # Limpiar valores vacíos (convertir a None)
-                        if email and not email.strip():
-                            email = None
-                        elif email:
-                            email = email.strip()
-                        
-                        if phone and not phone.strip():
-                            phone = None
-                        elif phone:
-                            phone = phone.strip()
-                        
-                        if address and not address.strip():
-                            address = None
-                        elif address:
-                            address = address.strip()
-                        
-                        if document_type and not document_type.strip():
-                            document_type = None
-                        elif document_type:
-                            document_type = document_type.strip()
-                        
-                        if document_number and not document_number.strip():
-                            document_number = None
-                        elif document_number:
-                            document_number = document_number.strip()
-                        
-                        if not name or not name.strip():
-                            errors.append(f"Fila {row_idx}: Nombre vacío")
-                            continue
-                        
-                        name = name.strip()
-                        
-                        # Verificar si ya existe un cliente con ese nombre o email
-                        existing = session.query(Customer).filter_by(name=name).first()
-                        if existing:
-                            errors.append(f"Fila {row_idx}: Cliente '{name}' ya existe")
-                            continue
-                        
-                        if email:
-                            existing_email = session.query(Customer).filter_by(email=email).first()
-                            if existing_email:
-                                errors.append(f"Fila {row_idx}: Email '{email}' ya existe")
-                                continue
-                        
-                        if document_number:
-                            existing_doc = session.query(Customer).filter_by(document_number=document_number).first()
-                            if existing_doc:
-                                errors.append(f"Fila {row_idx}: Número de documento '{document_number}' ya existe")
-                                continue
-                        
-                        # Crear cliente
-                        customer = Customer(
-                            name=name,
-                            email=email,
-                            phone=phone,
-                            address=address,
-                            document_type=document_type,
-                            document_number=document_number
-                        )
-                        
-                        session.add(customer)
-                        session.flush()  # Validar antes de continuar
-                        imported_count += 1
-                        
-                    except Exception as e:
-                        errors.append(f"Fila {row_idx}: {str(e)}")
-                        continue
-                
-                # Intentar hacer commit de todo
-                try:
-                    session.commit()
-                except Exception as e:
-                    session.rollback()
-                    raise Exception(f"Error al guardar datos: {str(e)}")
-                
-                # Mostrar resultado
-                result_msg = f"Importación completada\n\nClientes importados: {imported_count}"
-                if errors:
-                    result_msg += f"\n\nErrores encontrados:\n" + "\n".join(errors[:10])
-                    if len(errors) > 10:
-                        result_msg += f"\n... y {len(errors) - 10} errores más"
-                
-                QMessageBox.information(self, "Resultado de Importación", result_msg)
-                self.load_customers()
-                
-            except Exception as e:
-                session.rollback()
-                QMessageBox.critical(self, "Error", f"Error al importar: {str(e)}\n\n{traceback.format_exc()}")
-            finally:
-                close_session()
+                return
+            
+            # Lectura, validación e inserción por bloques en segundo plano
+            run_task(
+                self,
+                "Importando",
+                lambda session, progress, cancelled: ImportService.import_customers(
+                    session, file_path, progress, cancelled
+                ),
+                self.on_customers_imported,
+                error_prefix="Error al importar"
+            )
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error: {str(e)}")
     
+    def on_customers_imported(self, result):
+        """Muestra el resultado de la importación"""
+        EventBus.publish(CustomerUpdated(created=True))
+        QMessageBox.information(self, "Resultado de Importación", result.summary("Clientes importados"))
+    
     def clear_customers_table(self):
         """Limpia toda la tabla de clientes con confirmación"""
         try:
@@ -643,6 +487,7 @@ class CustomersView(QWidget):
                 session.query(Customer).delete()
                 
                 session.commit()
+                EventBus.publish(CustomerUpdated(deleted=True))
                 
                 QMessageBox.information(
                     self,
@@ -650,8 +495,6 @@ class CustomersView(QWidget):
                     f"Se han eliminado correctamente {total_customers} clientes"
                 )
                 
-                self.load_customers()
-                
             except Exception as e:
                 session.rollback()
                 QMessageBox.critical(self, "Error", f"Error al limpiar tabla: {str(e)}\n\n{traceback.format_exc()}")
@@ -808,6 +651,7 @@ class CustomerDialog(QDialog):
                 session.add(customer)
             
             session.commit()
+            EventBus.publish(CustomerUpdated([customer.id], created=not self.is_editing))
             
             QMessageBox.information(
                 self,
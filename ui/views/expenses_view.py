@@ -8,12 +8,17 @@ from PyQt6.QtWidgets import (
     QDateEdit, QCheckBox, QTabWidget
 )
 from PyQt6.QtCore import Qt, QDate
-from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QFont, QShowEvent
 from config.database import get_session, close_session
+from database.expense_repository import ExpenseRepository
+from ui.widgets.paged_table import PagedTableLoader
+from ui.widgets.view_refresher import ViewRefresher
+from core.events import EventBus, ExpenseRecorded, StockChanged
+from services.recipe_cache import RecipeCache
 from models import (
     Expense, ExpenseType, ExpenseReason, Product, RawMaterial,
     InventoryMovement, MovementType, RawMaterialMovement, RawMaterialMovementType,
-    ProductMaterial, PaymentMethod
+    PaymentMethod
 )
 from PyQt6.QtWidgets import QLineEdit
 from datetime import datetime
@@ -101,6 +106,29 @@ class ExpensesView(QWidget):
         self.tabs.addTab(self.inventory_tab, "📦 Inventario")
         
         layout.addWidget(self.tabs)
+        
+        # Carga por páginas de cada tabla: solo se traen las filas que se van a ver
+        self.cash_loader = PagedTableLoader(
+            self.cash_table, ExpenseRepository, self.fill_cash_row,
+            row_height=50,
+            on_error=self.show_load_error
+        )
+        self.inventory_loader = PagedTableLoader(
+            self.inventory_table, ExpenseRepository, self.fill_inventory_row,
+            row_height=50,
+            on_error=self.show_load_error
+        )
+        
+        # Refresco incremental: los egresos nuevos van al inicio (se recarga la
+        # primera página) y los eliminados solo se quitan de su tabla
+        self.refresher = ViewRefresher(self, self.load_expenses, self.refresh_expense_rows)
+        self.refresher.subscribe(ExpenseRecorded, self.on_expense_recorded)
+    
+    def showEvent(self, event: QShowEvent):
+        """Se ejecuta cuando la vista se muestra"""
+        super().showEvent(event)
+        # Solo aplica los cambios publicados mientras la vista estaba oculta
+        self.refresher.on_show()
     
     def create_table(self, headers):
         """Crea y configura una tabla con los headers especificados"""
@@ -146,178 +174,166 @@ class ExpensesView(QWidget):
         return table
     
     def load_expenses(self):
-        """Carga los egresos desde la base de datos y los separa por tipo"""
-        session = get_session()
-        try:
-            expenses = session.query(Expense).order_by(Expense.created_at.desc()).all()
-            
-            # Separar egresos
-            inventory_expenses = [e for e in expenses if e.expense_type != ExpenseType.CASH]
-            cash_expenses = [e for e in expenses if e.expense_type == ExpenseType.CASH]
-            
-            # Cargar tabla de inventario
-            self.load_inventory_table(inventory_expenses)
-            
-            # Cargar tabla de efectivo
-            self.load_cash_table(cash_expenses)
-        
-        finally:
-            close_session()
+        """Carga la primera página de egresos de cada tipo"""
+        self.cash_loader.reload({'cash': True})
+        self.inventory_loader.reload({'cash': False})
     
-    def load_inventory_table(self, expenses):
-        """Carga egresos de inventario en la tabla correspondiente"""
-        self.inventory_table.setRowCount(len(expenses))
-        
-        for row, expense in enumerate(expenses):
-            col = 0
-            # Fecha
-            date_str = expense.created_at.strftime("%Y-%m-%d %H:%M")
-            self.inventory_table.setItem(row, col, QTableWidgetItem(date_str))
-            col += 1
-            
-            # Tipo
-            self.inventory_table.setItem(row, col, QTableWidgetItem(expense.expense_type.value))
-            col += 1
-            
-            # Producto/Materia Prima
-            item_name = expense.product.name if expense.product else expense.raw_material.name
-            self.inventory_table.setItem(row, col, QTableWidgetItem(item_name))
-            col += 1
-            
-            # Cantidad
-            qty_item = QTableWidgetItem(f"{expense.quantity}")
-            qty_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.inventory_table.setItem(row, col, qty_item)
-            col += 1
-            
-            # Monto
-            amount_text = f"${expense.amount:,.2f}" if expense.amount else "-"
-            amount_item = QTableWidgetItem(amount_text)
-            amount_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            self.inventory_table.setItem(row, col, amount_item)
-            col += 1
-            
-            # Razón
-            self.inventory_table.setItem(row, col, QTableWidgetItem(expense.reason.value))
-            col += 1
-            
-            # Destinatario
-            recipient = expense.recipient if expense.recipient else "-"
-            self.inventory_table.setItem(row, col, QTableWidgetItem(recipient))
-            col += 1
-            
-            # Autorizado
-            authorized_text = "✓ Sí" if expense.is_authorized else "✗ No"
-            authorized_item = QTableWidgetItem(authorized_text)
-            if expense.is_authorized:
-                authorized_item.setForeground(Qt.GlobalColor.darkGreen)
-            else:
-                authorized_item.setForeground(Qt.GlobalColor.red)
-            authorized_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.inventory_table.setItem(row, col, authorized_item)
-            col += 1
-            
-            # Notas
-            notes = expense.notes if expense.notes else "-"
-            self.inventory_table.setItem(row, col, QTableWidgetItem(notes))
-            col += 1
-            
-            # Botón eliminar
-            btn_delete = QPushButton("🗑️ Eliminar")
-            btn_delete.setStyleSheet("""
-                QPushButton {
-                    background-color: #ef4444;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #dc2626;
-                }
-            """)
-            btn_delete.clicked.connect(lambda checked, e=expense: self.delete_expense(e))
-            self.inventory_table.setCellWidget(row, col, btn_delete)
-            
-            self.inventory_table.setRowHeight(row, 50)
+    def show_load_error(self, error):
+        QMessageBox.critical(self, "Error", f"Error al cargar egresos: {str(error)}")
     
-    def load_cash_table(self, expenses):
-        """Carga egresos de efectivo en la tabla correspondiente"""
-        self.cash_table.setRowCount(len(expenses))
-        
-        for row, expense in enumerate(expenses):
-            col = 0
-            # Fecha
-            date_str = expense.created_at.strftime("%Y-%m-%d %H:%M")
-            self.cash_table.setItem(row, col, QTableWidgetItem(date_str))
-            col += 1
-            
-            # Monto
-            amount_text = f"${expense.amount:,.2f}" if expense.amount else "-"
-            amount_item = QTableWidgetItem(amount_text)
-            amount_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            amount_item.setFont(QFont("Arial", 11, QFont.Weight.Bold))
-            self.cash_table.setItem(row, col, amount_item)
-            col += 1
-            
-            # Método de pago
-            payment_method = expense.payment_method.value if expense.payment_method else "-"
-            if expense.transfer_type:
-                payment_method += f" ({expense.transfer_type})"
-            self.cash_table.setItem(row, col, QTableWidgetItem(payment_method))
-            col += 1
-            
-            # Razón
-            self.cash_table.setItem(row, col, QTableWidgetItem(expense.reason.value))
-            col += 1
-            
-            # Destinatario
-            recipient = expense.recipient if expense.recipient else "-"
-            self.cash_table.setItem(row, col, QTableWidgetItem(recipient))
-            col += 1
-            
-            # Autorizado
-            authorized_text = "✓ Sí" if expense.is_authorized else "✗ No"
-            authorized_item = QTableWidgetItem(authorized_text)
-            if expense.is_authorized:
-                authorized_item.setForeground(Qt.GlobalColor.darkGreen)
-            else:
-                authorized_item.setForeground(Qt.GlobalColor.red)
-            authorized_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.cash_table.setItem(row, col, authorized_item)
-            col += 1
-            
-            # Notas
-            notes = expense.notes if expense.notes else "-"
-            self.cash_table.setItem(row, col, QTableWidgetItem(notes))
-            col += 1
-            
-            # Botón eliminar
-            btn_delete = QPushButton("🗑️ Eliminar")
-            btn_delete.setStyleSheet("""
-                QPushButton {
-                    background-color: #ef4444;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #dc2626;
-                }
-            """)
-            btn_delete.clicked.connect(lambda checked, e=expense: self.delete_expense(e))
-            self.cash_table.setCellWidget(row, col, btn_delete)
-            
-            self.cash_table.setRowHeight(row, 50)
+    def refresh_expense_rows(self, ids):
+        self.cash_loader.refresh_rows(ids)
+        self.inventory_loader.refresh_rows(ids)
+    
+    def on_expense_recorded(self, event):
+        if event.deleted:
+            self.refresher.patch([event.expense_id])
+        else:
+            self.refresher.invalidate()
+    
+    def fill_inventory_row(self, row, expense):
+        """Pinta un egreso de inventario en una fila de su tabla"""
+        col = 0
+        # Fecha
+        date_str = expense.created_at.strftime("%Y-%m-%d %H:%M")
+        self.inventory_table.setItem(row, col, QTableWidgetItem(date_str))
+        col += 1
+        
+        # Tipo
+        self.inventory_table.setItem(row, col, QTableWidgetItem(expense.expense_type.value))
+        col += 1
+        
+        # Producto/Materia Prima
+        item_name = expense.product.name if expense.product else expense.raw_material.name
+        self.inventory_table.setItem(row, col, QTableWidgetItem(item_name))
+        col += 1
+        
+        # Cantidad
+        qty_item = QTableWidgetItem(f"{expense.quantity}")
+        qty_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.inventory_table.setItem(row, col, qty_item)
+        col += 1
+        
+        # Monto
+        amount_text = f"${expense.amount:,.2f}" if expense.amount else "-"
+        amount_item = QTableWidgetItem(amount_text)
+        amount_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.inventory_table.setItem(row, col, amount_item)
+        col += 1
+        
+        # Razón
+        self.inventory_table.setItem(row, col, QTableWidgetItem(expense.reason.value))
+        col += 1
+        
+        # Destinatario
+        recipient = expense.recipient if expense.recipient else "-"
+        self.inventory_table.setItem(row, col, QTableWidgetItem(recipient))
+        col += 1
+        
+        # Autorizado
+        authorized_text = "✓ Sí" if expense.is_authorized else "✗ No"
+        authorized_item = QTableWidgetItem(authorized_text)
+        if expense.is_authorized:
+            authorized_item.setForeground(Qt.GlobalColor.darkGreen)
+        else:
+            authorized_item.setForeground(Qt.GlobalColor.red)
+        authorized_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.inventory_table.setItem(row, col, authorized_item)
+        col += 1
+        
+        # Notas
+        notes = expense.notes if expense.notes else "-"
+        self.inventory_table.setItem(row, col, QTableWidgetItem(notes))
+        col += 1
+        
+        # Botón eliminar
+        btn_delete = QPushButton("🗑️ Eliminar")
+        btn_delete.setStyleSheet("""
+            QPushButton {
+                background-color: #ef4444;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                padding: 6px 12px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #dc2626;
+            }
+        """)
+        btn_delete.clicked.connect(lambda checked, e=expense: self.delete_expense(e))
+        self.inventory_table.setCellWidget(row, col, btn_delete)
+    
+    def fill_cash_row(self, row, expense):
+        """Pinta un egreso de efectivo en una fila de su tabla"""
+        col = 0
+        # Fecha
+        date_str = expense.created_at.strftime("%Y-%m-%d %H:%M")
+        self.cash_table.setItem(row, col, QTableWidgetItem(date_str))
+        col += 1
+        
+        # Monto
+        amount_text = f"${expense.amount:,.2f}" if expense.amount else "-"
+        amount_item = QTableWidgetItem(amount_text)
+        amount_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        amount_item.setFont(QFont("Arial", 11, QFont.Weight.Bold))
+        self.cash_table.setItem(row, col, amount_item)
+        col += 1
+        
+        # Método de pago
+        payment_method = expense.payment_method.value if expense.payment_method else "-"
+        if expense.transfer_type:
+            payment_method += f" ({expense.transfer_type})"
+        self.cash_table.setItem(row, col, QTableWidgetItem(payment_method))
+        col += 1
+        
+        # Razón
+        self.cash_table.setItem(row, col, QTableWidgetItem(expense.reason.value))
+        col += 1
+        
+        # Destinatario
+        recipient = expense.recipient if expense.recipient else "-"
+        self.cash_table.setItem(row, col, QTableWidgetItem(recipient))
+        col += 1
+        
+        # Autorizado
+        authorized_text = "✓ Sí" if expense.is_authorized else "✗ No"
+        authorized_item = QTableWidgetItem(authorized_text)
+        if expense.is_authorized:
+            authorized_item.setForeground(Qt.GlobalColor.darkGreen)
+        else:
+            authorized_item.setForeground(Qt.GlobalColor.red)
+        authorized_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.cash_table.setItem(row, col, authorized_item)
+        col += 1
+        
+        # Notas
+        notes = expense.notes if expense.notes else "-"
+        self.cash_table.setItem(row, col, QTableWidgetItem(notes))
+        col += 1
+        
+        # Botón eliminar
+        btn_delete = QPushButton("🗑️ Eliminar")
+        btn_delete.setStyleSheet("""
+            QPushButton {
+                background-color: #ef4444;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                padding: 6px 12px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #dc2626;
+            }
+        """)
+        btn_delete.clicked.connect(lambda checked, e=expense: self.delete_expense(e))
+        self.cash_table.setCellWidget(row, col, btn_delete)
     
     def new_expense(self):
         """Abre el diálogo para crear un nuevo egreso"""
         dialog = NewExpenseDialog(self)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_expenses()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def delete_expense(self, expense):
         """Elimina un egreso (NO devuelve inventario, es solo registro)"""
@@ -336,8 +352,8 @@ class ExpensesView(QWidget):
                 expense_to_delete = session.query(Expense).filter_by(id=expense.id).first()
                 session.delete(expense_to_delete)
                 session.commit()
+                EventBus.publish(ExpenseRecorded(expense.id, deleted=True))
                 QMessageBox.information(self, "Éxito", "Registro de egreso eliminado")
-                self.load_expenses()
             except Exception as e:
                 session.rollback()
                 QMessageBox.critical(self, "Error", f"Error al eliminar: {str(e)}")
@@ -811,6 +827,7 @@ class NewExpenseDialog(QDialog):
                 
                 session.add(expense)
                 session.commit()
+                EventBus.publish(ExpenseRecorded(expense.id))
                 
                 QMessageBox.information(
                     self,
@@ -869,8 +886,11 @@ class NewExpenseDialog(QDialog):
             expense.is_authorized = 1 if self.authorized_checkbox.isChecked() else 0
             expense.amount = self.amount_spin.value() if self.amount_spin.value() > 0 else None
             
+            product_ids = []
+            raw_material_ids = []
             if expense_type == ExpenseType.PRODUCT:
                 expense.product_id = item_id
+                product_ids.append(item_id)
                 
                 # Descontar del inventario de productos
                 previous_stock = item.stock
@@ -887,12 +907,22 @@ class NewExpenseDialog(QDialog):
                 )
                 session.add(movement)
                 
-                # Descontar materia prima utilizada en el producto
-                product_materials = session.query(ProductMaterial).filter_by(product_id=item_id).all()
-                for product_material in product_materials:
-                    raw_material = product_material.raw_material
+                # Descontar materia prima utilizada en el producto (receta desde la caché)
+                recipe = RecipeCache.get(session, item_id)
+                materials = {}
+                if recipe:
+                    materials = {
+                        m.id: m for m in session.query(RawMaterial).filter(
+                            RawMaterial.id.in_([raw_material_id for raw_material_id, _ in recipe])
+                        ).all()
+                    }
+                for raw_material_id, quantity_needed in recipe:
+                    raw_material = materials.get(raw_material_id)
+                    if raw_material is None:
+                        continue
+                    raw_material_ids.append(raw_material.id)
                     # Calcular cantidad de materia prima a descontar
-                    material_quantity = product_material.quantity_needed * quantity
+                    material_quantity = quantity_needed * quantity
                     
                     # Verificar que hay suficiente materia prima
                     if raw_material.stock < material_quantity:
@@ -920,6 +950,7 @@ class NewExpenseDialog(QDialog):
                     session.add(material_movement)
             else:
                 expense.raw_material_id = item_id
+                raw_material_ids.append(item_id)
                 
                 # Descontar del inventario de materias primas
                 item.stock -= quantity
@@ -936,6 +967,8 @@ class NewExpenseDialog(QDialog):
             
             session.add(expense)
             session.commit()
+            EventBus.publish(ExpenseRecorded(expense.id))
+            EventBus.publish(StockChanged(product_ids, raw_material_ids))
             
             QMessageBox.information(
                 self,
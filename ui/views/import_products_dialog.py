@@ -4,10 +4,12 @@ Diálogo para importar productos desde archivo CSV/Excel
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QFileDialog, QMessageBox, QCheckBox, QSpinBox, QFormLayout,
-    QGroupBox, QTextEdit, QProgressBar
+    QGroupBox, QTextEdit, QProgressBar, QComboBox
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from utils.product_importer import ProductImporter
+from utils.import_profile import ImportProfile, ProfileError
+from core.events import EventBus, ProductUpdated, RawMaterialUpdated
 import traceback
 
 class ImportWorker(QThread):
@@ -15,26 +17,34 @@ class ImportWorker(QThread):
     finished = pyqtSignal(dict)
     progress = pyqtSignal(str)
     
-    def __init__(self, file_path, default_stock, update_existing):
+    def __init__(self, file_paths, default_stock, update_existing, profile):
         super().__init__()
-        self.file_path = file_path
+        self.file_paths = file_paths
         self.default_stock = default_stock
         self.update_existing = update_existing
+        self.profile = profile
     
     def run(self):
         """Ejecuta la importación"""
-        importer = ProductImporter()
+        importer = ProductImporter(self.profile)
         
+        # Varios archivos: lectura en paralelo en un pool de procesos
+        if len(self.file_paths) > 1:
+            result = importer.import_files(
+                self.file_paths,
+                self.default_stock,
+                self.update_existing
+            )
         # Determinar si es CSV o Excel
-        if self.file_path.lower().endswith('.csv'):
+        elif self.file_paths[0].lower().endswith('.csv'):
             result = importer.import_from_csv(
-                self.file_path, 
+                self.file_paths[0], 
                 self.default_stock, 
                 self.update_existing
             )
         else:
             result = importer.import_from_excel(
-                self.file_path, 
+                self.file_paths[0], 
                 self.default_stock, 
                 self.update_existing
             )
@@ -46,7 +56,7 @@ class ImportProductsDialog(QDialog):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.file_path = None
+        self.file_paths = []
         self.worker = None
         self.init_ui()
     
@@ -98,7 +108,8 @@ class ImportProductsDialog(QDialog):
             "COLORES, BOLSA NORMAL, BOLSA AL MAYOR, CAJA POPETA,\n"
             "JUGUETE, GRANIZADO, VASOS, PITILLOS, PERLAS,\n"
             "TOPIN GOMAS, GASEOSA, AGUA, AZUCAR, VASO ALGODÓN, PICANTE\n\n"
-            "Formatos soportados: CSV (.csv) y Excel (.xlsx)"
+            "Formatos soportados: CSV (.csv) y Excel (.xlsx)\n"
+            "Para catálogos con otras columnas seleccione un perfil de columnas (JSON)"
         )
         info_text.setWordWrap(True)
         info_text.setStyleSheet("color: #475569; font-size: 12px; padding: 10px;")
@@ -143,6 +154,41 @@ class ImportProductsDialog(QDialog):
         options_group = QGroupBox("Opciones de Importación")
         options_layout = QFormLayout()
         
+        # Perfil de columnas
+        profile_layout = QHBoxLayout()
+        self.profile_combo = QComboBox()
+        self.profile_combo.setStyleSheet("""
+            QComboBox {
+                font-size: 13px;
+                padding: 5px;
+                color: #0f172a;
+                background-color: white;
+                border: 1px solid #d1d5db;
+                border-radius: 4px;
+            }
+        """)
+        for name, path in ImportProfile.available():
+            self.profile_combo.addItem(name, path)
+        profile_layout.addWidget(self.profile_combo, 1)
+        
+        btn_load_profile = QPushButton("Cargar perfil...")
+        btn_load_profile.setStyleSheet("""
+            QPushButton {
+                background-color: #e2e8f0;
+                color: #0f172a;
+                border: none;
+                border-radius: 4px;
+                font-size: 13px;
+                padding: 6px 12px;
+            }
+            QPushButton:hover {
+                background-color: #cbd5e1;
+            }
+        """)
+        btn_load_profile.clicked.connect(self.select_profile)
+        profile_layout.addWidget(btn_load_profile)
+        options_layout.addRow("Perfil de columnas:", profile_layout)
+        
         # Stock inicial
         self.stock_spin = QSpinBox()
         self.stock_spin.setMinimum(0)
@@ -258,31 +304,69 @@ class ImportProductsDialog(QDialog):
     
     def select_file(self):
         """Abre el diálogo para seleccionar archivo"""
-        file_path, _ = QFileDialog.getOpenFileName(
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self,
-            "Seleccionar archivo CSV o Excel",
+            "Seleccionar archivos CSV o Excel",
             "",
             "Archivos CSV/Excel (*.csv *.xlsx);;Archivos CSV (*.csv);;Archivos Excel (*.xlsx)"
         )
         
-        if file_path:
-            self.file_path = file_path
+        if file_paths:
+            self.file_paths = file_paths
             import os
-            self.file_label.setText(os.path.basename(file_path))
+            if len(file_paths) == 1:
+                self.file_label.setText(os.path.basename(file_paths[0]))
+            else:
+                self.file_label.setText(f"{len(file_paths)} archivos seleccionados")
+                self.file_label.setToolTip("\n".join(os.path.basename(path) for path in file_paths))
             self.file_label.setStyleSheet("color: #10b981; font-size: 13px; font-weight: bold;")
             self.btn_import.setEnabled(True)
     
+    def select_profile(self):
+        """Agrega a la lista un perfil de columnas desde un archivo JSON"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Seleccionar perfil de columnas",
+            "",
+            "Perfiles de columnas (*.json)"
+        )
+        
+        if not file_path:
+            return
+        
+        try:
+            profile = ImportProfile.load(file_path)
+        except ProfileError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        
+        index = self.profile_combo.findData(file_path)
+        if index < 0:
+            self.profile_combo.addItem(profile.name, file_path)
+            index = self.profile_combo.count() - 1
+        self.profile_combo.setCurrentIndex(index)
+    
     def start_import(self):
         """Inicia el proceso de importación"""
-        if not self.file_path:
+        if not self.file_paths:
             QMessageBox.warning(self, "Error", "Por favor seleccione un archivo")
             return
         
+        # Perfil de columnas (se vuelve a leer por si el archivo cambió)
+        try:
+            profile_path = self.profile_combo.currentData()
+            profile = ImportProfile.load(profile_path) if profile_path else ImportProfile.default()
+        except ProfileError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        
         # Confirmar importación
+        files = "\n".join(self.file_paths)
         reply = QMessageBox.question(
             self,
             "Confirmar Importación",
-            f"¿Está seguro de importar productos desde:\n{self.file_path}?\n\n"
+            f"¿Está seguro de importar productos desde:\n{files}?\n\n"
+            f"Perfil de columnas: {profile.name}\n"
             f"Stock inicial: {self.stock_spin.value()} unidades\n"
             f"Actualizar existentes: {'Sí' if self.update_existing_check.isChecked() else 'No'}",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
@@ -302,13 +386,33 @@ class ImportProductsDialog(QDialog):
         
         # Crear y ejecutar worker
         self.worker = ImportWorker(
-            self.file_path,
+            self.file_paths,
             self.stock_spin.value(),
-            self.update_existing_check.isChecked()
+            self.update_existing_check.isChecked(),
+            profile
         )
         self.worker.finished.connect(self.on_import_finished)
         self.worker.start()
     
+    def files_report_html(self, reports):
+        """Tabla con filas, registros y filas/segundo de cada archivo"""
+        rows = ""
+        for report in reports:
+            status = f"<span style='color: #ef4444;'>{report['error']}</span>" if report['error'] else "OK"
+            rows += (
+                f"<tr><td>{report['file']}</td><td align='right'>{report['rows']:,}</td>"
+                f"<td align='right'>{report['records']:,}</td>"
+                f"<td align='right'>{report['parse_seconds']:.2f}s</td>"
+                f"<td align='right'>{report['write_seconds']:.2f}s</td>"
+                f"<td align='right'>{report['rows_per_second']:,.0f}</td><td>{status}</td></tr>"
+            )
+        return (
+            "<table cellspacing='0' cellpadding='3'>"
+            "<tr><th align='left'>Archivo</th><th>Filas</th><th>Válidas</th><th>Lectura</th>"
+            "<th>Escritura</th><th>Filas/s</th><th align='left'>Estado</th></tr>"
+            f"{rows}</table>"
+        )
+    
     def on_import_finished(self, result):
         """Maneja el fin de la importación"""
         # Restaurar UI
@@ -318,6 +422,10 @@ class ImportProductsDialog(QDialog):
         
         # Mostrar resultados
         if result['success']:
+            # Pueden haber cambiado productos y materias primas en cualquier posición
+            EventBus.publish(ProductUpdated(created=True))
+            EventBus.publish(RawMaterialUpdated(created=True))
+            
             results_html = f"""
             <h3 style="color: #10b981;">✅ Importación Exitosa</h3>
             <p><b>Productos creados:</b> {result['created_products']}</p>
@@ -326,6 +434,13 @@ class ImportProductsDialog(QDialog):
             <p><b>Relaciones producto-materia prima:</b> {result['created_relations']}</p>
             """
             
+            if result.get('timings'):
+                stages = " · ".join(f"{stage}: {seconds:.2f}s" for stage, seconds in result['timings'].items())
+                results_html += f"<p><b>Tiempos:</b> {stages}</p>"
+            
+            if result.get('files'):
+                results_html += "<p><b>Archivos:</b></p>" + self.files_report_html(result['files'])
+            
             if result.get('warnings'):
                 results_html += f"<p><b>Advertencias:</b> {len(result['warnings'])}</p>"
             
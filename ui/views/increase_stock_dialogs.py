@@ -7,6 +7,7 @@ from PyQt6.QtWidgets import (
 )
 from config.database import get_session, close_session
 from models import Product, InventoryMovement, MovementType
+from core.events import EventBus, StockChanged
 
 
 class IncreaseStockDialog(QDialog):
@@ -129,6 +130,7 @@ class IncreaseStockDialog(QDialog):
             )
             session.add(movement)
             session.commit()
+            EventBus.publish(StockChanged(product_ids=[product.id]))
             
             QMessageBox.information(
                 self,
@@ -266,7 +268,9 @@ class IncreaseStockAllDialog(QDialog):
                 session.add(movement)
                 updated_count += 1
             
+            product_ids = [product.id for product in products]
             session.commit()
+            EventBus.publish(StockChanged(product_ids=product_ids))
             
             QMessageBox.information(
                 self,
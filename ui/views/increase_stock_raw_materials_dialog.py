@@ -8,6 +8,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from config.database import get_session, close_session
 from models import RawMaterial, RawMaterialMovement, RawMaterialMovementType
+from core.events import EventBus, StockChanged
 
 class IncreaseStockAllRawMaterialsDialog(QDialog):
     """Diálogo para aumentar el stock de todas las materias primas"""
@@ -134,7 +135,9 @@ class IncreaseStockAllRawMaterialsDialog(QDialog):
                 session.add(movement)
                 updated_count += 1
             
+            material_ids = [material.id for material in materials]
             session.commit()
+            EventBus.publish(StockChanged(raw_material_ids=material_ids))
             
             QMessageBox.information(
                 self,
@@ -5,20 +5,34 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTableWidget, QTableWidgetItem, QLineEdit, QMessageBox,
     QDialog, QFormLayout, QSpinBox, QComboBox, QHeaderView,
-    QTextEdit, QDateEdit, QGroupBox, QTabWidget, QTimeEdit, QFileDialog
+    QTextEdit, QDateEdit, QGroupBox, QTabWidget, QTimeEdit
 )
 from PyQt6.QtCore import Qt, QDate, QDateTime
 from PyQt6.QtGui import QShowEvent
 from datetime import datetime, date
-from sqlalchemy import update, func
+from sqlalchemy import update
+from sqlalchemy.orm import joinedload
 from config.database import get_session, close_session
+from core.events import EventBus, StockChanged, ProductUpdated, RawMaterialUpdated
+from ui.widgets.view_refresher import ViewRefresher
+from ui.widgets.export_runner import get_export_path, run_export
+from services.export_service import ExportService
+from utils.date_ranges import on_day
 from models import Product, InventoryMovement, MovementType, RawMaterial, RawMaterialMovement, RawMaterialMovementType
 
 class InventoryView(QWidget):
     """Vista para control de inventario"""
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._product_rows = {}
+        self._material_rows = {}
         self.init_ui()
+        
+        # Refresco incremental: solo las filas de stock que cambiaron
+        self.refresher = ViewRefresher(self, self.load_inventory, self.patch_inventory)
+        self.refresher.subscribe(StockChanged, self.on_stock_changed)
+        self.refresher.subscribe(ProductUpdated, self.on_products_updated)
+        self.refresher.subscribe(RawMaterialUpdated, self.on_materials_updated)
         self.load_inventory()
     
     def init_ui(self):
@@ -282,8 +296,8 @@ class InventoryView(QWidget):
     def showEvent(self, event: QShowEvent):
         """Se ejecuta cuando la vista se muestra"""
         super().showEvent(event)
-        # Recargar inventario cada vez que se muestra la vista
-        self.load_inventory()
+        # Solo aplica los cambios publicados mientras la vista estaba oculta
+        self.refresher.on_show()
     
     def load_inventory(self):
         """Carga el inventario actual (ambos tabs)"""
@@ -306,87 +320,146 @@ class InventoryView(QWidget):
             materials = session.query(RawMaterial).all()
             
             self.raw_materials_table.setRowCount(len(materials))
+            self._material_rows = {}
             
             for row, material in enumerate(materials):
-                # SKU
-                self.raw_materials_table.setItem(row, 0, QTableWidgetItem(material.sku))
-                
-                # Nombre
-                name_item = QTableWidgetItem(material.name)
-                if material.is_low_stock:
-                    name_item.setForeground(Qt.GlobalColor.red)
-                self.raw_materials_table.setItem(row, 1, name_item)
-                
-                # Unidad
-                self.raw_materials_table.setItem(row, 2, QTableWidgetItem(material.unit))
-                
-                # Stock
-                stock_item = QTableWidgetItem(f"{material.stock:.2f}")
-                stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                if material.is_low_stock:
-                    stock_item.setForeground(Qt.GlobalColor.red)
-                self.raw_materials_table.setItem(row, 3, stock_item)
-                
-                # Stock mínimo
-                min_stock_item = QTableWidgetItem(f"{material.min_stock:.2f}")
-                min_stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.raw_materials_table.setItem(row, 4, min_stock_item)
+                self._material_rows[material.id] = row
+                self.fill_material_stock_row(row, material)
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al cargar materia prima: {str(e)}")
         finally:
             close_session()
     
+    def fill_material_stock_row(self, row, material):
+        """Pinta una materia prima en la tabla de inventario"""
+        # SKU
+        self.raw_materials_table.setItem(row, 0, QTableWidgetItem(material.sku))
+        
+        # Nombre
+        name_item = QTableWidgetItem(material.name)
+        if material.is_low_stock:
+            name_item.setForeground(Qt.GlobalColor.red)
+        self.raw_materials_table.setItem(row, 1, name_item)
+        
+        # Unidad
+        self.raw_materials_table.setItem(row, 2, QTableWidgetItem(material.unit))
+        
+        # Stock
+        stock_item = QTableWidgetItem(f"{material.stock:.2f}")
+        stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        if material.is_low_stock:
+            stock_item.setForeground(Qt.GlobalColor.red)
+        self.raw_materials_table.setItem(row, 3, stock_item)
+        
+        # Stock mínimo
+        min_stock_item = QTableWidgetItem(f"{material.min_stock:.2f}")
+        min_stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.raw_materials_table.setItem(row, 4, min_stock_item)
+    
     def load_products_inventory(self):
         """Carga el inventario de productos"""
         session = get_session()
         try:
-            products = session.query(Product).all()
+            products = session.query(Product).options(joinedload(Product.category)).all()
             
             self.stock_table.setRowCount(len(products))
+            self._product_rows = {}
             
             for row, product in enumerate(products):
-                # SKU
-                self.stock_table.setItem(row, 0, QTableWidgetItem(product.sku))
-                
-                # Nombre
-                self.stock_table.setItem(row, 1, QTableWidgetItem(product.name))
-                
-                # Categoría
-                category = product.category.name if product.category else "-"
-                self.stock_table.setItem(row, 2, QTableWidgetItem(category))
-                
-                # Stock
-                stock_item = QTableWidgetItem(str(product.stock))
-                stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.stock_table.setItem(row, 3, stock_item)
-                
-                # Stock mínimo
-                min_stock_item = QTableWidgetItem(str(product.min_stock))
-                min_stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.stock_table.setItem(row, 4, min_stock_item)
-                
-                # Estado
-                if product.stock == 0:
-                    status = "SIN STOCK"
-                    color = Qt.GlobalColor.red
-                elif product.is_low_stock:
-                    status = "BAJO"
-                    color = Qt.GlobalColor.darkYellow
-                else:
-                    status = "NORMAL"
-                    color = Qt.GlobalColor.darkGreen
-                
-                status_item = QTableWidgetItem(status)
-                status_item.setForeground(color)
-                status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.stock_table.setItem(row, 5, status_item)
+                self._product_rows[product.id] = row
+                self.fill_product_stock_row(row, product)
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al cargar productos: {str(e)}")
         finally:
             close_session()
     
+    def fill_product_stock_row(self, row, product):
+        """Pinta un producto en la tabla de inventario"""
+        # SKU
+        self.stock_table.setItem(row, 0, QTableWidgetItem(product.sku))
+        
+        # Nombre
+        self.stock_table.setItem(row, 1, QTableWidgetItem(product.name))
+        
+        # Categoría
+        category = product.category.name if product.category else "-"
+        self.stock_table.setItem(row, 2, QTableWidgetItem(category))
+        
+        # Stock
+        stock_item = QTableWidgetItem(str(product.stock))
+        stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.stock_table.setItem(row, 3, stock_item)
+        
+        # Stock mínimo
+        min_stock_item = QTableWidgetItem(str(product.min_stock))
+        min_stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.stock_table.setItem(row, 4, min_stock_item)
+        
+        # Estado
+        if product.stock == 0:
+            status = "SIN STOCK"
+            color = Qt.GlobalColor.red
+        elif product.is_low_stock:
+            status = "BAJO"
+            color = Qt.GlobalColor.darkYellow
+        else:
+            status = "NORMAL"
+            color = Qt.GlobalColor.darkGreen
+        
+        status_item = QTableWidgetItem(status)
+        status_item.setForeground(color)
+        status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.stock_table.setItem(row, 5, status_item)
+    
+    def patch_inventory(self, keys):
+        """
+        Actualiza solo las filas de stock que cambiaron y recarga los
+        movimientos del día del tab activo
+        
+        Args:
+            keys: Conjunto de ('product', id) / ('material', id)
+        """
+        product_ids = [item_id for kind, item_id in keys if kind == 'product' and item_id in self._product_rows]
+        material_ids = [item_id for kind, item_id in keys if kind == 'material' and item_id in self._material_rows]
+        
+        session = get_session()
+        try:
+            if product_ids:
+                products = session.query(Product).options(joinedload(Product.category)).filter(
+                    Product.id.in_(product_ids)
+                ).all()
+                for product in products:
+                    self.fill_product_stock_row(self._product_rows[product.id], product)
+            if material_ids:
+                materials = session.query(RawMaterial).filter(RawMaterial.id.in_(material_ids)).all()
+                for material in materials:
+                    self.fill_material_stock_row(self._material_rows[material.id], material)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error al actualizar inventario: {str(e)}")
+        finally:
+            close_session()
+        
+        self.on_tab_changed()
+    
+    def on_stock_changed(self, event):
+        keys = {('product', item_id) for item_id in event.product_ids}
+        keys |= {('material', item_id) for item_id in event.raw_material_ids}
+        self.refresher.patch(keys)
+    
+    def on_products_updated(self, event):
+        if event.created or event.deleted or not event.product_ids:
+            self.refresher.invalidate()
+        else:
+            self.refresher.patch({('product', item_id) for item_id in event.product_ids})
+    
+    def on_materials_updated(self, event):
+        if event.created or event.deleted or not event.raw_material_ids:
+            self.refresher.invalidate()
+        else:
+            self.refresher.patch({('material', item_id) for item_id in event.raw_material_ids})
+    
     def search_raw_materials(self, text):
         """Busca materias primas en la tabla"""
         for row in range(self.raw_materials_table.rowCount()):
@@ -407,7 +480,7 @@ class InventoryView(QWidget):
             
             # Consultar movimientos del día seleccionado
             movements = session.query(InventoryMovement).filter(
-                func.date(InventoryMovement.created_at) == selected_date
+                on_day(InventoryMovement.created_at, selected_date)
             ).order_by(InventoryMovement.created_at.desc()).all()
             
             self.movements_table.setRowCount(len(movements))
@@ -550,7 +623,7 @@ class InventoryView(QWidget):
             
             # Consultar movimientos del día seleccionado
             movements = session.query(RawMaterialMovement).filter(
-                func.date(RawMaterialMovement.created_at) == selected_date
+                on_day(RawMaterialMovement.created_at, selected_date)
             ).order_by(RawMaterialMovement.created_at.desc()).all()
             
             self.movements_table.setRowCount(len(movements))
@@ -647,154 +720,34 @@ class InventoryView(QWidget):
             self.on_tab_changed()  # Recargar movimientos según el tab activo
     
     def export_movements_to_excel(self):
-        """Exporta los movimientos del día seleccionado a Excel"""
-        try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, PatternFill, Alignment
-            from openpyxl.styles.colors import Color
-            import os
-            
-            # Solicitar ubicación para guardar
-            file_path, _ = QFileDialog.getSaveFileName(
-                self,
-                "Guardar movimientos del día",
-                os.path.join(os.path.expanduser("~"), "Desktop", f"Movimientos_{self.date_filter.date().toString('yyyyMMdd')}.xlsx"),
-                "Archivos Excel (*.xlsx)"
-            )
-            
-            if not file_path:
-                return
-            
-            # Obtener la fecha seleccionada
-            selected_date = self.date_filter.date().toPyDate()
-            
-            session = get_session()
-            try:
-                # Obtener movimientos de productos del día
-                product_movements = session.query(InventoryMovement).filter(
-                    func.date(InventoryMovement.created_at) == selected_date
-                ).order_by(InventoryMovement.created_at.asc()).all()
-                
-                # Obtener movimientos de materias primas del día
-                raw_material_movements = session.query(RawMaterialMovement).filter(
-                    func.date(RawMaterialMovement.created_at) == selected_date
-                ).order_by(RawMaterialMovement.created_at.asc()).all()
-                
-                # Crear libro de Excel
-                wb = Workbook()
-                wb.remove(wb.active)  # Eliminar hoja por defecto
-                
-                # Hoja 1: Movimientos de Productos
-                ws_products = wb.create_sheet(title="Productos")
-                
-                # Título
-                ws_products.merge_cells('A1:H1')
-                title_cell = ws_products['A1']
-                title_cell.value = f"Movimientos de Productos - {selected_date.strftime('%d/%m/%Y')}"
-                title_cell.font = Font(size=14, bold=True, color="FFFFFF")
-                title_cell.alignment = Alignment(horizontal="center", vertical="center")
-                title_cell.fill = PatternFill(start_color="2563eb", end_color="2563eb", fill_type="solid")
-                
-                # Encabezados
-                headers = ["Fecha/Hora", "Producto", "Tipo", "Cantidad", "Stock Anterior", "Stock Nuevo", "Razón", "Anotación"]
-                for col, header in enumerate(headers, 1):
-                    cell = ws_products.cell(row=3, column=col)
-                    cell.value = header
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                # Datos de productos
-                for row, movement in enumerate(product_movements, 4):
-                    ws_products.cell(row=row, column=1, value=movement.created_at.strftime("%d/%m/%Y %H:%M:%S"))
-                    ws_products.cell(row=row, column=2, value=movement.product.name if movement.product else "Producto eliminado")
-                    ws_products.cell(row=row, column=3, value=movement.movement_type.value)
-                    ws_products.cell(row=row, column=4, value=movement.quantity)
-                    ws_products.cell(row=row, column=5, value=movement.previous_stock)
-                    ws_products.cell(row=row, column=6, value=movement.new_stock)
-                    ws_products.cell(row=row, column=7, value=movement.reason or "")
-                    ws_products.cell(row=row, column=8, value=getattr(movement, 'note', '') or "")
-                
-                # Ajustar anchos de columna para productos
-                ws_products.column_dimensions['A'].width = 20
-                ws_products.column_dimensions['B'].width = 30
-                ws_products.column_dimensions['C'].width = 12
-                ws_products.column_dimensions['D'].width = 12
-                ws_products.column_dimensions['E'].width = 15
-                ws_products.column_dimensions['F'].width = 15
-                ws_products.column_dimensions['G'].width = 40
-                ws_products.column_dimensions['H'].width = 40
-                
-                # Hoja 2: Movimientos de Materias Primas
-                ws_materials = wb.create_sheet(title="Materias Primas")
-                
-                # Título
-                ws_materials.merge_cells('A1:G1')
-                title_cell = ws_materials['A1']
-                title_cell.value = f"Movimientos de Materias Primas - {selected_date.strftime('%d/%m/%Y')}"
-                title_cell.font = Font(size=14, bold=True, color="FFFFFF")
-                title_cell.alignment = Alignment(horizontal="center", vertical="center")
-                title_cell.fill = PatternFill(start_color="10b981", end_color="10b981", fill_type="solid")
-                
-                # Encabezados
-                headers = ["Fecha/Hora", "Materia Prima", "Tipo", "Cantidad", "Unidad", "Razón", "Costo"]
-                for col, header in enumerate(headers, 1):
-                    cell = ws_materials.cell(row=3, column=col)
-                    cell.value = header
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                # Datos de materias primas
-                for row, movement in enumerate(raw_material_movements, 4):
-                    material_name = movement.raw_material.name if movement.raw_material else "Materia prima eliminada"
-                    material_unit = movement.raw_material.unit if movement.raw_material else ""
-                    
-                    ws_materials.cell(row=row, column=1, value=movement.created_at.strftime("%d/%m/%Y %H:%M:%S"))
-                    ws_materials.cell(row=row, column=2, value=material_name)
-                    ws_materials.cell(row=row, column=3, value=movement.movement_type.value)
-                    ws_materials.cell(row=row, column=4, value=movement.quantity)
-                    ws_materials.cell(row=row, column=5, value=material_unit)
-                    ws_materials.cell(row=row, column=6, value=movement.reason or "")
-                    ws_materials.cell(row=row, column=7, value=movement.cost or 0)
-                
-                # Ajustar anchos de columna para materias primas
-                ws_materials.column_dimensions['A'].width = 20
-                ws_materials.column_dimensions['B'].width = 30
-                ws_materials.column_dimensions['C'].width = 15
-                ws_materials.column_dimensions['D'].width = 12
-                ws_materials.column_dimensions['E'].width = 12
-                ws_materials.column_dimensions['F'].width = 40
-                ws_materials.column_dimensions['G'].width = 12
-                
-                # Guardar archivo
-                wb.save(file_path)
-                
-                total_productos = len(product_movements)
-                total_materias = len(raw_material_movements)
-                
-                QMessageBox.information(
-                    self,
-                    "✅ Éxito",
-                    f"Movimientos exportados correctamente.\n\n"
-                    f"Fecha: {selected_date.strftime('%d/%m/%Y')}\n"
-                    f"Productos: {total_productos} movimientos\n"
-                    f"Materias Primas: {total_materias} movimientos\n"
-                    f"Archivo: {file_path}"
-                )
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al exportar: {str(e)}")
-            finally:
-                close_session()
-                
-        except ImportError:
-            QMessageBox.warning(
-                self,
-                "Error",
-                "La librería openpyxl no está instalada.\n\n"
-                "Instale con: pip install openpyxl"
+        """Exporta los movimientos del día seleccionado a Excel (o CSV) en segundo plano"""
+        import os
+        
+        # Solicitar ubicación para guardar
+        file_path = get_export_path(
+            self,
+            "Guardar movimientos del día",
+            os.path.join(os.path.expanduser("~"), "Desktop", f"Movimientos_{self.date_filter.date().toString('yyyyMMdd')}.xlsx")
+        )
+        
+        if not file_path:
+            return
+        
+        # Obtener la fecha seleccionada
+        selected_date = self.date_filter.date().toPyDate()
+        
+        product_sheet = ExportService.product_movements_sheet(selected_date)
+        material_sheet = ExportService.raw_material_movements_sheet(selected_date)
+        run_export(
+            self, file_path, [product_sheet, material_sheet],
+            lambda counts: (
+                f"Movimientos exportados correctamente.\n\n"
+                f"Fecha: {selected_date.strftime('%d/%m/%Y')}\n"
+                f"Productos: {counts[product_sheet.title]} movimientos\n"
+                f"Materias Primas: {counts[material_sheet.title]} movimientos\n"
+                f"Archivo: {file_path}"
             )
+        )
     
     def adjust_inventory(self):
         """Abre diálogo para ajustar inventario"""
@@ -802,8 +755,7 @@ class InventoryView(QWidget):
         is_raw_material = (current_index == 0)  # 0 = Materia Prima
         
         dialog = InventoryAdjustmentDialog(self, is_raw_material=is_raw_material)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_inventory()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def reset_all_stock_to_zero(self):
         """Resetea el stock de todos los productos a cero"""
@@ -874,6 +826,7 @@ class InventoryView(QWidget):
                 reset_count += 1
             
             session.commit()
+            EventBus.publish(StockChanged(product_ids=[product.id for product in products_with_stock]))
             
             QMessageBox.information(
                 self,
@@ -883,9 +836,6 @@ class InventoryView(QWidget):
                 f"Todos los productos ahora tienen stock en cero."
             )
             
-            # Recargar inventario
-            self.load_inventory()
-            
         except Exception as e:
             session.rollback()
             QMessageBox.critical(
@@ -1270,6 +1220,7 @@ class InventoryAdjustmentDialog(QDialog):
                 
                 session.add(movement)
                 session.commit()
+                EventBus.publish(StockChanged(raw_material_ids=[material.id]))
                 
                 QMessageBox.information(
                     self,
@@ -1313,6 +1264,7 @@ class InventoryAdjustmentDialog(QDialog):
                 
                 session.add(movement)
                 session.commit()
+                EventBus.publish(StockChanged(product_ids=[product.id]))
                 
                 QMessageBox.information(
                     self,
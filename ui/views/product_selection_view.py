@@ -1,23 +1,51 @@
 """
 Vista de Selección de Productos - Para elegir productos antes de completar la venta
 """
-import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QScrollArea, QGridLayout, QGroupBox, QLineEdit, QComboBox
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap, QIcon, QFont
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QIcon, QFont
 from config.database import get_session, close_session
 from models import Product, Customer, Category
+from database.search_index import SearchIndex
+from ui.widgets.thumbnail_cache import ThumbnailCache
+from ui.widgets.icon_loader import IconLoader
 
 class ProductSelectionView(QWidget):
     """Vista para seleccionar productos antes de completar la venta"""
     
+    # Galería: columnas, botones creados al abrir (la primera pantalla) y por lote después
+    GALLERY_COLUMNS = 6
+    GALLERY_FIRST_BATCH = 36
+    GALLERY_BATCH_SIZE = 60
+    ICON_SIZE = 90
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.selected_products = []  # Lista de productos seleccionados
         self.products_cache = []
+        self.gallery_built = 0
+        self.search_ids = None  # Ids que coinciden con la búsqueda (None = sin búsqueda)
+        
+        # Construcción de la galería por lotes y carga asíncrona de miniaturas
+        self.gallery_timer = QTimer(self)
+        self.gallery_timer.setSingleShot(True)
+        self.gallery_timer.setInterval(0)
+        self.gallery_timer.timeout.connect(self.build_next_gallery_batch)
+        self.icon_loader = IconLoader(self, self.ICON_SIZE, self.set_product_icon)
+        self.scroll_timer = QTimer(self)
+        self.scroll_timer.setSingleShot(True)
+        self.scroll_timer.setInterval(50)
+        self.scroll_timer.timeout.connect(self.icon_loader.prioritize)
+        
+        # Búsqueda en el índice de texto, con espera entre teclas
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.on_search_changed)
+        
         self.init_ui()
         self.load_products()
         self.build_products_gallery()
@@ -110,8 +138,8 @@ class ProductSelectionView(QWidget):
         
         # Búsqueda
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Buscar productos por nombre o SKU...")
-        self.search_input.textChanged.connect(self.filter_products)
+        self.search_input.setPlaceholderText("Buscar productos por nombre, SKU o categoría...")
+        self.search_input.textChanged.connect(self.search_timer.start)
         self.search_input.setFixedHeight(40)
         self.search_input.setStyleSheet("""
             QLineEdit {
@@ -216,6 +244,8 @@ class ProductSelectionView(QWidget):
         self.products_grid.setHorizontalSpacing(12)
         self.products_grid.setVerticalSpacing(12)
         self.products_scroll.setWidget(self.products_container)
+        # Al desplazarse, cargar primero las miniaturas que quedan a la vista
+        self.products_scroll.verticalScrollBar().valueChanged.connect(lambda *args: self.scroll_timer.start())
         
         products_layout.addWidget(self.products_scroll)
         products_section.setLayout(products_layout)
@@ -274,29 +304,17 @@ class ProductSelectionView(QWidget):
     
     def on_category_changed(self, category_name):
         """Filtra productos cuando cambia la categoría"""
-        search_text = self.search_input.text().lower()
-        
-        # Filtrar productos
-        for i in range(self.products_grid.count()):
-            widget = self.products_grid.itemAt(i).widget()
-            if isinstance(widget, QPushButton):
-                product = widget.product
-                
-                # Filtrar por categoría
-                if category_name != "Todas las categorías":
-                    if not product.category or product.category.name != category_name:
-                        widget.setVisible(False)
-                        continue
-                
-                # Filtrar por búsqueda
-                matches_search = not search_text or \
-                    search_text in product.name.lower() or \
-                    search_text in product.sku.lower()
-                
-                widget.setVisible(matches_search)
+        self.filter_products()
     
     def build_products_gallery(self):
-        """Construye la galería de productos"""
+        """
+        Construye la galería de productos: los botones de la primera pantalla
+        se crean de inmediato y el resto por lotes en las siguientes vueltas
+        del ciclo de eventos; las miniaturas llegan después (IconLoader)
+        """
+        self.gallery_timer.stop()
+        self.icon_loader.cancel()
+        
         # Limpiar grilla
         while self.products_grid.count():
             item = self.products_grid.takeAt(0)
@@ -304,140 +322,132 @@ class ProductSelectionView(QWidget):
             if w:
                 w.deleteLater()
         
-        max_cols = 6
-        row = 0
-        col = 0
-        
-        for product in self.products_cache:
-            # Crear botón del producto
-            btn = QPushButton()
-            btn.setFixedSize(140, 120)
-            btn.setStyleSheet("""
-                QPushButton { 
-                    background-color: white; 
-                    border: 2px solid #e2e8f0; 
-                    border-radius: 8px; 
-                    color: #0f172a;
-                    font-size: 11px;
-                    font-weight: bold;
-                    text-align: center;
-                }
-                QPushButton:hover { 
-                    background-color: #f1f5f9; 
-                    border-color: #3b82f6;
-                }
-                QPushButton:pressed {
-                    background-color: #dbeafe;
-                    border-color: #1d4ed8;
-                }
-            """)
-            
-            # Cargar imagen del producto
-            pix = None
-            if product.image_path:
-                # Construir ruta absoluta desde la raíz del proyecto
-                base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-                image_path = os.path.join(base_dir, product.image_path)
-                if os.path.exists(image_path):
-                    pix = QPixmap(image_path)
-            
-            # Si no hay imagen o no se cargó, intentar rutas alternativas (retrocompatibilidad)
-            if not pix or pix.isNull():
-                # Intentar con SKU o nombre del producto
-                base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-                alt_paths = [
-                    os.path.join(base_dir, "resources", "images", f"{product.sku}.png"),
-                    os.path.join(base_dir, "resources", "images", f"{product.name}.png"),
-                ]
-                for alt_path in alt_paths:
-                    if os.path.exists(alt_path):
-                        pix = QPixmap(alt_path)
-                        if not pix.isNull():
-                            break
-            
-            # Configurar imagen en el botón si existe
-            if pix and not pix.isNull():
-                # Escalar imagen para que quepa bien en la tarjeta (90x90 para tarjeta de 140x120)
-                scaled_pix = pix.scaled(
-                    90, 90,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                icon = QIcon(scaled_pix)
-                btn.setIcon(icon)
-                btn.setIconSize(scaled_pix.size())
-                btn.setText("")  # No mostrar texto cuando hay imagen
-                # Configurar estilo del botón con imagen
-                btn.setStyleSheet("""
-                    QPushButton { 
-                        background-color: white; 
-                        border: 2px solid #e2e8f0; 
-                        border-radius: 8px; 
-                    }
-                    QPushButton:hover { 
-                        background-color: #f1f5f9; 
-                        border-color: #3b82f6;
-                        border-width: 3px;
-                    }
-                    QPushButton:pressed {
-                        background-color: #dbeafe;
-                        border-color: #1d4ed8;
-                    }
-                """)
-            else:
-                # Si no hay imagen, mostrar nombre y precio
-                # Formatear precio
-                if product.sale_price == int(product.sale_price):
-                    price_text = f"${int(product.sale_price):,}"
-                else:
-                    price_text = f"${product.sale_price:.2f}"
-                
-                # Dividir nombre largo en múltiples líneas
-                display_name = product.name
-                if len(product.name) > 15:
-                    words = product.name.split()
-                    if len(words) > 1:
-                        mid_point = len(words) // 2
-                        line1 = ' '.join(words[:mid_point])
-                        line2 = ' '.join(words[mid_point:])
-                        display_name = f"{line1}\n{line2}"
-                    else:
-                        mid_point = len(product.name) // 2
-                        display_name = f"{product.name[:mid_point]}\n{product.name[mid_point:]}"
-                
-                btn.setText(f"{display_name}\n{price_text}\nStock: {product.stock}")
+        self.gallery_built = 0
+        self.build_gallery_batch(self.GALLERY_FIRST_BATCH)
+    
+    def build_next_gallery_batch(self):
+        self.build_gallery_batch(self.GALLERY_BATCH_SIZE)
+    
+    def build_gallery_batch(self, count):
+        """Crea los botones de los siguientes productos y encola sus miniaturas"""
+        category_name = self.category_filter.currentText()
+        start = self.gallery_built
+        loads = []
+        
+        for index, product in enumerate(self.products_cache[start:start + count], start):
+            btn = self.create_product_button(product)
+            self.products_grid.addWidget(btn, index // self.GALLERY_COLUMNS, index % self.GALLERY_COLUMNS)
             
-            # Crear tooltip con información completa del producto
-            category_name = product.category.name if product.category else "Sin categoría"
-            if product.sale_price == int(product.sale_price):
-                price_text = f"${int(product.sale_price):,}"
+            if not self.matches_filter(product, self.search_ids, category_name):
+                btn.setVisible(False)
+            elif btn.image_sources:
+                loads.append((btn, btn.image_sources))
+        
+        self.gallery_built = min(start + count, len(self.products_cache))
+        self.icon_loader.add(loads)
+        if self.gallery_built < len(self.products_cache):
+            self.gallery_timer.start()
+    
+    def create_product_button(self, product):
+        """Botón del producto con nombre, precio y stock (la imagen se agrega al cargarse)"""
+        # Crear botón del producto
+        btn = QPushButton()
+        btn.setFixedSize(140, 120)
+        btn.setStyleSheet("""
+            QPushButton { 
+                background-color: white; 
+                border: 2px solid #e2e8f0; 
+                border-radius: 8px; 
+                color: #0f172a;
+                font-size: 11px;
+                font-weight: bold;
+                text-align: center;
+            }
+            QPushButton:hover { 
+                background-color: #f1f5f9; 
+                border-color: #3b82f6;
+            }
+            QPushButton:pressed {
+                background-color: #dbeafe;
+                border-color: #1d4ed8;
+            }
+        """)
+        
+        # Mientras carga la miniatura (o si no tiene imagen), mostrar nombre y precio
+        # Formatear precio
+        if product.sale_price == int(product.sale_price):
+            price_text = f"${int(product.sale_price):,}"
+        else:
+            price_text = f"${product.sale_price:.2f}"
+        
+        # Dividir nombre largo en múltiples líneas
+        display_name = product.name
+        if len(product.name) > 15:
+            words = product.name.split()
+            if len(words) > 1:
+                mid_point = len(words) // 2
+                line1 = ' '.join(words[:mid_point])
+                line2 = ' '.join(words[mid_point:])
+                display_name = f"{line1}\n{line2}"
             else:
-                price_text = f"${product.sale_price:.2f}"
-            
-            tooltip_text = (
-                f"📦 {product.name}\n"
-                f"🏷️ SKU: {product.sku}\n"
-                f"💰 Precio: {price_text}\n"
-                f"📊 Stock: {product.stock}\n"
-                f"📁 Categoría: {category_name}\n"
-            )
-            if product.description:
-                tooltip_text += f"\n📝 {product.description[:100]}..."
-            tooltip_text += f"\n\n👆 Click para agregar (+1)"
-            
-            btn.setToolTip(tooltip_text)
-            
-            # Guardar referencia al producto en el botón para facilitar la búsqueda
-            btn.product = product
-            
-            # Conectar click
-            btn.clicked.connect(lambda checked=False, p=product: self.toggle_product_selection(p))
-            
-            self.products_grid.addWidget(btn, row, col)
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
+                mid_point = len(product.name) // 2
+                display_name = f"{product.name[:mid_point]}\n{product.name[mid_point:]}"
+        
+        btn.setText(f"{display_name}\n{price_text}\nStock: {product.stock}")
+    
+        # Crear tooltip con información completa del producto
+        category_name = product.category.name if product.category else "Sin categoría"
+        if product.sale_price == int(product.sale_price):
+            price_text = f"${int(product.sale_price):,}"
+        else:
+            price_text = f"${product.sale_price:.2f}"
+        
+        tooltip_text = (
+            f"📦 {product.name}\n"
+            f"🏷️ SKU: {product.sku}\n"
+            f"💰 Precio: {price_text}\n"
+            f"📊 Stock: {product.stock}\n"
+            f"📁 Categoría: {category_name}\n"
+        )
+        if product.description:
+            tooltip_text += f"\n📝 {product.description[:100]}..."
+        tooltip_text += f"\n\n👆 Click para agregar (+1)"
+        
+        btn.setToolTip(tooltip_text)
+        
+        # Guardar referencia al producto en el botón para facilitar la búsqueda
+        btn.product = product
+        
+        # Conectar click
+        btn.clicked.connect(lambda checked=False, p=product: self.toggle_product_selection(p))
+        
+        # Imágenes candidatas para la carga asíncrona de la miniatura
+        btn.image_sources = ThumbnailCache.sources_for(product)
+        return btn
+    
+    def set_product_icon(self, btn, pix):
+        """Pone la miniatura cargada en el botón del producto"""
+        icon = QIcon(pix)
+        btn.setIcon(icon)
+        btn.setIconSize(pix.size())
+        btn.setText("")  # No mostrar texto cuando hay imagen
+        # Configurar estilo del botón con imagen
+        btn.setStyleSheet("""
+            QPushButton { 
+                background-color: white; 
+                border: 2px solid #e2e8f0; 
+                border-radius: 8px; 
+            }
+            QPushButton:hover { 
+                background-color: #f1f5f9; 
+                border-color: #3b82f6;
+                border-width: 3px;
+            }
+            QPushButton:pressed {
+                background-color: #dbeafe;
+                border-color: #1d4ed8;
+            }
+        """)
     
     def toggle_product_selection(self, product):
         """Agrega o incrementa la cantidad de un producto"""
@@ -490,34 +500,48 @@ class ProductSelectionView(QWidget):
             self.btn_continue.setEnabled(True)
             self.btn_clear.setEnabled(True)
     
+    @staticmethod
+    def matches_filter(product, search_ids, category_name):
+        """True si el producto está entre los resultados de la búsqueda y es de la categoría"""
+        if category_name != "Todas las categorías":
+            if not product.category or product.category.name != category_name:
+                return False
+        return search_ids is None or product.id in search_ids
+    
+    def on_search_changed(self):
+        """Consulta el índice de búsqueda con el texto actual y filtra la galería"""
+        search = self.search_input.text()
+        if SearchIndex.match_query(search) is None:
+            self.search_ids = None
+        else:
+            session = get_session()
+            try:
+                self.search_ids = set(SearchIndex.search_products(session, search))
+            finally:
+                close_session()
+        self.filter_products()
+    
     def filter_products(self):
-        """Filtra productos por texto de búsqueda (nombre o SKU)"""
-        search_text = self.search_input.text().lower()
+        """
+        Filtra productos por los resultados de la búsqueda y la categoría
+        Las miniaturas pendientes se descartan y se encolan las de los
+        productos que quedan visibles
+        """
         category_name = self.category_filter.currentText()
         
-        # Filtrar productos
+        self.icon_loader.cancel()
+        loads = []
+        
+        # Filtrar productos (los que aún no tienen botón se filtran al crearlo)
         for i in range(self.products_grid.count()):
             widget = self.products_grid.itemAt(i).widget()
-            if isinstance(widget, QPushButton):
-                # Si el botón tiene referencia al producto, buscar directamente
-                if hasattr(widget, 'product'):
-                    product = widget.product
-                    product_name = product.name.lower()
-                    product_sku = product.sku.lower()
-                    
-                    # Filtrar por categoría
-                    matches_category = True
-                    if category_name != "Todas las categorías":
-                        if not product.category or product.category.name != category_name:
-                            matches_category = False
-                    
-                    # Mostrar si coincide con nombre o SKU y categoría
-                    matches_search = not search_text or (search_text in product_name or search_text in product_sku)
-                    widget.setVisible(matches_category and matches_search)
-                else:
-                    # Fallback: buscar en el tooltip como antes
-                    tooltip_text = widget.toolTip().lower()
-                    widget.setVisible(search_text in tooltip_text)
+            if isinstance(widget, QPushButton) and hasattr(widget, 'product'):
+                visible = self.matches_filter(widget.product, self.search_ids, category_name)
+                widget.setVisible(visible)
+                if visible and widget.image_sources and widget.icon().isNull():
+                    loads.append((widget, widget.image_sources))
+        
+        self.icon_loader.add(loads)
     
     def continue_to_sale(self):
         """Continúa a la vista de completar venta"""
@@ -11,10 +11,15 @@ from PyQt6.QtWidgets import (
     QFileDialog
 )
 from PyQt6.QtGui import QDoubleValidator, QShowEvent, QPixmap
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from config.database import get_session, close_session
 from models import Product, Category, RawMaterial, ProductMaterial, InventoryMovement, MovementType
+from database.product_repository import ProductRepository
 from ui.views.increase_stock_dialogs import IncreaseStockDialog, IncreaseStockAllDialog
+from ui.widgets.paged_table import PagedTableLoader
+from ui.widgets.view_refresher import ViewRefresher
+from ui.widgets.thumbnail_cache import ThumbnailCache
+from core.events import EventBus, ProductUpdated, StockChanged
 
 class ProductsView(QWidget):
     """Vista para gestionar productos"""
@@ -97,7 +102,7 @@ class ProductsView(QWidget):
         search_layout = QHBoxLayout()
         
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Buscar por nombre o SKU...")
+        self.search_input.setPlaceholderText("Buscar por nombre, SKU o categoría...")
         self.search_input.textChanged.connect(self.search_products)
         self.search_input.setFixedHeight(40)
         self.search_input.setStyleSheet("color: #0f172a;")
@@ -140,156 +145,166 @@ class ProductsView(QWidget):
         self.table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         
         layout.addWidget(self.table)
+        
+        # Carga por páginas: solo se traen las filas que se van a ver
+        self.loader = PagedTableLoader(
+            self.table, ProductRepository, self.fill_product_row,
+            row_height=50,  # Altura suficiente para los botones
+            on_error=self.show_load_error
+        )
+        
+        # Buscar en la base de datos cuando el usuario deja de escribir
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.load_products)
+        
+        # Refresco incremental: solo las filas de los productos que cambiaron
+        self.refresher = ViewRefresher(self, self.load_products, self.loader.refresh_rows)
+        self.refresher.subscribe(StockChanged, self.on_stock_changed)
+        self.refresher.subscribe(ProductUpdated, self.on_products_updated)
     
     def showEvent(self, event: QShowEvent):
         """Se ejecuta cuando la vista se muestra"""
         super().showEvent(event)
-        self.load_products()
+        # Solo aplica los cambios publicados mientras la vista estaba oculta
+        self.refresher.on_show()
     
     def load_products(self):
-        """Carga todos los productos en la tabla"""
-        session = get_session()
-        try:
-            products = session.query(Product).all()
-            
-            self.table.setRowCount(len(products))
-            
-            for row, product in enumerate(products):
-                # ID
-                self.table.setItem(row, 0, QTableWidgetItem(str(product.id)))
-                
-                # SKU
-                self.table.setItem(row, 1, QTableWidgetItem(product.sku))
-                
-                # Nombre
-                self.table.setItem(row, 2, QTableWidgetItem(product.name))
-                
-                # Categoría
-                category_name = product.category.name if product.category else "Sin categoría"
-                self.table.setItem(row, 3, QTableWidgetItem(category_name))
-                
-                # Precio de venta
-                price_item = QTableWidgetItem(f"${product.sale_price:,.2f}")
-                price_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                self.table.setItem(row, 4, price_item)
-                
-                # Stock
-                stock_item = QTableWidgetItem(str(product.stock))
-                stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                
-                # Colorear según stock
-                if product.is_low_stock:
-                    stock_item.setBackground(Qt.GlobalColor.yellow)
-                
-                self.table.setItem(row, 5, stock_item)
-                
-                # Botones de acción
-                actions_widget = QWidget()
-                actions_layout = QHBoxLayout(actions_widget)
-                actions_layout.setContentsMargins(4, 2, 4, 2)
-                actions_layout.setSpacing(0)
-                
-                # Botón agregar stock (verde, izquierda redondeada)
-                btn_add_stock = QPushButton("➕")
-                btn_add_stock.setFixedSize(40, 32)
-                btn_add_stock.setToolTip("Aumentar stock")
-                btn_add_stock.setStyleSheet("""
-                    QPushButton {
-                        background-color: #10b981;
-                        color: white;
-                        border: none;
-                        border-top-left-radius: 4px;
-                        border-bottom-left-radius: 4px;
-                        border-top-right-radius: 0px;
-                        border-bottom-right-radius: 0px;
-                        font-size: 16px;
-                        font-weight: bold;
-                        padding: 0px;
-                    }
-                    QPushButton:hover {
-                        background-color: #059669;
-                    }
-                """)
-                btn_add_stock.clicked.connect(lambda checked, p=product: self.increase_product_stock(p))
-                actions_layout.addWidget(btn_add_stock)
-                
-                # Botón editar (azul, sin bordes redondeados)
-                btn_edit = QPushButton("✏️")
-                btn_edit.setFixedSize(40, 32)
-                btn_edit.setToolTip("Editar producto")
-                btn_edit.setStyleSheet("""
-                    QPushButton {
-                        background-color: #2563eb;
-                        color: white;
-                        border: none;
-                        border-radius: 0px;
-                        font-size: 14px;
-                        padding: 0px;
-                    }
-                    QPushButton:hover {
-                        background-color: #1d4ed8;
-                    }
-                """)
-                btn_edit.clicked.connect(lambda checked, p=product: self.edit_product(p))
-                actions_layout.addWidget(btn_edit)
-                
-                # Botón eliminar (rojo, derecha redondeada)
-                btn_delete = QPushButton("🗑️")
-                btn_delete.setFixedSize(40, 32)
-                btn_delete.setToolTip("Eliminar producto")
-                btn_delete.setStyleSheet("""
-                    QPushButton {
-                        background-color: #ef4444;
-                        color: white;
-                        border: none;
-                        border-top-left-radius: 0px;
-                        border-bottom-left-radius: 0px;
-                        border-top-right-radius: 4px;
-                        border-bottom-right-radius: 4px;
-                        font-size: 14px;
-                        padding: 0px;
-                    }
-                    QPushButton:hover {
-                        background-color: #dc2626;
-                    }
-                """)
-                btn_delete.clicked.connect(lambda checked, p=product: self.delete_product(p))
-                actions_layout.addWidget(btn_delete)
-                
-                self.table.setCellWidget(row, 6, actions_widget)
-                self.table.setRowHeight(row, 50)  # Altura suficiente para los botones
-            
-            # Eliminar ajuste automático por contenido que encoge columnas y rompe el stretch
-            # self.table.resizeColumnsToContents()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al cargar productos: {str(e)}")
-        finally:
-            close_session()
+        """Carga la primera página de productos según la búsqueda actual"""
+        self.loader.reload({'search': self.search_input.text()})
+    
+    def fill_product_row(self, row, product):
+        """Pinta un producto en una fila de la tabla"""
+        # ID
+        self.table.setItem(row, 0, QTableWidgetItem(str(product.id)))
+        
+        # SKU
+        self.table.setItem(row, 1, QTableWidgetItem(product.sku))
+        
+        # Nombre
+        self.table.setItem(row, 2, QTableWidgetItem(product.name))
+        
+        # Categoría
+        category_name = product.category.name if product.category else "Sin categoría"
+        self.table.setItem(row, 3, QTableWidgetItem(category_name))
+        
+        # Precio de venta
+        price_item = QTableWidgetItem(f"${product.sale_price:,.2f}")
+        price_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.table.setItem(row, 4, price_item)
+        
+        # Stock
+        stock_item = QTableWidgetItem(str(product.stock))
+        stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        # Colorear según stock
+        if product.is_low_stock:
+            stock_item.setBackground(Qt.GlobalColor.yellow)
+        
+        self.table.setItem(row, 5, stock_item)
+        
+        # Botones de acción
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(4, 2, 4, 2)
+        actions_layout.setSpacing(0)
+        
+        # Botón agregar stock (verde, izquierda redondeada)
+        btn_add_stock = QPushButton("➕")
+        btn_add_stock.setFixedSize(40, 32)
+        btn_add_stock.setToolTip("Aumentar stock")
+        btn_add_stock.setStyleSheet("""
+            QPushButton {
+                background-color: #10b981;
+                color: white;
+                border: none;
+                border-top-left-radius: 4px;
+                border-bottom-left-radius: 4px;
+                border-top-right-radius: 0px;
+                border-bottom-right-radius: 0px;
+                font-size: 16px;
+                font-weight: bold;
+                padding: 0px;
+            }
+            QPushButton:hover {
+                background-color: #059669;
+            }
+        """)
+        btn_add_stock.clicked.connect(lambda checked, p=product: self.increase_product_stock(p))
+        actions_layout.addWidget(btn_add_stock)
+        
+        # Botón editar (azul, sin bordes redondeados)
+        btn_edit = QPushButton("✏️")
+        btn_edit.setFixedSize(40, 32)
+        btn_edit.setToolTip("Editar producto")
+        btn_edit.setStyleSheet("""
+            QPushButton {
+                background-color: #2563eb;
+                color: white;
+                border: none;
+                border-radius: 0px;
+                font-size: 14px;
+                padding: 0px;
+            }
+            QPushButton:hover {
+                background-color: #1d4ed8;
+            }
+        """)
+        btn_edit.clicked.connect(lambda checked, p=product: self.edit_product(p))
+        actions_layout.addWidget(btn_edit)
+        
+        # Botón eliminar (rojo, derecha redondeada)
+        btn_delete = QPushButton("🗑️")
+        btn_delete.setFixedSize(40, 32)
+        btn_delete.setToolTip("Eliminar producto")
+        btn_delete.setStyleSheet("""
+            QPushButton {
+                background-color: #ef4444;
+                color: white;
+                border: none;
+                border-top-left-radius: 0px;
+                border-bottom-left-radius: 0px;
+                border-top-right-radius: 4px;
+                border-bottom-right-radius: 4px;
+                font-size: 14px;
+                padding: 0px;
+            }
+            QPushButton:hover {
+                background-color: #dc2626;
+            }
+        """)
+        btn_delete.clicked.connect(lambda checked, p=product: self.delete_product(p))
+        actions_layout.addWidget(btn_delete)
+        
+        self.table.setCellWidget(row, 6, actions_widget)
+    
+    def show_load_error(self, error):
+        QMessageBox.critical(self, "Error", f"Error al cargar productos: {str(error)}")
+    
+    def on_stock_changed(self, event):
+        self.refresher.patch(event.product_ids)
+    
+    def on_products_updated(self, event):
+        if event.created:
+            self.refresher.invalidate()  # El nuevo producto puede ir en cualquier posición
+        else:
+            self.refresher.patch(event.product_ids)
     
     def search_products(self, text):
-        """Busca productos por nombre o SKU"""
-        for row in range(self.table.rowCount()):
-            sku = self.table.item(row, 1).text().lower()
-            name = self.table.item(row, 2).text().lower()
-            
-            if text.lower() in sku or text.lower() in name:
-                self.table.setRowHidden(row, False)
-            else:
-                self.table.setRowHidden(row, True)
+        """Busca productos por nombre, SKU, descripción o categoría (índice de búsqueda, con espera entre teclas)"""
+        self.search_timer.start()
     
     def add_product(self):
         """Abre diálogo para agregar producto"""
         dialog = ProductDialog(self)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_products()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def import_products(self):
         """Abre diálogo para importar productos desde Excel/CSV"""
         from ui.views.import_products_dialog import ImportProductsDialog
         dialog = ImportProductsDialog(self)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_products()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def manage_categories(self):
         """Abre diálogo para gestionar categorías"""
@@ -299,20 +314,17 @@ class ProductsView(QWidget):
     def edit_product(self, product):
         """Abre diálogo para editar producto"""
         dialog = ProductDialog(self, product)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_products()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def increase_product_stock(self, product):
         """Abre diálogo para aumentar stock de un producto específico"""
         dialog = IncreaseStockDialog(self, product)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_products()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def increase_stock_all_products(self):
         """Abre diálogo para aumentar stock a todos los productos"""
         dialog = IncreaseStockAllDialog(self)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_products()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def delete_product(self, product):
         """Elimina un producto"""
@@ -340,11 +352,12 @@ class ProductsView(QWidget):
                 session.query(ProductMaterial).filter_by(product_id=product.id).delete()
                 
                 # Eliminar el producto
+                product_id = product.id
                 session.delete(product)
                 
                 session.commit()
+                EventBus.publish(ProductUpdated([product_id], deleted=True))
                 QMessageBox.information(self, "Éxito", "Producto eliminado correctamente")
-                self.load_products()
             except Exception as e:
                 session.rollback()
                 QMessageBox.critical(self, "Error", f"Error al eliminar: {str(e)}")
@@ -583,6 +596,7 @@ class CategoriesDialog(QDialog):
             
             session.delete(category)
             session.commit()
+            EventBus.publish(ProductUpdated())  # Los productos muestran el nombre de la categoría
             QMessageBox.information(self, "Éxito", "Categoría eliminada correctamente")
             self.load_categories()
             
@@ -700,6 +714,8 @@ class CategoryFormDialog(QDialog):
                 session.add(category)
             
             session.commit()
+            if self.is_editing:
+                EventBus.publish(ProductUpdated())  # Los productos muestran el nombre de la categoría
             
             QMessageBox.information(self, "Éxito", "Categoría guardada correctamente")
             self.accept()
@@ -1004,8 +1020,9 @@ class ProductDialog(QDialog):
             if os.path.exists(dest_path):
                 os.remove(dest_path)
             
-            # Copiar la nueva imagen
+            # Copiar la nueva imagen y generar sus miniaturas para las galerías de venta
             shutil.copy2(source_path, dest_path)
+            ThumbnailCache.create(dest_path)
             
             # Retornar ruta relativa desde la raíz del proyecto
             return os.path.join('resources', 'images', 'products', filename)
@@ -1020,6 +1037,7 @@ class ProductDialog(QDialog):
             absolute_image_path = os.path.join(base_dir, image_path)
             if os.path.exists(absolute_image_path):
                 os.remove(absolute_image_path)
+            ThumbnailCache.discard(absolute_image_path)
         except Exception as e:
             # No es crítico si falla la eliminación
             print(f"Warning: No se pudo eliminar la imagen antigua: {str(e)}")
@@ -1134,8 +1152,10 @@ class ProductDialog(QDialog):
                 )
                 session.add(product_material)
             
+            product_id = product.id
             session.commit()
             self.product = product
+            EventBus.publish(ProductUpdated([product_id], created=not self.is_editing))
             
             QMessageBox.information(
                 self, 
@@ -1440,6 +1460,7 @@ class ProductMaterialsDialog(QDialog):
                 session.add(product_material)
 
             session.commit()
+            EventBus.publish(ProductUpdated([self.product.id]))
 
             QMessageBox.information(
                 self,
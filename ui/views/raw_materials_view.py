@@ -6,9 +6,13 @@ from PyQt6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QLineEdit, QMessageBox,
     QDialog, QFormLayout, QComboBox, QDoubleSpinBox, QTextEdit, QHeaderView
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QShowEvent
 from config.database import get_session, close_session
+from database.raw_material_repository import RawMaterialRepository
+from ui.widgets.paged_table import PagedTableLoader
+from ui.widgets.view_refresher import ViewRefresher
+from core.events import EventBus, RawMaterialUpdated, StockChanged
 from models import RawMaterial, RawMaterialMovement, RawMaterialMovementType
 from ui.views.increase_stock_raw_materials_dialog import IncreaseStockAllRawMaterialsDialog
 
@@ -22,10 +26,10 @@ class RawMaterialsView(QWidget):
     def showEvent(self, event: QShowEvent):
         """Evento que se ejecuta cuando la vista se muestra"""
         super().showEvent(event)
-        # Auto-refrescar datos cuando se accede a la vista
         if event.spontaneous():
             return
-        self.load_raw_materials()
+        # Solo aplica los cambios publicados mientras la vista estaba oculta
+        self.refresher.on_show()
     
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -108,122 +112,135 @@ class RawMaterialsView(QWidget):
         self.table.horizontalHeader().setStretchLastSection(False)
         
         layout.addWidget(self.table)
+        
+        # Carga por páginas: solo se traen las filas que se van a ver
+        self.loader = PagedTableLoader(
+            self.table, RawMaterialRepository, self.fill_material_row,
+            row_height=50,
+            on_error=self.show_load_error
+        )
+        
+        # Buscar en la base de datos cuando el usuario deja de escribir
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.load_raw_materials)
+        
+        # Refresco incremental: solo las filas de las materias primas que cambiaron
+        self.refresher = ViewRefresher(self, self.load_raw_materials, self.loader.refresh_rows)
+        self.refresher.subscribe(StockChanged, self.on_stock_changed)
+        self.refresher.subscribe(RawMaterialUpdated, self.on_materials_updated)
     
     def load_raw_materials(self):
-        """Carga todas las materias primas"""
-        session = get_session()
-        try:
-            materials = session.query(RawMaterial).all()
-            
-            self.table.setRowCount(len(materials))
-            
-            for row, material in enumerate(materials):
-                # ID
-                self.table.setItem(row, 0, QTableWidgetItem(str(material.id)))
-                
-                # SKU
-                self.table.setItem(row, 1, QTableWidgetItem(material.sku))
-                
-                # Nombre
-                name_item = QTableWidgetItem(material.name)
-                if material.is_low_stock:
-                    name_item.setForeground(Qt.GlobalColor.red)
-                self.table.setItem(row, 2, name_item)
-                
-                # Unidad
-                self.table.setItem(row, 3, QTableWidgetItem(material.unit))
-                
-                # Costo por unidad
-                self.table.setItem(row, 4, QTableWidgetItem(f"${material.cost_per_unit:.2f}"))
-                
-                # Stock
-                stock_item = QTableWidgetItem(f"{material.stock:.2f}")
-                if material.is_low_stock:
-                    stock_item.setForeground(Qt.GlobalColor.red)
-                self.table.setItem(row, 5, stock_item)
-                
-                # Botones de acción
-                actions_widget = QWidget()
-                actions_layout = QHBoxLayout(actions_widget)
-                actions_layout.setContentsMargins(8, 5, 8, 5)
-                actions_layout.setSpacing(8)
-                
-                btn_edit = QPushButton("Editar")
-                btn_edit.setFixedHeight(32)
-                btn_edit.setMinimumWidth(80)
-                btn_edit.setStyleSheet("""
-                    QPushButton {
-                        background-color: #3b82f6;
-                        color: white;
-                        border: none;
-                        border-radius: 4px;
-                        font-size: 12px;
-                        font-weight: 500;
-                        padding: 4px 8px;
-                    }
-                    QPushButton:hover {
-                        background-color: #2563eb;
-                    }
-                """)
-                btn_edit.clicked.connect(lambda checked, m=material: self.edit_material(m))
-                
-                btn_delete = QPushButton("Eliminar")
-                btn_delete.setFixedHeight(32)
-                btn_delete.setMinimumWidth(80)
-                btn_delete.setStyleSheet("""
-                    QPushButton {
-                        background-color: #ef4444;
-                        color: white;
-                        border: none;
-                        border-radius: 4px;
-                        font-size: 12px;
-                        font-weight: 500;
-                        padding: 4px 8px;
-                    }
-                    QPushButton:hover {
-                        background-color: #dc2626;
-                    }
-                """)
-                btn_delete.clicked.connect(lambda checked, m=material: self.delete_material(m))
-                
-                actions_layout.addWidget(btn_edit)
-                actions_layout.addWidget(btn_delete)
-                
-                self.table.setCellWidget(row, 6, actions_widget)
-                self.table.setRowHeight(row, 50)
+        """Carga la primera página de materias primas según la búsqueda actual"""
+        self.loader.reload({'search': self.search_input.text()})
+    
+    def fill_material_row(self, row, material):
+        """Pinta una materia prima en una fila de la tabla"""
+        # ID
+        self.table.setItem(row, 0, QTableWidgetItem(str(material.id)))
         
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al cargar materias primas: {str(e)}")
-        finally:
-            close_session()
+        # SKU
+        self.table.setItem(row, 1, QTableWidgetItem(material.sku))
+        
+        # Nombre
+        name_item = QTableWidgetItem(material.name)
+        if material.is_low_stock:
+            name_item.setForeground(Qt.GlobalColor.red)
+        self.table.setItem(row, 2, name_item)
+        
+        # Unidad
+        self.table.setItem(row, 3, QTableWidgetItem(material.unit))
+        
+        # Costo por unidad
+        self.table.setItem(row, 4, QTableWidgetItem(f"${material.cost_per_unit:.2f}"))
+        
+        # Stock
+        stock_item = QTableWidgetItem(f"{material.stock:.2f}")
+        if material.is_low_stock:
+            stock_item.setForeground(Qt.GlobalColor.red)
+        self.table.setItem(row, 5, stock_item)
+        
+        # Botones de acción
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(8, 5, 8, 5)
+        actions_layout.setSpacing(8)
+        
+        btn_edit = QPushButton("Editar")
+        btn_edit.setFixedHeight(32)
+        btn_edit.setMinimumWidth(80)
+        btn_edit.setStyleSheet("""
+            QPushButton {
+                background-color: #3b82f6;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                font-size: 12px;
+                font-weight: 500;
+                padding: 4px 8px;
+            }
+            QPushButton:hover {
+                background-color: #2563eb;
+            }
+        """)
+        btn_edit.clicked.connect(lambda checked, m=material: self.edit_material(m))
+        
+        btn_delete = QPushButton("Eliminar")
+        btn_delete.setFixedHeight(32)
+        btn_delete.setMinimumWidth(80)
+        btn_delete.setStyleSheet("""
+            QPushButton {
+                background-color: #ef4444;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                font-size: 12px;
+                font-weight: 500;
+                padding: 4px 8px;
+            }
+            QPushButton:hover {
+                background-color: #dc2626;
+            }
+        """)
+        btn_delete.clicked.connect(lambda checked, m=material: self.delete_material(m))
+        
+        actions_layout.addWidget(btn_edit)
+        actions_layout.addWidget(btn_delete)
+        
+        self.table.setCellWidget(row, 6, actions_widget)
+    
+    def show_load_error(self, error):
+        QMessageBox.critical(self, "Error", f"Error al cargar materias primas: {str(error)}")
+    
+    def on_stock_changed(self, event):
+        if event.raw_material_ids:
+            self.refresher.patch(event.raw_material_ids)
+    
+    def on_materials_updated(self, event):
+        if event.created:
+            self.refresher.invalidate()  # La nueva materia prima puede ir en cualquier posición
+        else:
+            self.refresher.patch(event.raw_material_ids)
     
     def search_materials(self, text):
-        """Busca materias primas por nombre o SKU"""
-        for row in range(self.table.rowCount()):
-            sku = self.table.item(row, 1).text().lower()
-            name = self.table.item(row, 2).text().lower()
-            if text.lower() in sku or text.lower() in name:
-                self.table.setRowHidden(row, False)
-            else:
-                self.table.setRowHidden(row, True)
+        """Busca materias primas por nombre o SKU (en la base de datos, con espera entre teclas)"""
+        self.search_timer.start()
     
     def create_new_material(self):
         """Crea una nueva materia prima"""
         dialog = MaterialDialog(self)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_raw_materials()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def edit_material(self, material):
         """Edita una materia prima existente"""
         dialog = MaterialDialog(self, material)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_raw_materials()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def increase_stock_all_materials(self):
         """Abre diálogo para aumentar stock a todas las materias primas"""
         dialog = IncreaseStockAllRawMaterialsDialog(self)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_raw_materials()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def delete_material(self, material):
         """Elimina una materia prima"""
@@ -255,8 +272,8 @@ class RawMaterialsView(QWidget):
                 session.delete(material_to_delete)
                 
                 session.commit()
+                EventBus.publish(RawMaterialUpdated([material.id], deleted=True))
                 QMessageBox.information(self, "Éxito", "Materia prima eliminada correctamente")
-                self.load_raw_materials()
             except Exception as e:
                 session.rollback()
                 QMessageBox.critical(self, "Error", f"Error al eliminar materia prima: {str(e)}")
@@ -439,6 +456,7 @@ class MaterialDialog(QDialog):
                 session.add(material)
             
             session.commit()
+            EventBus.publish(RawMaterialUpdated([material.id], created=not self.is_edit))
             
             action = "actualizada" if self.is_edit else "creada"
             QMessageBox.information(self, "Éxito", f"Materia prima {action} correctamente.")
@@ -4,24 +4,69 @@ Vista de Reportes - Estadísticas y reportes del negocio
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTableWidget, QTableWidgetItem, QComboBox, QDateEdit,
-    QHeaderView, QGroupBox, QFormLayout, QScrollArea, QFrame,
-    QMessageBox, QFileDialog
+    QHeaderView, QGroupBox, QFormLayout, QScrollArea, QFrame
 )
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QTimer
+from PyQt6.QtGui import QShowEvent
 from datetime import datetime, timedelta
-from config.database import get_session, close_session
-from models import Sale, Product, Customer, SaleItem, RawMaterial, RawMaterialMovement, RawMaterialMovementType, ProductMaterial
-from sqlalchemy import func, desc
-from sqlalchemy.orm import joinedload
+from services.report_service import ReportService
+from ui.widgets.report_runner import ReportRunner
+from ui.widgets.view_refresher import ViewRefresher
+from ui.widgets.export_runner import get_export_path, run_export
+from services.export_service import ExportSheet
+from core.events import (
+    SaleCommitted, SaleCancelled, SaleUpdated, SalesCleared, StockChanged,
+    ProductUpdated, RawMaterialUpdated, CustomerUpdated
+)
 
 class ReportsView(QWidget):
     """Vista para reportes y estadísticas"""
     def __init__(self):
         super().__init__()
         self.init_ui()
+        
+        # Tablas por nombre de reporte (ver load_reports)
+        self.report_tables = {
+            'top_products': self.top_products_table,
+            'top_customers': self.top_customers_table,
+            'low_stock_products': self.low_stock_table,
+            'materials_consumption': self.materials_consumption_table,
+            'production_projection': self.production_projection_table,
+            'low_materials_stock': self.low_materials_stock_table,
+        }
+        
+        # Las consultas corren en segundo plano y cada tabla se llena al llegar su resultado
+        self.report_runner = ReportRunner(self)
+        self.report_runner.report_ready.connect(self.on_report_ready)
+        self.report_runner.report_failed.connect(self.on_report_failed)
+        
+        # Recargar al cambiar el período (esperando a que el usuario termine de editar)
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(300)
+        self.reload_timer.timeout.connect(self.load_reports)
+        self.date_from.dateChanged.connect(self.schedule_reload)
+        self.date_to.dateChanged.connect(self.schedule_reload)
+        
+        # Ventas (también editadas: fecha, descuento, impuesto), stock o catálogo cambiados:
+        # recargar al mostrarse (o ya si está visible); el temporizador agrupa los eventos
+        # de una misma operación en una sola recarga
+        self.refresher = ViewRefresher(self, self.schedule_reload)
+        event_types = (
+            SaleCommitted, SaleCancelled, SaleUpdated, SalesCleared, StockChanged,
+            ProductUpdated, RawMaterialUpdated, CustomerUpdated
+        )
+        for event_type in event_types:
+            self.refresher.subscribe(event_type, lambda event: self.refresher.invalidate())
+        
         # Cargar reportes después de que la UI esté lista
         self.load_reports()
     
+    def showEvent(self, event: QShowEvent):
+        """Se ejecuta cuando la vista se muestra"""
+        super().showEvent(event)
+        self.refresher.on_show()
+    
     def init_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(30, 30, 30, 30)
@@ -426,466 +471,275 @@ class ReportsView(QWidget):
         layout.addWidget(scroll)
     
     def load_reports(self):
-        """Carga todos los reportes"""
-        self.load_top_products()
-        self.load_top_customers()
-        self.load_low_stock_products()
-        self.load_materials_consumption()
-        self.load_production_projection()
-        self.load_low_materials_stock()
+        """
+        Carga todos los reportes en segundo plano
+        Cada tabla se llena apenas llega su resultado; si cambia el período
+        mientras se ejecutan, la ejecución anterior se cancela
+        """
+        date_from = self.date_from.date().toPyDate()
+        date_to = self.date_to.date().toPyDate()
+        
+        for table in self.report_tables.values():
+            self.show_table_message(table, "Cargando...")
+        
+        self.report_runner.run({
+            'top_products': lambda session: ReportService.top_products(session, date_from, date_to),
+            'top_customers': lambda session: ReportService.top_customers(session, date_from, date_to),
+            'low_stock_products': ReportService.low_stock_products,
+            'materials_consumption': lambda session: ReportService.materials_consumption(session, date_from, date_to),
+            'production_projection': ReportService.production_projection,
+            'low_materials_stock': ReportService.low_materials_stock,
+        })
     
-    def load_top_products(self):
-        """Carga los productos más vendidos"""
-        session = get_session()
+    def on_report_ready(self, name, rows):
+        """Pinta el resultado de un reporte (hilo de la interfaz)"""
+        fill = {
+            'top_products': self.fill_top_products,
+            'top_customers': self.fill_top_customers,
+            'low_stock_products': self.fill_low_stock_products,
+            'materials_consumption': self.fill_materials_consumption,
+            'production_projection': self.fill_production_projection,
+            'low_materials_stock': self.fill_low_materials_stock,
+        }[name]
         try:
-            date_from = self.date_from.date().toPyDate()
-            date_to = self.date_to.date().toPyDate()
-            
-            from datetime import datetime
-            datetime_from = datetime.combine(date_from, datetime.min.time())
-            datetime_to = datetime.combine(date_to, datetime.max.time())
-            
-            # Consulta de productos más vendidos (sin filtro de status)
-            top_products = session.query(
-                Product.name,
-                func.sum(SaleItem.quantity).label('total_quantity'),
-                func.sum(SaleItem.subtotal).label('total_amount')
-            ).join(
-                SaleItem, Product.id == SaleItem.product_id
-            ).join(
-                Sale, SaleItem.sale_id == Sale.id
-            ).filter(
-                Sale.created_at.between(datetime_from, datetime_to)
-            ).group_by(
-                Product.id, Product.name
-            ).order_by(
-                desc('total_quantity')
-            ).limit(10).all()
-            
-            # Llenar tabla
-            self.top_products_table.setRowCount(len(top_products))
-            
-            for row, (name, quantity, amount) in enumerate(top_products):
-                self.top_products_table.setItem(row, 0, QTableWidgetItem(f"#{row + 1}"))
-                self.top_products_table.setItem(row, 1, QTableWidgetItem(name))
-                self.top_products_table.setItem(row, 2, QTableWidgetItem(f"{int(quantity)} unidades"))
-                self.top_products_table.setItem(row, 3, QTableWidgetItem(f"${amount:,.2f}"))
-            
+            fill(rows)
         except Exception as e:
-            print(f"Error al cargar productos más vendidos: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            close_session()
+            print(f"Error al mostrar el reporte {name}: {e}")
     
-    def load_top_customers(self):
-        """Carga los mejores clientes"""
-        session = get_session()
-        try:
-            date_from = self.date_from.date().toPyDate()
-            date_to = self.date_to.date().toPyDate()
-            
-            from datetime import datetime
-            datetime_from = datetime.combine(date_from, datetime.min.time())
-            datetime_to = datetime.combine(date_to, datetime.max.time())
-            
-            # Consulta de mejores clientes (sin filtro de status)
-            top_customers = session.query(
-                Customer.name,
-                func.count(Sale.id).label('purchase_count'),
-                func.sum(Sale.total).label('total_amount')
-            ).join(
-                Sale, Customer.id == Sale.customer_id
-            ).filter(
-                Sale.created_at.between(datetime_from, datetime_to)
-            ).group_by(
-                Customer.id, Customer.name
-            ).order_by(
-                desc('total_amount')
-            ).limit(10).all()
-            
-            # Llenar tabla
-            self.top_customers_table.setRowCount(len(top_customers))
-            
-            for row, (name, count, amount) in enumerate(top_customers):
-                self.top_customers_table.setItem(row, 0, QTableWidgetItem(f"#{row + 1}"))
-                self.top_customers_table.setItem(row, 1, QTableWidgetItem(name))
-                self.top_customers_table.setItem(row, 2, QTableWidgetItem(f"{count} compras"))
-                self.top_customers_table.setItem(row, 3, QTableWidgetItem(f"${amount:,.2f}"))
-            
-        except Exception as e:
-            print(f"Error al cargar mejores clientes: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            close_session()
+    def on_report_failed(self, name, message):
+        print(f"Error al cargar el reporte {name}: {message}")
+        self.show_table_message(self.report_tables[name], "Error al cargar el reporte")
     
-    def load_low_stock_products(self):
-        """Carga productos con stock bajo"""
-        session = get_session()
-        try:
-            # Productos con stock bajo o igual al mínimo
-            low_stock_products = session.query(Product).filter(
-                Product.stock <= Product.min_stock
-            ).all()
-            
-            # Llenar tabla
-            self.low_stock_table.setRowCount(len(low_stock_products))
-            
-            for row, product in enumerate(low_stock_products):
-                self.low_stock_table.setItem(row, 0, QTableWidgetItem(product.name))
-                
-                stock_item = QTableWidgetItem(str(product.stock))
-                stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.low_stock_table.setItem(row, 1, stock_item)
-                
-                min_stock_item = QTableWidgetItem(str(product.min_stock))
-                min_stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.low_stock_table.setItem(row, 2, min_stock_item)
-                
-                # Estado
-                if product.stock == 0:
-                    status = "SIN STOCK"
-                    color = Qt.GlobalColor.red
-                elif product.stock <= product.min_stock:
-                    status = "BAJO"
-                    color = Qt.GlobalColor.darkYellow
-                else:
-                    status = "NORMAL"
-                    color = Qt.GlobalColor.darkGreen
-                
-                status_item = QTableWidgetItem(status)
-                status_item.setForeground(color)
-                status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.low_stock_table.setItem(row, 3, status_item)
-            
-            if len(low_stock_products) == 0:
-                self.low_stock_table.setRowCount(1)
-                self.low_stock_table.setItem(0, 0, QTableWidgetItem("No hay productos con stock bajo"))
-                self.low_stock_table.setSpan(0, 0, 1, 4)
-            
-        except Exception as e:
-            print(f"Error al cargar productos con stock bajo: {e}")
-        finally:
-            close_session()
+    def show_table_message(self, table, text):
+        """Muestra un mensaje en una sola fila que ocupa toda la tabla"""
+        table.clearSpans()
+        table.setRowCount(1)
+        table.setItem(0, 0, QTableWidgetItem(text))
+        for column in range(1, table.columnCount()):
+            table.setItem(0, column, QTableWidgetItem(""))
+        table.setSpan(0, 0, 1, table.columnCount())
     
-    def load_materials_consumption(self):
-        """Carga el consumo de materias primas en el período seleccionado"""
-        session = get_session()
-        try:
-            date_from = self.date_from.date().toPyDate()
-            date_to = self.date_to.date().toPyDate()
-            
-            from datetime import datetime
-            datetime_from = datetime.combine(date_from, datetime.min.time())
-            datetime_to = datetime.combine(date_to, datetime.max.time())
-            
-            # Obtener movimientos de tipo PRODUCTION (ventas)
-            movements = session.query(
-                RawMaterialMovement.raw_material_id,
-                func.sum(RawMaterialMovement.quantity).label('total_quantity')
-            ).filter(
-                RawMaterialMovement.movement_type == RawMaterialMovementType.PRODUCTION,
-                RawMaterialMovement.created_at.between(datetime_from, datetime_to)
-            ).group_by(RawMaterialMovement.raw_material_id).all()
-            
-            self.materials_consumption_table.setRowCount(len(movements))
-            
-            for row, (material_id, total_qty) in enumerate(movements):
-                material = session.query(RawMaterial).filter_by(id=material_id).first()
-                if not material:
-                    continue
-                
-                # Nombre
-                self.materials_consumption_table.setItem(row, 0, QTableWidgetItem(material.name))
-                
-                # Unidad
-                unit_item = QTableWidgetItem(material.unit)
-                unit_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.materials_consumption_table.setItem(row, 1, unit_item)
-                
-                # Cantidad consumida (absoluto)
-                consumed = abs(total_qty)
-                qty_item = QTableWidgetItem(f"{consumed:.2f}")
-                qty_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.materials_consumption_table.setItem(row, 2, qty_item)
-                
-                # Costo total
-                cost = consumed * material.cost_per_unit
-                cost_item = QTableWidgetItem(f"${cost:,.2f}")
-                cost_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
-                self.materials_consumption_table.setItem(row, 3, cost_item)
-                
-                # Stock actual
-                stock_item = QTableWidgetItem(f"{material.stock:.2f}")
-                stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                if material.is_low_stock:
-                    stock_item.setForeground(Qt.GlobalColor.red)
-                self.materials_consumption_table.setItem(row, 4, stock_item)
-            
-            if len(movements) == 0:
-                self.materials_consumption_table.setRowCount(1)
-                self.materials_consumption_table.setItem(0, 0, QTableWidgetItem("No hay consumo de materias primas en este período"))
-                self.materials_consumption_table.setSpan(0, 0, 1, 5)
-        
-        except Exception as e:
-            print(f"Error al cargar consumo de materias primas: {e}")
-        finally:
-            close_session()
+    def schedule_reload(self):
+        """Recarga los reportes poco después del último cambio de fecha"""
+        self.reload_timer.start()
     
-    def load_production_projection(self):
-        """Carga la proyección de producción basada en stock de materias primas"""
-        session = get_session()
-        try:
-            # Obtener todos los productos con materias primas asociadas
-            products = session.query(Product).options(joinedload(Product.product_materials)).all()
-            
-            # Filtrar productos que tienen materias primas
-            products_with_materials = [p for p in products if p.product_materials]
-            
-            self.production_projection_table.setRowCount(len(products_with_materials))
-            
-            for row, product in enumerate(products_with_materials):
-                # Nombre del producto
-                self.production_projection_table.setItem(row, 0, QTableWidgetItem(product.name))
-                
-                # Unidades producibles
-                max_units = product.max_producible_units
-                units_item = QTableWidgetItem(str(max_units) if max_units != float('inf') else "∞")
-                units_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                if max_units == 0:
-                    units_item.setForeground(Qt.GlobalColor.red)
-                elif max_units < 10:
-                    units_item.setForeground(Qt.GlobalColor.darkYellow)
-                self.production_projection_table.setItem(row, 1, units_item)
-                
-                # Costo real de materias primas
-                real_cost = product.real_cost_from_materials
-                cost_item = QTableWidgetItem(f"${real_cost:.2f}")
-                cost_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
-                self.production_projection_table.setItem(row, 2, cost_item)
-                
-                # Precio de venta
-                price_item = QTableWidgetItem(f"${product.sale_price:.2f}")
-                price_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
-                self.production_projection_table.setItem(row, 3, price_item)
-            
-            if len(products_with_materials) == 0:
-                self.production_projection_table.setRowCount(1)
-                self.production_projection_table.setItem(0, 0, QTableWidgetItem("No hay productos con materias primas asignadas"))
-                self.production_projection_table.setSpan(0, 0, 1, 4)
-        
-        except Exception as e:
-            print(f"Error al cargar proyección de producción: {e}")
-        finally:
-            close_session()
+    def fill_top_products(self, top_products):
+        """Llena la tabla de productos más vendidos"""
+        self.top_products_table.clearSpans()
+        self.top_products_table.setRowCount(len(top_products))
+        
+        for row, (name, quantity, amount) in enumerate(top_products):
+            self.top_products_table.setItem(row, 0, QTableWidgetItem(f"#{row + 1}"))
+            self.top_products_table.setItem(row, 1, QTableWidgetItem(name))
+            self.top_products_table.setItem(row, 2, QTableWidgetItem(f"{int(quantity)} unidades"))
+            self.top_products_table.setItem(row, 3, QTableWidgetItem(f"${amount:,.2f}"))
     
-    def load_low_materials_stock(self):
-        """Carga las materias primas con stock bajo"""
-        session = get_session()
-        try:
-            # Obtener materias primas con stock bajo o en cero
-            materials = session.query(RawMaterial).filter(
-                RawMaterial.stock <= RawMaterial.min_stock
-            ).order_by(RawMaterial.stock.asc()).all()
-            
-            self.low_materials_stock_table.setRowCount(len(materials))
-            
-            for row, material in enumerate(materials):
-                # Nombre
-                name_item = QTableWidgetItem(material.name)
-                if material.stock == 0:
-                    name_item.setForeground(Qt.GlobalColor.red)
-                self.low_materials_stock_table.setItem(row, 0, name_item)
-                
-                # Unidad
-                unit_item = QTableWidgetItem(material.unit)
-                unit_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.low_materials_stock_table.setItem(row, 1, unit_item)
-                
-                # Stock actual
-                stock_item = QTableWidgetItem(f"{material.stock:.2f}")
-                stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                if material.stock == 0:
-                    stock_item.setForeground(Qt.GlobalColor.red)
-                self.low_materials_stock_table.setItem(row, 2, stock_item)
-                
-                # Stock mínimo
-                min_stock_item = QTableWidgetItem(f"{material.min_stock:.2f}")
-                min_stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.low_materials_stock_table.setItem(row, 3, min_stock_item)
-                
-                # Estado
-                if material.stock == 0:
-                    status = "SIN STOCK"
-                    color = Qt.GlobalColor.red
-                else:
-                    status = "BAJO"
-                    color = Qt.GlobalColor.darkYellow
-                
-                status_item = QTableWidgetItem(status)
-                status_item.setForeground(color)
-                status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.low_materials_stock_table.setItem(row, 4, status_item)
-            
-            if len(materials) == 0:
-                self.low_materials_stock_table.setRowCount(1)
-                self.low_materials_stock_table.setItem(0, 0, QTableWidgetItem("No hay materias primas con stock bajo"))
-                self.low_materials_stock_table.setSpan(0, 0, 1, 5)
-        
-        except Exception as e:
-            print(f"Error al cargar materias primas con stock bajo: {e}")
-        finally:
-            close_session()
+    def fill_top_customers(self, top_customers):
+        """Llena la tabla de mejores clientes"""
+        self.top_customers_table.clearSpans()
+        self.top_customers_table.setRowCount(len(top_customers))
+        
+        for row, (name, count, amount) in enumerate(top_customers):
+            self.top_customers_table.setItem(row, 0, QTableWidgetItem(f"#{row + 1}"))
+            self.top_customers_table.setItem(row, 1, QTableWidgetItem(name))
+            self.top_customers_table.setItem(row, 2, QTableWidgetItem(f"{count} compras"))
+            self.top_customers_table.setItem(row, 3, QTableWidgetItem(f"${amount:,.2f}"))
+    
+    def fill_low_stock_products(self, low_stock_products):
+        """Llena la tabla de productos con stock bajo"""
+        if len(low_stock_products) == 0:
+            self.show_table_message(self.low_stock_table, "No hay productos con stock bajo")
+            return
+        
+        self.low_stock_table.clearSpans()
+        self.low_stock_table.setRowCount(len(low_stock_products))
+        
+        for row, (name, stock, min_stock) in enumerate(low_stock_products):
+            self.low_stock_table.setItem(row, 0, QTableWidgetItem(name))
+            
+            stock_item = QTableWidgetItem(str(stock))
+            stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.low_stock_table.setItem(row, 1, stock_item)
+            
+            min_stock_item = QTableWidgetItem(str(min_stock))
+            min_stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.low_stock_table.setItem(row, 2, min_stock_item)
+            
+            # Estado
+            if stock == 0:
+                status = "SIN STOCK"
+                color = Qt.GlobalColor.red
+            elif stock <= min_stock:
+                status = "BAJO"
+                color = Qt.GlobalColor.darkYellow
+            else:
+                status = "NORMAL"
+                color = Qt.GlobalColor.darkGreen
+            
+            status_item = QTableWidgetItem(status)
+            status_item.setForeground(color)
+            status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.low_stock_table.setItem(row, 3, status_item)
+    
+    def fill_materials_consumption(self, consumption):
+        """Llena la tabla de consumo de materias primas del período"""
+        if len(consumption) == 0:
+            self.show_table_message(self.materials_consumption_table, "No hay consumo de materias primas en este período")
+            return
+        
+        self.materials_consumption_table.clearSpans()
+        self.materials_consumption_table.setRowCount(len(consumption))
+        
+        for row, (name, unit, consumed, cost, stock, is_low_stock) in enumerate(consumption):
+            # Nombre
+            self.materials_consumption_table.setItem(row, 0, QTableWidgetItem(name))
+            
+            # Unidad
+            unit_item = QTableWidgetItem(unit)
+            unit_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.materials_consumption_table.setItem(row, 1, unit_item)
+            
+            # Cantidad consumida (absoluto)
+            qty_item = QTableWidgetItem(f"{consumed:.2f}")
+            qty_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.materials_consumption_table.setItem(row, 2, qty_item)
+            
+            # Costo total
+            cost_item = QTableWidgetItem(f"${cost:,.2f}")
+            cost_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
+            self.materials_consumption_table.setItem(row, 3, cost_item)
+            
+            # Stock actual
+            stock_item = QTableWidgetItem(f"{stock:.2f}")
+            stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            if is_low_stock:
+                stock_item.setForeground(Qt.GlobalColor.red)
+            self.materials_consumption_table.setItem(row, 4, stock_item)
+    
+    def fill_production_projection(self, projection):
+        """Llena la proyección de producción basada en stock de materias primas"""
+        if len(projection) == 0:
+            self.show_table_message(self.production_projection_table, "No hay productos con materias primas asignadas")
+            return
+        
+        self.production_projection_table.clearSpans()
+        self.production_projection_table.setRowCount(len(projection))
+        
+        for row, (name, max_units, real_cost, sale_price) in enumerate(projection):
+            # Nombre del producto
+            self.production_projection_table.setItem(row, 0, QTableWidgetItem(name))
+            
+            # Unidades producibles
+            units_item = QTableWidgetItem(str(max_units) if max_units != float('inf') else "∞")
+            units_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            if max_units == 0:
+                units_item.setForeground(Qt.GlobalColor.red)
+            elif max_units < 10:
+                units_item.setForeground(Qt.GlobalColor.darkYellow)
+            self.production_projection_table.setItem(row, 1, units_item)
+            
+            # Costo real de materias primas
+            cost_item = QTableWidgetItem(f"${real_cost:.2f}")
+            cost_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
+            self.production_projection_table.setItem(row, 2, cost_item)
+            
+            # Precio de venta
+            price_item = QTableWidgetItem(f"${sale_price:.2f}")
+            price_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
+            self.production_projection_table.setItem(row, 3, price_item)
+    
+    def fill_low_materials_stock(self, materials):
+        """Llena la tabla de materias primas con stock bajo"""
+        if len(materials) == 0:
+            self.show_table_message(self.low_materials_stock_table, "No hay materias primas con stock bajo")
+            return
+        
+        self.low_materials_stock_table.clearSpans()
+        self.low_materials_stock_table.setRowCount(len(materials))
+        
+        for row, (name, unit, stock, min_stock) in enumerate(materials):
+            # Nombre
+            name_item = QTableWidgetItem(name)
+            if stock == 0:
+                name_item.setForeground(Qt.GlobalColor.red)
+            self.low_materials_stock_table.setItem(row, 0, name_item)
+            
+            # Unidad
+            unit_item = QTableWidgetItem(unit)
+            unit_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.low_materials_stock_table.setItem(row, 1, unit_item)
+            
+            # Stock actual
+            stock_item = QTableWidgetItem(f"{stock:.2f}")
+            stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            if stock == 0:
+                stock_item.setForeground(Qt.GlobalColor.red)
+            self.low_materials_stock_table.setItem(row, 2, stock_item)
+            
+            # Stock mínimo
+            min_stock_item = QTableWidgetItem(f"{min_stock:.2f}")
+            min_stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.low_materials_stock_table.setItem(row, 3, min_stock_item)
+            
+            # Estado
+            if stock == 0:
+                status = "SIN STOCK"
+                color = Qt.GlobalColor.red
+            else:
+                status = "BAJO"
+                color = Qt.GlobalColor.darkYellow
+            
+            status_item = QTableWidgetItem(status)
+            status_item.setForeground(color)
+            status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.low_materials_stock_table.setItem(row, 4, status_item)
     
     def export_to_excel(self):
-        """Exporta el reporte a Excel"""
-        try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, PatternFill, Alignment
-            from datetime import datetime
-            from PyQt6.QtWidgets import QFileDialog
-            
-            # Preguntar dónde guardar
-            file_name, _ = QFileDialog.getSaveFileName(
-                self,
-                "Guardar Reporte",
-                f"Reporte_Ventas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                "Excel Files (*.xlsx)"
-            )
-            
-            if not file_name:
-                return
-            
-            # Crear workbook
-            wb = Workbook()
-            
-            # Hoja 1: Resumen
-            ws1 = wb.active
-            ws1.title = "Resumen"
-            
-            # Título
-            ws1['A1'] = "REPORTE DE VENTAS"
-            ws1['A1'].font = Font(size=16, bold=True)
-            ws1['A2'] = f"Período: {self.date_from.date().toString('dd/MM/yyyy')} - {self.date_to.date().toString('dd/MM/yyyy')}"
-            
-            # Resumen de ventas (calculado dinámicamente)
-            ws1['A4'] = "RESUMEN DE VENTAS"
-            ws1['A4'].font = Font(bold=True)
-            
-            # Calcular resumen dinámicamente
-            session = get_session()
-            try:
-                date_from = self.date_from.date().toPyDate()
-                date_to = self.date_to.date().toPyDate()
-                from datetime import datetime
-                datetime_from = datetime.combine(date_from, datetime.min.time())
-                datetime_to = datetime.combine(date_to, datetime.max.time())
-                
-                total_sales = session.query(func.sum(Sale.total)).filter(
-                    Sale.created_at.between(datetime_from, datetime_to)
-                ).scalar() or 0
-                
-                sales_count = session.query(Sale).filter(
-                    Sale.created_at.between(datetime_from, datetime_to)
-                ).count()
-                
-                avg_sale = total_sales / sales_count if sales_count > 0 else 0
-                
-                ws1['A5'] = "Total Ventas:"
-                ws1['B5'] = f"${total_sales:,.2f}"
-                ws1['A6'] = "Número de Ventas:"
-                ws1['B6'] = str(sales_count)
-                ws1['A7'] = "Ticket Promedio:"
-                ws1['B7'] = f"${avg_sale:,.2f}"
-            except Exception as e:
-                ws1['A5'] = "Error al calcular resumen"
-                ws1['B5'] = str(e)
-            finally:
-                close_session()
-            
-            # Hoja 2: Top Productos
-            ws2 = wb.create_sheet("Top Productos")
-            ws2['A1'] = "TOP 10 PRODUCTOS MÁS VENDIDOS"
-            ws2['A1'].font = Font(size=14, bold=True)
-            
-            headers = ['Posición', 'Producto', 'Cantidad Vendida', 'Total Vendido']
-            for col, header in enumerate(headers, 1):
-                cell = ws2.cell(3, col)
-                cell.value = header
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-            
-            for row in range(self.top_products_table.rowCount()):
-                for col in range(4):
-                    item = self.top_products_table.item(row, col)
-                    if item:
-                        ws2.cell(row + 4, col + 1).value = item.text()
-            
-            # Hoja 3: Top Clientes
-            ws3 = wb.create_sheet("Top Clientes")
-            ws3['A1'] = "TOP 10 MEJORES CLIENTES"
-            ws3['A1'].font = Font(size=14, bold=True)
-            
-            headers = ['Posición', 'Cliente', 'N° Compras', 'Total Comprado']
-            for col, header in enumerate(headers, 1):
-                cell = ws3.cell(3, col)
-                cell.value = header
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-            
-            for row in range(self.top_customers_table.rowCount()):
-                for col in range(4):
-                    item = self.top_customers_table.item(row, col)
-                    if item:
-                        ws3.cell(row + 4, col + 1).value = item.text()
-            
-            # Hoja 4: Stock Bajo
-            ws4 = wb.create_sheet("Stock Bajo")
-            ws4['A1'] = "ALERTAS DE STOCK BAJO"
-            ws4['A1'].font = Font(size=14, bold=True)
-            
-            headers = ['Producto', 'Stock Actual', 'Stock Mínimo', 'Estado']
-            for col, header in enumerate(headers, 1):
-                cell = ws4.cell(3, col)
-                cell.value = header
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-            
-            for row in range(self.low_stock_table.rowCount()):
-                for col in range(4):
-                    item = self.low_stock_table.item(row, col)
-                    if item:
-                        ws4.cell(row + 4, col + 1).value = item.text()
-            
-            # Ajustar ancho de columnas
-            for ws in [ws1, ws2, ws3, ws4]:
-                for column in ws.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(cell.value)
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    ws.column_dimensions[column_letter].width = adjusted_width
-            
-            # Guardar
-            wb.save(file_name)
-            
-            QMessageBox.information(
-                self,
-                "Éxito",
-                f"Reporte exportado correctamente a:\n{file_name}"
-            )
-            
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"Error al exportar a Excel:\n{str(e)}"
-            )
-            import traceback
-            traceback.print_exc()
\ No newline at end of file
+        """Exporta el reporte a Excel (o CSV) en segundo plano"""
+        file_name = get_export_path(
+            self,
+            "Guardar Reporte",
+            f"Reporte_Ventas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        )
+        
+        if not file_name:
+            return
+        
+        date_from = self.date_from.date().toPyDate()
+        date_to = self.date_to.date().toPyDate()
+        period = f"{date_from.strftime('%d/%m/%Y')} - {date_to.strftime('%d/%m/%Y')}"
+        
+        def summary_rows(session):
+            # Resumen calculado en el hilo de la exportación
+            total_sales, sales_count = ReportService.sales_summary(session, date_from, date_to)
+            avg_sale = total_sales / sales_count if sales_count > 0 else 0
+            return [
+                ("Total Ventas:", f"${total_sales:,.2f}"),
+                ("Número de Ventas:", str(sales_count)),
+                ("Ticket Promedio:", f"${avg_sale:,.2f}"),
+            ]
+        
+        sheets = [
+            ExportSheet("Resumen", ["RESUMEN DE VENTAS", ""], summary_rows,
+                        widths=[22, 20], heading=f"REPORTE DE VENTAS - Período: {period}", count=3),
+            ExportSheet("Top Productos", ['Posición', 'Producto', 'Cantidad Vendida', 'Total Vendido'],
+                        self.table_rows(self.top_products_table), widths=[10, 35, 18, 18],
+                        heading="TOP 10 PRODUCTOS MÁS VENDIDOS"),
+            ExportSheet("Top Clientes", ['Posición', 'Cliente', 'N° Compras', 'Total Comprado'],
+                        self.table_rows(self.top_customers_table), widths=[10, 35, 15, 18],
+                        heading="TOP 10 MEJORES CLIENTES"),
+            ExportSheet("Stock Bajo", ['Producto', 'Stock Actual', 'Stock Mínimo', 'Estado'],
+                        self.table_rows(self.low_stock_table), widths=[35, 14, 14, 14],
+                        heading="ALERTAS DE STOCK BAJO"),
+        ]
+        run_export(self, file_name, sheets, lambda counts: f"Reporte exportado correctamente a:\n{file_name}")
+    
+    def table_rows(self, table):
+        """Textos de las celdas de una tabla, fila por fila"""
+        rows = []
+        for row in range(table.rowCount()):
+            rows.append([
+                table.item(row, col).text() if table.item(row, col) else ""
+                for col in range(table.columnCount())
+            ])
+        return rows
@@ -1,20 +1,29 @@
 """
 Vista de Ventas - Sistema completo de registro de ventas
 """
-import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTableWidget, QTableWidgetItem, QLineEdit, QMessageBox,
     QDialog, QFormLayout, QComboBox, QSpinBox, QDoubleSpinBox,
-    QHeaderView, QTextEdit, QDateEdit, QGroupBox, QFileDialog, QScrollArea, QGridLayout, QApplication
+    QHeaderView, QTextEdit, QDateEdit, QGroupBox, QFileDialog, QScrollArea, QGridLayout, QApplication,
+    QTableView
 )
-from PyQt6.QtCore import Qt, QDate
-from PyQt6.QtGui import QShowEvent, QPixmap, QIcon, QFont
+from PyQt6.QtCore import Qt, QDate, QTimer
+from PyQt6.QtGui import QShowEvent, QIcon, QFont
 from datetime import datetime
 from config.database import get_session, close_session
-from models import Sale, SaleItem, Product, Customer, PaymentMethod, SaleStatus, InventoryMovement, MovementType, ProductMaterial, RawMaterial, RawMaterialMovement, RawMaterialMovementType
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from models import Sale, SaleItem, Product, Customer, PaymentMethod, SaleStatus, DailySalesRollup
+from services.sale_service import SaleService
+from services.sales_rollup_service import SalesRollupService
+from ui.widgets.sales_table import SalesTableModel, SalesFilterProxyModel, SaleActionsDelegate
+from ui.widgets.paged_table import install_prefetch
+from ui.widgets.view_refresher import ViewRefresher
+from ui.widgets.export_runner import get_export_path, run_export
+from ui.widgets.task_runner import run_task
+from ui.widgets.thumbnail_cache import ThumbnailCache
+from services.export_service import ExportService
+from services.import_service import ImportService
+from core.events import EventBus, SaleCommitted, SaleCancelled, SaleUpdated, SalesCleared, CustomerUpdated
 import traceback
 
 class SalesView(QWidget):
@@ -230,12 +239,21 @@ class SalesView(QWidget):
         
         layout.addLayout(filter_layout)
         
-        # Tabla de ventas
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "N° Factura", "Fecha", "Cliente", "Total", "Método Pago", "Estado", "Acciones"
-        ])
+        # Tabla de ventas (model/view paginado: el costo depende de las filas visibles)
+        self.sales_model = SalesTableModel(self)
+        self.sales_proxy = SalesFilterProxyModel(self)
+        self.sales_proxy.setSourceModel(self.sales_model)
+        
+        self.actions_delegate = SaleActionsDelegate(self)
+        self.actions_delegate.view_clicked.connect(self.view_sale_detail)
+        self.actions_delegate.edit_clicked.connect(self.edit_sale_full)
+        self.actions_delegate.invoice_clicked.connect(self.generate_invoice)
+        self.actions_delegate.invoice_view_clicked.connect(self.view_invoice)
+        
+        self.table = QTableView()
+        self.table.setModel(self.sales_proxy)
+        self.table.setItemDelegateForColumn(SalesTableModel.ACTIONS_COLUMN, self.actions_delegate)
+        self.table.setMouseTracking(True)  # Hover de los botones de acción
         
         # Configurar tabla
         header = self.table.horizontalHeader()
@@ -250,208 +268,98 @@ class SalesView(QWidget):
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)  # Método Pago
         header.setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)  # Estado
         
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(50)
+        
+        # Traer la siguiente página antes de llegar al final del scroll
+        install_prefetch(
+            self.table,
+            lambda: self.sales_model.canFetchMore(),
+            lambda: self.sales_model.fetchMore()
+        )
         
         # Asegurar que la tabla use todo el espacio disponible
         self.table.horizontalHeader().setStretchLastSection(False)
         
+        # Recarga diferida al escribir (los filtros también se aplican en la base de datos)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(300)
+        self.filter_timer.timeout.connect(self.load_sales)
+        
         layout.addWidget(self.table)
+        
+        # Refresco incremental: las ventas nuevas van al inicio (se recarga la
+        # primera página); las editadas o canceladas solo actualizan su fila
+        self.refresher = ViewRefresher(self, self.load_sales, self.refresh_sale_rows)
+        self.refresher.subscribe(SaleCommitted, self.on_sale_committed)
+        self.refresher.subscribe(SaleCancelled, self.on_sale_changed)
+        self.refresher.subscribe(SaleUpdated, self.on_sale_changed)
+        self.refresher.subscribe(CustomerUpdated, self.on_customers_updated)
     
     def showEvent(self, event: QShowEvent):
         """Se ejecuta cuando la vista se muestra"""
         super().showEvent(event)
-        self.load_sales()
+        # Solo aplica los cambios publicados mientras la vista estaba oculta
+        self.refresher.on_show()
     
     def load_sales(self):
-        """Carga todas las ventas"""
-        session = get_session()
+        """Carga la primera página de ventas con los filtros vigentes"""
         try:
-            sales = session.query(Sale).order_by(Sale.created_at.desc()).all()
-            
-            self.table.setRowCount(len(sales))
-            
-            for row, sale in enumerate(sales):
-                # N° Factura
-                self.table.setItem(row, 0, QTableWidgetItem(sale.invoice_number))
-                
-                # Fecha
-                date_str = sale.created_at.strftime("%d/%m/%Y %H:%M")
-                self.table.setItem(row, 1, QTableWidgetItem(date_str))
-                
-                # Cliente
-                customer_name = sale.customer.name if sale.customer else "Cliente General"
-                self.table.setItem(row, 2, QTableWidgetItem(customer_name))
-                
-                # Total
-                if sale.total == int(sale.total):
-                    total_text = f"${int(sale.total):,}"
-                else:
-                    total_text = f"${sale.total:,.2f}"
-                total_item = QTableWidgetItem(total_text)
-                total_item.setData(Qt.ItemDataRole.UserRole, float(sale.total))
-                total_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                self.table.setItem(row, 3, total_item)
-                
-                # Método de pago
-                self.table.setItem(row, 4, QTableWidgetItem(sale.payment_method.value))
-                
-                # Estado
-                status_item = QTableWidgetItem(sale.status.value)
-                if sale.status == SaleStatus.COMPLETED:
-                    status_item.setForeground(Qt.GlobalColor.darkGreen)
-                elif sale.status == SaleStatus.CANCELLED:
-                    status_item.setForeground(Qt.GlobalColor.red)
-                elif sale.status == SaleStatus.EDITED:
-                    from PyQt6.QtGui import QColor
-                    status_item.setForeground(QColor("#f59e0b"))  # Naranja para editada
-                self.table.setItem(row, 5, status_item)
-                
-                # Botones de acción
-                actions_widget = QWidget()
-                actions_layout = QHBoxLayout(actions_widget)
-                actions_layout.setContentsMargins(4, 2, 4, 2)
-                actions_layout.setSpacing(0)
-                
-                # Botón ver detalle (ícono 👁️, izquierda redondeada)
-                btn_view = QPushButton("👁️")
-                btn_view.setFixedSize(40, 32)
-                btn_view.setToolTip("Ver Detalle")
-                btn_view.setStyleSheet("""
-                    QPushButton {
-                        background-color: #2563eb;
-                        color: white;
-                        border: none;
-                        border-top-left-radius: 4px;
-                        border-bottom-left-radius: 4px;
-                        border-top-right-radius: 0px;
-                        border-bottom-right-radius: 0px;
-                        font-size: 14px;
-                        padding: 0px;
-                    }
-                    QPushButton:hover {
-                        background-color: #1d4ed8;
-                    }
-                """)
-                btn_view.clicked.connect(lambda checked, s=sale: self.view_sale_detail(s))
-                actions_layout.addWidget(btn_view)
-                
-                # Botón editar (solo si no tiene factura) - sin bordes redondeados
-                if not sale.has_invoice:
-                    btn_edit = QPushButton("✏️")
-                    btn_edit.setFixedSize(40, 32)
-                    btn_edit.setToolTip("Editar")
-                    btn_edit.setStyleSheet("""
-                        QPushButton {
-                            background-color: #f59e0b;
-                            color: white;
-                            border: none;
-                            border-radius: 0px;
-                            font-size: 14px;
-                            padding: 0px;
-                        }
-                        QPushButton:hover {
-                            background-color: #d97706;
-                        }
-                    """)
-                    btn_edit.clicked.connect(lambda checked, s=sale: self.edit_sale_full(s))
-                    actions_layout.addWidget(btn_edit)
-                    
-                    # Botón generar factura (verde, derecha redondeada)
-                    btn_invoice = QPushButton("📄")
-                    btn_invoice.setFixedSize(40, 32)
-                    btn_invoice.setToolTip("Generar Factura")
-                    btn_invoice.setStyleSheet("""
-                        QPushButton {
-                            background-color: #10b981;
-                            color: white;
-                            border: none;
-                            border-top-left-radius: 0px;
-                            border-bottom-left-radius: 0px;
-                            border-top-right-radius: 4px;
-                            border-bottom-right-radius: 4px;
-                            font-size: 14px;
-                            padding: 0px;
-                        }
-                        QPushButton:hover {
-                            background-color: #059669;
-                        }
-                    """)
-                    btn_invoice.clicked.connect(lambda checked, s=sale: self.generate_invoice(s))
-                    actions_layout.addWidget(btn_invoice)
-                else:
-                    # Mostrar que ya tiene factura (verde, derecha redondeada)
-                    btn_invoice_view = QPushButton("✅")
-                    btn_invoice_view.setFixedSize(40, 32)
-                    btn_invoice_view.setToolTip("Ver Factura")
-                    btn_invoice_view.setStyleSheet("""
-                        QPushButton {
-                            background-color: #10b981;
-                            color: white;
-                            border: none;
-                            border-top-left-radius: 0px;
-                            border-bottom-left-radius: 0px;
-                            border-top-right-radius: 4px;
-                            border-bottom-right-radius: 4px;
-                            font-size: 14px;
-                            padding: 0px;
-                        }
-                        QPushButton:hover {
-                            background-color: #059669;
-                        }
-                    """)
-                    btn_invoice_view.clicked.connect(lambda checked, s=sale: self.view_invoice(s))
-                    actions_layout.addWidget(btn_invoice_view)
-                
-                self.table.setCellWidget(row, 6, actions_widget)
-                self.table.setRowHeight(row, 50)
-            
-            # Aplicar filtros vigentes y actualizar el total
-            self.apply_sales_filters()
-            
+            self.sales_model.reload(self.current_filters())
+            self.apply_sales_filters(reload=False)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al cargar ventas: {str(e)}")
-        finally:
-            close_session()
 
-    def apply_sales_filters(self):
+    def current_filters(self):
+        """Filtros del listado para el repositorio"""
+        return {
+            'search': self.search_input.text(),
+            'payment_method': self.payment_filter.currentText()
+        }
+
+    def apply_sales_filters(self, *args, reload=True):
         """Aplica filtros por búsqueda y método de pago y actualiza el total."""
-        text = self.search_input.text().lower() if hasattr(self, 'search_input') else ''
-        method = self.payment_filter.currentText() if hasattr(self, 'payment_filter') else 'Todos'
-        
-        for row in range(self.table.rowCount()):
-            invoice = (self.table.item(row, 0).text() if self.table.item(row, 0) else '').lower()
-            pay_method = (self.table.item(row, 4).text() if self.table.item(row, 4) else '')
-            
-            match_text = text in invoice
-            match_method = (method == 'Todos') or (pay_method == method)
-            self.table.setRowHidden(row, not (match_text and match_method))
-        
-        self.update_sales_total_label()
+        # Filtro inmediato sobre las filas ya cargadas
+        self.sales_proxy.set_filters(self.search_input.text(), self.payment_filter.currentText())
+        if reload:
+            # Recargar desde la base de datos cuando el usuario deja de escribir
+            self.filter_timer.start()
+        else:
+            self.update_sales_total_label()
 
+    def refresh_sale_rows(self, sale_ids):
+        """Actualiza solo las filas de esas ventas y el total"""
+        if self.sales_model.refresh_sales(sale_ids):
+            self.update_sales_total_label()
+    
+    def on_sale_committed(self, event):
+        if event.edited:
+            self.refresher.patch([event.sale_id])
+        else:
+            self.refresher.invalidate()
+    
+    def on_sale_changed(self, event):
+        self.refresher.patch([event.sale_id])
+    
+    def on_customers_updated(self, event):
+        """El nombre del cliente se muestra en el listado"""
+        if event.created:
+            return
+        if not event.customer_ids:
+            self.refresher.invalidate()
+            return
+        sale_ids = self.sales_model.sale_ids_for_customers(event.customer_ids)
+        if sale_ids:
+            self.refresher.patch(sale_ids)
+    
     def update_sales_total_label(self):
-        total = 0.0
-        for row in range(self.table.rowCount()):
-            if self.table.isRowHidden(row):
-                continue
-            
-            # Verificar si la venta está cancelada
-            status_item = self.table.item(row, 5)  # Columna "Estado"
-            if status_item and status_item.text().lower() == "cancelada":
-                continue  # Excluir ventas canceladas del total
-            
-            item = self.table.item(row, 3)
-            if item:
-                # Preferir valor crudo si existe
-                value = item.data(Qt.ItemDataRole.UserRole)
-                if value is None:
-                    # Fallback parseando texto "$1,234.56"
-                    try:
-                        value = float(item.text().replace('$', '').replace(',', ''))
-                    except:
-                        value = 0.0
-                total += float(value)
+        try:
+            total = self.sales_model.total_amount()  # Excluye ventas canceladas
+        except Exception:
+            total = 0.0
         
         # Formatear sin decimales si es entero
         if total == int(total):
@@ -463,19 +371,13 @@ class SalesView(QWidget):
     
     def search_sales(self, text):
         """Busca ventas por número de factura"""
-        for row in range(self.table.rowCount()):
-            invoice = self.table.item(row, 0).text().lower()
-            if text.lower() in invoice:
-                self.table.setRowHidden(row, False)
-            else:
-                self.table.setRowHidden(row, True)
+        self.search_input.setText(text)
     
     def create_new_sale(self):
         """Abre el diálogo para crear una nueva venta"""
         from ui.views.new_sale_dialog import NewSaleDialog
         dialog = NewSaleDialog(self)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_sales()
+        dialog.exec()  # SaleService publica la venta y la vista se actualiza sola
     
     def view_sale_detail(self, sale):
         """Muestra el detalle de una venta"""
@@ -492,8 +394,7 @@ class SalesView(QWidget):
             )
             return
         dialog = EditSaleFullDialog(self, sale.id)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_sales()
+        dialog.exec()  # SaleService publica el cambio y la vista se actualiza sola
     
     def generate_invoice(self, sale):
         """Genera una factura legal colombiana para la venta"""
@@ -521,7 +422,7 @@ class SalesView(QWidget):
                     updated_sale.has_invoice = 1
                     updated_sale.invoice_generated_at = datetime.now()
                     session.commit()
-                    self.load_sales()
+                    EventBus.publish(SaleUpdated(sale.id))
                     QMessageBox.information(self, "Éxito", "Factura generada correctamente.")
             except Exception as e:
                 session.rollback()
@@ -544,118 +445,34 @@ class SalesView(QWidget):
     def edit_sale_basic(self, sale):
         """Permite editar método de pago, estado, impuesto y descuento. No cambia items ni stock."""
         dialog = EditSaleDialog(self, sale)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_sales()
+        dialog.exec()  # El diálogo publica el cambio y la vista se actualiza sola
     
     def export_to_excel(self):
-        """Exporta todas las ventas a un archivo Excel"""
+        """Exporta todas las ventas a Excel (o CSV) en segundo plano"""
+        file_path = get_export_path(
+            self,
+            "Guardar Ventas como Excel",
+            f"Ventas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        )
+        
+        if not file_path:
+            return
+        
+        session = get_session()
         try:
-            # Seleccionar ubicación del archivo
-            file_path, _ = QFileDialog.getSaveFileName(
-                self,
-                "Guardar Ventas como Excel",
-                f"Ventas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                "Excel Files (*.xlsx)"
-            )
-            
-            if not file_path:
-                return
-            
-            session = get_session()
-            try:
-                # Obtener todas las ventas con sus items
-                from sqlalchemy.orm import joinedload
-                sales = session.query(Sale).options(joinedload(Sale.items)).order_by(Sale.created_at.desc()).all()
-                
-                if not sales:
-                    QMessageBox.warning(self, "Advertencia", "No hay ventas para exportar")
-                    return
-                
-                # Crear libro de Excel
-                wb = Workbook()
-                
-                # Hoja 1: Resumen de Ventas
-                ws_summary = wb.active
-                ws_summary.title = "Resumen de Ventas"
-                
-                # Encabezados con estilo
-                headers = ["N° Factura", "Fecha", "Cliente", "Método Pago", "Estado", "Subtotal", "Impuesto", "Descuento", "Total"]
-                for col, header in enumerate(headers, 1):
-                    cell = ws_summary.cell(row=1, column=col, value=header)
-                    cell.font = Font(bold=True, color="FFFFFF")
-                    cell.fill = PatternFill(start_color="2563eb", end_color="2563eb", fill_type="solid")
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                # Datos
-                for row, sale in enumerate(sales, 2):
-                    ws_summary.cell(row=row, column=1, value=sale.invoice_number)
-                    ws_summary.cell(row=row, column=2, value=sale.created_at.strftime("%d/%m/%Y %H:%M"))
-                    ws_summary.cell(row=row, column=3, value=sale.customer.name if sale.customer else "Cliente General")
-                    ws_summary.cell(row=row, column=4, value=sale.payment_method.value)
-                    ws_summary.cell(row=row, column=5, value=sale.status.value)
-                    ws_summary.cell(row=row, column=6, value=sale.subtotal)
-                    ws_summary.cell(row=row, column=7, value=sale.tax)
-                    ws_summary.cell(row=row, column=8, value=sale.discount)
-                    ws_summary.cell(row=row, column=9, value=sale.total)
-                
-                # Ajustar anchos de columna
-                ws_summary.column_dimensions['A'].width = 15
-                ws_summary.column_dimensions['B'].width = 18
-                ws_summary.column_dimensions['C'].width = 25
-                ws_summary.column_dimensions['D'].width = 15
-                ws_summary.column_dimensions['E'].width = 12
-                ws_summary.column_dimensions['F'].width = 12
-                ws_summary.column_dimensions['G'].width = 12
-                ws_summary.column_dimensions['H'].width = 12
-                ws_summary.column_dimensions['I'].width = 12
-                
-                # Hoja 2: Detalle de Items
-                ws_detail = wb.create_sheet(title="Detalle de Items")
-                
-                detail_headers = ["N° Factura", "Fecha", "Cliente", "Producto", "Cantidad", "Precio Unit.", "Subtotal"]
-                for col, header in enumerate(detail_headers, 1):
-                    cell = ws_detail.cell(row=1, column=col, value=header)
-                    cell.font = Font(bold=True, color="FFFFFF")
-                    cell.fill = PatternFill(start_color="10b981", end_color="10b981", fill_type="solid")
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-                
-                detail_row = 2
-                for sale in sales:
-                    for item in sale.items:
-                        ws_detail.cell(row=detail_row, column=1, value=sale.invoice_number)
-                        ws_detail.cell(row=detail_row, column=2, value=sale.created_at.strftime("%d/%m/%Y %H:%M"))
-                        ws_detail.cell(row=detail_row, column=3, value=sale.customer.name if sale.customer else "Cliente General")
-                        ws_detail.cell(row=detail_row, column=4, value=item.product.name)
-                        ws_detail.cell(row=detail_row, column=5, value=item.quantity)
-                        ws_detail.cell(row=detail_row, column=6, value=item.unit_price)
-                        ws_detail.cell(row=detail_row, column=7, value=item.subtotal)
-                        detail_row += 1
-                
-                # Ajustar anchos de columna
-                ws_detail.column_dimensions['A'].width = 15
-                ws_detail.column_dimensions['B'].width = 18
-                ws_detail.column_dimensions['C'].width = 25
-                ws_detail.column_dimensions['D'].width = 30
-                ws_detail.column_dimensions['E'].width = 10
-                ws_detail.column_dimensions['F'].width = 12
-                ws_detail.column_dimensions['G'].width = 12
-                
-                # Guardar archivo
-                wb.save(file_path)
-                
-                QMessageBox.information(
-                    self,
-                    "Éxito",
-                    f"Ventas exportadas correctamente\n\nArchivo: {file_path}\nTotal ventas: {len(sales)}"
-                )
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al exportar: {str(e)}\n\n{traceback.format_exc()}")
-            finally:
-                close_session()
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error: {str(e)}")
+            has_sales = session.query(Sale.id).first() is not None
+        finally:
+            close_session()
+        
+        if not has_sales:
+            QMessageBox.warning(self, "Advertencia", "No hay ventas para exportar")
+            return
+        
+        sheets = [ExportService.sales_sheet(), ExportService.sale_items_sheet()]
+        run_export(
+            self, file_path, sheets,
+            lambda counts: f"Ventas exportadas correctamente\n\nArchivo: {file_path}\nTotal ventas: {counts[sheets[0].title]}"
+        )
     
     def import_from_excel(self):
         """Importa ventas desde un archivo Excel"""
@@ -695,168 +512,49 @@ class SalesView(QWidget):
             if msg.exec() != QMessageBox.StandardButton.Yes:
                 return
             
-            session = get_session()
-            try:
-                # Cargar archivo Excel
-                wb = load_workbook(file_path)
-                ws = wb.active
-                
-                # Validar encabezados para asegurarse de que es un archivo de ventas
-                headers = [cell.value for cell in ws[1]]
-                
-                # Verificar que tenga encabezados relacionados con ventas
-                expected_headers_keywords = ['factura', 'fecha', 'cliente', 'método pago', 'metodo pago', 'estado', 'subtotal', 'total']
-                has_valid_headers = any(
-                    any(keyword in str(header).lower() for keyword in expected_headers_keywords)
-                    for header in headers if header
-                )
-                
-                # Verificar que NO tenga encabezados de clientes o productos
-                invalid_headers_keywords = ['teléfono', 'telefono', 'dirección', 'direccion', 'stock', 'precio venta', 'precio costo']
-                has_invalid_headers = any(
-                    any(keyword in str(header).lower() for keyword in invalid_headers_keywords)
-                    for header in headers if header
+            # Validar encabezados para asegurarse de que es un archivo de ventas
+            headers = ImportService.read_headers(file_path)
+            if not ImportService.headers_match(
+                headers, ImportService.SALES_HEADER_KEYWORDS, ImportService.SALES_INVALID_HEADER_KEYWORDS
+            ):
+                QMessageBox.critical(
+                    self,
+                    "Formato Incorrecto",
+                    "El archivo Excel no tiene el formato correcto para importar ventas.\n\n"
+                    "Parece ser un archivo de clientes, productos u otro tipo de datos.\n\n"
+                    "Por favor, seleccione un archivo Excel con el formato de ventas:\n"
+                    "• N° Factura\n"
+                    "• Fecha\n"
+                    "• Cliente\n"
+                    "• Método Pago\n"
+                    "• Estado\n"
+                    "• Subtotal\n"
+                    "• Impuesto\n"
+                    "• Descuento\n"
+                    "• Total"
                 )
-                
-                if has_invalid_headers or not has_valid_headers:
-                    QMessageBox.critical(
-                        self,
-                        "Formato Incorrecto",
-                        "El archivo Excel no tiene el formato correcto para importar ventas.\n\n"
-                        "Parece ser un archivo de clientes, productos u otro tipo de datos.\n\n"
-                        "Por favor, seleccione un archivo Excel con el formato de ventas:\n"
-                        "• N° Factura\n"
-                        "• Fecha\n"
-                        "• Cliente\n"
-                        "• Método Pago\n"
-                        "• Estado\n"
-                        "• Subtotal\n"
-                        "• Impuesto\n"
-                        "• Descuento\n"
-                        "• Total"
-                    )
-                    return
-                
-                imported_count = 0
-                errors = []
-                
-                # Leer datos (empezando desde la fila 2, asumiendo que la 1 son encabezados)
-                for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
-                    try:
-                        if not row[0]:  # Si no hay número de factura, saltar
-                            continue
-                        
-                        invoice_number = str(row[0])
-                        
-                        # Verificar si ya existe la factura
-                        existing = session.query(Sale).filter_by(invoice_number=invoice_number).first()
-                        if existing:
-                            errors.append(f"Fila {row_idx}: Factura {invoice_number} ya existe")
-                            continue
-                        
-                        # Parsear fecha
-                        try:
-                            from datetime import date
-                            if isinstance(row[1], datetime):
-                                sale_date = row[1]
-                            elif isinstance(row[1], date):
-                                # Convertir date a datetime
-                                sale_date = datetime.combine(row[1], datetime.min.time())
-                            elif row[1]:
-                                date_str = str(row[1]).strip()
-                                # Intentar varios formatos de fecha
-                                for date_format in ["%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]:
-                                    try:
-                                        sale_date = datetime.strptime(date_str, date_format)
-                                        break
-                                    except:
-                                        continue
-                                else:
-                                    raise ValueError("Formato no reconocido")
-                            else:
-                                raise ValueError("Fecha vacía")
-                        except Exception as e:
-                            errors.append(f"Fila {row_idx}: Formato de fecha inválido '{row[1]}' - {str(e)}")
-                            continue
-                        
-                        # Buscar o crear cliente
-                        customer_name = str(row[2]) if row[2] else "Cliente General"
-                        customer = session.query(Customer).filter_by(name=customer_name).first()
-                        if not customer and customer_name != "Cliente General":
-                            customer = Customer(
-                                name=customer_name,
-                                email="",
-                                phone="",
-                                address=""
-                            )
-                            session.add(customer)
-                            session.flush()
-                        
-                        # Método de pago
-                        payment_method_str = str(row[3]) if row[3] else "Efectivo"
-                        try:
-                            payment_method = PaymentMethod(payment_method_str)
-                        except:
-                            payment_method = PaymentMethod.CASH
-                        
-                        # Estado
-                        status_str = str(row[4]) if row[4] else "Completada"
-                        try:
-                            status = SaleStatus(status_str)
-                        except:
-                            status = SaleStatus.COMPLETED
-                        
-                        # Valores numéricos
-                        try:
-                            subtotal = float(row[5]) if row[5] else 0.0
-                            tax = float(row[6]) if row[6] else 0.0
-                            discount = float(row[7]) if row[7] else 0.0
-                            total = float(row[8]) if row[8] else 0.0
-                        except:
-                            errors.append(f"Fila {row_idx}: Valores numéricos inválidos")
-                            continue
-                        
-                        # Crear venta
-                        sale = Sale(
-                            invoice_number=invoice_number,
-                            customer_id=customer.id if customer else None,
-                            payment_method=payment_method,
-                            status=status,
-                            subtotal=subtotal,
-                            tax=tax,
-                            discount=discount,
-                            total=total,
-                            created_at=sale_date
-                        )
-                        
-                        session.add(sale)
-                        imported_count += 1
-                        
-                    except Exception as e:
-                        errors.append(f"Fila {row_idx}: {str(e)}")
-                        continue
-                
-                session.commit()
-                
-                # Mostrar resultado
-                result_msg = f"Importación completada\n\nVentas importadas: {imported_count}"
-                if errors:
-                    result_msg += f"\n\nErrores encontrados:\n" + "\n".join(errors[:10])
-                    if len(errors) > 10:
-                        result_msg += f"\n... y {len(errors) - 10} errores más"
-                
-                QMessageBox.information(self, "Resultado de Importación", result_msg)
-                self.load_sales()
-                
-            except Exception as e:
-                session.rollback()
-                QMessageBox.critical(self, "Error", f"Error al importar: {str(e)}\n\n{traceback.format_exc()}")
-            finally:
-                close_session()
+                return
+            
+            # Lectura, validación e inserción por bloques en segundo plano
+            run_task(
+                self,
+                "Importando",
+                lambda session, progress, cancelled: ImportService.import_sales(
+                    session, file_path, progress, cancelled
+                ),
+                self.on_sales_imported,
+                error_prefix="Error al importar"
+            )
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error: {str(e)}")
     
+    def on_sales_imported(self, result):
+        """Muestra el resultado de la importación y refresca la tabla"""
+        EventBus.publish(CustomerUpdated(created=True))  # La importación puede crear clientes
+        QMessageBox.information(self, "Resultado de Importación", result.summary("Ventas importadas"))
+        self.load_sales()
+    
     def clear_sales_table(self):
         """Limpia toda la tabla de ventas con confirmación"""
         try:
@@ -903,10 +601,12 @@ class SalesView(QWidget):
                 # Eliminar todos los items de ventas primero (por la relación)
                 session.query(SaleItem).delete()
                 
-                # Eliminar todas las ventas
+                # Eliminar todas las ventas y su resumen diario
                 session.query(Sale).delete()
+                session.query(DailySalesRollup).delete()
                 
                 session.commit()
+                EventBus.publish(SalesCleared())
                 
                 QMessageBox.information(
                     self,
@@ -1133,6 +833,8 @@ class EditSaleDialog(QDialog):
                 return
             old_status = sale.status
             new_status = self.status_combo.currentData()
+            # Aporte al resumen diario antes de modificar la venta
+            rollup_before = SalesRollupService.snapshot(session, sale.id)
             
             # Si se está cancelando la venta, devolver inventario
             if old_status != SaleStatus.CANCELLED and new_status == SaleStatus.CANCELLED:
@@ -1150,64 +852,23 @@ class EditSaleDialog(QDialog):
                 
                 if reply != QMessageBox.StandardButton.Yes:
                     return
-                
-                # Devolver productos al inventario
-                for item in sale.items:
-                    product = session.query(Product).filter_by(id=item.product_id).first()
-                    if product:
-                        previous_stock = product.stock
-                        product.stock += item.quantity
-                        
-                        # Buscar y anular el movimiento de venta original
-                        original_movement = session.query(InventoryMovement).filter(
-                            InventoryMovement.reference == f"SALE-{sale.id}",
-                            InventoryMovement.product_id == product.id
-                        ).first()
-                        
-                        if original_movement:
-                            # Anular el movimiento original agregando nota
-                            original_movement.note = f"[ANULADO] Cancelación de venta {sale.invoice_number}"
-                        
-                        # Registrar movimiento de devolución
-                        movement = InventoryMovement(
-                            product_id=product.id,
-                            movement_type=MovementType.ENTRY,
-                            quantity=item.quantity,
-                            previous_stock=previous_stock,
-                            new_stock=product.stock,
-                            reason=f"Devolución por cancelación de venta {sale.invoice_number}",
-                            reference=f"CANCELLED-SALE-{sale.id}"  # Referencia a venta cancelada
-                        )
-                        session.add(movement)
-                        
-                        # Devolver materias primas
-                        product_materials = session.query(ProductMaterial).filter_by(product_id=product.id).all()
-                        for pm in product_materials:
-                            raw_material = session.query(RawMaterial).filter_by(id=pm.raw_material_id).first()
-                            if raw_material:
-                                quantity_to_return = pm.quantity_needed * item.quantity
-                                previous_material_stock = raw_material.stock
-                                raw_material.stock += quantity_to_return
-                                
-                                # Registrar movimiento de materia prima
-                                material_movement = RawMaterialMovement(
-                                    raw_material_id=raw_material.id,
-                                    movement_type=RawMaterialMovementType.RETURN,
-                                    quantity=quantity_to_return,
-                                    reference=sale.invoice_number,
-                                    reason=f"Devolución por cancelación de venta {sale.invoice_number}"
-                                )
-                                session.add(material_movement)
             
             sale.payment_method = self.method_combo.currentData()
             sale.tax = self.tax_spin.value()
             sale.discount = self.discount_spin.value()
-            sale.status = new_status
             # actualizar fecha (conservando hora original)
             new_date = self.date_edit.date().toPyDate()
             sale.created_at = sale.created_at.replace(year=new_date.year, month=new_date.month, day=new_date.day)
             sale.calculate_total()
-            session.commit()
+            
+            if old_status != SaleStatus.CANCELLED and new_status == SaleStatus.CANCELLED:
+                # Devolver inventario y cancelar en la misma transacción
+                SaleService.cancel_sale(session, sale.id, rollup_before)
+            else:
+                sale.status = new_status
+                SalesRollupService.record(session, sale.id, rollup_before)
+                session.commit()
+                EventBus.publish(SaleUpdated(sale.id))
             
             if new_status == SaleStatus.CANCELLED:
                 QMessageBox.information(self, "Venta cancelada", "La venta ha sido cancelada y el inventario ha sido devuelto")
@@ -2103,40 +1764,14 @@ class ItemsFullViewDialog(QDialog):
                     border-color: #3b82f6;
                 }
             """)
-            # Cargar imagen del producto
-            pix = None
-            if product.image_path:
-                # Construir ruta absoluta desde la raíz del proyecto
-                base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-                image_path = os.path.join(base_dir, product.image_path)
-                if os.path.exists(image_path):
-                    pix = QPixmap(image_path)
-            
-            # Si no hay imagen o no se cargó, intentar rutas alternativas (retrocompatibilidad)
-            if not pix or pix.isNull():
-                # Intentar con SKU o nombre del producto
-                base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-                alt_paths = [
-                    os.path.join(base_dir, "resources", "images", f"{product.sku}.png"),
-                    os.path.join(base_dir, "resources", "images", f"{product.name}.png"),
-                ]
-                for alt_path in alt_paths:
-                    if os.path.exists(alt_path):
-                        pix = QPixmap(alt_path)
-                        if not pix.isNull():
-                            break
+            # Miniatura del producto (caché en disco y en memoria, sin decodificar la imagen original)
+            pix = ThumbnailCache.for_product(product, 60)
             
             # Configurar imagen en el botón si existe
-            if pix and not pix.isNull():
-                # Escalar imagen para que quepa bien en la tarjeta (60x60 para tarjeta de 90x80)
-                scaled_pix = pix.scaled(
-                    60, 60,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                icon = QIcon(scaled_pix)
+            if pix is not None:
+                icon = QIcon(pix)
                 btn.setIcon(icon)
-                btn.setIconSize(scaled_pix.size())
+                btn.setIconSize(pix.size())
                 btn.setText("")  # No mostrar texto cuando hay imagen
                 # Configurar estilo del botón con imagen
                 btn.setStyleSheet("""
@@ -2481,55 +2116,8 @@ class ItemsFullViewDialog(QDialog):
             if reply != QMessageBox.StandardButton.Yes:
                 return
             
-            # Devolver productos e items originales al inventario
-            for orig_item in self.original_items:
-                product = session.query(Product).filter_by(id=orig_item['product_id']).first()
-                if product:
-                    previous_stock = product.stock
-                    product.stock += orig_item['quantity']
-                    
-                    # Buscar y anular el movimiento de venta original
-                    original_movement = session.query(InventoryMovement).filter(
-                        InventoryMovement.reference == f"SALE-{sale.id}",
-                        InventoryMovement.product_id == product.id
-                    ).first()
-                    
-                    if original_movement:
-                        # Anular el movimiento original agregando nota
-                        original_movement.note = f"[ANULADO] Cancelación de venta {self.sale_invoice}"
-                    
-                    # Registrar movimiento de devolución
-                    movement = InventoryMovement(
-                        product_id=product.id,
-                        movement_type=MovementType.ENTRY,
-                        quantity=orig_item['quantity'],
-                        previous_stock=previous_stock,
-                        new_stock=product.stock,
-                        reason=f"Devolución por cancelación de venta {self.sale_invoice}",
-                        reference=f"CANCELLED-SALE-{sale.id}"  # Referencia a venta cancelada
-                    )
-                    session.add(movement)
-                    
-                    # Devolver materias primas
-                    product_materials = session.query(ProductMaterial).filter_by(product_id=product.id).all()
-                    for pm in product_materials:
-                        raw_material = session.query(RawMaterial).filter_by(id=pm.raw_material_id).first()
-                        if raw_material:
-                            quantity_to_return = pm.quantity_needed * orig_item['quantity']
-                            raw_material.stock += quantity_to_return
-                            
-                            material_movement = RawMaterialMovement(
-                                raw_material_id=raw_material.id,
-                                movement_type=RawMaterialMovementType.RETURN,
-                                quantity=quantity_to_return,
-                                reference=self.sale_invoice,
-                                reason=f"Devolución por cancelación de venta {self.sale_invoice}"
-                            )
-                            session.add(material_movement)
-            
-            # Cambiar estado a cancelada
-            sale.status = SaleStatus.CANCELLED
-            session.commit()
+            # Devolver productos y materias primas, y cambiar estado a cancelada
+            SaleService.cancel_sale(session, sale.id)
             
             QMessageBox.information(
                 self,
@@ -2584,113 +2172,23 @@ class ItemsFullViewDialog(QDialog):
             if reply != QMessageBox.StandardButton.Yes:
                 return
             
-            # PASO 1: Devolver al inventario los productos originales
-            for orig_item in self.original_items:
-                product = session.query(Product).filter_by(id=orig_item['product_id']).first()
-                if product:
-                    previous_stock = product.stock
-                    product.stock += orig_item['quantity']
-                    
-                    # Registrar movimiento
-                    movement = InventoryMovement(
-                        product_id=product.id,
-                        movement_type=MovementType.ENTRY,
-                        quantity=orig_item['quantity'],
-                        previous_stock=previous_stock,
-                        new_stock=product.stock,
-                        reason=f"Devolución por edición de venta {self.sale_invoice}"
-                    )
-                    session.add(movement)
-                    
-                    # Devolver materias primas
-                    product_materials = session.query(ProductMaterial).filter_by(product_id=product.id).all()
-                    for pm in product_materials:
-                        raw_material = session.query(RawMaterial).filter_by(id=pm.raw_material_id).first()
-                        if raw_material:
-                            quantity_to_return = pm.quantity_needed * orig_item['quantity']
-                            raw_material.stock += quantity_to_return
-                            
-                            material_movement = RawMaterialMovement(
-                                raw_material_id=raw_material.id,
-                                movement_type=RawMaterialMovementType.RETURN,
-                                quantity=quantity_to_return,
-                                reference=self.sale_invoice,
-                                reason=f"Devolución por edición de venta {self.sale_invoice}"
-                            )
-                            session.add(material_movement)
-            
-            # PASO 2: Eliminar items antiguos
-            for item in sale.items:
-                session.delete(item)
-            session.flush()
-            
-            # PASO 3: Agregar nuevos items y descontar inventario
-            for item_data in self.sale_items:
-                # Verificar stock disponible
-                product = session.query(Product).filter_by(id=item_data['product_id']).first()
-                if not product:
-                    raise Exception(f"Producto {item_data['product_name']} no encontrado")
-                
-                if product.stock < item_data['quantity']:
-                    raise Exception(f"Stock insuficiente para {item_data['product_name']}. Disponible: {product.stock}")
-                
-                # Crear nuevo item
-                item = SaleItem()
-                item.product_id = item_data['product_id']
-                item.quantity = item_data['quantity']
-                item.unit_price = item_data['unit_price']
-                item.subtotal = item_data['subtotal']
-                sale.items.append(item)
-                
-                # Descontar stock
-                previous_stock = product.stock
-                product.stock -= item_data['quantity']
-                
-                # Registrar movimiento
-                movement = InventoryMovement(
-                    product_id=product.id,
-                    movement_type=MovementType.EXIT,
-                    quantity=-item_data['quantity'],
-                    previous_stock=previous_stock,
-                    new_stock=product.stock,
-                    reason=f"Venta editada {self.sale_invoice}"
-                )
-                session.add(movement)
-                
-                # Descontar materias primas
-                product_materials = session.query(ProductMaterial).filter_by(product_id=product.id).all()
-                for pm in product_materials:
-                    raw_material = session.query(RawMaterial).filter_by(id=pm.raw_material_id).first()
-                    if raw_material:
-                        quantity_to_deduct = pm.quantity_needed * item_data['quantity']
-                        raw_material.stock -= quantity_to_deduct
-                        
-                        material_movement = RawMaterialMovement(
-                            raw_material_id=raw_material.id,
-                            movement_type=RawMaterialMovementType.PRODUCTION,
-                            quantity=-quantity_to_deduct,
-                            reference=self.sale_invoice,
-                            reason=f"Producción venta editada {self.sale_invoice}"
-                        )
-                        session.add(material_movement)
-            
-            # Actualizar datos de la venta
-            sale.customer_id = self.customer_combo.currentData()
-            sale.payment_method = self.payment_method_combo.currentData()
-            sale.tax = self.tax_input.value() if hasattr(self, 'tax_input') else 0.0  # Guardar impuesto
-            sale.transfer_type = self.get_transfer_type()  # Guardar tipo de transferencia
-            sale.discount = 0
-            sale.status = SaleStatus.EDITED  # Marcar como editada
-            sale.calculate_total()
-            
-            session.commit()
+            # Devolver los productos originales, descontar los nuevos y ajustar materias primas
+            result = SaleService.edit_sale(
+                session,
+                sale.id,
+                self.sale_items,
+                customer_id=self.customer_combo.currentData(),
+                payment_method=self.payment_method_combo.currentData(),
+                tax_amount=self.tax_input.value() if hasattr(self, 'tax_input') else 0.0,  # Guardar impuesto
+                transfer_type=self.get_transfer_type()  # Guardar tipo de transferencia
+            )
             
             QMessageBox.information(
                 self,
                 "Éxito",
                 f"Venta editada correctamente\n\n"
                 f"Factura: {self.sale_invoice}\n"
-                f"Nuevo Total: ${sale.total:,.2f}\n"
+                f"Nuevo Total: ${result.total:,.2f}\n"
                 f"Estado: Editada"
             )
             self.accept()
@@ -0,0 +1,51 @@
+"""
+Exportación a Excel/CSV en segundo plano
+La escritura corre como tarea de fondo (ver task_runner) con diálogo de
+progreso y opción de cancelar; el archivo parcial se borra si no termina.
+"""
+import os
+from PyQt6.QtWidgets import QFileDialog, QMessageBox
+from services.export_service import ExportService
+from ui.widgets.task_runner import run_task
+
+EXCEL_FILTER = "Excel Files (*.xlsx)"
+CSV_FILTER = "CSV (*.csv)"
+
+
+def get_export_path(parent, caption, default_name):
+    """
+    Diálogo para elegir el archivo destino (Excel o CSV)
+
+    Returns:
+        Ruta con la extensión del filtro elegido, o "" si se canceló
+    """
+    file_path, selected_filter = QFileDialog.getSaveFileName(
+        parent, caption, default_name, f"{EXCEL_FILTER};;{CSV_FILTER}"
+    )
+    if not file_path:
+        return ""
+    extension = '.csv' if selected_filter == CSV_FILTER else '.xlsx'
+    if os.path.splitext(file_path)[1].lower() not in ('.csv', '.xlsx'):
+        file_path += extension
+    return file_path
+
+
+def run_export(parent, file_path, sheets, success_message):
+    """
+    Exporta en segundo plano mostrando un diálogo de progreso
+
+    Args:
+        parent: Vista que lanza la exportación
+        file_path: Archivo destino (.xlsx o .csv)
+        sheets: Lista de ExportSheet
+        success_message: función(dict {hoja: filas}) que arma el mensaje final
+    """
+    return run_task(
+        parent,
+        "Exportando",
+        lambda session, progress, cancelled: ExportService.write(
+            file_path, sheets, session, progress=progress, cancelled=cancelled
+        ),
+        lambda counts: QMessageBox.information(parent, "Éxito", success_message(counts)),
+        error_prefix="Error al exportar"
+    )
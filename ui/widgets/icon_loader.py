@@ -0,0 +1,124 @@
+"""
+Carga asíncrona de miniaturas para las galerías de productos
+Los botones se muestran de inmediato (con nombre y precio) y un pool de
+hilos lee y decodifica las miniaturas; cada una llega por señal al hilo de
+la interfaz. Los botones que están a la vista en el área de desplazamiento
+se cargan primero y un cambio de filtro descarta las cargas pendientes.
+"""
+from collections import deque
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from ui.widgets.thumbnail_cache import ThumbnailCache
+
+
+class IconLoader(QObject):
+    """
+    Cola de cargas de miniaturas de una galería
+
+    Args:
+        parent: Vista dueña de la galería
+        size: Tamaño de la miniatura
+        on_icon: función(botón, QPixmap) llamada en el hilo de la interfaz
+        max_threads: Hilos de decodificación
+    """
+
+    loaded = pyqtSignal(int, object)   # (token, (fuente, mtime, QImage o None) o None)
+
+    def __init__(self, parent, size, on_icon, max_threads=2):
+        super().__init__(parent)
+        self.size = size
+        self.on_icon = on_icon
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._pending = deque()   # (token, botón, fuentes) en orden de carga
+        self._buttons = {}        # token -> botón, de las cargas pendientes y en curso
+        self._running = 0
+        self._next_token = 0
+        self.loaded.connect(self._on_loaded)
+
+    def add(self, items):
+        """Encola cargas: items es un iterable de (botón, fuentes candidatas)"""
+        for button, sources in items:
+            self._next_token += 1
+            self._pending.append((self._next_token, button, sources))
+            self._buttons[self._next_token] = button
+        self._dispatch()
+
+    def cancel(self):
+        """
+        Descarta las cargas pendientes y olvida los botones de las que están
+        en curso (su miniatura igual queda en la caché de memoria)
+        """
+        self._pending.clear()
+        self._buttons.clear()
+
+    def idle(self):
+        return not self._pending and not self._running
+
+    def prioritize(self):
+        """Pone primero los botones que están a la vista (llamar al desplazarse la galería)"""
+        self._pending = deque(sorted(self._pending, key=lambda item: item[1].visibleRegion().isEmpty()))
+
+    def _take_next(self):
+        """Siguiente carga pendiente, salteando los botones ocultos por el filtro"""
+        while self._pending:
+            item = self._pending.popleft()
+            if not item[1].isHidden():
+                return item
+            self._buttons.pop(item[0], None)
+        return None
+
+    def _dispatch(self):
+        while self._running < self.pool.maxThreadCount():
+            item = self._take_next()
+            if item is None:
+                return
+            token, _, sources = item
+            self._running += 1
+            self.pool.start(_Load(self, token, sources, self.size))
+
+    def _on_loaded(self, token, result):
+        self._running -= 1
+        button = self._buttons.pop(token, None)
+        if result is not None:
+            source_path, mtime_ns, image = result
+            if image is None:
+                pixmap = ThumbnailCache.cached_pixmap(source_path, mtime_ns, self.size)
+                if pixmap is None:
+                    pixmap = ThumbnailCache.pixmap(source_path, self.size)  # Salió del LRU mientras tanto
+            else:
+                pixmap = ThumbnailCache.store_pixmap(source_path, mtime_ns, self.size, image)
+            if button is not None and pixmap is not None:
+                try:
+                    self.on_icon(button, pixmap)
+                except RuntimeError:
+                    pass  # El botón ya fue destruido (se reconstruyó la galería)
+        self._dispatch()
+
+
+class _Load(QRunnable):
+    """Lectura de la miniatura en un hilo del pool"""
+
+    def __init__(self, loader, token, sources, size):
+        super().__init__()
+        self.loader = loader
+        self.token = token
+        self.sources = sources
+        self.size = size
+
+    def run(self):
+        result = None
+        for source_path in self.sources:
+            mtime_ns = ThumbnailCache.source_mtime(source_path)
+            if mtime_ns is None:
+                continue
+            if ThumbnailCache.has_pixmap(source_path, mtime_ns, self.size):
+                result = (source_path, mtime_ns, None)  # Ya está en memoria: no decodificar
+                break
+            loaded = ThumbnailCache.thumbnail_image(source_path, self.size)
+            if loaded is not None:
+                result = (source_path, loaded[0], loaded[1])
+                break
+        try:
+            self.loader.loaded.emit(self.token, result)
+        except RuntimeError:
+            pass  # La galería ya fue destruida
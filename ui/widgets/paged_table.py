@@ -0,0 +1,143 @@
+"""
+Carga paginada para tablas de listados
+- install_prefetch: pide la siguiente página antes de llegar al final del scroll
+- PagedTableLoader: llena un QTableWidget por páginas de un PagedRepository
+"""
+from PyQt6.QtCore import QObject
+from config.database import get_session, close_session
+
+
+def install_prefetch(view, can_fetch_more, fetch_more, pages_ahead=1):
+    """
+    Conecta el scroll vertical de la vista para cargar la siguiente página
+    cuando faltan menos de `pages_ahead` pantallas para llegar al final
+
+    Args:
+        view: QAbstractItemView (QTableWidget, QTableView, ...)
+        can_fetch_more: Función sin argumentos que indica si quedan páginas
+        fetch_more: Función sin argumentos que carga la siguiente página
+    """
+    scrollbar = view.verticalScrollBar()
+
+    def on_scroll(value):
+        remaining = scrollbar.maximum() - value
+        if remaining <= scrollbar.pageStep() * pages_ahead and can_fetch_more():
+            fetch_more()
+
+    scrollbar.valueChanged.connect(on_scroll)
+    scrollbar.rangeChanged.connect(lambda _min, _max: on_scroll(scrollbar.value()))
+    return on_scroll
+
+
+class PagedTableLoader(QObject):
+    """
+    Llena un QTableWidget por páginas
+
+    La vista solo aporta cómo pintar una fila (fill_row); el cargador lleva
+    la llave de la última fila, los filtros y el orden, y trae la siguiente
+    página al acercarse al final del scroll
+    """
+
+    def __init__(self, table, repository, fill_row, page_size=None, order=None,
+                 row_height=None, on_error=None):
+        """
+        Args:
+            table: QTableWidget a llenar
+            repository: Subclase de PagedRepository
+            fill_row: Función (fila_tabla, registro) que pinta la fila
+            page_size: Filas por página (por defecto la del repositorio)
+            order: Nombre del orden del repositorio
+            row_height: Alto fijo de cada fila nueva (opcional)
+            on_error: Función (excepción) para reportar errores de carga
+        """
+        super().__init__(table)
+        self.table = table
+        self.repository = repository
+        self.fill_row = fill_row
+        self.page_size = page_size or repository.DEFAULT_PAGE_SIZE
+        self.order = order
+        self.row_height = row_height
+        self.on_error = on_error
+        self.filters = {}
+        self._after_key = None
+        self._has_more = False
+        self._loading = False
+        self._row_by_id = {}
+        install_prefetch(table, self.can_fetch_more, self.fetch_more)
+
+    def reload(self, filters=None):
+        """Descarta las filas cargadas y trae la primera página"""
+        if filters is not None:
+            self.filters = dict(filters)
+        # Sin páginas pendientes mientras se vacía la tabla (el scroll vuelve a 0)
+        self._has_more = False
+        self._after_key = None
+        self._row_by_id = {}
+        self.table.setRowCount(0)
+        self._has_more = True
+        self.fetch_more()
+
+    def can_fetch_more(self):
+        return self._has_more and not self._loading
+
+    def fetch_more(self):
+        """Carga la siguiente página al final de la tabla"""
+        if not self.can_fetch_more():
+            return
+        self._loading = True
+        session = get_session()
+        try:
+            page = self.repository.fetch_page(
+                session, self._after_key, self.page_size, self.filters, self.order
+            )
+            self._has_more = len(page) == self.page_size
+            if page:
+                self._after_key = self.repository.key_of(page[-1], self.order)
+                first = self.table.rowCount()
+                self.table.setRowCount(first + len(page))
+                for offset, record in enumerate(page):
+                    self._row_by_id[record.id] = first + offset
+                    self.fill_row(first + offset, record)
+                    if self.row_height:
+                        self.table.setRowHeight(first + offset, self.row_height)
+        except Exception as e:
+            self._has_more = False
+            if self.on_error:
+                self.on_error(e)
+            else:
+                print(f"Error al cargar página de {self.repository.__name__}: {e}")
+        finally:
+            close_session()
+            self._loading = False
+
+    def refresh_rows(self, ids):
+        """
+        Vuelve a pintar solo las filas cargadas con esos ids y quita las que
+        ya no existen; los ids que no están cargados se ignoran
+        """
+        loaded = {record_id for record_id in ids if record_id in self._row_by_id}
+        if not loaded:
+            return
+        session = get_session()
+        try:
+            records = self.repository.fetch_by_ids(session, loaded)
+            for record in records:
+                self.fill_row(self._row_by_id[record.id], record)
+        except Exception as e:
+            if self.on_error:
+                self.on_error(e)
+            else:
+                print(f"Error al refrescar filas de {self.repository.__name__}: {e}")
+            return
+        finally:
+            close_session()
+
+        removed = loaded - {record.id for record in records}
+        if removed:
+            for row in sorted((self._row_by_id[record_id] for record_id in removed), reverse=True):
+                self.table.removeRow(row)
+            remaining = sorted(
+                (row, record_id) for record_id, row in self._row_by_id.items()
+                if record_id not in removed
+            )
+            self._row_by_id = {record_id: row for row, (_, record_id) in enumerate(remaining)}
@@ -0,0 +1,122 @@
+"""
+Ejecución de reportes en segundo plano
+Cada reporte corre en un hilo del QThreadPool con su propia sesión y su
+resultado llega por señal apenas termina, así la interfaz no se congela y
+las tablas se van llenando a medida que hay datos. Una nueva ejecución
+cancela la anterior: las tareas que no empezaron se descartan y las
+consultas en curso se interrumpen en SQLite.
+"""
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from config.database import get_session, close_session
+
+
+class ReportRunner(QObject):
+    """
+    Ejecuta un conjunto de reportes en paralelo
+
+    Señales:
+        report_ready(nombre, resultado): terminó un reporte de la ejecución actual
+        report_failed(nombre, mensaje): falló un reporte de la ejecución actual
+        finished(): terminaron todos los reportes de la ejecución actual
+    """
+
+    report_ready = pyqtSignal(str, object)
+    report_failed = pyqtSignal(str, str)
+    finished = pyqtSignal()
+
+    # Uso interno: llega desde los hilos de trabajo (conexión en cola)
+    _task_done = pyqtSignal(int, str, object, object)
+
+    # Instrucciones de SQLite entre revisiones de cancelación
+    PROGRESS_STEPS = 1000
+
+    def __init__(self, parent=None, max_threads=3):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._generation = 0
+        self._cancelled = threading.Event()
+        self._pending = set()
+        self._task_done.connect(self._on_task_done)
+
+    def run(self, reports):
+        """
+        Cancela la ejecución anterior y lanza los reportes
+
+        Args:
+            reports: dict {nombre: función(session)} que devuelve datos
+                simples (no objetos del ORM, la sesión se cierra al terminar)
+        """
+        self.cancel()
+        self._generation += 1
+        self._cancelled = threading.Event()
+        self._pending = set(reports)
+        for name, function in reports.items():
+            self.pool.start(_ReportTask(self, self._generation, name, function, self._cancelled))
+
+    def cancel(self):
+        """Descarta las tareas pendientes e interrumpe las que están corriendo"""
+        self._cancelled.set()
+        self.pool.clear()
+        self._pending = set()
+
+    def is_running(self):
+        return bool(self._pending)
+
+    def wait(self, msecs=-1):
+        """Espera a que terminen los hilos (ej: al cerrar la aplicación)"""
+        return self.pool.waitForDone(msecs)
+
+    def _on_task_done(self, generation, name, result, error):
+        # Resultados de una ejecución cancelada: se ignoran
+        if generation != self._generation or name not in self._pending:
+            return
+        self._pending.discard(name)
+        if error is None:
+            self.report_ready.emit(name, result)
+        else:
+            self.report_failed.emit(name, str(error))
+        if not self._pending:
+            self.finished.emit()
+
+
+class _ReportTask(QRunnable):
+    """Un reporte ejecutándose en un hilo del pool"""
+
+    def __init__(self, runner, generation, name, function, cancelled):
+        super().__init__()
+        self.runner = runner
+        self.generation = generation
+        self.name = name
+        self.function = function
+        self.cancelled = cancelled
+
+    def run(self):
+        if self.cancelled.is_set():
+            return
+
+        result, error = None, None
+        session = get_session()  # Sesión propia de este hilo (scoped_session)
+        try:
+            # SQLite consulta al manejador cada PROGRESS_STEPS instrucciones;
+            # devolver 1 aborta la consulta en curso
+            dbapi_connection = session.connection().connection.dbapi_connection
+            dbapi_connection.set_progress_handler(
+                lambda: 1 if self.cancelled.is_set() else 0, ReportRunner.PROGRESS_STEPS
+            )
+            try:
+                result = self.function(session)
+            finally:
+                dbapi_connection.set_progress_handler(None, 0)
+        except Exception as e:
+            error = e
+        finally:
+            close_session()
+
+        if self.cancelled.is_set():
+            return
+        try:
+            self.runner._task_done.emit(self.generation, self.name, result, error)
+        except RuntimeError:
+            pass  # El runner ya fue destruido
@@ -0,0 +1,345 @@
+"""
+Tabla virtualizada de ventas (model/view)
+- SalesTableModel: QAbstractTableModel alimentado por páginas keyset (fetchMore)
+- SalesFilterProxyModel: filtro inmediato por factura y método de pago
+- SaleActionsDelegate: pinta los botones de acción de cada fila sin crear widgets
+"""
+from PyQt6.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QRect, QRectF, QEvent,
+    pyqtSignal
+)
+from PyQt6.QtGui import QColor, QPainter, QPainterPath, QFont
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle, QToolTip
+from config.database import get_session, close_session
+from database.sale_repository import SaleRepository
+from models import SaleStatus
+
+
+class SalesTableModel(QAbstractTableModel):
+    """
+    Modelo de ventas paginado
+    Solo mantiene en memoria las filas ya recorridas; la vista pide más con
+    fetchMore() al llegar al final del scroll
+    """
+
+    HEADERS = ["N° Factura", "Fecha", "Cliente", "Total", "Método Pago", "Estado", "Acciones"]
+    ACTIONS_COLUMN = 6
+
+    # Rol con la SaleRow completa de la fila
+    SaleRole = Qt.ItemDataRole.UserRole + 1
+
+    STATUS_COLORS = {
+        SaleStatus.COMPLETED: QColor(Qt.GlobalColor.darkGreen),
+        SaleStatus.CANCELLED: QColor(Qt.GlobalColor.red),
+        SaleStatus.EDITED: QColor("#f59e0b"),  # Naranja para editada
+    }
+
+    def __init__(self, parent=None, page_size=SaleRepository.DEFAULT_PAGE_SIZE):
+        super().__init__(parent)
+        self.page_size = page_size
+        self.filters = {}
+        self._rows = []
+        self._row_by_id = {}
+        self._has_more = True
+
+    # ------------------------------------------------------------------
+    # Carga de datos
+    # ------------------------------------------------------------------
+
+    def reload(self, filters=None):
+        """Descarta las filas cargadas y trae la primera página"""
+        if filters is not None:
+            self.filters = dict(filters)
+        self.beginResetModel()
+        self._rows = []
+        self._row_by_id = {}
+        self._has_more = True
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more:
+            return
+        after_key = SaleRepository.key_of(self._rows[-1]) if self._rows else None
+        session = get_session()
+        try:
+            page = SaleRepository.fetch_page(session, after_key, self.page_size, self.filters)
+        finally:
+            close_session()
+
+        self._has_more = len(page) == self.page_size
+        if not page:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        for sale in page:
+            self._row_by_id[sale.id] = len(self._rows)
+            self._rows.append(sale)
+        self.endInsertRows()
+
+    def refresh_sale(self, sale_id):
+        """Vuelve a leer una sola venta y actualiza su fila si está cargada"""
+        return self.refresh_sales([sale_id]) > 0
+
+    def refresh_sales(self, sale_ids):
+        """
+        Vuelve a leer solo las ventas cargadas con esos ids y actualiza sus filas
+
+        Returns:
+            Cantidad de filas actualizadas
+        """
+        loaded = [sale_id for sale_id in sale_ids if sale_id in self._row_by_id]
+        if not loaded:
+            return 0
+        session = get_session()
+        try:
+            sales = SaleRepository.fetch_by_ids(session, loaded)
+        finally:
+            close_session()
+        for sale in sales:
+            row = self._row_by_id[sale.id]
+            self._rows[row] = sale
+            self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+        return len(sales)
+
+    def sale_ids_for_customers(self, customer_ids):
+        """Ids de las ventas cargadas de esos clientes"""
+        return [sale.id for sale in self._rows if sale.customer_id in customer_ids]
+
+    def sale_at(self, row):
+        """SaleRow de una fila del modelo"""
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def total_amount(self):
+        """Total de ventas no canceladas según los filtros actuales (consulta agregada)"""
+        session = get_session()
+        try:
+            return SaleRepository.total_amount(session, self.filters)
+        finally:
+            close_session()
+
+    # ------------------------------------------------------------------
+    # QAbstractTableModel
+    # ------------------------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        sale = self._rows[index.row()]
+        column = index.column()
+
+        if role == self.SaleRole:
+            return sale
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return sale.invoice_number
+            if column == 1:
+                return sale.created_at.strftime("%d/%m/%Y %H:%M")
+            if column == 2:
+                return sale.customer_name or "Cliente General"
+            if column == 3:
+                return self._format_money(sale.total)
+            if column == 4:
+                return sale.payment_method.value
+            if column == 5:
+                return sale.status.value
+            return None
+
+        if role == Qt.ItemDataRole.UserRole:
+            # Valor crudo para ordenar
+            if column == 1:
+                return sale.created_at
+            if column == 3:
+                return float(sale.total)
+            return self.data(index, Qt.ItemDataRole.DisplayRole)
+
+        if role == Qt.ItemDataRole.ForegroundRole and column == 5:
+            return self.STATUS_COLORS.get(sale.status)
+
+        if role == Qt.ItemDataRole.TextAlignmentRole and column == 3:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+        return None
+
+    @staticmethod
+    def _format_money(value):
+        """Formatea sin decimales si es entero"""
+        if value == int(value):
+            return f"${int(value):,}"
+        return f"${value:,.2f}"
+
+
+class SalesFilterProxyModel(QSortFilterProxyModel):
+    """
+    Filtro inmediato sobre las filas cargadas (búsqueda por factura y método de pago)
+    El modelo fuente además recarga con los mismos filtros en la base de datos
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search_text = ''
+        self.payment_method = 'Todos'
+        self.setSortRole(Qt.ItemDataRole.UserRole)
+
+    def set_filters(self, search_text, payment_method):
+        self.search_text = (search_text or '').lower()
+        self.payment_method = payment_method or 'Todos'
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        sale = self.sourceModel().sale_at(source_row)
+        if sale is None:
+            return False
+        if self.search_text and self.search_text not in sale.invoice_number.lower():
+            return False
+        if self.payment_method != 'Todos' and sale.payment_method.value != self.payment_method:
+            return False
+        return True
+
+
+class SaleActionsDelegate(QStyledItemDelegate):
+    """
+    Pinta los botones de acción (ver, editar, factura) de la columna Acciones
+    y traduce los clics en señales; no crea ningún QWidget por fila
+    """
+
+    view_clicked = pyqtSignal(object)
+    edit_clicked = pyqtSignal(object)
+    invoice_clicked = pyqtSignal(object)
+    invoice_view_clicked = pyqtSignal(object)
+
+    BUTTON_WIDTH = 40
+    BUTTON_HEIGHT = 32
+    MARGIN = 4
+    RADIUS = 4
+
+    # (clave, ícono, color, color hover, tooltip)
+    VIEW = ('view', "👁️", "#2563eb", "#1d4ed8", "Ver Detalle")
+    EDIT = ('edit', "✏️", "#f59e0b", "#d97706", "Editar")
+    INVOICE = ('invoice', "📄", "#10b981", "#059669", "Generar Factura")
+    INVOICE_VIEW = ('invoice_view', "✅", "#10b981", "#059669", "Ver Factura")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._hover = None  # (fila, clave) bajo el cursor
+        self._font = QFont()
+        self._font.setPointSize(11)
+
+    def _buttons(self, sale):
+        if sale.has_invoice:
+            return (self.VIEW, self.INVOICE_VIEW)
+        return (self.VIEW, self.EDIT, self.INVOICE)
+
+    def _button_rects(self, option_rect, sale):
+        buttons = self._buttons(sale)
+        x = option_rect.left() + self.MARGIN
+        y = option_rect.top() + (option_rect.height() - self.BUTTON_HEIGHT) // 2
+        rects = []
+        for button in buttons:
+            rects.append((button, QRect(x, y, self.BUTTON_WIDTH, self.BUTTON_HEIGHT)))
+            x += self.BUTTON_WIDTH
+        return rects
+
+    def paint(self, painter, option, index):
+        sale = index.data(SalesTableModel.SaleRole)
+        if sale is None:
+            return super().paint(painter, option, index)
+
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(self._font)
+        rects = self._button_rects(option.rect, sale)
+        last = len(rects) - 1
+        for position, ((key, icon, color, hover_color, _), rect) in enumerate(rects):
+            hovered = self._hover == (index.row(), key)
+            path = self._button_path(QRectF(rect), left=position == 0, right=position == last)
+            painter.fillPath(path, QColor(hover_color if hovered else color))
+            painter.setPen(QColor("white"))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, icon)
+        painter.restore()
+
+    def _button_path(self, rect, left, right):
+        """Botón con esquinas redondeadas solo en los extremos del grupo"""
+        path = QPainterPath()
+        path.addRoundedRect(rect, self.RADIUS, self.RADIUS)
+        if not left:
+            square = QPainterPath()
+            square.addRect(QRectF(rect.left(), rect.top(), rect.width() / 2, rect.height()))
+            path = path.united(square)
+        if not right:
+            square = QPainterPath()
+            square.addRect(QRectF(rect.center().x(), rect.top(), rect.width() / 2, rect.height()))
+            path = path.united(square)
+        return path
+
+    def _button_at(self, option_rect, sale, pos):
+        for button, rect in self._button_rects(option_rect, sale):
+            if rect.contains(pos):
+                return button
+        return None
+
+    def editorEvent(self, event, model, option, index):
+        sale = index.data(SalesTableModel.SaleRole)
+        if sale is None:
+            return False
+
+        if event.type() == QEvent.Type.MouseMove:
+            button = self._button_at(option.rect, sale, event.position().toPoint())
+            hover = (index.row(), button[0]) if button else None
+            if hover != self._hover:
+                self._hover = hover
+                if option.widget is not None:
+                    option.widget.viewport().update()
+            return False
+
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            button = self._button_at(option.rect, sale, event.position().toPoint())
+            if button is None:
+                return False
+            signal = {
+                'view': self.view_clicked,
+                'edit': self.edit_clicked,
+                'invoice': self.invoice_clicked,
+                'invoice_view': self.invoice_view_clicked,
+            }[button[0]]
+            signal.emit(sale)
+            return True
+
+        return False
+
+    def helpEvent(self, event, view, option, index):
+        sale = index.data(SalesTableModel.SaleRole)
+        if sale is not None and event.type() == QEvent.Type.ToolTip:
+            button = self._button_at(option.rect, sale, event.pos())
+            if button:
+                QToolTip.showText(event.globalPos(), button[4], view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        size.setWidth(self.MARGIN * 2 + self.BUTTON_WIDTH * 3)
+        size.setHeight(max(size.height(), self.BUTTON_HEIGHT + self.MARGIN * 2))
+        return size
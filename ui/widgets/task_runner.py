@@ -0,0 +1,117 @@
+"""
+Tareas largas en segundo plano con diálogo de progreso
+La tarea corre en un hilo del QThreadPool con su propia sesión y avisa el
+progreso por señal; la vista muestra un QProgressDialog con opción de
+cancelar y la interfaz sigue respondiendo (exportaciones, importaciones).
+"""
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtWidgets import QMessageBox, QProgressDialog
+from config.database import get_session, close_session
+
+
+def run_task(parent, label, function, on_finished, error_prefix="Error"):
+    """
+    Ejecuta function en segundo plano mostrando un diálogo de progreso
+
+    Args:
+        parent: Vista que lanza la tarea
+        label: Texto del diálogo (ej: "Exportando")
+        function: función(session, progress, cancelled) que devuelve el resultado;
+            progress(hechos, total) avisa el avance y cancelled es un threading.Event
+        on_finished: función(resultado) llamada en el hilo de la interfaz
+        error_prefix: Inicio del mensaje de error
+    """
+    runner = TaskRunner(parent)
+    dialog = QProgressDialog(f"{label}...", "Cancelar", 0, 0, parent)
+    dialog.setWindowTitle(label)
+    dialog.setWindowModality(Qt.WindowModality.WindowModal)
+    dialog.setMinimumDuration(300)
+    dialog.setAutoClose(False)
+    dialog.setAutoReset(False)
+
+    def on_progress(done, total):
+        dialog.setMaximum(total)
+        dialog.setValue(done)
+        dialog.setLabelText(f"{label}... {done:,} de {total:,} filas" if total else f"{label}... {done:,} filas")
+
+    def close():
+        dialog.close()
+        runner.deleteLater()
+
+    def on_done(result):
+        close()
+        on_finished(result)
+
+    def on_failed(message):
+        close()
+        QMessageBox.critical(parent, "Error", f"{error_prefix}: {message}")
+
+    runner.progress.connect(on_progress)
+    runner.finished.connect(on_done)
+    runner.failed.connect(on_failed)
+    runner.cancelled.connect(close)
+    dialog.canceled.connect(runner.cancel)
+    runner.run(function)
+    return runner
+
+
+class TaskRunner(QObject):
+    """
+    Ejecuta una tarea en un hilo de trabajo
+
+    Señales:
+        progress(hechos, total)
+        finished(resultado): la tarea terminó
+        failed(mensaje): la tarea lanzó una excepción
+        cancelled(): la tarea se interrumpió porque se pidió cancelar
+    """
+
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._cancelled = threading.Event()
+
+    def run(self, function):
+        self._cancelled = threading.Event()
+        self.pool.start(_Task(self, function, self._cancelled))
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+
+class _Task(QRunnable):
+    """La tarea corriendo en el hilo del pool"""
+
+    def __init__(self, runner, function, cancelled):
+        super().__init__()
+        self.runner = runner
+        self.function = function
+        self.cancelled = cancelled
+
+    def run(self):
+        session = get_session()  # Sesión propia de este hilo (scoped_session)
+        try:
+            try:
+                result = self.function(session, self.runner.progress.emit, self.cancelled)
+            finally:
+                close_session()
+            self.runner.finished.emit(result)
+        except Exception as e:
+            # Si se pidió cancelar, la excepción es la forma de cortar la tarea
+            try:
+                if self.cancelled.is_set():
+                    self.runner.cancelled.emit()
+                else:
+                    self.runner.failed.emit(str(e))
+            except RuntimeError:
+                pass  # El runner ya fue destruido
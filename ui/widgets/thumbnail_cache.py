@@ -0,0 +1,205 @@
+"""
+Miniaturas de las imágenes de productos para las galerías de venta
+Cada imagen se reduce una sola vez con Pillow a los tamaños de las galerías
+y se guarda en resources/images/.thumbs con un nombre que incluye la ruta y
+la fecha de modificación de la original (si la imagen cambia, la miniatura
+vieja deja de usarse). Encima hay un LRU de QPixmap en memoria, así abrir
+la pantalla de ventas no decodifica ninguna imagen de tamaño completo.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from PyQt6.QtGui import QImage, QPixmap
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+IMAGES_DIR = os.path.join(BASE_DIR, 'resources', 'images')
+THUMBS_DIR = os.path.join(IMAGES_DIR, '.thumbs')
+
+
+class ThumbnailCache:
+    """
+    Caché de miniaturas en disco y de QPixmap en memoria para todo el proceso
+    thumbnail_image() puede llamarse desde hilos de trabajo; los QPixmap solo
+    se crean en el hilo de la interfaz (pixmap, for_product)
+    """
+
+    # Tamaños usados por las galerías (venta rápida y selección de productos)
+    SIZES = (60, 90)
+
+    MAX_PIXMAPS = 512
+
+    _pixmaps = OrderedDict()   # (ruta, mtime, tamaño) -> QPixmap
+    _legacy_names = None       # (mtime de resources/images, archivos sueltos: imágenes por SKU o nombre)
+
+    @staticmethod
+    def _prefix(source_path):
+        return hashlib.sha1(os.path.normcase(os.path.abspath(source_path)).encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def thumbnail_path(source_path, mtime_ns, size):
+        """Ruta de la miniatura de una versión (mtime) de la imagen"""
+        return os.path.join(THUMBS_DIR, f"{ThumbnailCache._prefix(source_path)}_{mtime_ns}_{size}.png")
+
+    @staticmethod
+    def create(source_path):
+        """
+        Genera las miniaturas de todos los tamaños de una imagen (al guardarla
+        en recursos) y borra las de versiones anteriores
+
+        Returns:
+            True si se generaron
+        """
+        mtime_ns = ThumbnailCache.source_mtime(source_path)
+        if mtime_ns is None:
+            return False
+        ThumbnailCache.discard(source_path)
+        return all(ThumbnailCache._write(source_path, mtime_ns, size) for size in ThumbnailCache.SIZES)
+
+    @staticmethod
+    def discard(source_path):
+        """Borra las miniaturas (en disco y en memoria) de una imagen"""
+        prefix = f"{ThumbnailCache._prefix(source_path)}_"
+        if os.path.isdir(THUMBS_DIR):
+            for filename in os.listdir(THUMBS_DIR):
+                if filename.startswith(prefix):
+                    try:
+                        os.remove(os.path.join(THUMBS_DIR, filename))
+                    except OSError as e:
+                        print(f"No se pudo borrar la miniatura {filename}: {e}")
+        for key in [key for key in ThumbnailCache._pixmaps if key[0] == source_path]:
+            del ThumbnailCache._pixmaps[key]
+
+    @staticmethod
+    def _write(source_path, mtime_ns, size):
+        """Reduce la imagen con Pillow y la guarda como PNG (escritura atómica)"""
+        from PIL import Image
+
+        thumb_path = ThumbnailCache.thumbnail_path(source_path, mtime_ns, size)
+        temp_path = f"{thumb_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(THUMBS_DIR, exist_ok=True)
+            with Image.open(source_path) as image:
+                image.draft('RGB', (size, size))  # JPEG: decodifica ya reducido
+                image.thumbnail((size, size), Image.Resampling.LANCZOS)
+                if image.mode not in ('RGB', 'RGBA'):
+                    image = image.convert('RGBA')
+                image.save(temp_path, 'PNG')
+            os.replace(temp_path, thumb_path)
+            return True
+        except Exception as e:
+            print(f"Error al generar miniatura de {source_path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+    @staticmethod
+    def thumbnail_image(source_path, size):
+        """
+        Miniatura de una imagen como QImage (la genera si falta)
+        Segura para hilos de trabajo
+
+        Returns:
+            (mtime, QImage) o None si la imagen no existe o no se pudo leer
+        """
+        mtime_ns = ThumbnailCache.source_mtime(source_path)
+        if mtime_ns is None:
+            return None
+        thumb_path = ThumbnailCache.thumbnail_path(source_path, mtime_ns, size)
+        if not os.path.exists(thumb_path) and not ThumbnailCache._write(source_path, mtime_ns, size):
+            return None
+        image = QImage(thumb_path)
+        return None if image.isNull() else (mtime_ns, image)
+
+    @staticmethod
+    def source_mtime(source_path):
+        """Fecha de modificación (ns) de la imagen original, None si no existe"""
+        try:
+            return os.stat(source_path).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def has_pixmap(source_path, mtime_ns, size):
+        """True si la miniatura ya está en memoria (solo lectura, se puede consultar desde hilos)"""
+        return (source_path, mtime_ns, size) in ThumbnailCache._pixmaps
+
+    @staticmethod
+    def cached_pixmap(source_path, mtime_ns, size):
+        key = (source_path, mtime_ns, size)
+        pixmap = ThumbnailCache._pixmaps.get(key)
+        if pixmap is not None:
+            ThumbnailCache._pixmaps.move_to_end(key)
+        return pixmap
+
+    @staticmethod
+    def store_pixmap(source_path, mtime_ns, size, image):
+        """Convierte una miniatura en QPixmap y la guarda en el LRU (hilo de la interfaz)"""
+        pixmap = QPixmap.fromImage(image)
+        ThumbnailCache._pixmaps[(source_path, mtime_ns, size)] = pixmap
+        while len(ThumbnailCache._pixmaps) > ThumbnailCache.MAX_PIXMAPS:
+            ThumbnailCache._pixmaps.popitem(last=False)
+        return pixmap
+
+    @staticmethod
+    def pixmap(source_path, size):
+        """QPixmap de la miniatura de una imagen, None si no hay imagen"""
+        mtime_ns = ThumbnailCache.source_mtime(source_path)
+        if mtime_ns is None:
+            return None
+        pixmap = ThumbnailCache.cached_pixmap(source_path, mtime_ns, size)
+        if pixmap is not None:
+            return pixmap
+        loaded = ThumbnailCache.thumbnail_image(source_path, size)
+        if loaded is None:
+            return None
+        return ThumbnailCache.store_pixmap(source_path, loaded[0], size, loaded[1])
+
+    @staticmethod
+    def sources_for(product):
+        """
+        Imágenes candidatas de un producto en orden: su image_path y, por
+        retrocompatibilidad, resources/images/<sku>.png o <nombre>.png. Las
+        imágenes sueltas se buscan en un listado de la carpeta (ver
+        legacy_names), sin buscar cada archivo en el disco.
+        """
+        sources = []
+        if product.image_path:
+            sources.append(os.path.join(BASE_DIR, product.image_path))
+
+        legacy_names = ThumbnailCache.legacy_names()
+        for filename in (f"{product.sku}.png", f"{product.name}.png"):
+            if filename in legacy_names:
+                sources.append(os.path.join(IMAGES_DIR, filename))
+                break
+        return sources
+
+    @staticmethod
+    def legacy_names():
+        """
+        Nombres de los archivos sueltos de resources/images
+        El listado se vuelve a leer solo cuando cambia la fecha de
+        modificación de la carpeta (se agregó, borró o renombró un archivo),
+        así una imagen copiada con la aplicación abierta aparece sin reiniciar
+        """
+        try:
+            mtime_ns = os.stat(IMAGES_DIR).st_mtime_ns
+        except OSError:
+            return set()
+        cached = ThumbnailCache._legacy_names
+        if cached is None or cached[0] != mtime_ns:
+            try:
+                names = {entry.name for entry in os.scandir(IMAGES_DIR) if entry.is_file()}
+            except OSError:
+                names = set()
+            cached = ThumbnailCache._legacy_names = (mtime_ns, names)
+        return cached[1]
+
+    @staticmethod
+    def for_product(product, size):
+        """QPixmap de la miniatura de un producto, None si no tiene imagen"""
+        for source_path in ThumbnailCache.sources_for(product):
+            pixmap = ThumbnailCache.pixmap(source_path, size)
+            if pixmap is not None:
+                return pixmap
+        return None
@@ -0,0 +1,77 @@
+"""
+Refresco incremental de vistas a partir del bus de eventos
+- Vista visible: aplica el cambio en el momento (solo las filas afectadas)
+- Vista oculta: solo anota lo pendiente y lo aplica al mostrarse
+Cambiar de pestaña no cuesta nada si no hubo cambios.
+"""
+from PyQt6.QtCore import QObject
+from core.events import EventBus
+
+
+class ViewRefresher(QObject):
+    """
+    Acumula los cambios pendientes de una vista
+
+    Args:
+        view: Vista (QWidget) a refrescar
+        reload: Función sin argumentos que recarga la vista completa
+        patch: Función (ids) que actualiza solo esas filas; si no se indica,
+            cualquier cambio provoca una recarga completa
+    """
+
+    def __init__(self, view, reload, patch=None):
+        super().__init__(view)
+        self.view = view
+        self._reload = reload
+        self._patch = patch
+        self._dirty = False
+        self._pending = set()
+        self._subscriptions = []
+        subscriptions = self._subscriptions
+        view.destroyed.connect(lambda *args: _unsubscribe(subscriptions))
+
+    def subscribe(self, event_type, handler):
+        """Suscribe un manejador de la vista; se cancela al destruirse la vista"""
+        EventBus.subscribe(event_type, handler)
+        self._subscriptions.append((event_type, handler))
+
+    @property
+    def is_dirty(self):
+        return self._dirty or bool(self._pending)
+
+    def invalidate(self):
+        """Toda la vista quedó desactualizada"""
+        if self.view.isVisible():
+            self._dirty = False
+            self._pending.clear()
+            self._reload()
+        else:
+            self._dirty = True
+
+    def patch(self, ids):
+        """Cambiaron las filas con esos ids (vacío = no se sabe cuáles)"""
+        if not ids or self._patch is None:
+            self.invalidate()
+            return
+        if self._dirty:
+            return  # Ya se recargará completa al mostrarse
+        if self.view.isVisible():
+            self._patch(set(ids))
+        else:
+            self._pending.update(ids)
+
+    def on_show(self):
+        """Aplica lo pendiente; llamar desde showEvent"""
+        if self._dirty:
+            self._dirty = False
+            self._pending.clear()
+            self._reload()
+        elif self._pending:
+            ids, self._pending = self._pending, set()
+            self._patch(ids)
+
+
+def _unsubscribe(subscriptions):
+    for event_type, handler in subscriptions:
+        EventBus.unsubscribe(event_type, handler)
+    subscriptions.clear()
@@ -0,0 +1,40 @@
+"""
+Utilidades de filtrado por fechas
+Todos los filtros usan rangos semiabiertos [inicio, fin) sobre la columna
+sin envolverla en funciones (func.date, strftime...), de modo que SQLite
+puede usar el índice de created_at y la consulta sigue siendo O(log n)
+aunque el historial crezca a millones de filas.
+"""
+from datetime import date, datetime, timedelta
+from sqlalchemy import and_
+
+def _as_date(value):
+    """Convierte datetime/date en date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    raise TypeError(f"Se esperaba date o datetime, se recibió {type(value).__name__}")
+
+def day_bounds(day):
+    """Rango [día 00:00, día siguiente 00:00)"""
+    start = datetime.combine(_as_date(day), datetime.min.time())
+    return start, start + timedelta(days=1)
+
+def period_bounds(date_from, date_to):
+    """Rango que incluye completos los días date_from y date_to"""
+    start, _ = day_bounds(date_from)
+    _, end = day_bounds(date_to)
+    return start, end
+
+def in_range(column, start, end):
+    """Condición start <= column < end"""
+    return and_(column >= start, column < end)
+
+def on_day(column, day):
+    """Filtra la columna al día indicado"""
+    return in_range(column, *day_bounds(day))
+
+def in_period(column, date_from, date_to):
+    """Filtra la columna entre dos días (ambos incluidos)"""
+    return in_range(column, *period_bounds(date_from, date_to))
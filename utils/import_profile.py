@@ -0,0 +1,215 @@
+"""
+Perfiles de mapeo de columnas para la importación de productos
+Un perfil (archivo JSON en resources/import_profiles) define qué columna del
+archivo corresponde a cada campo del producto y a cada materia prima, y el
+formato numérico local de precios y cantidades. Al encontrar la fila de
+encabezados el perfil se compila una sola vez por archivo: las columnas se
+resuelven a posiciones y los formatos numéricos a funciones de conversión
+(str.translate + float), así cada fila se convierte sin volver a analizar
+nombres de columna ni probar formatos.
+"""
+import json
+import os
+
+PROFILES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources', 'import_profiles'
+)
+DEFAULT_PROFILE = 'crispetas.json'
+
+
+class ProfileError(Exception):
+    """Perfil inválido o que no corresponde a los encabezados del archivo"""
+    pass
+
+
+def normalize_column(name):
+    """Nombre de columna comparable: mayúsculas y espacios internos colapsados"""
+    return ' '.join(str(name).split()).upper() if name is not None else ''
+
+
+def number_parser(decimal='.', thousands='', currency='', absolute=False, on_error=None):
+    """
+    Compila un formato numérico en una función valor -> float
+
+    Args:
+        decimal: Separador decimal del archivo
+        thousands: Separador de miles ('' si no se usa)
+        currency: Símbolo de moneda a descartar
+        absolute: Si True devuelve el valor absoluto (cantidades negativas = consumo)
+        on_error: Función llamada con el texto que no se pudo convertir (el valor queda en 0)
+    """
+    table = {ord(char): None for char in f"{thousands}{currency} \xa0" if char}
+    if decimal != '.':
+        table[ord(decimal)] = '.'
+
+    def parse(value):
+        if value is None:
+            return 0.0
+        if isinstance(value, (int, float)):
+            number = float(value)
+        else:
+            text = str(value).translate(table)
+            if not text:
+                return 0.0
+            try:
+                number = float(text)
+            except ValueError:
+                if on_error is not None:
+                    on_error(value)
+                return 0.0
+        return abs(number) if absolute else number
+
+    return parse
+
+
+class CompiledProfile:
+    """
+    Perfil resuelto contra los encabezados de un archivo
+
+    Atributos:
+        width: Cantidad de columnas del encabezado (las filas se completan hasta este ancho)
+        code, name, price, category: Posición de cada campo (price y category pueden ser None)
+        materials: Lista de (posición, materia prima, unidad)
+        parse_price, parse_quantity: Conversores numéricos compilados
+    """
+
+    def __init__(self, profile, header, on_price_error=None):
+        positions = {}
+        for index, column in enumerate(header):
+            positions[normalize_column(column)] = index  # Con columnas repetidas gana la última
+
+        missing = [
+            profile.columns[field] for field in ImportProfile.REQUIRED_FIELDS
+            if normalize_column(profile.columns[field]) not in positions
+        ]
+        if missing:
+            raise ProfileError(
+                f"El archivo no tiene las columnas del perfil '{profile.name}': {', '.join(missing)}"
+            )
+
+        def position(field):
+            column = profile.columns.get(field)
+            return positions.get(normalize_column(column)) if column else None
+
+        self.width = len(header)
+        self.code = position('code')
+        self.name = position('name')
+        self.price = position('price')
+        self.category = position('category')
+        self.materials = [
+            (positions[normalize_column(material['column'])], material['material'], material['unit'])
+            for material in profile.materials
+            if normalize_column(material['column']) in positions
+        ]
+        self.parse_price = number_parser(**profile.price_format, on_error=on_price_error)
+        self.parse_quantity = number_parser(**profile.quantity_format)
+
+        self._category_rules = [
+            (tuple(keyword.upper() for keyword in rule['contains']), rule['category'])
+            for rule in profile.categories
+        ]
+        self._default_category = profile.default_category
+        self._sku_prefix = profile.sku_prefix
+        self._sku_pad = profile.sku_pad
+
+    def category_for(self, product_name):
+        """Categoría según la primera regla cuyo texto aparece en el nombre"""
+        name = product_name.upper()
+        for keywords, category in self._category_rules:
+            if any(keyword in name for keyword in keywords):
+                return category
+        return self._default_category
+
+    def sku_for(self, code):
+        return f"{self._sku_prefix}{code.zfill(self._sku_pad)}"
+
+
+class ImportProfile:
+    """
+    Perfil de mapeo de columnas (ver resources/import_profiles/crispetas.json)
+    """
+
+    REQUIRED_FIELDS = ('code', 'name')
+
+    NUMBER_FORMAT_KEYS = ('decimal', 'thousands', 'currency', 'absolute')
+
+    def __init__(self, data, path=None):
+        self.path = path
+        try:
+            self.name = data.get('name') or (os.path.basename(path) if path else 'Perfil')
+            self.header_markers = [str(marker).upper() for marker in data.get('header_markers', [])]
+            self.columns = dict(data['columns'])
+            self.materials = [
+                {'column': item['column'], 'material': item['material'], 'unit': item.get('unit', 'und')}
+                for item in data.get('materials', [])
+            ]
+            self.price_format = self._number_format(data.get('price_format', {}))
+            self.quantity_format = self._number_format({'absolute': True, **data.get('quantity_format', {})})
+            self.categories = [
+                {'contains': list(rule['contains']), 'category': rule['category']}
+                for rule in data.get('categories', [])
+            ]
+            self.default_category = data.get('default_category', 'General')
+            self.sku_prefix = data.get('sku', {}).get('prefix', '')
+            self.sku_pad = int(data.get('sku', {}).get('pad', 0))
+            self.cost_ratio = float(data.get('cost_ratio', 0.4))
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ProfileError(f"Perfil de importación inválido: {str(e)}")
+
+        missing = [field for field in self.REQUIRED_FIELDS if not self.columns.get(field)]
+        if missing:
+            raise ProfileError(f"El perfil '{self.name}' no define las columnas: {', '.join(missing)}")
+        if not self.header_markers:
+            self.header_markers = [normalize_column(self.columns[field]) for field in self.REQUIRED_FIELDS]
+
+    @classmethod
+    def _number_format(cls, number_format):
+        unknown = set(number_format) - set(cls.NUMBER_FORMAT_KEYS)
+        if unknown:
+            raise ValueError(f"claves de formato desconocidas: {', '.join(sorted(unknown))}")
+        return dict(number_format)
+
+    @classmethod
+    def load(cls, path):
+        """Carga un perfil desde un archivo JSON"""
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            raise ProfileError(f"No se pudo leer el perfil '{path}': {str(e)}")
+        return cls(data, path)
+
+    @classmethod
+    def default(cls):
+        """Perfil del formato original de la plantilla de productos"""
+        return cls.load(os.path.join(PROFILES_DIR, DEFAULT_PROFILE))
+
+    @staticmethod
+    def available():
+        """
+        Perfiles incluidos con la aplicación
+
+        Returns:
+            Lista de (nombre, ruta), el perfil por defecto primero
+        """
+        profiles = []
+        if os.path.isdir(PROFILES_DIR):
+            for filename in sorted(os.listdir(PROFILES_DIR)):
+                if not filename.lower().endswith('.json'):
+                    continue
+                path = os.path.join(PROFILES_DIR, filename)
+                try:
+                    profiles.append((ImportProfile.load(path).name, path))
+                except ProfileError as e:
+                    print(f"Error al cargar perfil de importación: {e}")
+        profiles.sort(key=lambda item: os.path.basename(item[1]) != DEFAULT_PROFILE)
+        return profiles
+
+    def is_header(self, row):
+        """True si la fila contiene todos los marcadores de encabezado"""
+        line = ' '.join(normalize_column(value) for value in row if value is not None)
+        return all(marker in line for marker in self.header_markers)
+
+    def compile(self, header, on_price_error=None):
+        """Resuelve el perfil contra los encabezados del archivo (ver CompiledProfile)"""
+        return CompiledProfile(self, header, on_price_error)
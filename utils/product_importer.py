@@ -1,423 +1,484 @@
 """
 Utilidad para importar productos y materias primas desde archivo CSV/Excel
+Las filas se leen directo del archivo (csv.reader sobre el archivo abierto u
+openpyxl en modo read_only) y se convierten con el perfil de columnas
+(utils.import_profile) compilado contra el encabezado del archivo. Los SKU,
+categorías y materias primas existentes se precargan en diccionarios y cada
+bloque de filas se guarda con INSERT/UPDATE masivos, sin consultas por fila.
+Varios archivos (import_files) se leen y validan en paralelo en un pool de
+procesos y un solo escritor guarda sus registros en una misma transacción.
 """
 import csv
+import multiprocessing
+import os
+import time
 import traceback
-from decimal import Decimal
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from sqlalchemy import insert, update
 from config.database import get_session, close_session
 from models import Product, RawMaterial, ProductMaterial, Category
+from services.recipe_cache import RecipeCache
+from utils.import_profile import ImportProfile
 
 class ProductImporter:
     """Clase para importar productos y sus materias primas desde CSV"""
     
-    # Mapeo de columnas del CSV a materias primas
-    MATERIAL_COLUMNS = {
-        'ACEITE (ML)': 'Aceite',
-        'MAIZ     (GR)': 'Maíz',
-        'SAL       (GR)': 'Sal',
-        'CARAMELO (GR)': 'Caramelo',
-        'QUESO   (GR)': 'Queso',
-        'LIMON       (GR)': 'Limón',
-        'TOCINETA   (GR)': 'Tocineta',
-        'COLORES    (GR)': 'Colores',
-        'BOLSA NORMAL (UND)': 'Bolsa Normal',
-        'BOLSA AL MAYOR (UND)': 'Bolsa al Mayor',
-        'CAJA POPETA (UND)': 'Caja Popeta',
-        'JUGUETE       (UND)': 'Juguete',
-        'GRANIZADO   (ONZ)': 'Granizado',
-        'VASOS    (UND)': 'Vasos',
-        'PITILLOS    (UND)': 'Pitillos',
-        'PERLAS    (GR)': 'Perlas',
-        'TOPIN GOMAS': 'Topin Gomas',
-        'GASEOSA     (UND)': 'Gaseosa',
-        'AGUA           (UND)': 'Agua',
-        'AZUCAR    (GR)': 'Azúcar',
-        'VASO ALGODÓN': 'Vaso Algodón',
-        'PICANTE (GR)': 'Picante'
-    }
+    # Filas por bloque de escritura
+    CHUNK_SIZE = 1000
     
-    def __init__(self):
+    def __init__(self, profile=None):
         self.errors = []
         self.warnings = []
         self.created_products = 0
         self.updated_products = 0
         self.created_materials = 0
         self.created_relations = 0
+        self.read_rows = 0
+        self.timings = {}
+        
+        # Mapeo de columnas y formatos numéricos (se compila al leer el encabezado)
+        self.profile = profile or ImportProfile.default()
+        self.columns = None
+        
+        # Precargados de la base de datos (ver preload)
+        self.product_ids = {}   # sku -> id
+        self.category_ids = {}  # nombre -> id
+        self.material_ids = {}  # nombre -> id
+    
+    def _price_warning(self, value):
+        self.warnings.append(f"Error parseando precio '{value}'")
+    
+    # ========== Lectura ==========
+    
+    def read_csv_rows(self, file_path):
+        """Filas de datos del CSV, leídas directo del archivo (ver rows_after_header)"""
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+            yield from self.rows_after_header(csv.reader(file))
+    
+    def read_excel_rows(self, file_path):
+        """Filas de datos de la hoja activa con openpyxl read_only (ver rows_after_header)"""
+        import openpyxl
+        
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            yield from self.rows_after_header(wb.active.iter_rows(values_only=True))
+        finally:
+            wb.close()
     
-    def parse_csv_value(self, value):
+    def rows_after_header(self, rows):
         """
-        Parsea un valor del CSV que puede estar en formato "123,45" o "123.45"
-        Los valores negativos indican consumo (se toman como positivos)
+        Salta las filas anteriores a la de encabezados (la que contiene los
+        marcadores del perfil), compila el perfil contra esos encabezados y
+        devuelve las filas siguientes completadas hasta el ancho del encabezado
+        
+        Yields:
+            (número de fila en el archivo, tupla de valores)
         """
-        if not value or value.strip() == '' or value.strip() == '0':
-            return 0.0
+        width = None
+        for row_idx, row in enumerate(rows, start=1):
+            if width is None:
+                if self.profile.is_header(row):
+                    self.columns = self.profile.compile(list(row), self._price_warning)
+                    width = self.columns.width
+                continue
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            yield row_idx, row
         
-        try:
-            # Limpiar el valor
-            value = str(value).strip()
-            
-            # Si es 0 o vacío, retornar 0
-            if value in ['0', '0,0', '0.0', '']:
-                return 0.0
-            
-            # Reemplazar coma por punto para formato decimal
-            value = value.replace(',', '.')
-            # Tomar valor absoluto (los negativos indican consumo)
-            parsed_value = abs(float(value))
-            
-            # Solo retornar si es mayor que 0
-            return parsed_value if parsed_value > 0 else 0.0
-        except (ValueError, AttributeError):
-            return 0.0
+        if width is None:
+            markers = "', '".join(self.profile.header_markers)
+            raise Exception(f"No se encontró la línea de encabezados con '{markers}'")
     
-    def parse_price(self, price_str):
-        """Parsea un precio en formato "$ 5.000" o similar"""
-        if not price_str or price_str.strip() == '':
-            return 0.0
+    @staticmethod
+    def cell_text(value):
+        """Texto de una celda (los números enteros de Excel sin '.0')"""
+        if value is None:
+            return ''
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value).strip()
+    
+    def parse_record(self, row_idx, row):
+        """
+        Valida una fila y la convierte en un registro normalizado con los
+        conversores compilados del perfil
         
-        try:
-            # Limpiar el precio
-            price_str = str(price_str).strip()
-            
-            # Si es 0, retornar 0
-            if price_str in ['0', '$ 0', '0,0', '0.0']:
-                return 0.0
-            
-            # Remover símbolo de pesos y espacios
-            clean_price = price_str.replace('$', '').replace(' ', '').strip()
-            
-            # Si tiene punto como separador de miles (formato colombiano)
-            if ',' in clean_price and '.' in clean_price:
-                # Formato: 5.000,50 -> 5000.50
-                parts = clean_price.split(',')
-                if len(parts) == 2:
-                    integer_part = parts[0].replace('.', '')  # Quitar puntos de miles
-                    decimal_part = parts[1]
-                    clean_price = f"{integer_part}.{decimal_part}"
-            elif ',' in clean_price and '.' not in clean_price:
-                # Formato: 5.000 -> 5000
-                clean_price = clean_price.replace('.', '')
-            elif ',' in clean_price:
-                # Formato: 5000,50 -> 5000.50
-                clean_price = clean_price.replace(',', '.')
-            elif '.' in clean_price and ',' not in clean_price:
-                # Formato: 5.000 -> 5000 (solo puntos de miles)
-                clean_price = clean_price.replace('.', '')
+        Returns:
+            dict con row, sku, name, sale_price, category y materials
+            [(materia prima, unidad, cantidad)], o None si la fila se omite
+        """
+        columns = self.columns
+        cell_text = self.cell_text
+        
+        # Saltar la primera fila de ejemplo (código 0)
+        codigo = cell_text(row[columns.code])
+        if not codigo or codigo == '0':
+            return None
+        
+        product_name = cell_text(row[columns.name])
+        if not product_name:
+            self.warnings.append(f"Fila {row_idx}: Nombre de producto vacío")
+            return None
+        
+        parse_quantity = columns.parse_quantity
+        materials = []
+        for index, material_name, unit in columns.materials:
+            quantity = parse_quantity(row[index])
+            if quantity > 0:
+                materials.append((material_name, unit, quantity))
+        
+        category = cell_text(row[columns.category]) if columns.category is not None else ''
+        
+        return {
+            'row': row_idx,
+            'sku': columns.sku_for(codigo),
+            'name': product_name,
+            'sale_price': columns.parse_price(row[columns.price]) if columns.price is not None else 0.0,
+            'category': category or columns.category_for(product_name),
+            'materials': materials
+        }
+    
+    def parse_records(self, rows):
+        """Registros válidos de las filas; las filas con error se anotan y se saltan"""
+        for row_idx, row in rows:
+            self.read_rows += 1
+            try:
+                record = self.parse_record(row_idx, row)
+            except Exception as e:
+                self.errors.append(f"Fila {row_idx}: {str(e)}")
+                continue
+            if record is not None:
+                yield record
+    
+    # ========== Escritura ==========
+    
+    def preload(self, session):
+        """Carga en diccionarios los SKU, categorías y materias primas existentes"""
+        self.product_ids = dict(session.query(Product.sku, Product.id).all())
+        self.category_ids = dict(session.query(Category.name, Category.id).all())
+        self.material_ids = {}
+        for material_id, name in session.query(RawMaterial.id, RawMaterial.name).order_by(RawMaterial.id.desc()):
+            self.material_ids[name] = material_id  # Con nombres repetidos gana el primero
+    
+    def write_chunk(self, session, records, default_stock, update_existing):
+        """Guarda un bloque de registros con inserciones y actualizaciones masivas"""
+        new_products = {}      # sku -> fila a insertar
+        product_updates = {}   # id -> cambios
+        recipes = []           # (sku, materials)
+        
+        for record in records:
+            sku = record['sku']
+            if sku in self.product_ids or sku in new_products:
+                if not update_existing:
+                    self.warnings.append(f"Producto ya existe (omitido): {record['name']}")
+                    continue
+                # Actualizar producto existente (o el insertado por una fila anterior del bloque)
+                if sku in new_products:
+                    new_products[sku].update(name=record['name'], sale_price=record['sale_price'])
+                else:
+                    product_updates[self.product_ids[sku]] = {
+                        'id': self.product_ids[sku], 'name': record['name'], 'sale_price': record['sale_price']
+                    }
+                self.updated_products += 1
+                self.warnings.append(f"Producto actualizado: {record['name']}")
+            else:
+                new_products[sku] = {
+                    'sku': sku,
+                    'name': record['name'],
+                    'description': f"Producto importado: {record['name']}",
+                    'category_name': record['category'],
+                    'stock': default_stock,
+                    'min_stock': 10,
+                    'cost_price': record['sale_price'] * self.profile.cost_ratio,  # Costo estimado según el perfil
+                    'sale_price': record['sale_price']
+                }
+            recipes.append((sku, record['materials']))
+        
+        self._create_categories(session, {row['category_name'] for row in new_products.values()})
+        self._create_materials(session, {
+            (material_name, unit) for _, materials in recipes for material_name, unit, _ in materials
+        })
+        
+        if new_products:
+            rows = list(new_products.values())
+            for row in rows:
+                row['category_id'] = self.category_ids[row.pop('category_name')]
+            created = session.execute(
+                insert(Product.__table__).returning(Product.sku, Product.id), rows
+            )
+            self.product_ids.update(dict(created.all()))
+            self.created_products += len(rows)
+        
+        if product_updates:
+            session.execute(update(Product), list(product_updates.values()))
+        
+        self._write_recipes(session, recipes)
+    
+    def _create_categories(self, session, names):
+        missing = sorted(name for name in names if name not in self.category_ids)
+        if not missing:
+            return
+        created = session.execute(
+            insert(Category.__table__).returning(Category.name, Category.id),
+            [{'name': name, 'description': f"Categoría {name}"} for name in missing]
+        )
+        self.category_ids.update(dict(created.all()))
+        for name in missing:
+            self.warnings.append(f"Categoría creada: {name}")
+    
+    def _create_materials(self, session, materials):
+        missing = {}
+        for material_name, unit in sorted(materials):
+            if material_name not in self.material_ids:
+                missing.setdefault(material_name, unit)
+        if not missing:
+            return
+        created = session.execute(
+            insert(RawMaterial.__table__).returning(RawMaterial.name, RawMaterial.id),
+            [
+                {'name': name, 'sku': f"MAT-{name[:10].upper()}", 'unit': unit,
+                 'stock': 0, 'min_stock': 10, 'cost_per_unit': 0}
+                for name, unit in missing.items()
+            ]
+        )
+        self.material_ids.update(dict(created.all()))
+        self.created_materials += len(missing)
+        for name, unit in missing.items():
+            self.warnings.append(f"Materia prima creada: {name} ({unit})")
+    
+    def _write_recipes(self, session, recipes):
+        """Crea o actualiza las relaciones producto-materia prima del bloque"""
+        quantities = {}  # (product_id, raw_material_id) -> cantidad (gana la última fila)
+        for sku, materials in recipes:
+            product_id = self.product_ids[sku]
+            for material_name, _, quantity in materials:
+                quantities[(product_id, self.material_ids[material_name])] = quantity
+        if not quantities:
+            return
+        
+        existing = {}
+        product_ids = {product_id for product_id, _ in quantities}
+        for relation_id, product_id, raw_material_id in session.query(
+            ProductMaterial.id, ProductMaterial.product_id, ProductMaterial.raw_material_id
+        ).filter(ProductMaterial.product_id.in_(product_ids)):
+            existing[(product_id, raw_material_id)] = relation_id
+        
+        updates, inserts = [], []
+        for (product_id, raw_material_id), quantity in quantities.items():
+            relation_id = existing.get((product_id, raw_material_id))
+            if relation_id is not None:
+                updates.append({'id': relation_id, 'quantity_needed': quantity})
+            else:
+                inserts.append({'product_id': product_id, 'raw_material_id': raw_material_id, 'quantity_needed': quantity})
+        
+        if updates:
+            session.execute(update(ProductMaterial), updates)
+        if inserts:
+            session.execute(insert(ProductMaterial.__table__), inserts)
+            self.created_relations += len(inserts)
+    
+    # ========== Importación ==========
+    
+    def _add_timing(self, stage, started):
+        self.timings[stage] = self.timings.get(stage, 0.0) + time.perf_counter() - started
+    
+    def _write_records(self, session, records, default_stock, update_existing):
+        """Guarda los registros por bloques de CHUNK_SIZE"""
+        records = iter(records)
+        while True:
+            # Lectura y validación del siguiente bloque
+            started = time.perf_counter()
+            chunk = list(islice(records, self.CHUNK_SIZE))
+            self._add_timing('lectura', started)
+            if not chunk:
+                break
             
-            return float(clean_price)
-        except (ValueError, AttributeError) as e:
-            self.warnings.append(f"Error parseando precio '{price_str}': {str(e)}")
-            return 0.0
+            started = time.perf_counter()
+            self.write_chunk(session, chunk, default_stock, update_existing)
+            self._add_timing('escritura', started)
     
-    def get_or_create_material(self, session, material_name, unit):
-        """Obtiene o crea una materia prima"""
+    def _commit(self, session):
+        started = time.perf_counter()
         try:
-            # Buscar materia prima existente
-            material = session.query(RawMaterial).filter_by(name=material_name).first()
-            
-            if not material:
-                # Crear nueva materia prima
-                material = RawMaterial(
-                    name=material_name,
-                    sku=f"MAT-{material_name[:10].upper()}",
-                    unit=unit,
-                    stock=0,
-                    min_stock=10,
-                    cost_per_unit=0
-                )
-                session.add(material)
-                session.flush()
-                self.created_materials += 1
-                self.warnings.append(f"Materia prima creada: {material_name} ({unit})")
-            
-            return material
-        except Exception as e:
-            self.warnings.append(f"Error creando materia prima {material_name}: {str(e)}")
-            raise e
+            session.commit()
+            RecipeCache.invalidate()  # Se crearon o actualizaron recetas
+        except Exception as commit_error:
+            session.rollback()
+            self.errors.append(f"Error al confirmar cambios: {str(commit_error)}")
+            raise commit_error
+        self._add_timing('confirmacion', started)
+    
+    def _result(self, **extra):
+        return {
+            'success': True,
+            'created_products': self.created_products,
+            'updated_products': self.updated_products,
+            'created_materials': self.created_materials,
+            'created_relations': self.created_relations,
+            'errors': self.errors,
+            'warnings': self.warnings,
+            'timings': self.timings,
+            **extra
+        }
     
-    def get_unit_from_column(self, column_name):
-        """Extrae la unidad de medida del nombre de columna"""
-        if '(ML)' in column_name:
-            return 'ml'
-        elif '(GR)' in column_name:
-            return 'g'
-        elif '(ONZ)' in column_name:
-            return 'oz'
-        elif '(UND)' in column_name:
-            return 'und'
-        else:
-            return 'und'
+    def _failure(self, session, error):
+        session.rollback()
+        self.errors.append(f"Error general: {str(error)}\n{traceback.format_exc()}")
+        return {
+            'success': False,
+            'error': str(error),
+            'errors': self.errors,
+            'warnings': self.warnings,
+            'timings': self.timings
+        }
     
-    def get_or_create_category(self, session, category_name):
-        """Obtiene o crea una categoría"""
+    def import_rows(self, rows, default_stock=100, update_existing=False):
+        """
+        Importa por bloques las filas de rows_after_header (el perfil ya compilado)
+        
+        Returns:
+            dict con estadísticas de la importación y tiempos por etapa (timings)
+        """
+        session = get_session()
+        import_started = time.perf_counter()
+        
         try:
-            category = session.query(Category).filter_by(name=category_name).first()
+            started = time.perf_counter()
+            self.preload(session)
+            self._add_timing('precarga', started)
             
-            if not category:
-                category = Category(
-                    name=category_name,
-                    description=f"Categoría {category_name}"
-                )
-                session.add(category)
-                session.flush()
-                self.warnings.append(f"Categoría creada: {category_name}")
+            self._write_records(session, self.parse_records(rows), default_stock, update_existing)
             
-            return category
+            self._commit(session)
+            self._add_timing('total', import_started)
+            return self._result()
+        
         except Exception as e:
-            self.warnings.append(f"Error creando categoría {category_name}: {str(e)}")
-            raise e
+            return self._failure(session, e)
+        finally:
+            close_session()
     
-    def import_from_csv(self, file_path, default_stock=100, update_existing=False):
+    @staticmethod
+    def parse_file(file_path, profile):
         """
-        Importa productos desde un archivo CSV
+        Lee y valida un archivo completo sin tocar la base de datos
+        (se ejecuta en un proceso del pool de import_files)
         
-        Args:
-            file_path: Ruta al archivo CSV
-            default_stock: Stock inicial para productos nuevos
-            update_existing: Si True, actualiza productos existentes
+        Returns:
+            dict con records, warnings, errors, rows (filas de datos leídas),
+            error (si el archivo no se pudo leer) y seconds
+        """
+        importer = ProductImporter(profile)
+        started = time.perf_counter()
+        
+        try:
+            if file_path.lower().endswith('.csv'):
+                rows = importer.read_csv_rows(file_path)
+            else:
+                rows = importer.read_excel_rows(file_path)
+            records = list(importer.parse_records(rows))
+            error = None
+        except Exception as e:
+            records, error = [], str(e)
+        
+        return {
+            'records': records,
+            'warnings': importer.warnings,
+            'errors': importer.errors,
+            'rows': importer.read_rows,
+            'error': error,
+            'seconds': time.perf_counter() - started
+        }
+    
+    def import_files(self, file_paths, default_stock=100, update_existing=False, max_workers=None):
+        """
+        Importa varios archivos CSV/Excel: se leen y validan en paralelo en
+        procesos separados y los registros se guardan en el orden de los
+        archivos (ante SKU repetidos gana el último archivo) en una sola
+        transacción
         
         Returns:
-            dict con estadísticas de la importación
+            dict de import_rows más 'files': reporte por archivo con
+            file, rows, records, parse_seconds, write_seconds, rows_per_second
+            y error
         """
         session = get_session()
+        import_started = time.perf_counter()
+        reports = []
+        workers = max_workers or min(len(file_paths), os.cpu_count() or 1) or 1
         
+        # spawn: no copiar al hijo los hilos de Qt ni la conexión abierta
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
         try:
-            # Verificar conexión a la base de datos
-            try:
-                from sqlalchemy import text
-                session.execute(text("SELECT 1"))
-            except Exception as db_error:
-                self.errors.append(f"Error de conexión a la base de datos: {str(db_error)}")
-                return {
-                    'success': False,
-                    'error': f"Error de conexión a la base de datos: {str(db_error)}",
-                    'errors': self.errors,
-                    'warnings': self.warnings
-                }
-            with open(file_path, 'r', encoding='utf-8') as file:
-                # Leer todas las líneas y encontrar la línea de encabezados
-                lines = file.readlines()
-                
-                # Buscar la línea que contiene "CODIGO" (línea de encabezados)
-                header_line_idx = None
-                for i, line in enumerate(lines):
-                    if 'CODIGO' in line and 'PRODUCTO' in line:
-                        header_line_idx = i
-                        break
-                
-                if header_line_idx is None:
-                    raise Exception("No se encontró la línea de encabezados con 'CODIGO' y 'PRODUCTO'")
-                
-                # Crear un nuevo archivo temporal sin las líneas vacías
-                import tempfile
-                import os
-                
-                temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', encoding='utf-8', newline='')
-                
-                # Escribir la línea de encabezados
-                temp_file.write(lines[header_line_idx])
-                
-                # Escribir las líneas de datos (después de la línea de encabezados)
-                for line in lines[header_line_idx + 1:]:
-                    temp_file.write(line)
-                
-                temp_file.close()
-                
-                # Leer el archivo temporal
-                with open(temp_file.name, 'r', encoding='utf-8') as temp_file_handle:
-                    csv_reader = csv.DictReader(temp_file_handle)
-                    
-                    for row_idx, row in enumerate(csv_reader, start=2):
-                        product_name = "Desconocido"  # Valor por defecto
-                        try:
-                            # Saltar la primera fila de ejemplo (código 0)
-                            codigo = row.get('CODIGO', '').strip()
-                            if not codigo or codigo == '0':
-                                continue
-                            
-                            
-                            # Extraer datos del producto
-                            product_name = row.get('PRODUCTO', '').strip()
-                            if not product_name:
-                                self.warnings.append(f"Fila {row_idx}: Nombre de producto vacío")
-                                continue
-                            
-                            # Parsear precio
-                            price_str = row.get('VALOR UNITARIO', '0')
-                            sale_price = self.parse_price(price_str)
-                            
-                            # Generar SKU
-                            sku = f"PROD-{codigo.zfill(3)}"
-                            
-                            # Buscar producto existente
-                            product = session.query(Product).filter_by(sku=sku).first()
-                            
-                            if product:
-                                if update_existing:
-                                    # Actualizar producto existente
-                                    product.name = product_name
-                                    product.sale_price = sale_price
-                                    self.updated_products += 1
-                                    self.warnings.append(f"Producto actualizado: {product_name}")
-                                else:
-                                    self.warnings.append(f"Producto ya existe (omitido): {product_name}")
-                                    continue
-                            else:
-                                # Determinar categoría basada en el nombre
-                                if 'SENA' in product_name.upper():
-                                    category_name = 'SENA'
-                                elif 'COLEGIO' in product_name.upper():
-                                    category_name = 'COLEGIO'
-                                elif 'MAYOR' in product_name.upper():
-                                    category_name = 'AL MAYOR'
-                                elif 'GRANIZADO' in product_name.upper():
-                                    category_name = 'GRANIZADOS'
-                                elif 'ALGODÓN' in product_name.upper():
-                                    category_name = 'ALGODÓN'
-                                elif 'COCA' in product_name.upper() or 'AGUA' in product_name.upper():
-                                    category_name = 'BEBIDAS'
-                                else:
-                                    category_name = 'CRISPETAS'
-                                
-                                category = self.get_or_create_category(session, category_name)
-                                
-                            # Crear nuevo producto
-                            product = Product(
-                                sku=sku,
-                                name=product_name,
-                                description=f"Producto importado: {product_name}",
-                                category_id=category.id,
-                                stock=default_stock,
-                                min_stock=10,
-                                cost_price=sale_price * 0.4,  # Estimar costo como 40% del precio
-                                sale_price=sale_price
-                            )
-                            session.add(product)
-                            session.flush()
-                            self.created_products += 1
-                            
-                            # Procesar materias primas
-                            materials_processed = 0
-                            for column_name, material_name in self.MATERIAL_COLUMNS.items():
-                                quantity_str = row.get(column_name, '0')
-                                quantity = self.parse_csv_value(quantity_str)
-                                
-                                if quantity > 0:
-                                    materials_processed += 1
-                                    # Obtener unidad de medida
-                                    unit = self.get_unit_from_column(column_name)
-                                    
-                                    # Obtener o crear materia prima
-                                    material = self.get_or_create_material(session, material_name, unit)
-                                    
-                                    # Verificar si ya existe la relación
-                                    existing_relation = session.query(ProductMaterial).filter_by(
-                                        product_id=product.id,
-                                        raw_material_id=material.id
-                                    ).first()
-                                    
-                                    if existing_relation:
-                                        # Actualizar cantidad
-                                        existing_relation.quantity_needed = quantity
-                                    else:
-                                        # Crear relación producto-materia prima
-                                        product_material = ProductMaterial(
-                                            product_id=product.id,
-                                            raw_material_id=material.id,
-                                            quantity_needed=quantity
-                                        )
-                                        session.add(product_material)
-                                        self.created_relations += 1
-                            
-                            if materials_processed == 0:
-                                self.warnings.append(f"DEBUG: {product_name} - Sin materias primas procesadas")
-                            else:
-                                self.warnings.append(f"DEBUG: {product_name} - {materials_processed} materias primas procesadas")
-                            
-                        except Exception as e:
-                            error_msg = f"Fila {row_idx} ({product_name}): {str(e)}"
-                            self.errors.append(error_msg)
-                            continue
-                
-                # Confirmar cambios
-                try:
-                    session.commit()
-                except Exception as commit_error:
-                    session.rollback()
-                    self.errors.append(f"Error al confirmar cambios: {str(commit_error)}")
-                    raise commit_error
+            futures = [pool.submit(ProductImporter.parse_file, path, self.profile) for path in file_paths]
+            
+            started = time.perf_counter()
+            self.preload(session)
+            self._add_timing('precarga', started)
+            
+            for file_path, future in zip(file_paths, futures):
+                file_name = os.path.basename(file_path)
                 
-                # Limpiar archivo temporal
-                try:
-                    os.unlink(temp_file.name)
-                except:
-                    pass
+                started = time.perf_counter()
+                parsed = future.result()
+                self._add_timing('espera', started)
                 
-                # Agregar estadísticas finales
-                self.warnings.append(f"DEBUG: Estadísticas finales - Productos: {self.created_products}, Materias: {self.created_materials}, Relaciones: {self.created_relations}")
+                self.warnings.extend(f"{file_name}: {warning}" for warning in parsed['warnings'])
+                self.errors.extend(f"{file_name}: {error}" for error in parsed['errors'])
+                if parsed['error']:
+                    self.errors.append(f"{file_name}: {parsed['error']}")
                 
-                return {
-                    'success': True,
-                    'created_products': self.created_products,
-                    'updated_products': self.updated_products,
-                    'created_materials': self.created_materials,
-                    'created_relations': self.created_relations,
-                    'errors': self.errors,
-                    'warnings': self.warnings
-                }
+                warnings_before = len(self.warnings)
+                started = time.perf_counter()
+                self._write_records(session, parsed['records'], default_stock, update_existing)
+                write_seconds = time.perf_counter() - started
+                self.warnings[warnings_before:] = [f"{file_name}: {warning}" for warning in self.warnings[warnings_before:]]
                 
-        except Exception as e:
-            session.rollback()
-            self.errors.append(f"Error general: {str(e)}\n{traceback.format_exc()}")
+                elapsed = parsed['seconds'] + write_seconds
+                reports.append({
+                    'file': file_name,
+                    'rows': parsed['rows'],
+                    'records': len(parsed['records']),
+                    'parse_seconds': parsed['seconds'],
+                    'write_seconds': write_seconds,
+                    'rows_per_second': parsed['rows'] / elapsed if elapsed > 0 else 0.0,
+                    'error': parsed['error']
+                })
             
-            # Limpiar archivo temporal en caso de error
-            try:
-                if 'temp_file' in locals():
-                    os.unlink(temp_file.name)
-            except:
-                pass
-            
-            return {
-                'success': False,
-                'error': str(e),
-                'errors': self.errors,
-                'warnings': self.warnings
-            }
+            self._commit(session)
+            self._add_timing('total', import_started)
+            return self._result(files=reports)
+        
+        except Exception as e:
+            result = self._failure(session, e)
+            result['files'] = reports
+            return result
         finally:
+            pool.shutdown(cancel_futures=True)
             close_session()
     
+    def import_from_csv(self, file_path, default_stock=100, update_existing=False):
+        """
+        Importa productos desde un archivo CSV
+        
+        Args:
+            file_path: Ruta al archivo CSV
+            default_stock: Stock inicial para productos nuevos
+            update_existing: Si True, actualiza productos existentes
+        
+        Returns:
+            dict con estadísticas de la importación
+        """
+        return self.import_rows(self.read_csv_rows(file_path), default_stock, update_existing)
+    
     def import_from_excel(self, file_path, default_stock=100, update_existing=False):
         """
         Importa productos desde un archivo Excel
-        Convierte el Excel a CSV temporalmente y luego importa
+        Lee las filas directamente con openpyxl en modo read_only
         """
         try:
             import openpyxl
-            import tempfile
-            import os
-            
-            # Cargar el archivo Excel
-            wb = openpyxl.load_workbook(file_path)
-            ws = wb.active
-            
-            # Crear archivo CSV temporal
-            temp_csv = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', encoding='utf-8', newline='')
-            csv_writer = csv.writer(temp_csv)
-            
-            # Escribir datos al CSV
-            for row in ws.iter_rows(values_only=True):
-                csv_writer.writerow(row)
-            
-            temp_csv.close()
-            
-            # Importar desde el CSV temporal
-            result = self.import_from_csv(temp_csv.name, default_stock, update_existing)
-            
-            # Eliminar archivo temporal
-            os.unlink(temp_csv.name)
-            
-            return result
-            
         except ImportError:
             return {
                 'success': False,
@@ -425,10 +486,4 @@ class ProductImporter:
                 'errors': ['openpyxl no disponible'],
                 'warnings': []
             }
-        except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'errors': [f"Error al procesar Excel: {str(e)}\n{traceback.format_exc()}"],
-                'warnings': []
-            }
+        return self.import_rows(self.read_excel_rows(file_path), default_stock, update_existing)
@@ -0,0 +1,175 @@
+"""
+Trazas del inicio de la aplicación
+Mide el tiempo de reloj y el tiempo de importación de módulos de cada fase
+del arranque (base de datos, licencia, interfaz...) y al terminar agrega el
+resultado a un registro JSON local (startup_log.json junto a la base de
+datos), para saber en qué se va el inicio en cada equipo. Fuera del inicio
+StartupTracer.phase() no hace nada, así que las fases pueden quedar en el
+código (ej: init_db) sin costo.
+"""
+import builtins
+import importlib.util
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Presupuesto del inicio hasta la primera pintura de la ventana (ms)
+DEFAULT_BUDGET_MS = int(os.environ.get('INVENTORY_STARTUP_BUDGET_MS', '3000'))
+
+# Ejecuciones que se conservan en el registro
+LOG_ENTRIES = 50
+
+
+class StartupTracer:
+    """
+    Trazador del inicio para todo el proceso (solo mide en el hilo que lo inició)
+    """
+
+    _active = False
+    _started = None
+    _thread = None
+    _stack = []          # Fases abiertas (nombres)
+    _phases = []         # Fases terminadas: dict con name, wall_ms, import_ms, modules
+    _import_seconds = 0.0
+    _import_depth = 0
+    _module_seconds = {}  # Módulo importado -> segundos (incluye sus dependencias)
+    _original_import = None
+
+    @staticmethod
+    def start():
+        """Empieza a medir (al principio de main) e instala el medidor de imports"""
+        if StartupTracer._active:
+            return
+        StartupTracer._active = True
+        StartupTracer._started = time.perf_counter()
+        StartupTracer._thread = threading.get_ident()
+        StartupTracer._stack = []
+        StartupTracer._phases = []
+        StartupTracer._import_seconds = 0.0
+        StartupTracer._module_seconds = {}
+        StartupTracer._original_import = builtins.__import__
+        builtins.__import__ = StartupTracer._timed_import
+
+    @staticmethod
+    def is_active():
+        return StartupTracer._active
+
+    @staticmethod
+    def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+        original = StartupTracer._original_import
+        if threading.get_ident() != StartupTracer._thread:
+            return original(name, globals, locals, fromlist, level)
+        module = name
+        if level:
+            package = (globals or {}).get('__package__') or (globals or {}).get('__name__', '')
+            try:
+                module = importlib.util.resolve_name(f"{'.' * level}{name}", package)
+            except (ImportError, ValueError):
+                pass
+        if module in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        # Se cronometra cada módulo nuevo (con lo que él importa); al total
+        # solo suma el import más externo para no contar dos veces
+        StartupTracer._import_depth += 1
+        started = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            StartupTracer._import_depth -= 1
+            if not StartupTracer._import_depth:
+                StartupTracer._import_seconds += elapsed
+            if elapsed >= 0.001:
+                StartupTracer._module_seconds.setdefault(module, elapsed)
+
+    @staticmethod
+    @contextmanager
+    def phase(name):
+        """
+        Mide una fase del inicio; las fases anidadas quedan como "padre/hija"
+        Sin trazador activo no hace nada
+        """
+        if not StartupTracer._active or threading.get_ident() != StartupTracer._thread:
+            yield
+            return
+
+        StartupTracer._stack.append(name)
+        modules_before = len(sys.modules)
+        imports_before = StartupTracer._import_seconds
+        started = time.perf_counter()
+        record = {'name': '/'.join(StartupTracer._stack),
+                  'start_ms': round((started - StartupTracer._started) * 1000, 1)}
+        StartupTracer._phases.append(record)  # En orden de inicio (la padre antes que sus hijas)
+        try:
+            yield
+        finally:
+            record['wall_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            record['import_ms'] = round((StartupTracer._import_seconds - imports_before) * 1000, 1)
+            record['modules'] = len(sys.modules) - modules_before
+            StartupTracer._stack.pop()
+
+    @staticmethod
+    def slowest_imports(limit=20):
+        """Módulos cuya importación (con sus dependencias) tardó más: [(módulo, ms)]"""
+        ranking = sorted(StartupTracer._module_seconds.items(), key=lambda item: item[1], reverse=True)
+        return [(module, round(seconds * 1000, 1)) for module, seconds in ranking[:limit]]
+
+    @staticmethod
+    def finish(log_path, budget_ms=DEFAULT_BUDGET_MS):
+        """
+        Termina la medición (primera pintura de la ventana), restaura el import
+        original y agrega la ejecución al registro JSON
+
+        Returns:
+            dict con total_ms, budget_ms, over_budget, phases e imports
+        """
+        if not StartupTracer._active:
+            return None
+        total_ms = round((time.perf_counter() - StartupTracer._started) * 1000, 1)
+        builtins.__import__ = StartupTracer._original_import
+        StartupTracer._active = False
+
+        report = {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'total_ms': total_ms,
+            'budget_ms': budget_ms,
+            'over_budget': total_ms > budget_ms,
+            'import_ms': round(StartupTracer._import_seconds * 1000, 1),
+            'phases': StartupTracer._phases,
+            'imports': StartupTracer.slowest_imports(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'frozen': bool(getattr(sys, 'frozen', False))
+        }
+
+        try:
+            entries = []
+            if os.path.exists(log_path):
+                with open(log_path, 'r', encoding='utf-8') as file:
+                    entries = json.load(file)
+            entries = (entries if isinstance(entries, list) else [])[-(LOG_ENTRIES - 1):] + [report]
+            with open(log_path, 'w', encoding='utf-8') as file:
+                json.dump(entries, file, indent=2, ensure_ascii=False)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo guardar el registro de inicio: {e}")
+
+        return report
+
+    @staticmethod
+    def summary(report):
+        """Texto con las fases del inicio para la consola"""
+        lines = [f"Inicio: {report['total_ms']:.0f} ms (presupuesto {report['budget_ms']} ms, "
+                 f"importaciones {report['import_ms']:.0f} ms)"]
+        for phase in report['phases']:
+            indent = '   ' * phase['name'].count('/')
+            lines.append(
+                f"   {indent}{phase['name'].rsplit('/', 1)[-1]:<28} {phase['wall_ms']:>8.0f} ms"
+                f"   (imports {phase['import_ms']:.0f} ms, {phase['modules']} módulos)"
+            )
+        return "\n".join(lines)